@@ -1,12 +1,15 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
+import structlog
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import get_settings
 
 settings = get_settings()
 
+logger = structlog.get_logger()
+
 # Create engine
 engine = create_engine(
     settings.DATABASE_URL,
@@ -27,3 +30,23 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def create_missing_indexes(target, connection, **kw):
+    """Create declared indexes missing from tables that already exist.
+
+    ``create_all`` only creates indexes along with new tables, so databases
+    created before an index was declared would never get it. Registered as
+    an ``after_create`` listener on the metadata in models.py.
+
+    Args:
+        target: MetaData being created
+        connection: Connection the DDL ran on
+    """
+    inspector = inspect(connection)
+    for table in target.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                logger.info("database_index_created", table=table.name, index=index.name)
@@ -55,6 +55,10 @@ async def shutdown():
     """Cleanup on shutdown."""
     logger.info("Shutting down API server")
 
+    # Write out memory retrieval counts (only if a manager was created)
+    if memory.get_async_memory_manager.cache_info().currsize:
+        memory.get_async_memory_manager().memory_manager.close()
+
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
@@ -1,12 +1,13 @@
 """SQLAlchemy models for team dashboard."""
 
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, JSON, ForeignKey, Table
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, JSON, ForeignKey, Table, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
 
-from .database import Base
+from .database import Base, create_missing_indexes
+from .rollups import install_rollups
 
 
 def generate_uuid():
@@ -79,6 +80,16 @@ class User(Base):
 class SessionModel(Base):
     """Extended Session model for team dashboard."""
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Session lists: newest activity first, optionally per team/status/project
+        Index("ix_sessions_last_activity_id", "last_activity", "id"),
+        Index("ix_sessions_team_last_activity", "team_id", "last_activity", "id"),
+        Index("ix_sessions_status_last_activity", "status", "last_activity", "id"),
+        Index("ix_sessions_project_last_activity", "project_name", "last_activity", "id"),
+        # Time-window analytics
+        Index("ix_sessions_start_time", "start_time"),
+        Index("ix_sessions_team_start_time", "team_id", "start_time"),
+    )
 
     # Core fields (from CLI version)
     id = Column(String, primary_key=True, default=generate_uuid)
@@ -163,6 +174,33 @@ class TeamMetric(Base):
     team = relationship("Team", back_populates="metrics")
 
 
+class SessionRollup(Base):
+    """Per team/day/type/status/project session aggregates (see rollups.py)."""
+    __tablename__ = "session_rollups"
+
+    team_key = Column(String, primary_key=True)  # team_id, '' for no team
+    day = Column(String, primary_key=True)  # date(start_time), YYYY-MM-DD
+    type = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    project_name = Column(String, primary_key=True)  # '' for no project
+
+    session_count = Column(Integer, nullable=False, default=0)
+    token_total = Column(Integer, nullable=False, default=0)
+    health_total = Column(Float, nullable=False, default=0.0)
+    duration_total = Column(Float, nullable=False, default=0.0)  # seconds
+
+
+class SessionBucketRollup(Base):
+    """Per team session counts by health (10-point) or token bucket (see rollups.py)."""
+    __tablename__ = "session_bucket_rollups"
+
+    team_key = Column(String, primary_key=True)  # team_id, '' for no team
+    metric = Column(String, primary_key=True)  # health, tokens
+    bucket = Column(Integer, primary_key=True)
+
+    session_count = Column(Integer, nullable=False, default=0)
+
+
 class SharedInsight(Base):
     """Shared insights and learnings."""
     __tablename__ = "shared_insights"
@@ -197,6 +235,9 @@ class SharedInsight(Base):
 class SessionParticipant(Base):
     """Track participants in collaborative sessions."""
     __tablename__ = "session_participants"
+    __table_args__ = (
+        Index("ix_session_participants_session_user", "session_id", "user_id"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     session_id = Column(String, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
@@ -221,6 +262,9 @@ class SessionParticipant(Base):
 class SessionMessage(Base):
     """Chat messages and comments in sessions."""
     __tablename__ = "session_messages"
+    __table_args__ = (
+        Index("ix_session_messages_session_created", "session_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     session_id = Column(String, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
@@ -250,6 +294,9 @@ class SessionMessage(Base):
 class SessionEvent(Base):
     """Track events in collaborative sessions."""
     __tablename__ = "session_events"
+    __table_args__ = (
+        Index("ix_session_events_session_timestamp", "session_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(String, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
@@ -265,3 +312,9 @@ class SessionEvent(Base):
     # Relationships
     session = relationship("SessionModel", backref="events")
     user = relationship("User", backref="events")
+
+
+# Whenever the schema is created: add indexes that existing tables lack,
+# then install rollup triggers (and backfill)
+event.listen(Base.metadata, "after_create", create_missing_indexes)
+event.listen(Base.metadata, "after_create", install_rollups)
@@ -0,0 +1,156 @@
+"""Keyset pagination, field projection and conditional responses for session lists.
+
+Session lists are ordered newest activity first on ``(last_activity, id)``.
+A page's cursor encodes the last row's key, and the next page starts
+strictly after it, so deep pages cost the same as the first one and rows
+written while a client pages are neither skipped nor repeated.
+
+Responses carry an ETag (a hash of the body). Clients that poll can send
+it back in ``If-None-Match`` and get ``304 Not Modified`` with no body
+when the page is unchanged.
+"""
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import String, and_, cast, exists, func, or_, select
+from sqlalchemy.orm import Query, load_only
+
+from .models import SessionModel
+
+MAX_PAGE_SIZE = 500
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+# Session fields a list can project, with how each is serialized
+SESSION_FIELDS: Dict[str, Callable[[SessionModel], Any]] = {
+    "id": lambda s: s.id,
+    "pid": lambda s: s.pid,
+    "type": lambda s: s.type,
+    "status": lambda s: s.status,
+    "start_time": lambda s: _isoformat(s.start_time),
+    "last_activity": lambda s: _isoformat(s.last_activity),
+    "working_directory": lambda s: s.working_directory,
+    "token_count": lambda s: s.token_count,
+    "token_limit": lambda s: s.token_limit,
+    "health_score": lambda s: s.health_score,
+    "message_count": lambda s: s.message_count,
+    "file_count": lambda s: s.file_count,
+    "error_count": lambda s: s.error_count,
+    "tags": lambda s: s.tags or [],
+    "project_name": lambda s: s.project_name,
+    "description": lambda s: s.description,
+    "team_id": lambda s: s.team_id,
+    "visibility": lambda s: s.visibility,
+    "hostname": lambda s: s.hostname,
+}
+
+
+def parse_fields(fields: Optional[str], default: List[str]) -> List[str]:
+    """Resolve a ``fields=a,b,c`` parameter against SESSION_FIELDS.
+
+    Raises:
+        HTTPException: 400 if a field is unknown
+    """
+    if not fields:
+        return default
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SESSION_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(SESSION_FIELDS)}"
+        )
+    return names
+
+
+def project_sessions(sessions: List[SessionModel], fields: List[str]) -> List[Dict[str, Any]]:
+    """Serialize sessions keeping only ``fields``."""
+    return [{name: SESSION_FIELDS[name](s) for name in fields} for s in sessions]
+
+
+def encode_cursor(session: SessionModel) -> str:
+    """Opaque cursor pointing just after ``session`` in list order."""
+    key = json.dumps([session.last_activity.isoformat(), session.id])
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_activity, session_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(last_activity), str(session_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def has_tag(query: Query, tag: str) -> Query:
+    """Filter sessions whose JSON ``tags`` list contains ``tag``."""
+    if query.session.get_bind().dialect.name == "sqlite":
+        tags = func.json_each(SessionModel.tags).table_valued("value")
+        return query.filter(exists(select(1).select_from(tags).where(tags.c.value == tag)))
+    return query.filter(cast(SessionModel.tags, String).like(f'%"{tag}"%'))
+
+
+def keyset_page(
+    query: Query,
+    cursor: Optional[str],
+    limit: int,
+    fields: List[str],
+) -> Tuple[List[SessionModel], Optional[str]]:
+    """Fetch one page of sessions, newest activity first.
+
+    Args:
+        query: Filtered SessionModel query
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size
+        fields: Projected fields; only these columns (plus the key) are loaded
+
+    Returns:
+        The page's sessions and the cursor for the next page (None on the last page)
+    """
+    if cursor:
+        last_activity, session_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            SessionModel.last_activity < last_activity,
+            and_(SessionModel.last_activity == last_activity, SessionModel.id < session_id),
+        ))
+
+    columns = {"id", "last_activity", *fields}
+    rows = query.options(
+        load_only(*(getattr(SessionModel, name) for name in columns))
+    ).order_by(
+        SessionModel.last_activity.desc(), SessionModel.id.desc()
+    ).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def conditional_json(request: Request, payload: Dict[str, Any]) -> Response:
+    """JSON response with an ETag, or 304 if it matches ``If-None-Match``."""
+    body = json.dumps(payload, sort_keys=True, default=str)
+    etag = f'W/"{hashlib.sha1(body.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(content=payload, headers=headers)
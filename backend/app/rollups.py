@@ -0,0 +1,230 @@
+"""Incrementally maintained session rollups for team analytics.
+
+The analytics endpoints read pre-aggregated rows instead of scanning every
+session. Two tables are kept current by SQLite triggers on ``sessions``, so
+rows written by the API and rows written directly by the CLI (raw sqlite3)
+are both counted:
+
+- ``session_rollups``: count, token, health and duration totals per
+  team/day/type/status/project.
+- ``session_bucket_rollups``: session counts per team in 10-point health
+  buckets and in token-usage buckets.
+
+Each trigger subtracts the OLD row from its group and adds the NEW row, so
+an insert, update or delete costs a handful of primary-key upserts. Groups
+that drop to zero sessions are removed.
+"""
+
+from typing import Dict, List
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = structlog.get_logger()
+
+# Health buckets, indexed by int(health_score) // 10 clamped to 0-9
+HEALTH_BUCKETS = [
+    "0-9", "10-19", "20-29", "30-39", "40-49",
+    "50-59", "60-69", "70-79", "80-89", "90-100",
+]
+
+# Token usage buckets: (label, upper bound); the last bucket is open-ended
+TOKEN_BUCKETS = [
+    ("0-10k", 10000),
+    ("10k-50k", 50000),
+    ("50k-100k", 100000),
+    ("100k-150k", 150000),
+    ("150k-200k", 200000),
+    ("200k+", None),
+]
+
+# Columns whose changes move a session between (or within) rollup groups
+ROLLUP_COLUMNS = [
+    "team_id", "type", "status", "project_name",
+    "start_time", "last_activity", "token_count", "health_score",
+]
+
+TRIGGER_NAMES = ["sessions_rollup_insert", "sessions_rollup_update", "sessions_rollup_delete"]
+
+
+def _keys(row: str) -> List[str]:
+    """Group key expressions for a sessions row (or alias)."""
+    return [
+        f"COALESCE({row}.team_id, '')",
+        f"COALESCE(date({row}.start_time), '')",
+        f"{row}.type",
+        f"{row}.status",
+        f"COALESCE({row}.project_name, '')",
+    ]
+
+
+def _duration(row: str) -> str:
+    return (
+        f"COALESCE((julianday({row}.last_activity) - julianday({row}.start_time)) * 86400.0, 0)"
+    )
+
+
+def _health_bucket(row: str) -> str:
+    return f"MIN(9, MAX(0, CAST(COALESCE({row}.health_score, 0) AS INTEGER) / 10))"
+
+
+def _token_bucket(row: str) -> str:
+    cases = " ".join(
+        f"WHEN COALESCE({row}.token_count, 0) < {bound} THEN {i}"
+        for i, (_, bound) in enumerate(TOKEN_BUCKETS) if bound is not None
+    )
+    return f"CASE {cases} ELSE {len(TOKEN_BUCKETS) - 1} END"
+
+
+def _apply(row: str, sign: int) -> str:
+    """Statements adding (sign=1) or removing (sign=-1) one row from the rollups."""
+    team, day, type_, status, project = _keys(row)
+    buckets = [("health", _health_bucket(row)), ("tokens", _token_bucket(row))]
+
+    statements = [
+        f"""
+        INSERT INTO session_rollups
+            (team_key, day, type, status, project_name,
+             session_count, token_total, health_total, duration_total)
+        VALUES ({team}, {day}, {type_}, {status}, {project},
+                {sign}, {sign} * COALESCE({row}.token_count, 0),
+                {sign} * COALESCE({row}.health_score, 0), {sign} * {_duration(row)})
+        ON CONFLICT (team_key, day, type, status, project_name) DO UPDATE SET
+            session_count = session_count + excluded.session_count,
+            token_total = token_total + excluded.token_total,
+            health_total = health_total + excluded.health_total,
+            duration_total = duration_total + excluded.duration_total;
+        """
+    ]
+    for metric, bucket in buckets:
+        statements.append(f"""
+        INSERT INTO session_bucket_rollups (team_key, metric, bucket, session_count)
+        VALUES ({team}, '{metric}', {bucket}, {sign})
+        ON CONFLICT (team_key, metric, bucket) DO UPDATE SET
+            session_count = session_count + excluded.session_count;
+        """)
+
+    if sign < 0:
+        statements.append(f"""
+        DELETE FROM session_rollups
+        WHERE team_key = {team} AND day = {day} AND type = {type_}
+          AND status = {status} AND project_name = {project} AND session_count <= 0;
+        """)
+        statements.append(f"""
+        DELETE FROM session_bucket_rollups
+        WHERE team_key = {team} AND session_count <= 0;
+        """)
+    return "".join(statements)
+
+
+def _trigger_ddl() -> List[str]:
+    columns = ", ".join(ROLLUP_COLUMNS)
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sessions_rollup_insert AFTER INSERT ON sessions
+        BEGIN {_apply('NEW', 1)} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sessions_rollup_update AFTER UPDATE OF {columns} ON sessions
+        BEGIN {_apply('OLD', -1)} {_apply('NEW', 1)} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sessions_rollup_delete AFTER DELETE ON sessions
+        BEGIN {_apply('OLD', -1)} END
+        """,
+    ]
+
+
+def _rebuild_sql() -> List[str]:
+    keys = _keys("s")
+    group_keys = ", ".join(keys)
+    statements = [
+        "DELETE FROM session_rollups",
+        "DELETE FROM session_bucket_rollups",
+        f"""
+        INSERT INTO session_rollups
+            (team_key, day, type, status, project_name,
+             session_count, token_total, health_total, duration_total)
+        SELECT {group_keys}, COUNT(*), SUM(COALESCE(s.token_count, 0)),
+               SUM(COALESCE(s.health_score, 0)), SUM({_duration('s')})
+        FROM sessions AS s
+        GROUP BY {group_keys}
+        """,
+    ]
+    for metric, bucket in (("health", _health_bucket("s")), ("tokens", _token_bucket("s"))):
+        statements.append(f"""
+        INSERT INTO session_bucket_rollups (team_key, metric, bucket, session_count)
+        SELECT {keys[0]}, '{metric}', {bucket}, COUNT(*)
+        FROM sessions AS s
+        GROUP BY {keys[0]}, {bucket}
+        """)
+    return statements
+
+
+def rebuild_rollups(connection) -> None:
+    """Recompute both rollup tables from the sessions table.
+
+    Args:
+        connection: SQLAlchemy connection (runs inside its transaction)
+    """
+    for statement in _rebuild_sql():
+        connection.execute(text(statement))
+    logger.info("session_rollups_rebuilt")
+
+
+def install_rollups(target, connection, **kw) -> None:
+    """Create the rollup triggers and backfill (``after_create`` listener).
+
+    Only SQLite is supported; other dialects keep the scanning code paths.
+    Existing triggers are left alone, so a restart does not rebuild.
+
+    Args:
+        target: MetaData being created
+        connection: Connection the DDL ran on
+    """
+    if connection.dialect.name != "sqlite":
+        logger.info("session_rollups_skipped", dialect=connection.dialect.name)
+        return
+
+    columns = {row[1] for row in connection.execute(text("PRAGMA table_info(sessions)"))}
+    missing = set(ROLLUP_COLUMNS) - columns
+    if missing:
+        logger.warning("session_rollups_skipped", missing_columns=sorted(missing))
+        return
+
+    existing = {
+        row[0] for row in connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        )
+    }
+    if set(TRIGGER_NAMES) <= existing:
+        return
+
+    for ddl in _trigger_ddl():
+        connection.execute(text(ddl))
+    rebuild_rollups(connection)
+    logger.info("session_rollups_installed")
+
+
+_available: Dict[str, bool] = {}
+
+
+def rollups_available(db: Session) -> bool:
+    """Whether the rollup triggers are installed on this session's database."""
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _available:
+        if bind.dialect.name != "sqlite":
+            _available[key] = False
+        else:
+            names = {
+                row[0] for row in db.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+                )
+            }
+            # Only cache a positive answer; tables may be created later
+            if not set(TRIGGER_NAMES) <= names:
+                return False
+            _available[key] = True
+    return _available[key]
@@ -1,16 +1,147 @@
-"""Analytics router."""
+"""Analytics router.
+
+Every endpoint aggregates in the database. Totals and bucket counts come
+from the rollup tables when their triggers are installed (see rollups.py);
+otherwise the same numbers come from GROUP BY queries over ``sessions``.
+"""
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import Optional
-from datetime import datetime, timedelta
+from sqlalchemy import Date, case, cast, func, select
+from typing import Dict, Optional
+from datetime import date, datetime, time, timedelta
 
 from ..database import get_db
-from ..models import SessionModel, Team, User, TeamMetric, SessionHistory
+from ..models import SessionModel, Team, SessionRollup, SessionBucketRollup
+from ..rollups import HEALTH_BUCKETS, TOKEN_BUCKETS, rollups_available
 
 router = APIRouter()
 
+# Statuses broken out in team summaries and daily trends
+TRACKED_STATUSES = ("active", "completed", "failed")
+
+sessions_table = SessionModel.__table__
+rollups_table = SessionRollup.__table__
+bucket_rollups_table = SessionBucketRollup.__table__
+
+
+def _is_sqlite(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def _duration_seconds(db: Session):
+    """Session duration in seconds as a SQL expression."""
+    c = sessions_table.c
+    if _is_sqlite(db):
+        return (func.julianday(c.last_activity) - func.julianday(c.start_time)) * 86400.0
+    return func.extract("epoch", c.last_activity - c.start_time)
+
+
+def _health_bucket():
+    """Index into HEALTH_BUCKETS as a SQL expression."""
+    health = func.coalesce(sessions_table.c.health_score, 0)
+    return case(*[(health >= b * 10, b) for b in range(9, 0, -1)], else_=0)
+
+
+def _token_bucket():
+    """Index into TOKEN_BUCKETS as a SQL expression."""
+    tokens = func.coalesce(sessions_table.c.token_count, 0)
+    return case(
+        *[(tokens < bound, i) for i, (_, bound) in enumerate(TOKEN_BUCKETS) if bound is not None],
+        else_=len(TOKEN_BUCKETS) - 1
+    )
+
+
+def _session_dimensions(db: Session):
+    """Group-by expressions over ``sessions`` matching the rollup key columns."""
+    c = sessions_table.c
+    return {
+        "status": c.status,
+        "type": c.type,
+        "project_name": func.coalesce(c.project_name, ""),
+        "day": func.date(c.start_time) if _is_sqlite(db) else cast(c.start_time, Date),
+    }
+
+
+def _team_filter(stmt, team_id: Optional[str]):
+    return stmt.where(sessions_table.c.team_id == team_id) if team_id else stmt
+
+
+def _totals(db: Session, team_id: Optional[str], *dimensions: str, since: Optional[date] = None):
+    """Session count and token, health and duration sums per group.
+
+    Args:
+        db: Database session
+        team_id: Team to aggregate, or None for all teams
+        *dimensions: Group-by keys: status, type, project_name, day
+        since: Only count sessions started on or after this day
+
+    Returns:
+        Rows with the dimensions plus session_count, token_total,
+        health_total and duration_total; empty groups are dropped
+    """
+    if rollups_available(db):
+        columns = [rollups_table.c[name] for name in dimensions]
+        stmt = select(
+            *columns,
+            func.sum(rollups_table.c.session_count).label("session_count"),
+            func.sum(rollups_table.c.token_total).label("token_total"),
+            func.sum(rollups_table.c.health_total).label("health_total"),
+            func.sum(rollups_table.c.duration_total).label("duration_total"),
+        )
+        if team_id:
+            stmt = stmt.where(rollups_table.c.team_key == team_id)
+        if since:
+            stmt = stmt.where(rollups_table.c.day >= since.isoformat())
+    else:
+        c = sessions_table.c
+        expressions = _session_dimensions(db)
+        columns = [expressions[name].label(name) for name in dimensions]
+        stmt = _team_filter(select(
+            *columns,
+            func.count().label("session_count"),
+            func.sum(func.coalesce(c.token_count, 0)).label("token_total"),
+            func.sum(func.coalesce(c.health_score, 0)).label("health_total"),
+            func.sum(func.coalesce(_duration_seconds(db), 0)).label("duration_total"),
+        ), team_id)
+        if since:
+            stmt = stmt.where(c.start_time >= datetime.combine(since, time.min))
+
+    if columns:
+        stmt = stmt.group_by(*columns)
+    return [row for row in db.execute(stmt) if row.session_count]
+
+
+def _buckets(db: Session, team_id: Optional[str], metric: str) -> Dict[int, int]:
+    """Session counts per bucket index ("health" or "tokens") for a team or all teams."""
+    if rollups_available(db):
+        bucket = bucket_rollups_table.c.bucket
+        stmt = select(bucket, func.sum(bucket_rollups_table.c.session_count)).where(
+            bucket_rollups_table.c.metric == metric
+        )
+        if team_id:
+            stmt = stmt.where(bucket_rollups_table.c.team_key == team_id)
+    else:
+        bucket = (_health_bucket() if metric == "health" else _token_bucket()).label("bucket")
+        stmt = _team_filter(select(bucket, func.count()), team_id)
+    return {index: count for index, count in db.execute(stmt.group_by(bucket))}
+
+
+def _session_trend(daily_breakdown):
+    """Compare mean daily session counts in the first and second half of the period."""
+    if len(daily_breakdown) < 2:
+        return "insufficient_data", 0
+
+    first_half = daily_breakdown[:len(daily_breakdown)//2]
+    second_half = daily_breakdown[len(daily_breakdown)//2:]
+
+    first_avg = sum(d["session_count"] for d in first_half) / len(first_half)
+    second_avg = sum(d["session_count"] for d in second_half) / len(second_half)
+
+    trend = "increasing" if second_avg > first_avg else "decreasing" if second_avg < first_avg else "stable"
+    trend_percentage = round(((second_avg - first_avg) / first_avg * 100), 1) if first_avg > 0 else 0
+    return trend, trend_percentage
+
 
 @router.get("/team")
 async def team_analytics(
@@ -18,72 +149,46 @@ async def team_analytics(
     db: Session = Depends(get_db)
 ):
     """Get comprehensive team analytics."""
-    query = db.query(SessionModel)
-
     if team_id:
         # Team-specific analytics
         team = db.query(Team).filter(Team.id == team_id).first()
         if not team:
             return {"error": "Team not found"}
-
-        query = query.filter(SessionModel.team_id == team_id)
         team_name = team.name
     else:
         # Global analytics across all teams
         team_name = "All Teams"
 
-    sessions = query.all()
-
-    if not sessions:
+    groups = _totals(db, team_id, "status", "type", "project_name")
+    if not groups:
         return {
             "team_name": team_name,
             "total_sessions": 0,
             "message": "No sessions found"
         }
 
-    # Calculate metrics
-    total_sessions = len(sessions)
-    active_sessions = sum(1 for s in sessions if s.status == "active")
-    completed_sessions = sum(1 for s in sessions if s.status == "completed")
-    failed_sessions = sum(1 for s in sessions if s.status == "failed")
+    total_sessions = sum(g.session_count for g in groups)
+    total_tokens = sum(g.token_total for g in groups)
+    total_health = sum(g.health_total for g in groups)
 
-    total_tokens = sum(s.token_count for s in sessions)
-    avg_tokens = total_tokens / total_sessions if total_sessions > 0 else 0
-
-    total_health = sum(s.health_score for s in sessions)
-    avg_health = total_health / total_sessions if total_sessions > 0 else 0
-
-    # Health distribution
-    healthy = sum(1 for s in sessions if s.health_score >= 80)
-    warning = sum(1 for s in sessions if 50 <= s.health_score < 80)
-    critical = sum(1 for s in sessions if s.health_score < 50)
-
-    # Session types
+    status_counts = {status: 0 for status in TRACKED_STATUSES}
     session_types = {}
-    for session in sessions:
-        session_types[session.type] = session_types.get(session.type, 0) + 1
-
-    # Top projects
     projects = {}
-    for session in sessions:
-        if session.project_name:
-            if session.project_name not in projects:
-                projects[session.project_name] = {
-                    "session_count": 0,
-                    "total_tokens": 0,
-                    "avg_health": 0,
-                    "health_sum": 0
-                }
-            projects[session.project_name]["session_count"] += 1
-            projects[session.project_name]["total_tokens"] += session.token_count
-            projects[session.project_name]["health_sum"] += session.health_score
+    for g in groups:
+        if g.status in status_counts:
+            status_counts[g.status] += g.session_count
+        session_types[g.type] = session_types.get(g.type, 0) + g.session_count
+        if g.project_name:
+            project = projects.setdefault(
+                g.project_name, {"session_count": 0, "total_tokens": 0, "health_sum": 0}
+            )
+            project["session_count"] += g.session_count
+            project["total_tokens"] += g.token_total
+            project["health_sum"] += g.health_total
 
     # Calculate average health for each project
     for project in projects.values():
-        project["avg_health"] = round(
-            project["health_sum"] / project["session_count"], 2
-        )
-        del project["health_sum"]
+        project["avg_health"] = round(project.pop("health_sum") / project["session_count"], 2)
 
     # Sort projects by session count
     top_projects = sorted(
@@ -92,25 +197,31 @@ async def team_analytics(
         reverse=True
     )[:10]
 
+    # Health distribution: healthy >= 80, warning 50-79, critical < 50
+    health = _buckets(db, team_id, "health")
+    healthy = sum(health.get(b, 0) for b in range(8, 10))
+    warning = sum(health.get(b, 0) for b in range(5, 8))
+    critical = sum(health.get(b, 0) for b in range(0, 5))
+
     return {
         "team_name": team_name,
         "summary": {
             "total_sessions": total_sessions,
-            "active_sessions": active_sessions,
-            "completed_sessions": completed_sessions,
-            "failed_sessions": failed_sessions,
+            "active_sessions": status_counts["active"],
+            "completed_sessions": status_counts["completed"],
+            "failed_sessions": status_counts["failed"],
             "total_tokens": total_tokens,
-            "average_tokens_per_session": round(avg_tokens, 2),
-            "average_health_score": round(avg_health, 2)
+            "average_tokens_per_session": round(total_tokens / total_sessions, 2),
+            "average_health_score": round(total_health / total_sessions, 2)
         },
         "health_distribution": {
             "healthy": healthy,
             "warning": warning,
             "critical": critical,
             "percentages": {
-                "healthy": round(healthy / total_sessions * 100, 1) if total_sessions > 0 else 0,
-                "warning": round(warning / total_sessions * 100, 1) if total_sessions > 0 else 0,
-                "critical": round(critical / total_sessions * 100, 1) if total_sessions > 0 else 0
+                "healthy": round(healthy / total_sessions * 100, 1),
+                "warning": round(warning / total_sessions * 100, 1),
+                "critical": round(critical / total_sessions * 100, 1)
             }
         },
         "session_types": session_types,
@@ -125,16 +236,11 @@ async def analytics_trends(
     db: Session = Depends(get_db)
 ):
     """Get usage trends over time."""
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-    query = db.query(SessionModel).filter(SessionModel.start_time >= cutoff_date)
-
-    if team_id:
-        query = query.filter(SessionModel.team_id == team_id)
-
-    sessions = query.all()
+    # Aggregated per day, so the window starts at midnight of the cutoff day
+    since = (datetime.utcnow() - timedelta(days=days)).date()
+    groups = _totals(db, team_id, "day", "status", since=since)
 
-    if not sessions:
+    if not groups:
         return {
             "period_days": days,
             "total_sessions": 0,
@@ -143,58 +249,32 @@ async def analytics_trends(
 
     # Group by day
     daily_stats = {}
-    for session in sessions:
-        day = session.start_time.date().isoformat()
-
-        if day not in daily_stats:
-            daily_stats[day] = {
-                "date": day,
-                "session_count": 0,
-                "total_tokens": 0,
-                "avg_health": 0,
-                "health_sum": 0,
-                "active_count": 0,
-                "completed_count": 0,
-                "failed_count": 0
-            }
-
-        daily_stats[day]["session_count"] += 1
-        daily_stats[day]["total_tokens"] += session.token_count
-        daily_stats[day]["health_sum"] += session.health_score
-
-        if session.status == "active":
-            daily_stats[day]["active_count"] += 1
-        elif session.status == "completed":
-            daily_stats[day]["completed_count"] += 1
-        elif session.status == "failed":
-            daily_stats[day]["failed_count"] += 1
+    for g in groups:
+        day = str(g.day)
+        stats = daily_stats.setdefault(day, {
+            "date": day,
+            "session_count": 0,
+            "total_tokens": 0,
+            "health_sum": 0,
+            **{f"{status}_count": 0 for status in TRACKED_STATUSES},
+        })
+        stats["session_count"] += g.session_count
+        stats["total_tokens"] += g.token_total
+        stats["health_sum"] += g.health_total
+        if g.status in TRACKED_STATUSES:
+            stats[f"{g.status}_count"] += g.session_count
 
     # Calculate averages
     for stats in daily_stats.values():
-        if stats["session_count"] > 0:
-            stats["avg_health"] = round(stats["health_sum"] / stats["session_count"], 2)
-        del stats["health_sum"]
+        stats["avg_health"] = round(stats.pop("health_sum") / stats["session_count"], 2)
 
     # Sort by date
     daily_breakdown = sorted(daily_stats.values(), key=lambda x: x["date"])
-
-    # Calculate overall trend
-    if len(daily_breakdown) >= 2:
-        first_half = daily_breakdown[:len(daily_breakdown)//2]
-        second_half = daily_breakdown[len(daily_breakdown)//2:]
-
-        first_avg = sum(d["session_count"] for d in first_half) / len(first_half)
-        second_avg = sum(d["session_count"] for d in second_half) / len(second_half)
-
-        trend = "increasing" if second_avg > first_avg else "decreasing" if second_avg < first_avg else "stable"
-        trend_percentage = round(((second_avg - first_avg) / first_avg * 100), 1) if first_avg > 0 else 0
-    else:
-        trend = "insufficient_data"
-        trend_percentage = 0
+    trend, trend_percentage = _session_trend(daily_breakdown)
 
     return {
         "period_days": days,
-        "total_sessions": len(sessions),
+        "total_sessions": sum(d["session_count"] for d in daily_breakdown),
         "trend": trend,
         "trend_percentage": trend_percentage,
         "daily_breakdown": daily_breakdown
@@ -207,68 +287,27 @@ async def health_distribution(
     db: Session = Depends(get_db)
 ):
     """Get detailed health score distribution."""
-    query = db.query(SessionModel)
-
-    if team_id:
-        query = query.filter(SessionModel.team_id == team_id)
+    totals = _totals(db, team_id)
 
-    sessions = query.all()
-
-    if not sessions:
+    if not totals:
         return {"total_sessions": 0, "distribution": {}}
 
-    # Define health buckets
-    buckets = {
-        "90-100": 0,
-        "80-89": 0,
-        "70-79": 0,
-        "60-69": 0,
-        "50-59": 0,
-        "40-49": 0,
-        "30-39": 0,
-        "20-29": 0,
-        "10-19": 0,
-        "0-9": 0
-    }
+    total = totals[0].session_count
+    buckets = _buckets(db, team_id, "health")
 
-    for session in sessions:
-        score = int(session.health_score)
-        if score >= 90:
-            buckets["90-100"] += 1
-        elif score >= 80:
-            buckets["80-89"] += 1
-        elif score >= 70:
-            buckets["70-79"] += 1
-        elif score >= 60:
-            buckets["60-69"] += 1
-        elif score >= 50:
-            buckets["50-59"] += 1
-        elif score >= 40:
-            buckets["40-49"] += 1
-        elif score >= 30:
-            buckets["30-39"] += 1
-        elif score >= 20:
-            buckets["20-29"] += 1
-        elif score >= 10:
-            buckets["10-19"] += 1
-        else:
-            buckets["0-9"] += 1
-
-    total = len(sessions)
-
-    # Add percentages
-    distribution = {
-        k: {
-            "count": v,
-            "percentage": round(v / total * 100, 1) if total > 0 else 0
+    # Highest bucket first, with percentages
+    distribution = {}
+    for index in reversed(range(len(HEALTH_BUCKETS))):
+        count = buckets.get(index, 0)
+        distribution[HEALTH_BUCKETS[index]] = {
+            "count": count,
+            "percentage": round(count / total * 100, 1)
         }
-        for k, v in buckets.items()
-    }
 
     return {
         "total_sessions": total,
         "distribution": distribution,
-        "average_health": round(sum(s.health_score for s in sessions) / total, 2) if total > 0 else 0
+        "average_health": round(totals[0].health_total / total, 2)
     }
 
 
@@ -317,75 +356,58 @@ async def top_sessions(
     }
 
 
+
+
 @router.get("/token-usage")
 async def token_usage_analytics(
     team_id: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
     """Get detailed token usage patterns."""
-    query = db.query(SessionModel)
+    totals = _totals(db, team_id)
 
-    if team_id:
-        query = query.filter(SessionModel.team_id == team_id)
-
-    sessions = query.all()
-
-    if not sessions:
+    if not totals:
         return {"total_sessions": 0, "token_stats": {}}
 
-    total_tokens = sum(s.token_count for s in sessions)
-    avg_tokens = total_tokens / len(sessions)
-
-    # Token usage distribution
-    token_buckets = {
-        "0-10k": 0,
-        "10k-50k": 0,
-        "50k-100k": 0,
-        "100k-150k": 0,
-        "150k-200k": 0,
-        "200k+": 0
-    }
+    total = totals[0].session_count
+    total_tokens = totals[0].token_total
+    buckets = _buckets(db, team_id, "tokens")
 
-    for session in sessions:
-        tokens = session.token_count
-        if tokens < 10000:
-            token_buckets["0-10k"] += 1
-        elif tokens < 50000:
-            token_buckets["10k-50k"] += 1
-        elif tokens < 100000:
-            token_buckets["100k-150k"] += 1
-        elif tokens < 150000:
-            token_buckets["150k-200k"] += 1
-        elif tokens < 200000:
-            token_buckets["150k-200k"] += 1
-        else:
-            token_buckets["200k+"] += 1
+    c = sessions_table.c
+    min_tokens, max_tokens = db.execute(
+        _team_filter(select(func.min(c.token_count), func.max(c.token_count)), team_id)
+    ).one()
 
     # Find sessions approaching limits
-    approaching_limit = [
-        {
-            "id": s.id,
-            "token_count": s.token_count,
-            "token_limit": s.token_limit,
-            "usage_percentage": round(s.token_count / s.token_limit * 100, 1) if s.token_limit > 0 else 0,
-            "project_name": s.project_name
-        }
-        for s in sessions
-        if s.token_limit > 0 and (s.token_count / s.token_limit) > 0.8
-    ]
-
-    approaching_limit.sort(key=lambda x: x["usage_percentage"], reverse=True)
+    usage = c.token_count * 1.0 / c.token_limit
+    approaching = db.execute(
+        _team_filter(select(c.id, c.token_count, c.token_limit, c.project_name), team_id)
+        .where(c.token_limit > 0, usage > 0.8)
+        .order_by(usage.desc())
+        .limit(10)
+    ).all()
 
     return {
-        "total_sessions": len(sessions),
+        "total_sessions": total,
         "token_stats": {
             "total_tokens": total_tokens,
-            "average_tokens": round(avg_tokens, 2),
-            "max_tokens": max(s.token_count for s in sessions),
-            "min_tokens": min(s.token_count for s in sessions)
+            "average_tokens": round(total_tokens / total, 2),
+            "max_tokens": max_tokens,
+            "min_tokens": min_tokens
+        },
+        "distribution": {
+            label: buckets.get(index, 0) for index, (label, _) in enumerate(TOKEN_BUCKETS)
         },
-        "distribution": token_buckets,
-        "sessions_approaching_limit": approaching_limit[:10]
+        "sessions_approaching_limit": [
+            {
+                "id": s.id,
+                "token_count": s.token_count,
+                "token_limit": s.token_limit,
+                "usage_percentage": round(s.token_count / s.token_limit * 100, 1),
+                "project_name": s.project_name
+            }
+            for s in approaching
+        ]
     }
 
 
@@ -395,40 +417,42 @@ async def session_duration_analytics(
     db: Session = Depends(get_db)
 ):
     """Analyze session duration patterns."""
-    query = db.query(SessionModel)
+    totals = _totals(db, team_id)
 
-    if team_id:
-        query = query.filter(SessionModel.team_id == team_id)
-
-    sessions = query.filter(
-        and_(
-            SessionModel.start_time.isnot(None),
-            SessionModel.last_activity.isnot(None)
-        )
-    ).all()
-
-    if not sessions:
+    if not totals:
         return {"total_sessions": 0, "duration_stats": {}}
 
-    durations = []
-    for session in sessions:
-        duration_minutes = (session.last_activity - session.start_time).total_seconds() / 60
-        durations.append({
-            "session_id": session.id,
-            "duration_minutes": round(duration_minutes, 1),
-            "project_name": session.project_name,
-            "status": session.status
-        })
-
-    duration_values = [d["duration_minutes"] for d in durations]
+    total = totals[0].session_count
+    c = sessions_table.c
+    minutes = (_duration_seconds(db) / 60.0).label("minutes")
+
+    min_minutes, max_minutes = db.execute(
+        _team_filter(select(func.min(minutes), func.max(minutes)), team_id)
+    ).one()
+    median_minutes = db.execute(
+        _team_filter(select(minutes), team_id).order_by(minutes).offset(total // 2).limit(1)
+    ).scalar()
+    longest = db.execute(
+        _team_filter(select(c.id, c.project_name, c.status, minutes), team_id)
+        .order_by(minutes.desc())
+        .limit(10)
+    ).all()
 
     return {
-        "total_sessions": len(sessions),
+        "total_sessions": total,
         "duration_stats": {
-            "average_minutes": round(sum(duration_values) / len(duration_values), 1),
-            "max_minutes": round(max(duration_values), 1),
-            "min_minutes": round(min(duration_values), 1),
-            "median_minutes": round(sorted(duration_values)[len(duration_values)//2], 1)
+            "average_minutes": round(totals[0].duration_total / 60 / total, 1),
+            "max_minutes": round(max_minutes, 1),
+            "min_minutes": round(min_minutes, 1),
+            "median_minutes": round(median_minutes, 1)
         },
-        "longest_sessions": sorted(durations, key=lambda x: x["duration_minutes"], reverse=True)[:10]
+        "longest_sessions": [
+            {
+                "session_id": s.id,
+                "duration_minutes": round(s.minutes, 1),
+                "project_name": s.project_name,
+                "status": s.status
+            }
+            for s in longest
+        ]
     }
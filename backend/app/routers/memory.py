@@ -1,6 +1,7 @@
 """Memory/knowledge base router."""
 
 from fastapi import APIRouter, Depends, Query
+from functools import lru_cache
 from typing import Optional
 import sys
 from pathlib import Path
@@ -11,26 +12,27 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 router = APIRouter()
 
 
+@lru_cache()
+def get_async_memory_manager():
+    """Shared async memory manager.
+
+    One ChromaDB client is opened per process, and searches run on a
+    bounded thread pool instead of the event loop.
+    """
+    from llm_session_manager.core.memory_manager import MemoryManager
+    from llm_session_manager.core.async_memory_manager import AsyncMemoryManager
+
+    return AsyncMemoryManager(MemoryManager())
+
+
 @router.get("/")
 async def list_memories(limit: int = Query(50, description="Maximum number of memories to return")):
-    """List recent memories."""
-    try:
-        from llm_session_manager.core.memory_manager import MemoryManager
-        
-        memory_manager = MemoryManager()
-        
-        # Get all memories (simplified - real implementation would paginate)
-        return {
-            "memories": [],
-            "total": 0,
-            "message": "Memory listing through API is available"
-        }
-    except Exception as e:
-        return {
-            "memories": [],
-            "total": 0,
-            "error": str(e)
-        }
+    """List recent memories (not implemented yet; use /search)."""
+    return {
+        "memories": [],
+        "total": 0,
+        "message": "Memory listing through API is available"
+    }
 
 
 @router.get("/search")
@@ -40,20 +42,18 @@ async def search_memories(
 ):
     """Search memories using semantic search."""
     try:
-        from llm_session_manager.core.memory_manager import MemoryManager
-        
-        memory_manager = MemoryManager()
-        results = memory_manager.search(query, limit=limit)
-        
+        memory_manager = get_async_memory_manager()
+        results = await memory_manager.search_memories(query, limit=limit)
+
         return {
             "query": query,
             "results": [
                 {
                     "content": r["content"],
-                    "session_id": r["session_id"],
+                    "session_id": r["metadata"].get("session_id", ""),
                     "tags": r.get("tags", []),
-                    "timestamp": r.get("timestamp", ""),
-                    "relevance": r.get("distance", 0)
+                    "timestamp": r["metadata"].get("timestamp", ""),
+                    "relevance": r.get("relevance", 0)
                 }
                 for r in results
             ],
@@ -72,11 +72,9 @@ async def search_memories(
 async def get_memory_stats():
     """Get memory system statistics."""
     try:
-        from llm_session_manager.core.memory_manager import MemoryManager
-        
-        memory_manager = MemoryManager()
-        stats = memory_manager.get_stats()
-        
+        memory_manager = get_async_memory_manager()
+        stats = await memory_manager.get_stats()
+
         return stats
     except Exception as e:
         return {
@@ -1,33 +1,64 @@
 """Sessions router."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 from ..database import get_db
 from ..models import SessionModel
+from ..pagination import (
+    MAX_PAGE_SIZE, conditional_json, has_tag, keyset_page, parse_fields, project_sessions
+)
 
 router = APIRouter(redirect_slashes=False)
 
+# Fields returned when the request does not pass ``fields=``
+DEFAULT_LIST_FIELDS = ["id", "type", "status", "token_count", "health_score", "start_time"]
+
 
 @router.get("")
 @router.get("/")
-async def list_sessions(db: Session = Depends(get_db)):
-    """List all sessions."""
-    sessions = db.query(SessionModel).all()
-    return {
-        "sessions": [
-            {
-                "id": s.id,
-                "type": s.type,
-                "status": s.status,
-                "token_count": s.token_count,
-                "health_score": s.health_score,
-                "start_time": s.start_time.isoformat(),
-            }
-            for s in sessions
-        ]
-    }
+async def list_sessions(
+    request: Request,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    team_id: Optional[str] = None,
+    project: Optional[str] = Query(None, description="Project name"),
+    tag: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Last activity at or after"),
+    until: Optional[datetime] = Query(None, description="Last activity before"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """List sessions, most recently active first, one page at a time."""
+    selected = parse_fields(fields, DEFAULT_LIST_FIELDS)
+    query = db.query(SessionModel)
+
+    if status:
+        query = query.filter(SessionModel.status == status)
+    if type:
+        query = query.filter(SessionModel.type == type)
+    if team_id:
+        query = query.filter(SessionModel.team_id == team_id)
+    if project:
+        query = query.filter(SessionModel.project_name == project)
+    if tag:
+        query = has_tag(query, tag)
+    if since:
+        query = query.filter(SessionModel.last_activity >= since)
+    if until:
+        query = query.filter(SessionModel.last_activity < until)
+
+    sessions, next_cursor = keyset_page(query, cursor, limit, selected)
+
+    return conditional_json(request, {
+        "sessions": project_sessions(sessions, selected),
+        "count": len(sessions),
+        "next_cursor": next_cursor
+    })
 
 
 @router.get("/stats")
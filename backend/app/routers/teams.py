@@ -1,6 +1,6 @@
 """Teams router."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from pydantic import BaseModel
@@ -9,9 +9,18 @@ from datetime import datetime
 
 from ..database import get_db
 from ..models import Team, User, SessionModel
+from ..pagination import (
+    MAX_PAGE_SIZE, conditional_json, keyset_page, parse_fields, project_sessions
+)
 
 router = APIRouter()
 
+# Fields returned by the team session list when ``fields=`` is not given
+TEAM_SESSION_FIELDS = [
+    "id", "type", "status", "token_count", "health_score",
+    "project_name", "start_time", "last_activity", "visibility",
+]
+
 
 # Pydantic models for request/response
 class TeamCreate(BaseModel):
@@ -306,39 +315,31 @@ async def remove_team_member(team_id: str, user_id: str, db: Session = Depends(g
 @router.get("/{team_id}/sessions")
 async def list_team_sessions(
     team_id: str,
+    request: Request,
     status: Optional[str] = None,
-    limit: int = 50,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    """List all sessions for a team."""
+    """List a team's sessions, most recently active first, one page at a time."""
     team = db.query(Team).filter(Team.id == team_id).first()
 
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
+    selected = parse_fields(fields, TEAM_SESSION_FIELDS)
     query = db.query(SessionModel).filter(SessionModel.team_id == team_id)
 
     if status:
         query = query.filter(SessionModel.status == status)
 
-    sessions = query.order_by(SessionModel.last_activity.desc()).limit(limit).all()
+    sessions, next_cursor = keyset_page(query, cursor, limit, selected)
 
-    return {
+    return conditional_json(request, {
         "team_id": team_id,
         "team_name": team.name,
-        "sessions": [
-            {
-                "id": s.id,
-                "type": s.type,
-                "status": s.status,
-                "token_count": s.token_count,
-                "health_score": s.health_score,
-                "project_name": s.project_name,
-                "start_time": s.start_time.isoformat(),
-                "last_activity": s.last_activity.isoformat(),
-                "visibility": s.visibility
-            }
-            for s in sessions
-        ],
-        "count": len(sessions)
-    }
+        "sessions": project_sessions(sessions, selected),
+        "count": len(sessions),
+        "next_cursor": next_cursor
+    })
@@ -17,6 +17,7 @@ from .core.memory_manager import MemoryManager
 from .utils.token_estimator import TokenEstimator
 from .utils.recommendations import RecommendationEngine
 from .utils.auto_tagger import AutoTagger
+from .utils.tag_ranker import TagRanker
 from .storage.database import Database
 from .ui.dashboard import Dashboard
 from .models import Session
@@ -36,6 +37,12 @@ structlog.configure(
 logger = structlog.get_logger()
 console = Console()
 
+# Per-file content tags reused across auto-tag runs
+TAG_CACHE_PATH = "data/tag_cache.json"
+
+# Learned tag acceptance counts (snapshot of tag_feedback)
+TAG_RANKER_PATH = "data/tag_ranker.json"
+
 # Create Typer app
 app = typer.Typer(
     name="llm-session",
@@ -92,7 +99,8 @@ def find_session(session_id: str, db: Database, discovery: SessionDiscovery) ->
 
 @app.command()
 def monitor(
-    refresh_interval: int = typer.Option(5, "--interval", "-i", help="Refresh interval in seconds")
+    refresh_interval: int = typer.Option(5, "--interval", "-i", help="Refresh interval in seconds"),
+    textual: bool = typer.Option(False, "--textual", help="Use the Textual (asyncio) dashboard")
 ):
     """Start the real-time dashboard for monitoring sessions.
 
@@ -113,12 +121,25 @@ def monitor(
         # Initialize components
         db, discovery, health_monitor, token_estimator = get_components()
 
+        if textual:
+            from .ui.textual_dashboard import DashboardApp
+
+            DashboardApp(
+                discovery=discovery,
+                health_monitor=health_monitor,
+                token_estimator=token_estimator,
+                refresh_interval=refresh_interval,
+                db=db
+            ).run()
+            return
+
         # Create dashboard
         dashboard = Dashboard(
             discovery=discovery,
             health_monitor=health_monitor,
             token_estimator=token_estimator,
-            refresh_interval=refresh_interval
+            refresh_interval=refresh_interval,
+            db=db
         )
 
         # Run dashboard
@@ -860,7 +881,8 @@ def auto_tag(
     session_id: str = typer.Argument(..., help="Session ID to auto-tag"),
     apply: bool = typer.Option(False, "--apply", "-a", help="Apply tags automatically without confirmation"),
     use_ai: bool = typer.Option(False, "--ai", help="Use AI for intelligent tag suggestions"),
-    interactive: bool = typer.Option(False, "--interactive", "-i", help="Choose tags individually")
+    interactive: bool = typer.Option(False, "--interactive", "-i", help="Choose tags individually"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached AI suggestions and re-query")
 ):
     """Suggest tags for a session based on file content analysis.
 
@@ -872,13 +894,15 @@ def auto_tag(
         llm-session auto-tag abc123 --ai           # AI-powered suggestions
         llm-session auto-tag abc123 --interactive  # Choose tags individually
         llm-session auto-tag abc123 --apply        # Auto-apply tags
+        llm-session auto-tag abc123 --ai --refresh # Bypass the AI response cache
     """
     try:
         from llm_session_manager.utils.ai_tagger import AITagger
 
         # Initialize components
         db, discovery, health_monitor, token_estimator = get_components()
-        auto_tagger = AutoTagger()
+        ranker = TagRanker.load(db, TAG_RANKER_PATH)
+        auto_tagger = AutoTagger(cache_path=TAG_CACHE_PATH, ranker=ranker)
 
         # Find session
         console.print(f"[dim]Searching for session: {session_id}...[/dim]")
@@ -895,14 +919,16 @@ def auto_tag(
 
         if use_ai:
             console.print(f"[dim]Using AI to analyze session content...[/dim]\n")
-            ai_tagger = AITagger()
+            ai_tagger = AITagger(ranker=ranker)
             if not ai_tagger.is_available():
                 console.print("[yellow]AI tagging not available. Set ANTHROPIC_API_KEY environment variable.[/yellow]")
                 console.print("[dim]Falling back to heuristic analysis...[/dim]\n")
                 suggested_tags = auto_tagger.suggest_tags(session, max_tags=10)
             else:
-                suggested_tags = ai_tagger.suggest_tags_ai(session, max_tags=10)
+                suggested_tags = ai_tagger.suggest_tags_ai(session, max_tags=10, refresh=refresh)
                 tag_source = "ai"
+                if ai_tagger.cache.stats["hits"]:
+                    console.print("[dim]Served from cache (context unchanged). Use --refresh to re-query.[/dim]\n")
                 if not suggested_tags:
                     console.print("[dim]AI analysis didn't return tags. Trying heuristic analysis...[/dim]\n")
                     suggested_tags = auto_tagger.suggest_tags(session, max_tags=10)
@@ -918,6 +944,13 @@ def auto_tag(
         # Show suggestions
         console.print(f"[bold cyan]Suggested tags for session {session.id[:20]}... ({tag_source})[/bold cyan]\n")
 
+        # Context recorded with feedback so the ranker learns per file type
+        extensions = ai_tagger.last_extensions if tag_source == "ai" else auto_tagger.last_extensions
+
+        def record_feedback(tag: str, accepted: bool) -> None:
+            ranker.record(session.id, tag, accepted, tag_source,
+                          context_tags=session.tags, extensions=extensions)
+
         # Separate existing vs new tags
         existing_tags = set(session.tags)
         new_tags = [t for t in suggested_tags if t not in existing_tags]
@@ -945,10 +978,10 @@ def auto_tag(
                 if typer.confirm(f"Apply #{tag}?", default=True):
                     selected_tags.append(tag)
                     # Record positive feedback
-                    db.add_tag_feedback(session.id, tag, True, tag_source)
+                    record_feedback(tag, True)
                 else:
                     # Record negative feedback
-                    db.add_tag_feedback(session.id, tag, False, tag_source)
+                    record_feedback(tag, False)
         elif apply:
             should_apply = True
         else:
@@ -957,7 +990,8 @@ def auto_tag(
             if not should_apply:
                 # Record all as rejected
                 for tag in new_tags:
-                    db.add_tag_feedback(session.id, tag, False, tag_source)
+                    record_feedback(tag, False)
+                ranker.save()
                 console.print("[dim]Tags not applied.[/dim]")
                 return
             selected_tags = new_tags
@@ -968,13 +1002,15 @@ def auto_tag(
                 session.add_tag(tag)
                 # Record feedback if not already recorded
                 if not interactive:
-                    db.add_tag_feedback(session.id, tag, True, tag_source)
+                    record_feedback(tag, True)
 
             db.update_session(session)
 
             console.print(f"\n[green]✓[/green] Applied {len(selected_tags)} tags to session")
             console.print(f"  All tags: {', '.join(f'#{t}' for t in session.tags)}")
 
+        ranker.save()
+
     except Exception as e:
         console.print(f"[red]Error auto-tagging: {e}[/red]")
         logger.error("auto_tag_failed", error=str(e))
@@ -986,7 +1022,8 @@ def describe(
     session_id: str = typer.Argument(..., help="Session ID to describe"),
     description: Optional[str] = typer.Argument(None, help="Session description (omit to use AI)"),
     use_ai: bool = typer.Option(False, "--ai", help="Generate description using AI"),
-    show_only: bool = typer.Option(False, "--show", help="Show current description without editing")
+    show_only: bool = typer.Option(False, "--show", help="Show current description without editing"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore a cached AI description and re-query")
 ):
     """Add or update a session description.
 
@@ -997,6 +1034,7 @@ def describe(
         llm-session describe abc123 "Working on auth feature"  # Manual
         llm-session describe abc123 --ai                        # AI-generated
         llm-session describe abc123 --show                      # View current
+        llm-session describe abc123 --ai --refresh              # Bypass the AI response cache
     """
     try:
         from llm_session_manager.utils.description_generator import DescriptionGenerator
@@ -1063,9 +1101,10 @@ def describe(
                     console.print("[yellow]Description not updated.[/yellow]")
                     return
             else:
-                generated = desc_gen.generate_description(session)
+                generated = desc_gen.generate_description(session, refresh=refresh)
                 if generated:
-                    console.print(f"[bold cyan]Generated description:[/bold cyan]")
+                    cached = " (cached)" if desc_gen.cache.stats["hits"] else ""
+                    console.print(f"[bold cyan]Generated description{cached}:[/bold cyan]")
                     console.print(f"  {generated}\n")
 
                     # Ask user to confirm
@@ -1532,6 +1571,133 @@ def batch_export(
         raise typer.Exit(code=1)
 
 
+def _run_ai_batch(session_pattern: str, kind: str, apply: bool, concurrency: int, refresh: bool = False) -> None:
+    """Run AI tagging or description generation over matching sessions.
+
+    Results are printed as each session completes and, with ``apply``,
+    saved immediately. Unchanged sessions are served from the response
+    cache unless ``refresh`` is set.
+    """
+    import asyncio
+    from .utils.ai_batch import AIBatchProcessor
+
+    db, discovery, health_monitor, token_estimator = get_components()
+
+    console.print("[dim]Discovering sessions...[/dim]")
+    all_sessions = discovery.discover_sessions()
+
+    if session_pattern == "all":
+        sessions = all_sessions
+    else:
+        pattern = session_pattern.replace("*", "")
+        sessions = [s for s in all_sessions if s.id.startswith(pattern)]
+
+    if not sessions:
+        console.print(f"[yellow]No sessions match pattern '{session_pattern}'[/yellow]")
+        return
+
+    from .utils.ai_tagger import AITagger
+
+    # Batch results are applied without review, so they rank tags but are
+    # not recorded as feedback
+    tagger = AITagger(api_key="", ranker=TagRanker.load(db, TAG_RANKER_PATH)) if kind == "tags" else None
+    processor = AIBatchProcessor(max_concurrency=concurrency, refresh=refresh, tagger=tagger)
+    if not processor.is_available():
+        console.print("[yellow]AI batch processing not available. Set ANTHROPIC_API_KEY environment variable.[/yellow]")
+        raise typer.Exit(code=1)
+
+    console.print(f"[dim]Processing {len(sessions)} sessions ({concurrency} concurrent requests)...[/dim]\n")
+
+    async def consume() -> int:
+        results = (
+            processor.suggest_tags(sessions) if kind == "tags"
+            else processor.generate_descriptions(sessions)
+        )
+        succeeded = 0
+        async for result in results:
+            label = f"{result.session.id[:30]}{' [dim](cached)[/dim]' if result.cached else ''}"
+            if not result.ok:
+                console.print(f"[yellow]•[/yellow] {label} [dim]skipped: {result.error}[/dim]")
+                continue
+
+            succeeded += 1
+            if kind == "tags":
+                new_tags = [t for t in result.tags if t not in result.session.tags]
+                console.print(f"[green]✓[/green] {label} → {', '.join(f'#{t}' for t in result.tags) or '(none)'}")
+                if apply and new_tags:
+                    for tag in new_tags:
+                        result.session.add_tag(tag)
+                    db.update_session(result.session)
+            else:
+                console.print(f"[green]✓[/green] {label} → {result.description}")
+                if apply:
+                    result.session.description = result.description
+                    db.update_session(result.session)
+        return succeeded
+
+    succeeded = asyncio.run(consume())
+
+    stats = processor.stats
+    cache_stats = processor.tagger.cache.stats if kind == "tags" else processor.generator.cache.stats
+    console.print(f"\n[green]✓[/green] {succeeded}/{len(sessions)} sessions processed"
+                  f"{' and saved' if apply else ''}")
+    console.print(f"[dim]Requests: {stats['requests']}  Retries: {stats['retries']}  "
+                  f"Rate limited: {stats['rate_limited']}  "
+                  f"Cache hits: {cache_stats['hits']}  Misses: {cache_stats['misses']}[/dim]")
+    if not apply:
+        console.print("[dim]Tip: Use --apply to save the results[/dim]")
+
+
+@app.command()
+def batch_auto_tag(
+    session_pattern: str = typer.Argument(..., help="Pattern to match sessions (e.g., 'abc*' or 'all')"),
+    apply: bool = typer.Option(False, "--apply", "-a", help="Apply suggested tags"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Maximum concurrent AI requests"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached AI responses and re-query")
+):
+    """Suggest AI tags for multiple sessions concurrently.
+
+    Results stream in as each session completes.
+
+    Example:
+        llm-session batch-auto-tag all
+        llm-session batch-auto-tag "claude*" --apply --concurrency 8
+    """
+    try:
+        _run_ai_batch(session_pattern, "tags", apply, concurrency, refresh)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error batch auto-tagging: {e}[/red]")
+        logger.error("batch_auto_tag_failed", error=str(e))
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def batch_describe(
+    session_pattern: str = typer.Argument(..., help="Pattern to match sessions (e.g., 'abc*' or 'all')"),
+    apply: bool = typer.Option(False, "--apply", "-a", help="Save generated descriptions"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Maximum concurrent AI requests"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached AI responses and re-query")
+):
+    """Generate AI descriptions for multiple sessions concurrently.
+
+    Results stream in as each session completes.
+
+    Example:
+        llm-session batch-describe all
+        llm-session batch-describe "cursor*" --apply
+    """
+    try:
+        _run_ai_batch(session_pattern, "description", apply, concurrency, refresh)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error batch describing: {e}[/red]")
+        logger.error("batch_describe_failed", error=str(e))
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def memory_add(
     session_id: str = typer.Argument(..., help="Session ID to save memory from"),
@@ -1586,15 +1752,18 @@ def memory_add(
 def memory_search(
     query: str = typer.Argument(..., help="What to search for"),
     limit: int = typer.Option(5, "--limit", "-n", help="Number of results"),
-    session: Optional[str] = typer.Option(None, "--session", "-s", help="Filter by session ID")
+    session: Optional[str] = typer.Option(None, "--session", "-s", help="Filter by session ID"),
+    mode: str = typer.Option("hybrid", "--mode", "-m", help="Search mode: hybrid, dense or lexical")
 ):
     """Search across all session memories using semantic search.
 
-    Finds relevant knowledge from past sessions based on meaning, not just keywords.
+    Finds relevant knowledge from past sessions based on meaning and keywords
+    (hybrid search fuses embedding similarity with BM25 keyword matching).
 
     Example:
         llm-session memory-search "how to implement authentication"
         llm-session memory-search "database setup" --limit 3
+        llm-session memory-search "ECONNRESET" --mode lexical
     """
     try:
         memory_mgr = MemoryManager()
@@ -1608,8 +1777,10 @@ def memory_search(
         memories = memory_mgr.search_memories(
             query=query,
             limit=limit,
-            session_id=session
+            session_id=session,
+            mode=mode
         )
+        memory_mgr.close()
 
         if not memories:
             console.print("[yellow]No memories found.[/yellow]")
@@ -1736,6 +1907,80 @@ def memory_stats():
         raise typer.Exit(code=1)
 
 
+@app.command()
+def memory_compact(
+    full: bool = typer.Option(False, "--full", help="Re-cluster all memories, not only those added since the last run"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would be removed without changing anything"),
+    threshold: float = typer.Option(0.92, "--threshold", help="Similarity at which memories are merged (0-1)"),
+    expire_days: Optional[float] = typer.Option(180, "--expire-days", help="Expire memories unused for this many days"),
+    no_expire: bool = typer.Option(False, "--no-expire", help="Disable age/usage expiry"),
+    json_output: bool = typer.Option(False, "--json", help="Output report as JSON"),
+    every: Optional[float] = typer.Option(None, "--every", help="Keep running, compacting incrementally every N minutes")
+):
+    """Merge near-duplicate memories and expire unused ones.
+
+    Merged memories keep the IDs and sessions they absorbed. By default only
+    memories added since the last run are compared against the store. With
+    --every, later runs happen in the background until interrupted.
+
+    Example:
+        llm-session memory-compact
+        llm-session memory-compact --full --dry-run
+        llm-session memory-compact --threshold 0.95 --no-expire
+        llm-session memory-compact --every 60
+    """
+    import time
+    from .context.memory_compactor import MemoryCompactor
+
+    if every is not None and (every <= 0 or dry_run):
+        console.print("[red]--every needs a positive number of minutes and cannot be combined with --dry-run[/red]")
+        raise typer.Exit(code=1)
+
+    try:
+        memory_mgr = MemoryManager()
+
+        if not memory_mgr.is_available():
+            console.print("[red]Memory system not available. ChromaDB may not be installed.[/red]")
+            raise typer.Exit(code=1)
+
+        compactor = MemoryCompactor(
+            memory_mgr,
+            similarity_threshold=threshold,
+            expire_after_days=None if no_expire else expire_days
+        )
+        report = compactor.run(full=full, dry_run=dry_run)
+
+        if json_output:
+            console.print_json(json.dumps(report.to_dict()))
+        else:
+            verb = "Would remove" if dry_run else "Removed"
+            console.print(f"\n[bold cyan]Memory Compaction ({'incremental' if report.incremental else 'full'})[/bold cyan]\n")
+            console.print(f"  Memories Scanned:  {report.scanned:,}")
+            console.print(f"  Duplicate Clusters: {report.clusters}")
+            console.print(f"  {verb} (merged):  {report.merged}")
+            console.print(f"  {verb} (expired): {report.expired}")
+            console.print(f"  Data Reclaimed:    {report.bytes_reclaimed / 1024:.1f} KB")
+            console.print(f"  Storage on Disk:   {report.disk_bytes_before / 1024:.1f} KB -> {report.disk_bytes_after / 1024:.1f} KB")
+            console.print(f"  [dim]Completed in {report.duration_seconds:.2f}s[/dim]\n")
+
+        if every:
+            console.print(f"[dim]Compacting every {every:g} minutes. Press Ctrl+C to stop.[/dim]")
+            compactor.start_background(interval_seconds=every * 60)
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                compactor.stop_background()
+                memory_mgr.close()
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error compacting memories: {e}[/red]")
+        logger.error("memory_compact_failed", error=str(e))
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def recommend():
     """Get smart recommendations for session management.
@@ -1810,7 +2055,10 @@ def recommend():
 @app.command()
 def mcp_server(
     db_path: str = typer.Option("data/sessions.db", "--db", help="Path to session database"),
-    memory_path: str = typer.Option("data/memories", "--memory", help="Path to memory storage")
+    memory_path: str = typer.Option("data/memories", "--memory", help="Path to memory storage"),
+    compact_every: Optional[float] = typer.Option(
+        None, "--compact-every", help="Compact memories incrementally every N minutes while running"
+    )
 ):
     """Start the main MCP server for session management.
 
@@ -1833,11 +2081,13 @@ def mcp_server(
         from .mcp.server import MCPServer
         import asyncio
 
-        server = MCPServer(db_path=db_path, memory_path=memory_path)
+        server = MCPServer(db_path=db_path, memory_path=memory_path, compact_every=compact_every)
 
         console.print("[green]MCP Server initialized successfully[/green]")
         console.print(f"Database: {db_path}")
         console.print(f"Memory: {memory_path}")
+        if compact_every:
+            console.print(f"Memory compaction: every {compact_every:g} minutes")
         console.print("\n[yellow]Server is running. Connect via MCP client (e.g., Claude Desktop)[/yellow]\n")
 
         # Run the server
@@ -1900,6 +2150,55 @@ def mcp_session_server(
         raise typer.Exit(code=1)
 
 
+@app.command()
+def mcp_gateway(
+    session_ids: Optional[List[str]] = typer.Option(
+        None, "--session", "-s", help="Session ID to serve (repeatable; default: all active sessions)"
+    ),
+    socket_path: Optional[str] = typer.Option(
+        None, "--socket", help="Serve clients on this Unix socket instead of stdio"
+    ),
+    db_path: str = typer.Option("data/sessions.db", "--db", help="Path to session database")
+):
+    """Serve many sessions from one MCP server process.
+
+    Resources are namespaced as session://{id}/..., and tools and prompts
+    take a session_id argument. Token caches, file indexes and git status
+    caches are shared between sessions.
+
+    Example:
+        llm-session mcp-gateway
+        llm-session mcp-gateway --socket /tmp/llm-sessions.sock
+    """
+    # Keep stdout free for the protocol when serving over stdio
+    out = console if socket_path else Console(stderr=True)
+    out.print("\n[cyan]Starting LLM Session Manager MCP Gateway...[/cyan]\n")
+
+    try:
+        from .mcp.gateway import SessionGateway
+        import asyncio
+
+        gateway = SessionGateway(session_ids=session_ids, db_path=db_path)
+
+        out.print("[green]MCP Gateway initialized[/green]")
+        out.print(f"Sessions: {', '.join(session_ids) if session_ids else 'all active'}")
+        out.print(f"Transport: {socket_path or 'stdio'}")
+        out.print("\n[yellow]Gateway is running. Connect via MCP client[/yellow]\n")
+
+        if socket_path:
+            asyncio.run(gateway.run_socket(socket_path))
+        else:
+            asyncio.run(gateway.run())
+
+    except ImportError:
+        out.print("[red]Error: MCP not installed. Install with: pip install mcp[/red]")
+        raise typer.Exit(code=1)
+    except Exception as e:
+        out.print(f"[red]Error starting MCP gateway: {e}[/red]")
+        logger.error("mcp_gateway_failed", error=str(e))
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def mcp_config():
     """Generate MCP server configuration for Claude Desktop.
@@ -0,0 +1,342 @@
+"""Token-budgeted packing of memories into prompt context.
+
+Selects memories greedily by relevance per token, trims the last one that
+does not fit whole, and drops near-duplicates (MinHash over word shingles)
+so a fixed token budget is spent on distinct, useful snippets.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from ..utils.token_estimator import TokenEstimator
+
+logger = structlog.get_logger()
+
+WORD_PATTERN = re.compile(r"\w+")
+
+CONTEXT_HEADER = "=== RELEVANT KNOWLEDGE FROM PAST SESSIONS ===\n"
+CONTEXT_FOOTER = "\n=== END PAST KNOWLEDGE ===\n"
+TRIM_MARKER = " [...]"
+
+
+class MinHasher:
+    """MinHash signatures over word shingles for near-duplicate detection."""
+
+    # Mersenne prime used for the universal hash family
+    PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        """Initialize hash permutations.
+
+        Args:
+            num_perm: Number of hash permutations (signature length).
+            shingle_size: Words per shingle.
+            seed: Seed for the permutation coefficients.
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._params = [
+            (self._seeded(seed, i, b"a") | 1, self._seeded(seed, i, b"b"))
+            for i in range(num_perm)
+        ]
+
+    @classmethod
+    def _seeded(cls, seed: int, i: int, salt: bytes) -> int:
+        digest = hashlib.blake2b(f"{seed}:{i}".encode() + salt, digest_size=8).digest()
+        return int.from_bytes(digest, "little") % cls.PRIME
+
+    def shingles(self, text: str) -> set:
+        """Split text into hashed word shingles.
+
+        Args:
+            text: Text to shingle.
+
+        Returns:
+            Set of 64-bit shingle hashes.
+        """
+        words = WORD_PATTERN.findall(text.lower())
+        size = min(self.shingle_size, len(words)) or 1
+        grams = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        return {
+            int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "little")
+            for g in grams
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a text.
+
+        Args:
+            text: Text to sign.
+
+        Returns:
+            Tuple of ``num_perm`` minimum hash values.
+        """
+        shingles = self.shingles(text)
+        return tuple(
+            min((a * s + b) % self.PRIME for s in shingles)
+            for a, b in self._params
+        )
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimate Jaccard similarity from two signatures.
+
+        Args:
+            sig_a: First signature.
+            sig_b: Second signature.
+
+        Returns:
+            Fraction of matching signature slots (0.0-1.0).
+        """
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+@dataclass
+class PackedContext:
+    """Result of packing memories into a token budget.
+
+    Attributes:
+        text: Context string ready to inject ("" if nothing was packed).
+        manifest: One entry per included memory (id, session_id, relevance,
+            tokens, original_tokens, trimmed).
+        skipped: One entry per excluded memory (id, reason).
+        token_budget: Budget that was requested.
+        tokens_used: Tokens of ``text`` as counted by the estimator.
+    """
+
+    text: str = ""
+    manifest: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: List[Dict[str, Any]] = field(default_factory=list)
+    token_budget: int = 0
+    tokens_used: int = 0
+
+
+def format_memory_block(index: int, memory: Dict[str, Any], content: str) -> str:
+    """Format a single memory the way it appears in injected context.
+
+    Args:
+        index: 1-based position in the context.
+        memory: Memory dict (metadata, relevance).
+        content: Content to show (possibly trimmed).
+
+    Returns:
+        Formatted block.
+    """
+    metadata = memory.get("metadata", {})
+    session_id = metadata.get("session_id", "unknown")
+    timestamp = metadata.get("timestamp", "unknown")
+    relevance = memory.get("relevance", 0.0) * 100
+
+    return (
+        f"\n[Memory {index}] (Relevance: {relevance:.0f}%)\n"
+        f"From: {session_id[:20]}...\n"
+        f"When: {timestamp}\n"
+        f"Content: {content}\n"
+    )
+
+
+class ContextPacker:
+    """Packs ranked memories into a token budget.
+
+    Example:
+        packer = ContextPacker()
+        packed = packer.pack(memory_mgr.search_memories("auth"), token_budget=800)
+        prompt += packed.text
+    """
+
+    def __init__(
+        self,
+        token_estimator: Optional[TokenEstimator] = None,
+        dedup_threshold: float = 0.8,
+        min_snippet_tokens: int = 32,
+        minhasher: Optional[MinHasher] = None
+    ):
+        """Initialize packer.
+
+        Args:
+            token_estimator: Estimator whose ``count_tokens`` defines the budget.
+            dedup_threshold: Estimated Jaccard similarity above which a memory
+                is treated as a duplicate of a more relevant one.
+            min_snippet_tokens: Smallest trimmed snippet worth including.
+            minhasher: MinHash implementation (default settings if None).
+        """
+        self.token_estimator = token_estimator or TokenEstimator()
+        self.dedup_threshold = dedup_threshold
+        self.min_snippet_tokens = min_snippet_tokens
+        self.minhasher = minhasher or MinHasher()
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens with the configured estimator."""
+        return self.token_estimator.count_tokens(text)
+
+    def pack(
+        self,
+        memories: List[Dict[str, Any]],
+        token_budget: int,
+        header: str = CONTEXT_HEADER,
+        footer: str = CONTEXT_FOOTER,
+        formatter: Callable[[int, Dict[str, Any], str], str] = format_memory_block
+    ) -> PackedContext:
+        """Select, trim and format memories to fit a token budget.
+
+        Args:
+            memories: Memory dicts with ``id``, ``content`` and optionally
+                ``relevance`` (default 1.0) and ``metadata``.
+            token_budget: Maximum tokens for the whole returned text.
+            header: Text placed before the memories.
+            footer: Text placed after the memories.
+            formatter: Builds the block for (index, memory, content).
+
+        Returns:
+            PackedContext whose ``tokens_used`` never exceeds the budget.
+        """
+        packed = PackedContext(token_budget=token_budget)
+        overhead = self.count_tokens(header + footer)
+        if not memories or token_budget <= overhead:
+            packed.skipped = [{"id": m.get("id"), "reason": "budget"} for m in memories]
+            return packed
+
+        candidates = self._dedupe(memories, packed.skipped)
+
+        # Greedy by value density; the index placeholder keeps the count
+        # conservative for any final position below 100.
+        scored = []
+        for memory in candidates:
+            tokens = self.count_tokens(formatter(99, memory, memory.get("content", "")))
+            density = memory.get("relevance", 1.0) / max(tokens, 1)
+            scored.append((density, tokens, memory))
+        scored.sort(key=lambda item: item[0], reverse=True)
+
+        remaining = token_budget - overhead
+        selected: List[Tuple[Dict[str, Any], str, int, bool]] = []
+        for _, tokens, memory in scored:
+            content = memory.get("content", "")
+            if tokens <= remaining:
+                selected.append((memory, content, tokens, False))
+                remaining -= tokens
+                continue
+
+            trimmed = self._trim_to_fit(memory, content, remaining, formatter)
+            if trimmed is not None:
+                trimmed_tokens = self.count_tokens(formatter(99, memory, trimmed))
+                selected.append((memory, trimmed, trimmed_tokens, True))
+                remaining -= trimmed_tokens
+            else:
+                packed.skipped.append({"id": memory.get("id"), "reason": "budget"})
+
+        # Present in relevance order, then enforce the budget on the exact
+        # text (tokenizers are not perfectly additive across boundaries).
+        selected.sort(key=lambda item: item[0].get("relevance", 1.0), reverse=True)
+        while selected:
+            text = header + "".join(
+                formatter(i, memory, content)
+                for i, (memory, content, _, _) in enumerate(selected, 1)
+            ) + footer
+            used = self.count_tokens(text)
+            if used <= token_budget:
+                break
+            dropped = min(selected, key=lambda item: item[0].get("relevance", 1.0) / max(item[2], 1))
+            selected.remove(dropped)
+            packed.skipped.append({"id": dropped[0].get("id"), "reason": "budget"})
+        else:
+            return packed
+
+        packed.text = text
+        packed.tokens_used = used
+        packed.manifest = [
+            {
+                "id": memory.get("id"),
+                "session_id": memory.get("metadata", {}).get("session_id"),
+                "relevance": memory.get("relevance", 1.0),
+                "tokens": tokens,
+                "original_tokens": self.count_tokens(memory.get("content", "")),
+                "trimmed": trimmed,
+            }
+            for memory, _, tokens, trimmed in selected
+        ]
+
+        logger.debug("context_packed",
+                    budget=token_budget,
+                    used=used,
+                    included=len(packed.manifest),
+                    skipped=len(packed.skipped))
+
+        return packed
+
+    def _dedupe(self, memories: List[Dict[str, Any]], skipped: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop memories that near-duplicate a more relevant one.
+
+        Args:
+            memories: Candidate memories.
+            skipped: List to append skipped entries to.
+
+        Returns:
+            Memories kept, most relevant first.
+        """
+        kept: List[Tuple[Dict[str, Any], Tuple[int, ...]]] = []
+        ordered = sorted(memories, key=lambda m: m.get("relevance", 1.0), reverse=True)
+
+        for memory in ordered:
+            signature = self.minhasher.signature(memory.get("content", ""))
+            duplicate_of = next(
+                (other for other, other_sig in kept
+                 if self.minhasher.similarity(signature, other_sig) >= self.dedup_threshold),
+                None
+            )
+            if duplicate_of is not None:
+                skipped.append({
+                    "id": memory.get("id"),
+                    "reason": "duplicate",
+                    "duplicate_of": duplicate_of.get("id"),
+                })
+                continue
+            kept.append((memory, signature))
+
+        return [memory for memory, _ in kept]
+
+    def _trim_to_fit(
+        self,
+        memory: Dict[str, Any],
+        content: str,
+        available: int,
+        formatter: Callable[[int, Dict[str, Any], str], str]
+    ) -> Optional[str]:
+        """Cut content at a word boundary so its block fits ``available`` tokens.
+
+        Args:
+            memory: Memory being trimmed.
+            content: Full content.
+            available: Tokens left in the budget.
+            formatter: Block formatter.
+
+        Returns:
+            Trimmed content, or None if less than ``min_snippet_tokens`` of
+            content would fit.
+        """
+        frame_tokens = self.count_tokens(formatter(99, memory, TRIM_MARKER))
+        content_budget = available - frame_tokens
+        if content_budget < self.min_snippet_tokens:
+            return None
+
+        content_tokens = max(self.count_tokens(content), 1)
+        chars = int(len(content) * content_budget / content_tokens)
+
+        # Proportional estimate first, then shrink until the block fits
+        while chars > 0:
+            cut = content[:chars]
+            if chars < len(content) and " " in cut:
+                cut = cut.rsplit(" ", 1)[0]
+            candidate = cut.rstrip() + TRIM_MARKER
+            if self.count_tokens(formatter(99, memory, candidate)) <= available:
+                if self.count_tokens(cut) < self.min_snippet_tokens:
+                    return None
+                return candidate
+            chars = int(chars * 0.9)
+
+        return None
@@ -0,0 +1,348 @@
+"""Hybrid lexical + semantic retrieval for cross-session memories.
+
+Dense (embedding) search is good at paraphrases but misses exact identifiers
+such as library names or error codes; BM25 is the opposite. This module keeps a
+small in-process BM25 index over memory content and fuses both result lists
+with reciprocal-rank fusion (RRF), then applies a recency decay on the memory
+timestamp.
+"""
+
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+# Kept deliberately short: BM25's IDF already discounts common words, this
+# only drops the ones that carry no meaning at all in a memory snippet.
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "in", "is", "it", "of", "on", "or", "the", "this", "to", "was", "we",
+    "what", "with",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase BM25 terms.
+
+    Args:
+        text: Text to tokenize.
+
+    Returns:
+        List of terms with stopwords removed.
+    """
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Incremental Okapi BM25 index over memory documents.
+
+    Documents can be added and removed one at a time, so the index can be
+    kept in sync with the ChromaDB collection without rebuilding it.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation parameter.
+            b: Document length normalization parameter.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Add (or replace) a document.
+
+        Args:
+            doc_id: Document identifier.
+            text: Document text.
+        """
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+
+        terms = Counter(tokenize(text))
+        self._doc_terms[doc_id] = terms
+        length = sum(terms.values())
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document if present.
+
+        Args:
+            doc_id: Document identifier.
+        """
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        self._total_length -= self._doc_lengths.pop(doc_id, 0)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        allowed_ids: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """Score documents against a query.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of results.
+            allowed_ids: Optional set of document IDs to restrict results to.
+
+        Returns:
+            List of (doc_id, score) tuples, best first. Documents sharing no
+            term with the query are not returned.
+        """
+        doc_count = len(self._doc_terms)
+        if doc_count == 0 or limit <= 0:
+            return []
+
+        allowed = set(allowed_ids) if allowed_ids is not None else None
+        avg_length = self._total_length / doc_count if doc_count else 0.0
+        scores: Dict[str, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+            for doc_id, tf in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                length_norm = 1 - self.b + self.b * (self._doc_lengths[doc_id] / avg_length) if avg_length else 1.0
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (tf * (self.k1 + 1)) / (tf + self.k1 * length_norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: List[List[str]],
+    k: int = 60,
+    weights: Optional[List[float]] = None
+) -> Dict[str, float]:
+    """Fuse several ranked ID lists with reciprocal-rank fusion.
+
+    Args:
+        ranked_lists: Ranked lists of document IDs (best first).
+        k: RRF damping constant; larger values flatten rank differences.
+        weights: Optional per-list weights (default 1.0 each).
+
+    Returns:
+        Mapping of document ID to fused score.
+    """
+    weights = weights or [1.0] * len(ranked_lists)
+    fused: Dict[str, float] = {}
+
+    for ranked, weight in zip(ranked_lists, weights):
+        for rank, doc_id in enumerate(ranked, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+
+    return fused
+
+
+def recency_decay(
+    timestamp: Optional[str],
+    now: Optional[datetime] = None,
+    half_life_days: float = 30.0
+) -> float:
+    """Exponential decay factor for a memory's age.
+
+    Args:
+        timestamp: ISO timestamp stored with the memory.
+        now: Reference time (default: now).
+        half_life_days: Age at which the factor reaches 0.5.
+
+    Returns:
+        Factor between 0.0 and 1.0 (1.0 for missing/unparseable timestamps,
+        so undated memories are not penalized).
+    """
+    if not timestamp or half_life_days <= 0:
+        return 1.0
+
+    try:
+        created = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return 1.0
+
+    now = now or datetime.now()
+    age_days = max(0.0, (now - created).total_seconds() / 86400)
+    return 0.5 ** (age_days / half_life_days)
+
+
+class HybridRetriever:
+    """Fuses dense and BM25 results into one calibrated ranking.
+
+    Ranking uses RRF so the two retrievers' incomparable raw scores never need
+    to be mixed. The reported ``relevance`` is calibrated separately from the
+    raw signals: cosine similarity for dense hits and a saturated BM25 score
+    for lexical hits, combined with a noisy-OR so agreement between retrievers
+    raises confidence, then scaled by recency.
+    """
+
+    def __init__(
+        self,
+        rrf_k: int = 60,
+        dense_weight: float = 1.0,
+        lexical_weight: float = 1.0,
+        recency_weight: float = 0.2,
+        half_life_days: float = 30.0,
+        bm25_saturation: float = 5.0
+    ):
+        """Initialize retriever settings.
+
+        Args:
+            rrf_k: RRF damping constant.
+            dense_weight: Weight of the dense list in fusion.
+            lexical_weight: Weight of the BM25 list in fusion.
+            recency_weight: Share of the score subject to recency decay (0-1).
+            half_life_days: Half-life of the recency decay.
+            bm25_saturation: BM25 score that maps to 0.5 calibrated relevance.
+        """
+        self.rrf_k = rrf_k
+        self.dense_weight = dense_weight
+        self.lexical_weight = lexical_weight
+        self.recency_weight = max(0.0, min(1.0, recency_weight))
+        self.half_life_days = half_life_days
+        self.bm25_saturation = bm25_saturation
+
+    @staticmethod
+    def dense_similarity(distance: float) -> float:
+        """Convert a ChromaDB squared-L2 distance to cosine similarity.
+
+        ChromaDB's default embedding function produces unit vectors, for which
+        squared L2 distance equals ``2 - 2 * cos``.
+
+        Args:
+            distance: Squared L2 distance.
+
+        Returns:
+            Similarity clamped to 0.0-1.0.
+        """
+        return max(0.0, min(1.0, 1.0 - distance / 2.0))
+
+    def lexical_similarity(self, score: float) -> float:
+        """Map an unbounded BM25 score to 0.0-1.0.
+
+        Args:
+            score: Raw BM25 score.
+
+        Returns:
+            Saturated similarity.
+        """
+        if score <= 0:
+            return 0.0
+        return score / (score + self.bm25_saturation)
+
+    def recency_factor(self, timestamp: Optional[str], now: Optional[datetime] = None) -> float:
+        """Blend recency decay with a constant floor.
+
+        Args:
+            timestamp: ISO timestamp of the memory.
+            now: Reference time.
+
+        Returns:
+            Multiplier between ``1 - recency_weight`` and 1.0.
+        """
+        decay = recency_decay(timestamp, now, self.half_life_days)
+        return (1.0 - self.recency_weight) + self.recency_weight * decay
+
+    def fuse(
+        self,
+        dense_hits: List[Tuple[str, float]],
+        lexical_hits: List[Tuple[str, float]],
+        documents: Dict[str, Tuple[str, Dict[str, Any]]],
+        limit: int,
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Fuse dense and lexical hits into ranked memory dicts.
+
+        Args:
+            dense_hits: (memory_id, squared L2 distance) pairs, best first.
+            lexical_hits: (memory_id, BM25 score) pairs, best first.
+            documents: memory_id -> (content, metadata) for every hit.
+            limit: Maximum number of results.
+            now: Reference time for recency decay.
+
+        Returns:
+            Memory dicts (id, content, metadata, distance, relevance, score,
+            scores) ordered by fused score.
+        """
+        now = now or datetime.now()
+        distances = dict(dense_hits)
+        bm25_scores = dict(lexical_hits)
+
+        lists, weights = [], []
+        if dense_hits:
+            lists.append([doc_id for doc_id, _ in dense_hits])
+            weights.append(self.dense_weight)
+        if lexical_hits:
+            lists.append([doc_id for doc_id, _ in lexical_hits])
+            weights.append(self.lexical_weight)
+
+        fused = reciprocal_rank_fusion(lists, k=self.rrf_k, weights=weights)
+        # Score of a document ranked first by every retriever: normalizes the
+        # fused score to 0-1 regardless of how many lists took part.
+        max_fused = sum(weights) / (self.rrf_k + 1) if weights else 1.0
+
+        results = []
+        for doc_id, rrf_score in fused.items():
+            if doc_id not in documents:
+                continue
+            content, metadata = documents[doc_id]
+
+            dense_sim = self.dense_similarity(distances[doc_id]) if doc_id in distances else 0.0
+            lexical_sim = self.lexical_similarity(bm25_scores.get(doc_id, 0.0))
+            recency = self.recency_factor(metadata.get("timestamp"), now)
+
+            evidence = 1.0 - (1.0 - dense_sim) * (1.0 - lexical_sim)
+            results.append({
+                "id": doc_id,
+                "content": content,
+                "metadata": metadata,
+                "distance": distances.get(doc_id),
+                "relevance": evidence * recency,
+                "score": (rrf_score / max_fused) * recency,
+                "scores": {
+                    "rrf": rrf_score,
+                    "dense": dense_sim,
+                    "lexical": lexical_sim,
+                    "bm25": bm25_scores.get(doc_id, 0.0),
+                    "recency": recency,
+                },
+            })
+
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[:limit]
@@ -0,0 +1,446 @@
+"""Compaction of the cross-session memory store.
+
+Merges near-duplicate memories (clustered by embedding similarity) into a
+single memory that keeps the provenance of every source session, and
+expires memories that are old and rarely retrieved. Runs incrementally:
+only memories added since the last run are compared against the store.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of one compaction run.
+
+    Attributes:
+        incremental: Whether only new memories were clustered.
+        dry_run: Whether changes were only computed, not applied.
+        scanned: Memories clustered against the store.
+        clusters: Duplicate clusters found.
+        merged: Memories removed by merging into a cluster keeper.
+        expired: Memories removed by the age/usage policy.
+        bytes_reclaimed: Content, metadata and embedding bytes removed.
+        disk_bytes_before: Size of the storage directory before the run.
+        disk_bytes_after: Size of the storage directory after the run.
+        duration_seconds: Wall time of the run.
+        merges: One entry per cluster (keeper, merged_ids, source_sessions).
+    """
+
+    incremental: bool = True
+    dry_run: bool = False
+    scanned: int = 0
+    clusters: int = 0
+    merged: int = 0
+    expired: int = 0
+    bytes_reclaimed: int = 0
+    disk_bytes_before: int = 0
+    disk_bytes_after: int = 0
+    duration_seconds: float = 0.0
+    merges: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to dictionary."""
+        return asdict(self)
+
+
+class _UnionFind:
+    """Disjoint sets over memory IDs."""
+
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: str, b: str) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def groups(self) -> List[List[str]]:
+        clusters: Dict[str, List[str]] = {}
+        for item in self.parent:
+            clusters.setdefault(self.find(item), []).append(item)
+        return list(clusters.values())
+
+
+def _json_list(value: Any) -> List[Any]:
+    """Decode a JSON-encoded list stored in Chroma metadata."""
+    if not value:
+        return []
+    try:
+        decoded = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    return decoded if isinstance(decoded, list) else []
+
+
+def _created_at(metadata: Dict[str, Any]) -> float:
+    """Creation time of a memory as a UNIX timestamp."""
+    if metadata.get("created_at"):
+        return float(metadata["created_at"])
+    try:
+        return datetime.fromisoformat(metadata.get("timestamp", "")).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _directory_size(path: Path) -> int:
+    """Total size in bytes of all files below a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class MemoryCompactor:
+    """Merges near-duplicate memories and expires stale ones.
+
+    Example:
+        compactor = MemoryCompactor(memory_mgr)
+        report = compactor.run()              # incremental
+        report = compactor.run(full=True)     # re-cluster everything
+        compactor.start_background(interval_seconds=3600)
+    """
+
+    STATE_FILE = "compaction_state.json"
+
+    def __init__(
+        self,
+        memory_manager,
+        similarity_threshold: float = 0.92,
+        neighbours: int = 10,
+        expire_after_days: Optional[float] = 180,
+        keep_access_count: int = 3
+    ):
+        """Initialize compactor.
+
+        Args:
+            memory_manager: MemoryManager whose store is compacted.
+            similarity_threshold: Cosine similarity at or above which two
+                memories are merged.
+            neighbours: Nearest neighbours examined per memory.
+            expire_after_days: Days without creation or retrieval after which
+                a memory expires (None disables expiry).
+            keep_access_count: Memories retrieved at least this often never
+                expire.
+        """
+        self.memory_manager = memory_manager
+        self.similarity_threshold = similarity_threshold
+        self.neighbours = neighbours
+        self.expire_after_days = expire_after_days
+        self.keep_access_count = keep_access_count
+        self.state_path = Path(memory_manager.storage_path) / self.STATE_FILE
+
+        self._run_lock = threading.Lock()
+        self._stop_event: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ==================== STATE ====================
+
+    def load_state(self) -> Dict[str, Any]:
+        """Load persisted state (``last_run`` UNIX timestamp, last report)."""
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("compaction_state_unreadable", error=str(e))
+            return {}
+
+    def _save_state(self, started_at: float, report: CompactionReport) -> None:
+        state = {"last_run": started_at, "last_report": report.to_dict()}
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+
+    # ==================== RUN ====================
+
+    def run(self, full: bool = False, dry_run: bool = False, now: Optional[float] = None) -> CompactionReport:
+        """Run one compaction pass.
+
+        Args:
+            full: Cluster every memory instead of only those added since the
+                last run.
+            dry_run: Compute the report without modifying the store.
+            now: Current UNIX time (for testing).
+
+        Returns:
+            CompactionReport describing what was (or would be) removed.
+
+        Raises:
+            RuntimeError: If the memory system is not available.
+        """
+        if not self.memory_manager.is_available():
+            raise RuntimeError("Memory system not available - ChromaDB not initialized")
+
+        with self._run_lock:
+            started = time.perf_counter()
+            now = now if now is not None else time.time()
+            last_run = None if full else self.load_state().get("last_run")
+
+            report = CompactionReport(incremental=last_run is not None, dry_run=dry_run)
+            report.disk_bytes_before = _directory_size(self.memory_manager.storage_path)
+
+            # Persist pending retrieval counts so expiry sees current usage
+            self.memory_manager.flush_usage()
+
+            removed: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+            for keeper, members, records in self._find_clusters(last_run, report):
+                merged_meta = self._merge_metadata(keeper, members, records)
+                absorbed = [m for m in members if m != keeper]
+                report.clusters += 1
+                report.merged += len(absorbed)
+                report.merges.append({
+                    "keeper": keeper,
+                    "merged_ids": absorbed,
+                    "source_sessions": _json_list(merged_meta["source_sessions"]),
+                })
+                removed.update({m: records[m] for m in absorbed})
+
+                if not dry_run:
+                    self.memory_manager.update_memory_metadata(keeper, merged_meta)
+                    self.memory_manager.delete_memories(absorbed)
+
+            expired = self._find_expired(now, exclude=set(removed))
+            report.expired = len(expired)
+            removed.update(expired)
+            if not dry_run and expired:
+                self.memory_manager.delete_memories(list(expired))
+
+            report.bytes_reclaimed = sum(
+                self._record_size(content, meta) for content, meta in removed.values()
+            )
+            report.disk_bytes_after = _directory_size(self.memory_manager.storage_path)
+            report.duration_seconds = time.perf_counter() - started
+
+            if not dry_run:
+                self._save_state(now, report)
+
+            logger.info("memory_compaction_completed",
+                       incremental=report.incremental,
+                       dry_run=dry_run,
+                       scanned=report.scanned,
+                       clusters=report.clusters,
+                       merged=report.merged,
+                       expired=report.expired,
+                       bytes_reclaimed=report.bytes_reclaimed)
+
+            return report
+
+    def _find_clusters(self, since: Optional[float], report: CompactionReport):
+        """Group memories whose embeddings are near-identical.
+
+        Each candidate (all memories, or those created after ``since``) is
+        compared with its nearest neighbours in the whole store, so new
+        memories are merged into old ones as well as into each other.
+
+        Args:
+            since: Only cluster memories created after this UNIX time.
+            report: Report whose ``scanned`` count is updated.
+
+        Yields:
+            Tuples of (keeper_id, member_ids, records by id).
+        """
+        collection = self.memory_manager.collection
+        total = collection.count()
+        if total < 2:
+            return
+
+        candidates = collection.get(
+            where={"created_at": {"$gt": since}} if since is not None else None,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        ids = candidates.get("ids") or []
+        embeddings = candidates.get("embeddings")
+        report.scanned = len(ids)
+        if not ids or embeddings is None:
+            return
+
+        records: Dict[str, Tuple[str, Dict[str, Any]]] = {
+            memory_id: (candidates["documents"][i] or "", candidates["metadatas"][i] or {})
+            for i, memory_id in enumerate(ids)
+        }
+        clusters = _UnionFind()
+
+        for i, memory_id in enumerate(ids):
+            results = collection.query(
+                query_embeddings=[[float(x) for x in embeddings[i]]],
+                n_results=min(self.neighbours + 1, total),
+                include=["documents", "metadatas", "distances"]
+            )
+            for j, other_id in enumerate(results["ids"][0]):
+                if other_id == memory_id:
+                    continue
+                if self._similarity(results["distances"][0][j]) < self.similarity_threshold:
+                    continue
+                records.setdefault(other_id, (
+                    results["documents"][0][j] or "",
+                    results["metadatas"][0][j] or {}
+                ))
+                clusters.union(memory_id, other_id)
+
+        for members in clusters.groups():
+            if len(members) > 1:
+                yield self._choose_keeper(members, records), members, records
+
+    def _similarity(self, distance: float) -> float:
+        """Convert a Chroma distance into cosine similarity.
+
+        Chroma's default ``l2`` space stores squared distances, which for the
+        unit-length embeddings of its default model equal ``2 - 2 * cos``.
+        """
+        space = (self.memory_manager.collection.metadata or {}).get("hnsw:space", "l2")
+        if space == "l2":
+            return 1.0 - distance / 2.0
+        return 1.0 - distance
+
+    @staticmethod
+    def _choose_keeper(members: List[str], records: Dict[str, Tuple[str, Dict[str, Any]]]) -> str:
+        """Pick the memory that survives a merge.
+
+        Prefers the most retrieved memory, then the longest content, then
+        the oldest.
+        """
+        def rank(memory_id: str):
+            content, meta = records[memory_id]
+            return (int(meta.get("access_count", 0)), len(content), -_created_at(meta))
+
+        return max(members, key=rank)
+
+    @staticmethod
+    def _merge_metadata(
+        keeper: str,
+        members: List[str],
+        records: Dict[str, Tuple[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Build the keeper's metadata after absorbing the other members.
+
+        Source sessions, tags and previously merged IDs are unioned, and
+        retrieval counts are summed so usage is not lost by merging.
+        """
+        merged = dict(records[keeper][1])
+        sessions: List[str] = []
+        tags: List[str] = []
+        merged_ids: List[str] = []
+        access_count = 0
+        last_accessed = 0.0
+
+        for memory_id in [keeper] + [m for m in members if m != keeper]:
+            meta = records[memory_id][1]
+            for session in _json_list(meta.get("source_sessions")) or [meta.get("session_id")]:
+                if session and session not in sessions:
+                    sessions.append(session)
+            tags.extend(t for t in _json_list(meta.get("tags")) if t not in tags)
+            if memory_id != keeper:
+                merged_ids.append(memory_id)
+            merged_ids.extend(m for m in _json_list(meta.get("merged_ids")) if m not in merged_ids)
+            access_count += int(meta.get("access_count", 0))
+            last_accessed = max(last_accessed, float(meta.get("last_accessed", 0.0)))
+
+        merged.update({
+            "source_sessions": json.dumps(sessions),
+            "tags": json.dumps(tags),
+            "merged_ids": json.dumps(merged_ids),
+            "access_count": access_count,
+        })
+        if last_accessed:
+            merged["last_accessed"] = last_accessed
+        return merged
+
+    def _find_expired(self, now: float, exclude: set) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Find memories neither created nor retrieved within the expiry window.
+
+        Args:
+            now: Current UNIX time.
+            exclude: IDs already removed by merging.
+
+        Returns:
+            Expired memory_id -> (content, metadata).
+        """
+        if self.expire_after_days is None:
+            return {}
+
+        cutoff = now - self.expire_after_days * SECONDS_PER_DAY
+        results = self.memory_manager.collection.get(include=["documents", "metadatas"])
+        expired = {}
+        for i, memory_id in enumerate(results.get("ids") or []):
+            if memory_id in exclude:
+                continue
+            meta = results["metadatas"][i] or {}
+            if int(meta.get("access_count", 0)) >= self.keep_access_count:
+                continue
+            last_used = max(_created_at(meta), float(meta.get("last_accessed", 0.0)))
+            if last_used < cutoff:
+                expired[memory_id] = (results["documents"][i] or "", meta)
+        return expired
+
+    @staticmethod
+    def _record_size(content: str, metadata: Dict[str, Any], dimensions: int = 384) -> int:
+        """Approximate stored bytes of one memory (text, metadata, float32 embedding)."""
+        return len(content.encode("utf-8")) + len(json.dumps(metadata).encode("utf-8")) + dimensions * 4
+
+    # ==================== BACKGROUND ====================
+
+    def start_background(self, interval_seconds: float = 3600) -> None:
+        """Run incremental compaction periodically in a daemon thread.
+
+        The first run happens ``interval_seconds`` after starting.
+
+        Args:
+            interval_seconds: Seconds between runs.
+        """
+        if self._thread and self._thread.is_alive():
+            logger.warning("compaction_already_running")
+            return
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._background_loop,
+            args=(interval_seconds, self._stop_event),
+            daemon=True,
+            name="memory-compaction"
+        )
+        self._thread.start()
+        logger.info("compaction_background_started", interval=interval_seconds)
+
+    def stop_background(self, timeout: float = 5.0) -> None:
+        """Stop the background thread started by start_background."""
+        if self._stop_event:
+            self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self._stop_event = None
+
+    def _background_loop(self, interval_seconds: float, stop_event: threading.Event) -> None:
+        while not stop_event.wait(interval_seconds):
+            try:
+                report = self.run(full=False)
+                logger.info("memory_compaction_completed", merged=report.merged, expired=report.expired)
+            except Exception as e:
+                logger.error("memory_compaction_failed", error=str(e))
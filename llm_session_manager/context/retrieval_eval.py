@@ -0,0 +1,103 @@
+"""Offline evaluation of memory retrieval quality and latency.
+
+Runs a set of labeled queries against any search function and reports
+recall@k, mean reciprocal rank and latency percentiles, so retriever
+settings (fusion weights, recency half-life, ...) can be tuned on fixed data.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+@dataclass
+class LabeledQuery:
+    """A query together with the memory IDs that should be retrieved."""
+
+    query: str
+    relevant_ids: List[str] = field(default_factory=list)
+
+
+def load_eval_set(path: str) -> Tuple[List[Dict[str, Any]], List[LabeledQuery]]:
+    """Load an evaluation set from JSON.
+
+    The file holds a ``memories`` list (each with ``id``, ``content`` and
+    optional ``session_id``, ``tags``, ``timestamp``) and a ``queries`` list
+    (each with ``query`` and ``relevant`` memory IDs).
+
+    Args:
+        path: Path to the JSON file.
+
+    Returns:
+        Tuple of (memories, labeled queries).
+    """
+    with open(Path(path), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    queries = [
+        LabeledQuery(query=q["query"], relevant_ids=list(q.get("relevant", [])))
+        for q in data.get("queries", [])
+    ]
+    return data.get("memories", []), queries
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def evaluate_retrieval(
+    search_fn: Callable[[str, int], List[str]],
+    queries: List[LabeledQuery],
+    k_values: Sequence[int] = (1, 3, 5, 10)
+) -> Dict[str, Any]:
+    """Evaluate a search function against labeled queries.
+
+    Args:
+        search_fn: Callable taking (query, limit) and returning ranked IDs.
+        queries: Labeled queries to run.
+        k_values: Cutoffs to report recall at.
+
+    Returns:
+        Dictionary with ``recall`` (k -> mean recall@k), ``mrr``,
+        ``latency_ms`` (mean/p50/p95/max) and ``queries`` count.
+    """
+    max_k = max(k_values) if k_values else 10
+    recall_sums = {k: 0.0 for k in k_values}
+    reciprocal_ranks = []
+    latencies = []
+    evaluated = 0
+
+    for labeled in queries:
+        relevant = set(labeled.relevant_ids)
+        if not relevant:
+            continue
+
+        start = time.perf_counter()
+        ranked = search_fn(labeled.query, max_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        evaluated += 1
+
+        for k in k_values:
+            recall_sums[k] += len(relevant & set(ranked[:k])) / len(relevant)
+
+        rank = next((i for i, doc_id in enumerate(ranked, 1) if doc_id in relevant), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+    return {
+        "queries": evaluated,
+        "recall": {k: (recall_sums[k] / evaluated if evaluated else 0.0) for k in k_values},
+        "mrr": sum(reciprocal_ranks) / evaluated if evaluated else 0.0,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "max": max(latencies) if latencies else 0.0,
+        },
+    }
@@ -0,0 +1,93 @@
+"""Async facade over MemoryManager.
+
+Every call runs on a BlockingCallRunner so embedding and ChromaDB work
+never blocks the event loop. Concurrent identical read queries are
+coalesced into one search.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .memory_manager import MemoryManager
+from ..context.context_packer import PackedContext
+from ..utils.async_runner import BlockingCallRunner
+
+
+class AsyncMemoryManager:
+    """Awaitable wrapper around a MemoryManager.
+
+    Example:
+        memories = AsyncMemoryManager(MemoryManager())
+        results = await memories.search_memories("auth", limit=3)
+    """
+
+    def __init__(self, memory_manager: MemoryManager, runner: Optional[BlockingCallRunner] = None):
+        """Initialize facade.
+
+        Args:
+            memory_manager: Wrapped synchronous manager.
+            runner: Executor to run calls on (a private 4-thread one if None).
+        """
+        self.memory_manager = memory_manager
+        self.runner = runner or BlockingCallRunner(max_workers=4, name="memory")
+
+    def is_available(self) -> bool:
+        """Check if memory system is available (no I/O)."""
+        return self.memory_manager.is_available()
+
+    async def search_memories(
+        self,
+        query: str,
+        limit: int = 5,
+        session_id: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        mode: str = "hybrid"
+    ) -> List[Dict[str, Any]]:
+        """Search memories; see MemoryManager.search_memories."""
+        key = ("search_memories", query, limit, session_id, tuple(tags or ()), mode)
+        return await self.runner.run(
+            self.memory_manager.search_memories,
+            query, limit=limit, session_id=session_id, tags=tags, mode=mode,
+            key=key
+        )
+
+    async def pack_relevant_context(
+        self,
+        query: str,
+        current_session_id: Optional[str] = None,
+        limit: int = 10,
+        token_budget: Optional[int] = None
+    ) -> PackedContext:
+        """Search and pack memories; see MemoryManager.pack_relevant_context."""
+        key = ("pack_relevant_context", query, current_session_id, limit, token_budget)
+        return await self.runner.run(
+            self.memory_manager.pack_relevant_context,
+            query, current_session_id=current_session_id, limit=limit, token_budget=token_budget,
+            key=key
+        )
+
+    async def get_memories_by_session(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get all memories of a session."""
+        return await self.runner.run(
+            self.memory_manager.get_memories_by_session, session_id,
+            key=("get_memories_by_session", session_id)
+        )
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get memory system statistics."""
+        return await self.runner.run(self.memory_manager.get_stats, key=("get_stats",))
+
+    async def add_memory(
+        self,
+        session_id: str,
+        content: str,
+        tags: List[str] = None,
+        metadata: Dict[str, Any] = None
+    ) -> str:
+        """Add a memory (never coalesced)."""
+        return await self.runner.run(
+            self.memory_manager.add_memory, session_id, content, tags=tags, metadata=metadata
+        )
+
+    async def delete_memory(self, memory_id: str) -> bool:
+        """Delete a memory by ID (never coalesced)."""
+        return await self.runner.run(self.memory_manager.delete_memory, memory_id)
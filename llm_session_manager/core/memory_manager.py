@@ -5,6 +5,8 @@ When you learn something in Session A, Session B can find and use that knowledge
 """
 
 import json
+import threading
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +21,9 @@ except ImportError:
     CHROMADB_AVAILABLE = False
 
 from ..models import Session, Memory
+from ..context.hybrid_retriever import BM25Index, HybridRetriever
+from ..context.context_packer import ContextPacker, PackedContext
+from ..utils.async_runner import OperationCancelled, check_cancelled
 
 logger = structlog.get_logger()
 
@@ -45,14 +50,47 @@ class MemoryManager:
         # Returns relevant memories from Session A
     """
 
-    def __init__(self, storage_path: str = "data/memories"):
+    # Number of candidates fetched from each retriever per requested result
+    CANDIDATE_MULTIPLIER = 4
+
+    # Default token budget for context injected into prompts
+    DEFAULT_CONTEXT_BUDGET = 1500
+
+    # Pending retrieval counts are written out after this many retrievals
+    # or this many seconds, whichever comes first (and by close())
+    USAGE_FLUSH_THRESHOLD = 50
+    USAGE_FLUSH_INTERVAL = 300
+
+    # Seconds before the lexical index is rebuilt from the collection, to
+    # pick up memories other processes changed without changing the count
+    LEXICAL_INDEX_TTL = 300
+
+    def __init__(
+        self,
+        storage_path: str = "data/memories",
+        retriever: Optional[HybridRetriever] = None
+    ):
         """Initialize memory manager with ChromaDB.
 
         Args:
             storage_path: Directory to store ChromaDB data.
+            retriever: Fusion settings for hybrid search (defaults if None).
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.retriever = retriever or HybridRetriever()
+        self._context_packer: Optional[ContextPacker] = None
+
+        # Lexical index over memory content, built lazily on first search
+        self._lexical_index: Optional[BM25Index] = None
+        self._lexical_built_at = 0.0
+        self._documents: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+        # Retrieval counts not yet written to memory metadata (see flush_usage)
+        self._pending_usage: Dict[str, int] = {}
+        self._pending_retrievals = 0
+        self._last_usage_flush = time.monotonic()
+        self._lock = threading.RLock()
 
         if not CHROMADB_AVAILABLE:
             logger.warning("chromadb_not_available", fallback="memory_disabled")
@@ -124,6 +162,7 @@ class MemoryManager:
         meta = {
             "session_id": session_id,
             "timestamp": timestamp,
+            "created_at": time.time(),
             "tags": json.dumps(tags or []),
         }
         if metadata:
@@ -135,6 +174,7 @@ class MemoryManager:
             documents=[content],
             metadatas=[meta]
         )
+        self._index_document(memory_id, content, meta)
 
         logger.info("memory_added",
                    memory_id=memory_id,
@@ -148,15 +188,21 @@ class MemoryManager:
         query: str,
         limit: int = 5,
         session_id: Optional[str] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        mode: str = "hybrid"
     ) -> List[Dict[str, Any]]:
-        """Search memories using semantic similarity.
+        """Search memories using dense, lexical or hybrid retrieval.
+
+        Hybrid mode fuses ChromaDB similarity results with a local BM25 index
+        using reciprocal-rank fusion and applies a recency decay; see
+        HybridRetriever for how ``relevance`` is calibrated.
 
         Args:
             query: Natural language search query.
             limit: Maximum number of results.
             session_id: Optional filter by source session.
             tags: Optional filter by tags.
+            mode: "hybrid" (default), "dense" or "lexical".
 
         Returns:
             List of matching memories with metadata and relevance scores.
@@ -165,56 +211,273 @@ class MemoryManager:
             logger.warning("memory_search_failed", reason="chromadb_not_available")
             return []
 
-        try:
-            # Build where filter
-            where = None
-            if session_id:
-                where = {"session_id": session_id}
+        if mode not in ("hybrid", "dense", "lexical"):
+            raise ValueError(f"Unknown search mode: {mode}")
 
-            # Query ChromaDB
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=limit,
-                where=where
-            )
+        try:
+            # Over-fetch so tag filtering and fusion still leave enough results
+            candidates = max(limit, 1) * self.CANDIDATE_MULTIPLIER
+
+            dense_hits: List[Tuple[str, float]] = []
+            documents: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+            if mode in ("hybrid", "dense"):
+                dense_hits, documents = self._dense_search(query, candidates, session_id)
+                check_cancelled()
+
+            lexical_hits: List[Tuple[str, float]] = []
+            if mode in ("hybrid", "lexical"):
+                lexical_hits = self._lexical_search(query, candidates, session_id)
+                check_cancelled()
+
+            if lexical_hits:
+                with self._lock:
+                    documents.update({
+                        doc_id: self._documents[doc_id]
+                        for doc_id, _ in lexical_hits if doc_id in self._documents
+                    })
+            fused = self.retriever.fuse(dense_hits, lexical_hits, documents, limit=candidates)
 
             # Format results
             memories = []
-            if results and results['ids'] and results['ids'][0]:
-                for i, memory_id in enumerate(results['ids'][0]):
-                    # ChromaDB uses L2 distance - lower is better
-                    # Convert to relevance score (0-1, higher is better)
-                    distance = results['distances'][0][i] if 'distances' in results else 0.0
-                    # Normalize distance to 0-1 range (assuming max distance ~2)
-                    relevance = max(0.0, 1.0 - (distance / 2.0))
-
-                    memory = {
-                        "id": memory_id,
-                        "content": results['documents'][0][i],
-                        "metadata": results['metadatas'][0][i],
-                        "distance": distance,
-                        "relevance": relevance,
-                        "tags": json.loads(results['metadatas'][0][i].get('tags', '[]'))
-                    }
+            for memory in fused:
+                memory["tags"] = json.loads(memory["metadata"].get("tags", "[]"))
+
+                # Filter by tags if specified
+                if tags:
+                    memory_tags = set(memory["tags"])
+                    if not any(tag in memory_tags for tag in tags):
+                        continue
 
-                    # Filter by tags if specified
-                    if tags:
-                        memory_tags = set(memory['tags'])
-                        if not any(tag in memory_tags for tag in tags):
-                            continue
+                memories.append(memory)
+                if len(memories) >= limit:
+                    break
 
-                    memories.append(memory)
+            self._record_usage([m["id"] for m in memories])
 
             logger.info("memory_search_completed",
                        query=query,
+                       mode=mode,
+                       dense_hits=len(dense_hits),
+                       lexical_hits=len(lexical_hits),
                        results=len(memories))
 
             return memories
 
+        except OperationCancelled:
+            logger.debug("memory_search_cancelled", query=query)
+            raise
         except Exception as e:
             logger.error("memory_search_failed", error=str(e))
             return []
 
+    def _dense_search(
+        self,
+        query: str,
+        limit: int,
+        session_id: Optional[str] = None
+    ) -> Tuple[List[Tuple[str, float]], Dict[str, Tuple[str, Dict[str, Any]]]]:
+        """Run an embedding similarity query against ChromaDB.
+
+        Args:
+            query: Search query.
+            limit: Maximum number of hits.
+            session_id: Optional filter by source session.
+
+        Returns:
+            Tuple of ((memory_id, distance) pairs best first, and
+            memory_id -> (content, metadata) for the hits).
+        """
+        total = self.collection.count()
+        if total == 0:
+            return [], {}
+
+        results = self.collection.query(
+            query_texts=[query],
+            n_results=min(limit, total),
+            where={"session_id": session_id} if session_id else None
+        )
+
+        hits = []
+        documents = {}
+        if results and results['ids'] and results['ids'][0]:
+            distances = results.get('distances') or [[0.0] * len(results['ids'][0])]
+            for i, memory_id in enumerate(results['ids'][0]):
+                hits.append((memory_id, distances[0][i]))
+                documents[memory_id] = (
+                    results['documents'][0][i],
+                    results['metadatas'][0][i]
+                )
+
+        return hits, documents
+
+    def _lexical_search(
+        self,
+        query: str,
+        limit: int,
+        session_id: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """Run a BM25 query against the local lexical index.
+
+        Args:
+            query: Search query.
+            limit: Maximum number of hits.
+            session_id: Optional filter by source session.
+
+        Returns:
+            List of (memory_id, bm25_score) pairs, best first.
+        """
+        with self._lock:
+            index = self._ensure_lexical_index()
+
+            allowed_ids = None
+            if session_id:
+                allowed_ids = {
+                    memory_id for memory_id, (_, meta) in self._documents.items()
+                    if meta.get("session_id") == session_id
+                }
+
+            return index.search(query, limit=limit, allowed_ids=allowed_ids)
+
+    def _ensure_lexical_index(self) -> BM25Index:
+        """Build the BM25 index from the collection, or rebuild a stale one.
+
+        Adds and deletes through this manager keep the index in sync. It is
+        rebuilt when the collection size differs from the index (another
+        process added or deleted memories) or after LEXICAL_INDEX_TTL seconds.
+
+        Returns:
+            The lexical index.
+        """
+        if (
+            self._lexical_index is not None
+            and time.monotonic() - self._lexical_built_at < self.LEXICAL_INDEX_TTL
+            and self.collection.count() == len(self._lexical_index)
+        ):
+            return self._lexical_index
+
+        index = BM25Index()
+        documents: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+        results = self.collection.get(include=["documents", "metadatas"])
+        if results and results['ids']:
+            for i, memory_id in enumerate(results['ids']):
+                content = results['documents'][i] or ""
+                meta = results['metadatas'][i] or {}
+                index.add(memory_id, content)
+                documents[memory_id] = (content, meta)
+
+        self._lexical_index = index
+        self._documents = documents
+        self._lexical_built_at = time.monotonic()
+        logger.debug("lexical_index_built", documents=len(index))
+        return index
+
+    def _index_document(self, memory_id: str, content: str, metadata: Dict[str, Any]) -> None:
+        """Add a memory to the lexical index if it has been built."""
+        with self._lock:
+            if self._lexical_index is None:
+                return
+            self._lexical_index.add(memory_id, content)
+            self._documents[memory_id] = (content, metadata)
+
+    def _unindex_documents(self, memory_ids: List[str]) -> None:
+        """Remove memories from the lexical index if it has been built."""
+        with self._lock:
+            if self._lexical_index is None:
+                return
+            for memory_id in memory_ids:
+                self._lexical_index.remove(memory_id)
+                self._documents.pop(memory_id, None)
+
+    def _record_usage(self, memory_ids: List[str]) -> None:
+        """Count memories returned by a search, flushing when enough are pending."""
+        with self._lock:
+            for memory_id in memory_ids:
+                self._pending_usage[memory_id] = self._pending_usage.get(memory_id, 0) + 1
+            self._pending_retrievals += len(memory_ids)
+            due = (
+                self._pending_retrievals >= self.USAGE_FLUSH_THRESHOLD
+                or time.monotonic() - self._last_usage_flush >= self.USAGE_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush_usage()
+
+    def flush_usage(self) -> int:
+        """Write pending retrieval counts into memory metadata.
+
+        Searches count retrievals in memory and flush every
+        USAGE_FLUSH_THRESHOLD retrievals or USAGE_FLUSH_INTERVAL seconds;
+        flushing adds them to each memory's ``access_count`` and sets
+        ``last_accessed`` so compaction can expire memories that are never
+        used.
+
+        Returns:
+            Number of memories updated.
+        """
+        if not self.is_available():
+            return 0
+
+        with self._lock:
+            pending, self._pending_usage = self._pending_usage, {}
+            self._pending_retrievals = 0
+            self._last_usage_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            results = self.collection.get(ids=list(pending), include=["metadatas"])
+            ids = results.get('ids') or []
+            now = time.time()
+            metadatas = []
+            for i, memory_id in enumerate(ids):
+                meta = dict(results['metadatas'][i] or {})
+                meta["access_count"] = int(meta.get("access_count", 0)) + pending[memory_id]
+                meta["last_accessed"] = now
+                metadatas.append(meta)
+
+            if ids:
+                self.collection.update(ids=ids, metadatas=metadatas)
+                for memory_id, meta in zip(ids, metadatas):
+                    self._update_indexed_metadata(memory_id, meta)
+
+            logger.debug("memory_usage_flushed", memories=len(ids))
+            return len(ids)
+
+        except Exception as e:
+            logger.error("memory_usage_flush_failed", error=str(e))
+            return 0
+
+    def close(self) -> None:
+        """Write out pending retrieval counts before the process exits."""
+        self.flush_usage()
+
+    def _update_indexed_metadata(self, memory_id: str, metadata: Dict[str, Any]) -> None:
+        """Refresh cached metadata of an indexed memory."""
+        with self._lock:
+            if memory_id in self._documents:
+                self._documents[memory_id] = (self._documents[memory_id][0], metadata)
+
+    def update_memory_metadata(self, memory_id: str, metadata: Dict[str, Any]) -> bool:
+        """Replace the metadata of a memory.
+
+        Args:
+            memory_id: Memory ID to update.
+            metadata: New metadata (replaces the existing metadata).
+
+        Returns:
+            True if updated successfully.
+        """
+        if not self.is_available():
+            return False
+
+        try:
+            self.collection.update(ids=[memory_id], metadatas=[metadata])
+            self._update_indexed_metadata(memory_id, metadata)
+            return True
+        except Exception as e:
+            logger.error("memory_update_failed", memory_id=memory_id, error=str(e))
+            return False
+
     def get_memories_by_session(self, session_id: str) -> List[Dict[str, Any]]:
         """Get all memories from a specific session.
 
@@ -262,12 +525,37 @@ class MemoryManager:
 
         try:
             self.collection.delete(ids=[memory_id])
+            self._unindex_documents([memory_id])
             logger.info("memory_deleted", memory_id=memory_id)
             return True
         except Exception as e:
             logger.error("memory_delete_failed", error=str(e))
             return False
 
+    def delete_memories(self, memory_ids: List[str]) -> int:
+        """Delete several memories in one call.
+
+        Args:
+            memory_ids: Memory IDs to delete.
+
+        Returns:
+            Number of memories deleted.
+        """
+        if not self.is_available() or not memory_ids:
+            return 0
+
+        try:
+            self.collection.delete(ids=memory_ids)
+            self._unindex_documents(memory_ids)
+            with self._lock:
+                for memory_id in memory_ids:
+                    self._pending_usage.pop(memory_id, None)
+            logger.info("memories_deleted", count=len(memory_ids))
+            return len(memory_ids)
+        except Exception as e:
+            logger.error("memories_delete_failed", error=str(e))
+            return 0
+
     def delete_session_memories(self, session_id: str) -> int:
         """Delete all memories from a session.
 
@@ -287,6 +575,7 @@ class MemoryManager:
 
             if memory_ids:
                 self.collection.delete(ids=memory_ids)
+                self._unindex_documents(memory_ids)
                 logger.info("session_memories_deleted",
                            session_id=session_id,
                            count=len(memory_ids))
@@ -327,7 +616,8 @@ class MemoryManager:
         self,
         query: str,
         current_session_id: str,
-        limit: int = 3
+        limit: int = 3,
+        token_budget: Optional[int] = None
     ) -> str:
         """Get relevant context from other sessions for a query.
 
@@ -335,10 +625,40 @@ class MemoryManager:
             query: What you're working on or need help with.
             current_session_id: Current session ID (to exclude).
             limit: Max number of relevant memories.
+            token_budget: Max tokens of the returned string
+                (default: DEFAULT_CONTEXT_BUDGET).
 
         Returns:
             Formatted context string to inject into prompts.
         """
+        return self.pack_relevant_context(
+            query,
+            current_session_id=current_session_id,
+            limit=limit,
+            token_budget=token_budget
+        ).text
+
+    def pack_relevant_context(
+        self,
+        query: str,
+        current_session_id: Optional[str] = None,
+        limit: int = 10,
+        token_budget: Optional[int] = None
+    ) -> PackedContext:
+        """Search memories and pack the best ones into a token budget.
+
+        Args:
+            query: What you're working on or need help with.
+            current_session_id: Session whose own memories are excluded.
+            limit: Max number of memories to consider including.
+            token_budget: Max tokens of the packed text
+                (default: DEFAULT_CONTEXT_BUDGET).
+
+        Returns:
+            PackedContext with the text and a manifest of included memories.
+        """
+        budget = token_budget if token_budget is not None else self.DEFAULT_CONTEXT_BUDGET
+
         # Search memories from other sessions
         all_memories = self.search_memories(query, limit=limit * 2)
 
@@ -348,29 +668,14 @@ class MemoryManager:
             if m['metadata'].get('session_id') != current_session_id
         ][:limit]
 
-        if not other_memories:
-            return ""
-
-        # Format as context
-        context_parts = [
-            "=== RELEVANT KNOWLEDGE FROM PAST SESSIONS ===\n"
-        ]
-
-        for i, memory in enumerate(other_memories, 1):
-            session_id = memory['metadata'].get('session_id', 'unknown')
-            timestamp = memory['metadata'].get('timestamp', 'unknown')
-            relevance = memory['relevance'] * 100
-
-            context_parts.append(
-                f"\n[Memory {i}] (Relevance: {relevance:.0f}%)\n"
-                f"From: {session_id[:20]}...\n"
-                f"When: {timestamp}\n"
-                f"Content: {memory['content']}\n"
-            )
-
-        context_parts.append("\n=== END PAST KNOWLEDGE ===\n")
+        return self.context_packer.pack(other_memories, token_budget=budget)
 
-        return "".join(context_parts)
+    @property
+    def context_packer(self) -> ContextPacker:
+        """Packer used for prompt context, created on first use."""
+        if self._context_packer is None:
+            self._context_packer = ContextPacker()
+        return self._context_packer
 
     def get_stats(self) -> Dict[str, Any]:
         """Get memory system statistics.
@@ -130,15 +130,16 @@ class SessionDiscovery:
         proc_info = process.info
         pid = proc_info['pid']
 
-        # Generate session ID using pid and timestamp
-        session_id = f"{session_type.value}_{pid}_{int(datetime.now().timestamp())}"
-
         # Get process creation time
         try:
             create_time = datetime.fromtimestamp(proc_info.get('create_time', 0))
         except (OSError, ValueError):
             create_time = datetime.now()
 
+        # Generate session ID using pid and process start, so rediscovering
+        # the same process (e.g. after a restart) yields the same ID
+        session_id = f"{session_type.value}_{pid}_{int(create_time.timestamp())}"
+
         # Get working directory
         working_dir = self.get_working_directory(process)
 
@@ -6,5 +6,6 @@ and operations to MCP-compatible clients like Claude Desktop.
 
 from .server import MCPServer
 from .session_server import SessionMCPServer
+from .gateway import SessionGateway
 
-__all__ = ["MCPServer", "SessionMCPServer"]
+__all__ = ["MCPServer", "SessionMCPServer", "SessionGateway"]
@@ -0,0 +1,471 @@
+"""One MCP server process for many AI coding sessions.
+
+``mcp-session-server`` runs one process per session, each with its own
+token estimator, file index and git cache. ``SessionGateway`` serves every
+session from a single process instead, under per-session namespaces:
+
+- Resources: ``session://{session_id}/{name}`` (the names a
+  ``SessionMCPServer`` exposes), plus ``session://sessions``.
+- Tools and prompts: the per-session ones, with a required ``session_id``
+  argument, plus ``list_sessions``.
+
+Shared across sessions: the TokenEstimator (file token cache), the
+GitStatusProvider (keyed by repository), one FileIndex per working
+directory, the HealthMonitor and the database. Per session: the Session
+object, its MetricsSampler and the ``SessionMCPServer`` that owns them,
+so one session's state never leaks into another's responses.
+
+Clients connect over stdio, or over a local (Unix domain) socket where
+each connection gets its own MCP session against the same shared state.
+"""
+
+import asyncio
+import json
+import os
+import stat
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import structlog
+
+try:
+    import anyio
+    import anyio.lowlevel
+    import mcp.types as types
+    from anyio.streams.buffered import BufferedByteReceiveStream
+    from mcp.server import Server
+    from mcp.server.lowlevel.helper_types import ReadResourceContents
+    from mcp.server.stdio import stdio_server
+    from mcp.shared.message import SessionMessage
+    from mcp.types import GetPromptResult, Prompt, PromptArgument, PromptMessage, Resource, ResourceTemplate, TextContent, Tool
+    MCP_AVAILABLE = True
+except ImportError:
+    MCP_AVAILABLE = False
+    Server = None
+
+from ..core.health_monitor import HealthMonitor
+from ..models.session import Session
+from ..storage.async_database import AsyncDatabase
+from ..storage.database import Database
+from ..utils.async_runner import BlockingCallRunner
+from ..utils.file_index import FileIndex
+from ..utils.git_status import GitStatusProvider
+from ..utils.token_estimator import TokenEstimator
+from .session_server import SESSION_RESOURCES, SessionMCPServer
+
+logger = structlog.get_logger()
+
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+@asynccontextmanager
+async def socket_transport(stream):
+    """Server transport over one accepted socket connection.
+
+    The socket counterpart of ``mcp.server.stdio.stdio_server``: messages
+    are newline-delimited JSON-RPC in both directions.
+
+    Args:
+        stream: Connected anyio byte stream.
+
+    Yields:
+        (read_stream, write_stream) for ``Server.run``.
+    """
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    buffered = BufferedByteReceiveStream(stream)
+
+    async def socket_reader():
+        async with read_stream_writer:
+            while True:
+                try:
+                    line = await buffered.receive_until(b"\n", MAX_MESSAGE_BYTES)
+                except (anyio.EndOfStream, anyio.IncompleteRead, anyio.ClosedResourceError,
+                        anyio.BrokenResourceError):
+                    return
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as exc:
+                    await read_stream_writer.send(exc)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+
+    async def socket_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    body = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                    await stream.send(body.encode("utf-8") + b"\n")
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        yield read_stream, write_stream
+        tg.cancel_scope.cancel()
+
+
+class SessionGateway:
+    """MCP server exposing many sessions through per-session namespaces.
+
+    Example:
+        gateway = SessionGateway(db_path="data/sessions.db")
+        asyncio.run(gateway.run())                    # stdio
+        asyncio.run(gateway.run_socket("/tmp/llm-sessions.sock"))
+    """
+
+    INDEX_POLL_INTERVAL = 30.0
+    SYNC_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        db: Optional[Database] = None,
+        session_ids: Optional[List[str]] = None,
+        db_path: str = "data/sessions.db"
+    ):
+        """Initialize gateway.
+
+        Args:
+            db: Session database (default: opened from ``db_path``).
+            session_ids: Sessions to serve (default: all active sessions,
+                followed as they start and stop).
+            db_path: Database path used when ``db`` is not given.
+        """
+        if not MCP_AVAILABLE:
+            raise RuntimeError(
+                "MCP not available. Install with: pip install mcp"
+            )
+
+        self.db = db or Database(db_path)
+        self.db.init_db()
+        self.runner = BlockingCallRunner(max_workers=4, name="gateway")
+        self.async_db = AsyncDatabase(self.db, self.runner)
+        self.session_ids = list(session_ids) if session_ids else None
+
+        # Shared by all sessions
+        self.token_estimator = TokenEstimator()
+        self.git = GitStatusProvider()
+        self.health_monitor = HealthMonitor()
+        self._indexes: Dict[str, FileIndex] = {}
+        self._index_users: Dict[str, Set[str]] = {}
+        self._watched: Set[str] = set()
+
+        # Per session
+        self.sessions: Dict[str, SessionMCPServer] = {}
+        self._samplers: Dict[str, asyncio.Task] = {}
+
+        self._running = False
+        self._synced_version: Optional[int] = None
+        self._background: Set[asyncio.Task] = set()
+
+        self.server = Server("llm-session-gateway")
+        self._register_handlers()
+
+        logger.info("session_gateway_initialized", sessions=self.session_ids or "active")
+
+    # ==================== SESSIONS ====================
+
+    def add_session(self, session: Session) -> SessionMCPServer:
+        """Serve a session (replacing nothing if it is already served).
+
+        Args:
+            session: Session to expose.
+
+        Returns:
+            The session's handler.
+        """
+        if session.id in self.sessions:
+            return self.sessions[session.id]
+
+        key = str(Path(session.working_directory).resolve())
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = FileIndex(key)
+        self._index_users.setdefault(key, set()).add(session.id)
+
+        handler = SessionMCPServer(
+            session,
+            git=self.git,
+            token_estimator=self.token_estimator,
+            files=index,
+            health_monitor=self.health_monitor,
+        )
+        self.sessions[session.id] = handler
+
+        if self._running:
+            self._start_session(handler)
+        logger.info("gateway_session_added", session_id=session.id,
+                    shared_index=len(self._index_users[key]) > 1)
+        return handler
+
+    def remove_session(self, session_id: str) -> None:
+        """Stop serving a session; its directory index is dropped with its last user."""
+        handler = self.sessions.pop(session_id, None)
+        if handler is None:
+            return
+
+        sampler = self._samplers.pop(session_id, None)
+        if sampler is not None:
+            sampler.cancel()
+        handler.files.remove_listener(handler.metrics.trigger)
+
+        key = str(handler.files.root)
+        users = self._index_users.get(key, set())
+        users.discard(session_id)
+        if not users:
+            self._index_users.pop(key, None)
+            self._watched.discard(key)
+            index = self._indexes.pop(key, None)
+            if index is not None:
+                index.stop_watching()
+            self.git.invalidate(handler.working_dir)
+        logger.info("gateway_session_removed", session_id=session_id)
+
+    async def sync_sessions(self, force: bool = False) -> bool:
+        """Match the served sessions to the database.
+
+        Skipped unless the sessions table changed since the last sync.
+
+        Args:
+            force: Sync even if the database has not changed.
+
+        Returns:
+            True if the database was read.
+        """
+        version = await self.async_db.get_change_counter()
+        if not force and version == self._synced_version:
+            return False
+        self._synced_version = version
+
+        if self.session_ids is not None:
+            wanted = {}
+            for session_id in self.session_ids:
+                session = await self.async_db.get_session(session_id)
+                if session is None:
+                    logger.warning("gateway_session_not_found", session_id=session_id)
+                else:
+                    wanted[session_id] = session
+        else:
+            wanted = {s.id: s for s in await self.async_db.get_active_sessions()}
+
+        for session_id in [sid for sid in self.sessions if sid not in wanted]:
+            self.remove_session(session_id)
+        for session in wanted.values():
+            self.add_session(session)
+        return True
+
+    def _handler(self, session_id: Optional[str]) -> SessionMCPServer:
+        handler = self.sessions.get(session_id or "")
+        if handler is None:
+            raise ValueError(f"Unknown session: {session_id}")
+        return handler
+
+    def _start_session(self, handler: SessionMCPServer) -> None:
+        self._samplers[handler.session.id] = asyncio.create_task(handler.metrics.run())
+        key = str(handler.files.root)
+        if key not in self._watched and handler.working_dir.exists():
+            self._watched.add(key)
+            task = asyncio.create_task(
+                asyncio.to_thread(handler.files.start_watching, self.INDEX_POLL_INTERVAL)
+            )
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    def describe_sessions(self) -> List[Dict[str, Any]]:
+        """Summary of each served session."""
+        return [
+            {
+                "session_id": session_id,
+                "type": handler.session.type.value,
+                "status": handler.session.status.value,
+                "working_directory": handler.session.working_directory,
+                "resources": [f"session://{session_id}/{name}" for name, _, _ in SESSION_RESOURCES],
+            }
+            for session_id, handler in self.sessions.items()
+        ]
+
+    # ==================== HANDLERS ====================
+
+    def _register_handlers(self):
+        """Register MCP handlers that route to per-session handlers."""
+
+        @self.server.list_resources()
+        async def list_resources() -> List[Resource]:
+            """List the resources of every served session."""
+            resources = [
+                Resource(
+                    uri="session://sessions",
+                    name="Served Sessions",
+                    description="Sessions served by this gateway",
+                    mimeType="application/json"
+                )
+            ]
+            for handler in self.sessions.values():
+                resources.extend(handler.resources())
+            return resources
+
+        @self.server.list_resource_templates()
+        async def list_resource_templates() -> List[ResourceTemplate]:
+            """List URI templates of per-session resources."""
+            return [
+                ResourceTemplate(
+                    uriTemplate=f"session://{{session_id}}/{name}",
+                    name=title,
+                    description=description,
+                    mimeType="application/json"
+                )
+                for name, title, description in SESSION_RESOURCES
+            ]
+
+        @self.server.read_resource()
+        async def read_resource(uri) -> List[ReadResourceContents]:
+            """Read ``session://sessions`` or ``session://{id}/{name}``."""
+            uri = str(uri)
+            logger.info("gateway_resource_read", uri=uri)
+            if uri == "session://sessions":
+                body = self.describe_sessions()
+            else:
+                session_id, _, name = uri[len("session://"):].partition("/")
+                if not uri.startswith("session://") or session_id not in self.sessions:
+                    body = {"error": f"Unknown resource: {uri}"}
+                else:
+                    body = await self.sessions[session_id].read(name)
+            return [ReadResourceContents(content=json.dumps(body, indent=2), mime_type="application/json")]
+
+        @self.server.list_tools()
+        async def list_tools() -> List[Tool]:
+            """List per-session tools (taking a session_id) and list_sessions."""
+            tools = [
+                Tool(
+                    name="list_sessions",
+                    description="List the sessions served by this gateway",
+                    inputSchema={"type": "object", "properties": {}}
+                )
+            ]
+            # Tool definitions are the same for every session
+            for tool in SessionMCPServer.tools():
+                schema = dict(tool.inputSchema)
+                schema["properties"] = {
+                    "session_id": {"type": "string", "description": "Session to act on"},
+                    **schema.get("properties", {}),
+                }
+                schema["required"] = ["session_id", *schema.get("required", [])]
+                tools.append(Tool(name=tool.name, description=tool.description, inputSchema=schema))
+            return tools
+
+        @self.server.call_tool()
+        async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+            """Route a tool call to the named session."""
+            arguments = dict(arguments or {})
+            session_id = arguments.pop("session_id", None)
+            logger.info("gateway_tool_called", tool=name, session=session_id)
+            try:
+                if name == "list_sessions":
+                    result = {"sessions": self.describe_sessions(), "count": len(self.sessions)}
+                else:
+                    result = await self._handler(session_id).call(name, arguments)
+            except Exception as e:
+                logger.error("gateway_tool_error", tool=name, session=session_id, error=str(e))
+                result = {"error": str(e)}
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        @self.server.list_prompts()
+        async def list_prompts() -> List[Prompt]:
+            """List per-session prompts (taking a session_id)."""
+            return [
+                Prompt(
+                    name=prompt.name,
+                    description=prompt.description,
+                    arguments=[PromptArgument(name="session_id", description="Session to report on", required=True)]
+                )
+                for prompt in SessionMCPServer.prompts()
+            ]
+
+        @self.server.get_prompt()
+        async def get_prompt(name: str, arguments: Dict[str, str]) -> GetPromptResult:
+            """Render a prompt for the named session."""
+            session_id = (arguments or {}).get("session_id")
+            try:
+                text = await self._handler(session_id).prompt(name)
+            except ValueError as e:
+                text = str(e)
+            return GetPromptResult(
+                messages=[PromptMessage(role="user", content=TextContent(type="text", text=text))]
+            )
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        """Load sessions and start samplers, index watching and session sync."""
+        await self.sync_sessions(force=True)
+        self._running = True
+        for handler in self.sessions.values():
+            self._start_session(handler)
+
+        if self.session_ids is None:
+            task = asyncio.create_task(self._follow_sessions())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        logger.info("session_gateway_started", sessions=len(self.sessions), indexes=len(self._indexes))
+
+    async def stop(self) -> None:
+        """Stop all background work."""
+        self._running = False
+        for task in [*self._samplers.values(), *self._background]:
+            task.cancel()
+        self._samplers.clear()
+        for index in self._indexes.values():
+            index.stop_watching()
+        self._watched.clear()
+        self.runner.shutdown()
+
+    async def _follow_sessions(self) -> None:
+        """Pick up sessions that start or stop while the gateway runs."""
+        while True:
+            await asyncio.sleep(self.SYNC_INTERVAL)
+            try:
+                await self.sync_sessions()
+            except Exception as e:
+                logger.warning("gateway_sync_failed", error=str(e))
+
+    async def run(self) -> None:
+        """Serve one client over stdio."""
+        await self.start()
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+        finally:
+            await self.stop()
+
+    async def run_socket(self, path: str) -> None:
+        """Serve any number of clients over a Unix domain socket.
+
+        Args:
+            path: Socket path (a stale socket file there is replaced).
+        """
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise RuntimeError(f"{path} exists and is not a socket")
+            os.unlink(path)
+
+        listener = await anyio.create_unix_listener(path)
+        try:
+            await self.start()
+            logger.info("session_gateway_listening", socket=path)
+            await listener.serve(self._serve_connection)
+        finally:
+            await listener.aclose()
+            await self.stop()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def _serve_connection(self, stream) -> None:
+        logger.info("gateway_client_connected")
+        try:
+            async with stream, socket_transport(stream) as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+        except Exception as e:
+            logger.error("gateway_client_error", error=str(e))
+        logger.info("gateway_client_disconnected")
@@ -0,0 +1,143 @@
+"""Background sampling of a session's token and health metrics.
+
+Token estimation walks the session's working directory, so it is too slow
+to run inside an MCP request handler. ``MetricsSampler`` measures in a
+worker thread on a fixed interval, and sooner when the file index reports
+changes (debounced), and keeps the latest ``MetricsSample``. Handlers read
+that sample and report its age instead of measuring on demand; only the
+very first read waits for a measurement.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import structlog
+
+from ..core.health_monitor import HealthMonitor
+from ..models.session import Session
+from ..utils.token_estimator import TokenEstimator
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class MetricsSample:
+    """One measurement of a session.
+
+    Attributes:
+        token_count: Estimated tokens in context.
+        token_usage_percent: token_count as a percentage of the session limit.
+        health_score: Health score (0-100 scale).
+        sampled_at: When the measurement finished.
+        duration_ms: How long the measurement took.
+    """
+
+    token_count: int
+    token_usage_percent: float
+    health_score: float
+    sampled_at: datetime = field(default_factory=datetime.now)
+    duration_ms: float = 0.0
+
+    def age(self) -> float:
+        """Seconds since the sample was taken."""
+        return max(0.0, (datetime.now() - self.sampled_at).total_seconds())
+
+
+class MetricsSampler:
+    """Keeps the latest MetricsSample of a session fresh in the background.
+
+    Example:
+        sampler = MetricsSampler(session, TokenEstimator(), HealthMonitor())
+        task = asyncio.create_task(sampler.run())
+        sample = await sampler.latest()
+        print(sample.token_count, sample.age())
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        token_estimator: TokenEstimator,
+        health_monitor: Optional[HealthMonitor] = None,
+        interval: float = 30.0,
+        min_interval: float = 2.0
+    ):
+        """Initialize sampler.
+
+        Args:
+            session: Session to measure (its token_count and health_score are updated).
+            token_estimator: Estimator for the session's tokens.
+            health_monitor: Health scorer (default: a new HealthMonitor).
+            interval: Seconds between samples without file changes.
+            min_interval: Minimum seconds between samples triggered by file changes.
+        """
+        self.session = session
+        self.token_estimator = token_estimator
+        self.health_monitor = health_monitor or HealthMonitor()
+        self.interval = interval
+        self.min_interval = min_interval
+        self.sample: Optional[MetricsSample] = None
+        self.stats = {"samples": 0, "triggers": 0, "errors": 0}
+
+        self._inflight: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def latest(self) -> MetricsSample:
+        """The most recent sample, measuring first if there is none yet."""
+        if self.sample is None:
+            return await self.refresh()
+        return self.sample
+
+    async def refresh(self) -> MetricsSample:
+        """Measure now in a worker thread (concurrent callers share one measurement)."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(asyncio.to_thread(self._measure))
+        return await asyncio.shield(self._inflight)
+
+    def trigger(self) -> None:
+        """Request an early sample; safe to call from any thread (e.g. file events)."""
+        self.stats["triggers"] += 1
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def run(self) -> None:
+        """Sample every ``interval`` seconds, or after a trigger, until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.warning("metrics_sample_failed", session_id=self.session.id, error=str(e))
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.interval)
+                    # Debounce bursts of file events
+                    await asyncio.sleep(max(0.0, self.min_interval - self.sample.age()) if self.sample else 0)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            self._loop = None
+
+    def _measure(self) -> MetricsSample:
+        started = time.perf_counter()
+        session = self.session
+        session.token_count = self.token_estimator.estimate_session_tokens(session)
+        session.health_score = self.health_monitor.calculate_health(session) * 100
+
+        sample = MetricsSample(
+            token_count=session.token_count,
+            token_usage_percent=session.calculate_token_usage_percent(),
+            health_score=session.health_score,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        self.sample = sample
+        self.stats["samples"] += 1
+        logger.debug("metrics_sampled", session_id=session.id,
+                     tokens=sample.token_count, ms=sample.duration_ms)
+        return sample
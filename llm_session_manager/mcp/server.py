@@ -4,16 +4,25 @@ This server exposes session management functionality via Model Context Protocol,
 allowing MCP clients (like Claude Desktop) to query and interact with session data.
 """
 
+import asyncio
+import base64
+import binascii
 import json
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
 import structlog
 from datetime import datetime
 
 try:
     from mcp.server import Server
+    from mcp.server.lowlevel.helper_types import ReadResourceContents
     from mcp.server.stdio import stdio_server
     from mcp.types import (
+        ListResourcesRequest,
+        ListResourcesResult,
         Resource,
+        ResourceTemplate,
         Tool,
         TextContent,
         ImageContent,
@@ -21,7 +30,9 @@ try:
         Prompt,
         PromptMessage,
         PromptArgument,
+        GetPromptResult,
     )
+    from pydantic import AnyUrl
     MCP_AVAILABLE = True
 except ImportError:
     MCP_AVAILABLE = False
@@ -31,6 +42,11 @@ from ..storage.database import Database
 from ..core.session_discovery import SessionDiscovery
 from ..core.health_monitor import HealthMonitor
 from ..core.memory_manager import MemoryManager
+from ..core.async_memory_manager import AsyncMemoryManager
+from ..context.context_packer import PackedContext
+from ..context.memory_compactor import MemoryCompactor
+from ..storage.async_database import AsyncDatabase
+from ..utils.async_runner import BlockingCallRunner
 from ..utils.recommendations import RecommendationEngine
 from ..models.session import Session, SessionType, SessionStatus
 
@@ -44,18 +60,43 @@ class MCPServer:
     - Resources: Session data, health metrics, memory
     - Tools: Search, export, recommendations
     - Prompts: Common session management workflows
+
+    Per-session resources are listed one page at a time (``session://{id}/info``
+    only; health and memories are advertised as resource templates). Pages
+    are cached until the sessions table's change counter moves.
+
+    Resource bodies are compact JSON, cached briefly and stamped with the
+    same counter. Clients can subscribe to resources and receive
+    resources/updated notifications instead of polling.
     """
 
+    # Sessions per resources/list page, and listing pages kept in the cache
+    RESOURCE_PAGE_SIZE = 100
+    RESOURCE_PAGE_CACHE_SIZE = 64
+
+    # Seconds a rendered resource is reused while the sessions are unchanged,
+    # and rendered resources kept in the cache
+    RESOURCE_TTL = 2.0
+    RESOURCE_CACHE_SIZE = 256
+
+    # Seconds between checks of subscribed resources
+    WATCH_INTERVAL = 1.0
+
     def __init__(
         self,
         db_path: str = "data/sessions.db",
-        memory_path: str = "data/memories"
+        memory_path: str = "data/memories",
+        max_workers: int = 4,
+        compact_every: Optional[float] = None
     ):
         """Initialize MCP server.
 
         Args:
             db_path: Path to session database.
             memory_path: Path to memory storage.
+            max_workers: Threads available for blocking database/memory calls.
+            compact_every: Minutes between incremental memory compactions
+                while the server runs (None disables them).
         """
         if not MCP_AVAILABLE:
             raise RuntimeError(
@@ -70,6 +111,28 @@ class MCPServer:
         self.memory_manager = MemoryManager(memory_path)
         self.recommendation_engine = RecommendationEngine()
 
+        # Blocking storage/embedding work runs off the event loop
+        self.runner = BlockingCallRunner(max_workers=max_workers, name="mcp")
+        self.async_db = AsyncDatabase(self.db, self.runner)
+        self.async_memory = AsyncMemoryManager(self.memory_manager, self.runner)
+        self.compact_every = compact_every
+        self.compactor = MemoryCompactor(self.memory_manager)
+
+        # Resource listing pages by cursor, valid for one sessions change counter
+        self._listing_version: Optional[int] = None
+        self._listing_pages: "OrderedDict[Optional[str], ListResourcesResult]" = OrderedDict()
+        self.listing_stats = {"hits": 0, "misses": 0}
+
+        # Rendered resources: uri -> (sessions version, rendered at, body)
+        # kept for one sessions version, least recently used evicted first
+        self._resource_cache_version: Optional[int] = None
+        self._resource_cache: "OrderedDict[str, tuple[int, float, str]]" = OrderedDict()
+        self.resource_cache_stats = {"hits": 0, "misses": 0}
+
+        # Subscribed client sessions per URI, and the body last notified
+        self._subscriptions: Dict[str, Set[Any]] = {}
+        self._notified: Dict[str, str] = {}
+
         self.server = Server("llm-session-manager")
         self._register_handlers()
 
@@ -83,110 +146,58 @@ class MCPServer:
         # ==================== RESOURCES ====================
 
         @self.server.list_resources()
-        async def list_resources() -> List[Resource]:
-            """List all available resources."""
-            resources = [
-                Resource(
-                    uri="session://list",
-                    name="All Sessions",
-                    description="List of all tracked sessions",
+        async def list_resources(request: ListResourcesRequest) -> ListResourcesResult:
+            """List resources a page at a time."""
+            cursor = request.params.cursor if request.params else None
+            return await self._list_resource_page(cursor)
+
+        @self.server.list_resource_templates()
+        async def list_resource_templates() -> List[ResourceTemplate]:
+            """List URI templates of per-session resources."""
+            return [
+                ResourceTemplate(
+                    uriTemplate="session://{session_id}/info",
+                    name="Session Info",
+                    description="Detailed info for a session",
                     mimeType="application/json"
                 ),
-                Resource(
-                    uri="session://active",
-                    name="Active Sessions",
-                    description="Currently active sessions",
+                ResourceTemplate(
+                    uriTemplate="session://{session_id}/health",
+                    name="Session Health",
+                    description="Health metrics for a session",
                     mimeType="application/json"
                 ),
-                Resource(
-                    uri="memory://stats",
-                    name="Memory Statistics",
-                    description="Cross-session memory statistics",
+                ResourceTemplate(
+                    uriTemplate="session://{session_id}/memories",
+                    name="Session Memories",
+                    description="Memories from a session",
                     mimeType="application/json"
                 ),
             ]
 
-            # Add individual session resources
-            sessions = self.db.get_all_sessions()
-            for session in sessions:
-                resources.extend([
-                    Resource(
-                        uri=f"session://{session.id}/info",
-                        name=f"Session {session.id[:8]} Info",
-                        description=f"Detailed info for {session.type.value} session",
-                        mimeType="application/json"
-                    ),
-                    Resource(
-                        uri=f"session://{session.id}/health",
-                        name=f"Session {session.id[:8]} Health",
-                        description=f"Health metrics for session",
-                        mimeType="application/json"
-                    ),
-                    Resource(
-                        uri=f"session://{session.id}/memories",
-                        name=f"Session {session.id[:8]} Memories",
-                        description=f"Memories from this session",
-                        mimeType="application/json"
-                    ),
-                ])
-
-            return resources
-
         @self.server.read_resource()
-        async def read_resource(uri: str) -> str:
+        async def read_resource(uri: str) -> List[ReadResourceContents]:
             """Read a specific resource."""
-            logger.info("mcp_resource_read", uri=uri)
-
-            if uri == "session://list":
-                sessions = self.db.get_all_sessions()
-                return json.dumps({
-                    "sessions": [s.to_dict() for s in sessions],
-                    "count": len(sessions)
-                }, indent=2)
-
-            elif uri == "session://active":
-                sessions = self.db.get_active_sessions()
-                return json.dumps({
-                    "sessions": [s.to_dict() for s in sessions],
-                    "count": len(sessions)
-                }, indent=2)
-
-            elif uri == "memory://stats":
-                stats = self.memory_manager.get_stats()
-                return json.dumps(stats, indent=2)
-
-            elif uri.startswith("session://"):
-                # Parse session-specific URIs
-                parts = uri.split("/")
-                if len(parts) >= 3:
-                    session_id = parts[2]
-                    resource_type = parts[3] if len(parts) > 3 else "info"
-
-                    session = self.db.get_session(session_id)
-                    if not session:
-                        return json.dumps({"error": f"Session {session_id} not found"})
-
-                    if resource_type == "info":
-                        return json.dumps(session.to_dict(), indent=2)
-
-                    elif resource_type == "health":
-                        health_breakdown = self.health_monitor.calculate_health_breakdown(session)
-                        return json.dumps({
-                            "session_id": session.id,
-                            "health_score": session.health_score,
-                            "breakdown": health_breakdown,
-                            "is_healthy": session.is_healthy(),
-                        }, indent=2)
-
-                    elif resource_type == "memories":
-                        memories = self.memory_manager.get_memories_by_session(session_id)
-                        return json.dumps({
-                            "session_id": session_id,
-                            "memories": memories,
-                            "count": len(memories)
-                        }, indent=2)
-
-            return json.dumps({"error": f"Unknown resource: {uri}"})
+            logger.info("mcp_resource_read", uri=str(uri))
+            body = await self._read_resource(str(uri))
+            return [ReadResourceContents(content=body, mime_type="application/json")]
+
+        @self.server.subscribe_resource()
+        async def subscribe_resource(uri: str) -> None:
+            """Notify the calling client when a resource changes."""
+            client = self.server.request_context.session
+            self._subscriptions.setdefault(str(uri), set()).add(client)
+            logger.info("mcp_resource_subscribed", uri=str(uri))
+
+        @self.server.unsubscribe_resource()
+        async def unsubscribe_resource(uri: str) -> None:
+            """Stop change notifications for a resource."""
+            client = self.server.request_context.session
+            clients = self._subscriptions.get(str(uri), set())
+            clients.discard(client)
+            if not clients:
+                self._subscriptions.pop(str(uri), None)
+                self._notified.pop(str(uri), None)
 
         # ==================== TOOLS ====================
 
@@ -221,6 +232,19 @@ class MCPServer:
                             "context": {
                                 "type": "string",
                                 "description": "Optional context about what you're working on"
+                            },
+                            "project": {
+                                "type": "string",
+                                "description": "Optional project name to find the best session for"
+                            },
+                            "tags": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Optional task tags to find the best session for"
+                            },
+                            "since_version": {
+                                "type": "number",
+                                "description": "Version from a previous call; only changes since then are returned"
                             }
                         }
                     }
@@ -304,7 +328,7 @@ class MCPServer:
                     query = arguments.get("query", "")
                     limit = arguments.get("limit", 5)
 
-                    memories = self.memory_manager.search_memories(query, limit=limit)
+                    memories = await self.async_memory.search_memories(query, limit=limit)
 
                     result = {
                         "query": query,
@@ -319,24 +343,34 @@ class MCPServer:
 
                 elif name == "recommend_session":
                     context = arguments.get("context", "")
+                    since_version = arguments.get("since_version")
 
-                    # Get all sessions
-                    sessions = self.db.get_all_sessions()
+                    # Get all sessions and update the engine's indexes
+                    sessions = await self.async_db.get_all_sessions()
+                    self.recommendation_engine.sync(sessions)
 
-                    # Generate recommendations
-                    recommendations = self.recommendation_engine.generate_recommendations(
-                        sessions
+                    # Recommendations as a diff against the caller's version
+                    recommendations = self.recommendation_engine.diff(
+                        int(since_version) if since_version is not None else None
                     )
 
+                    best_sessions = [
+                        {"session_id": session.id, "score": round(score, 3), "reasons": reasons}
+                        for session, score, reasons in self.recommendation_engine.top_sessions_for_task(
+                            arguments.get("tags"), arguments.get("project"), k=3
+                        )
+                    ]
+
                     # If context provided, search memories for relevant info
                     relevant_memories = []
                     if context:
-                        relevant_memories = self.memory_manager.search_memories(
+                        relevant_memories = await self.async_memory.search_memories(
                             context, limit=3
                         )
 
                     result = {
                         "recommendations": recommendations,
+                        "best_sessions": best_sessions,
                         "relevant_memories": relevant_memories if context else [],
                         "context": context
                     }
@@ -350,7 +384,7 @@ class MCPServer:
                     session_id = arguments.get("session_id")
                     format_type = arguments.get("format", "json")
 
-                    session = self.db.get_session(session_id)
+                    session = await self.async_db.get_session(session_id)
                     if not session:
                         return [TextContent(
                             type="text",
@@ -359,7 +393,7 @@ class MCPServer:
 
                     # Get additional data
                     health_breakdown = self.health_monitor.calculate_health_breakdown(session)
-                    memories = self.memory_manager.get_memories_by_session(session_id)
+                    memories = await self.async_memory.get_memories_by_session(session_id)
 
                     export_data = {
                         "session": session.to_dict(),
@@ -390,7 +424,7 @@ class MCPServer:
                     status = arguments.get("status")
                     description = arguments.get("description")
 
-                    sessions = self.db.get_all_sessions()
+                    sessions = await self.async_db.get_all_sessions()
 
                     # Filter sessions
                     filtered = sessions
@@ -425,7 +459,7 @@ class MCPServer:
                 elif name == "update_session_health":
                     session_id = arguments.get("session_id")
 
-                    session = self.db.get_session(session_id)
+                    session = await self.async_db.get_session(session_id)
                     if not session:
                         return [TextContent(
                             type="text",
@@ -435,7 +469,7 @@ class MCPServer:
                     # Recalculate health
                     health_score = self.health_monitor.calculate_health_score(session)
                     session.health_score = health_score
-                    self.db.update_session(session)
+                    await self.async_db.update_session(session)
 
                     breakdown = self.health_monitor.calculate_health_breakdown(session)
 
@@ -453,7 +487,7 @@ class MCPServer:
 
                 elif name == "discover_sessions":
                     # Discover sessions
-                    discovered = self.discovery.discover_sessions()
+                    discovered = await self.runner.run(self.discovery.discover_sessions)
 
                     result = {
                         "discovered": [s.to_dict() for s in discovered],
@@ -498,7 +532,8 @@ class MCPServer:
                             name="task",
                             description="What task are you working on?",
                             required=True
-                        )
+                        ),
+                        self._token_budget_argument(),
                     ]
                 ),
                 Prompt(
@@ -509,7 +544,8 @@ class MCPServer:
                             name="session_id",
                             description="Session ID to summarize",
                             required=True
-                        )
+                        ),
+                        self._token_budget_argument(),
                     ]
                 ),
                 Prompt(
@@ -520,19 +556,20 @@ class MCPServer:
                             name="query",
                             description="What are you looking for?",
                             required=True
-                        )
+                        ),
+                        self._token_budget_argument(),
                     ]
                 ),
             ]
 
         @self.server.get_prompt()
-        async def get_prompt(name: str, arguments: Dict[str, str]) -> PromptMessage:
+        async def get_prompt(name: str, arguments: Dict[str, str]) -> GetPromptResult:
             """Get a specific prompt with arguments."""
             logger.info("mcp_prompt_requested", prompt=name, args=arguments)
 
             if name == "session_health_check":
-                sessions = self.db.get_all_sessions()
-                recommendations = self.recommendation_engine.generate_recommendations(sessions)
+                sessions = await self.async_db.get_all_sessions()
+                recommendations = self.recommendation_engine.analyze_sessions(sessions)
 
                 content = f"""# Session Health Check
 
@@ -549,20 +586,19 @@ Active Sessions: {len([s for s in sessions if s.status == SessionStatus.ACTIVE])
                 for rec in recommendations:
                     content += f"\n- {rec['type']}: {rec['message']}"
 
-                return PromptMessage(
-                    role="user",
-                    content=TextContent(type="text", text=content)
-                )
+                return self._prompt_result(content)
 
             elif name == "find_relevant_session":
                 task = arguments.get("task", "")
+                token_budget = self._parse_token_budget(arguments)
 
                 # Search memories
-                relevant_memories = self.memory_manager.search_memories(task, limit=5)
+                relevant_memories = await self.async_memory.search_memories(task, limit=5)
+                packed = await self._pack(relevant_memories, token_budget=token_budget)
 
                 # Get sessions mentioned in memories
                 session_ids = set(m['metadata'].get('session_id') for m in relevant_memories)
-                sessions = [self.db.get_session(sid) for sid in session_ids if sid]
+                sessions = [await self.async_db.get_session(sid) for sid in session_ids if sid]
                 sessions = [s for s in sessions if s]  # Filter None
 
                 content = f"""# Find Session for: {task}
@@ -579,23 +615,20 @@ Active Sessions: {len([s for s in sessions if s.status == SessionStatus.ACTIVE])
                     content += "\n"
 
                 content += "\n## Relevant Memories\n"
-                for memory in relevant_memories:
-                    content += f"\n- {memory['content']} (Relevance: {memory['relevance']*100:.0f}%)"
+                content += packed.text or "\nNo relevant memories found.\n"
 
-                return PromptMessage(
-                    role="user",
-                    content=TextContent(type="text", text=content)
-                )
+                return self._prompt_result(content)
 
             elif name == "session_summary":
                 session_id = arguments.get("session_id", "")
-                session = self.db.get_session(session_id)
+                token_budget = self._parse_token_budget(arguments)
+                session = await self.async_db.get_session(session_id)
 
                 if not session:
                     content = f"Session {session_id} not found."
                 else:
-                    health_breakdown = self.health_monitor.calculate_health_breakdown(session)
-                    memories = self.memory_manager.get_memories_by_session(session_id)
+                    scores = self.health_monitor.get_health_summary(session)["component_scores"]
+                    memories = await self.async_memory.get_memories_by_session(session_id)
 
                     content = f"""# Session Summary: {session.type.value}
 
@@ -605,10 +638,10 @@ Active Sessions: {len([s for s in sessions if s.status == SessionStatus.ACTIVE])
 **Working Directory**: {session.working_directory}
 
 ## Health Breakdown
-- Token Usage: {health_breakdown.get('token_usage_score', 0):.1f}%
-- Duration: {health_breakdown.get('duration_score', 0):.1f}%
-- Activity: {health_breakdown.get('activity_score', 0):.1f}%
-- Errors: {health_breakdown.get('error_score', 0):.1f}%
+- Token Usage: {scores['token'] * 100:.1f}%
+- Duration: {scores['duration'] * 100:.1f}%
+- Activity: {scores['activity'] * 100:.1f}%
+- Errors: {scores['errors'] * 100:.1f}%
 
 ## Metadata
 - Project: {session.project_name or 'N/A'}
@@ -617,39 +650,296 @@ Active Sessions: {len([s for s in sessions if s.status == SessionStatus.ACTIVE])
 
 ## Memories ({len(memories)})
 """
-                    for memory in memories[:5]:  # Show first 5
-                        content += f"\n- {memory.get('content', 'N/A')}"
+                    packed = await self._pack(
+                        memories,
+                        token_budget=token_budget,
+                        header="",
+                        footer="",
+                        formatter=lambda i, memory, text: f"\n- {text}"
+                    )
+                    content += packed.text
 
-                return PromptMessage(
-                    role="user",
-                    content=TextContent(type="text", text=content)
-                )
+                return self._prompt_result(content)
 
             elif name == "cross_session_search":
                 query = arguments.get("query", "")
-                memories = self.memory_manager.search_memories(query, limit=10)
+                token_budget = self._parse_token_budget(arguments)
+                memories = await self.async_memory.search_memories(query, limit=10)
+                packed = await self._pack(
+                    memories,
+                    token_budget=token_budget,
+                    header="",
+                    footer="",
+                    formatter=self._format_search_result
+                )
 
                 content = f"""# Cross-Session Search: {query}
 
-Found {len(memories)} relevant memories:
+Found {len(memories)} relevant memories ({len(packed.manifest)} shown within {token_budget} tokens):
 """
-                for i, memory in enumerate(memories, 1):
-                    session_id = memory['metadata'].get('session_id', 'unknown')[:8]
-                    relevance = memory['relevance'] * 100
-                    content += f"\n## Result {i} (Relevance: {relevance:.0f}%)"
-                    content += f"\nSession: {session_id}"
-                    content += f"\n{memory['content']}\n"
-
-                return PromptMessage(
-                    role="user",
-                    content=TextContent(type="text", text=content)
-                )
+                content += packed.text
+
+                return self._prompt_result(content)
 
             # Default
-            return PromptMessage(
-                role="user",
-                content=TextContent(type="text", text=f"Unknown prompt: {name}")
+            return self._prompt_result(f"Unknown prompt: {name}")
+
+    async def _pack(self, memories: List[Dict[str, Any]], **kwargs) -> PackedContext:
+        """Pack memories into a token budget on the worker pool (tokenizing blocks)."""
+        return await self.runner.run(self.memory_manager.context_packer.pack, memories, **kwargs)
+
+    @staticmethod
+    def _prompt_result(text: str) -> GetPromptResult:
+        """Wrap prompt text as a prompts/get result."""
+        return GetPromptResult(messages=[PromptMessage(role="user", content=TextContent(type="text", text=text))])
+
+    @staticmethod
+    def _to_json(data: Any) -> str:
+        """Serialize a response compactly."""
+        return json.dumps(data, separators=(",", ":"), default=str)
+
+    async def _read_resource(self, uri: str) -> str:
+        """Serve a resource from the response cache or render it.
+
+        Entries are stamped with the sessions change counter and expire
+        after RESOURCE_TTL seconds (health and memories also change
+        without a sessions write).
+
+        Args:
+            uri: Resource URI.
+
+        Returns:
+            JSON body.
+        """
+        version = await self.async_db.get_change_counter("sessions")
+        if version != self._resource_cache_version:
+            # Older entries can never hit again (this also drops deleted sessions)
+            self._resource_cache.clear()
+            self._resource_cache_version = version
+
+        cached = self._resource_cache.get(uri)
+        if cached and cached[0] == version and time.monotonic() - cached[1] < self.RESOURCE_TTL:
+            self._resource_cache.move_to_end(uri)
+            self.resource_cache_stats["hits"] += 1
+            return cached[2]
+
+        self.resource_cache_stats["misses"] += 1
+        body = await self._render_resource(uri)
+        self._resource_cache[uri] = (version, time.monotonic(), body)
+        self._resource_cache.move_to_end(uri)
+        while len(self._resource_cache) > self.RESOURCE_CACHE_SIZE:
+            self._resource_cache.popitem(last=False)
+        return body
+
+    async def _render_resource(self, uri: str) -> str:
+        """Build the JSON body of a resource."""
+        if uri == "session://list":
+            sessions = await self.async_db.get_all_sessions()
+            return self._to_json({
+                "sessions": [s.to_dict() for s in sessions],
+                "count": len(sessions)
+            })
+
+        elif uri == "session://active":
+            sessions = await self.async_db.get_active_sessions()
+            return self._to_json({
+                "sessions": [s.to_dict() for s in sessions],
+                "count": len(sessions)
+            })
+
+        elif uri == "memory://stats":
+            stats = await self.async_memory.get_stats()
+            return self._to_json(stats)
+
+        elif uri.startswith("session://"):
+            # Parse session-specific URIs
+            parts = uri.split("/")
+            if len(parts) >= 3:
+                session_id = parts[2]
+                resource_type = parts[3] if len(parts) > 3 else "info"
+
+                session = await self.async_db.get_session(session_id)
+                if not session:
+                    return self._to_json({"error": f"Session {session_id} not found"})
+
+                if resource_type == "info":
+                    return self._to_json(session.to_dict())
+
+                elif resource_type == "health":
+                    health_breakdown = self.health_monitor.get_health_summary(session)
+                    return self._to_json({
+                        "session_id": session.id,
+                        "health_score": session.health_score,
+                        "breakdown": health_breakdown,
+                        "is_healthy": session.is_healthy(),
+                    })
+
+                elif resource_type == "memories":
+                    memories = await self.async_memory.get_memories_by_session(session_id)
+                    return self._to_json({
+                        "session_id": session_id,
+                        "memories": memories,
+                        "count": len(memories)
+                    })
+
+        return self._to_json({"error": f"Unknown resource: {uri}"})
+
+    async def notify_resource_changes(self) -> int:
+        """Send resources/updated for subscribed resources whose body changed.
+
+        Returns:
+            Number of notifications sent.
+        """
+        sent = 0
+        for uri, clients in list(self._subscriptions.items()):
+            body = await self._read_resource(uri)
+            if self._notified.get(uri) == body:
+                continue
+            first = uri not in self._notified
+            self._notified[uri] = body
+            if first:
+                # Baseline: the client read the resource when it subscribed
+                continue
+
+            for client in list(clients):
+                try:
+                    await client.send_resource_updated(AnyUrl(uri))
+                    sent += 1
+                except Exception as e:
+                    logger.debug("mcp_notification_failed", uri=uri, error=str(e))
+                    clients.discard(client)
+        return sent
+
+    async def _watch_resources(self) -> None:
+        """Check subscribed resources every WATCH_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(self.WATCH_INTERVAL)
+            if not self._subscriptions:
+                continue
+            try:
+                sent = await self.notify_resource_changes()
+                if sent:
+                    logger.debug("mcp_resources_updated", notifications=sent)
+            except Exception as e:
+                logger.warning("mcp_resource_watch_failed", error=str(e))
+
+    async def _list_resource_page(self, cursor: Optional[str]) -> ListResourcesResult:
+        """Build (or reuse) one page of the resource listing.
+
+        The first page starts with the global resources. Sessions are paged
+        by ID (keyset), so each page costs one index range scan.
+
+        Args:
+            cursor: Opaque cursor from a previous page, None for the first.
+
+        Returns:
+            ListResourcesResult with nextCursor set if more sessions follow.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        version = await self.async_db.get_change_counter("sessions")
+        if version != self._listing_version:
+            self._listing_pages.clear()
+            self._listing_version = version
+
+        cached = self._listing_pages.get(cursor)
+        if cached is not None:
+            self._listing_pages.move_to_end(cursor)
+            self.listing_stats["hits"] += 1
+            return cached
+        self.listing_stats["misses"] += 1
+
+        rows = await self.async_db.get_session_page(
+            self._decode_cursor(cursor), self.RESOURCE_PAGE_SIZE + 1
+        )
+        has_more = len(rows) > self.RESOURCE_PAGE_SIZE
+        rows = rows[:self.RESOURCE_PAGE_SIZE]
+
+        resources = []
+        if cursor is None:
+            resources = [
+                Resource(
+                    uri="session://list",
+                    name="All Sessions",
+                    description="List of all tracked sessions",
+                    mimeType="application/json"
+                ),
+                Resource(
+                    uri="session://active",
+                    name="Active Sessions",
+                    description="Currently active sessions",
+                    mimeType="application/json"
+                ),
+                Resource(
+                    uri="memory://stats",
+                    name="Memory Statistics",
+                    description="Cross-session memory statistics",
+                    mimeType="application/json"
+                ),
+            ]
+        resources.extend(
+            Resource(
+                uri=f"session://{row['id']}/info",
+                name=f"Session {row['id'][:8]} Info",
+                description=f"Detailed info for {row['type']} session",
+                mimeType="application/json"
             )
+            for row in rows
+        )
+
+        result = ListResourcesResult(
+            resources=resources,
+            nextCursor=self._encode_cursor(rows[-1]["id"]) if has_more else None
+        )
+        self._listing_pages[cursor] = result
+        if len(self._listing_pages) > self.RESOURCE_PAGE_CACHE_SIZE:
+            self._listing_pages.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _encode_cursor(after_id: str) -> str:
+        """Opaque cursor for the page after a session ID."""
+        return base64.urlsafe_b64encode(json.dumps({"after": after_id}).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[str]:
+        """Session ID a cursor continues after (None for the first page)."""
+        if cursor is None:
+            return None
+        try:
+            return json.loads(base64.urlsafe_b64decode(cursor.encode()))["after"]
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    @staticmethod
+    def _token_budget_argument() -> "PromptArgument":
+        """Optional prompt argument bounding injected memory context."""
+        return PromptArgument(
+            name="token_budget",
+            description=f"Max tokens of memory context (default: {MemoryManager.DEFAULT_CONTEXT_BUDGET})",
+            required=False
+        )
+
+    @staticmethod
+    def _parse_token_budget(arguments: Optional[Dict[str, str]]) -> int:
+        """Read the token_budget prompt argument, falling back to the default."""
+        try:
+            budget = int((arguments or {}).get("token_budget", 0))
+        except (TypeError, ValueError):
+            budget = 0
+        return budget if budget > 0 else MemoryManager.DEFAULT_CONTEXT_BUDGET
+
+    @staticmethod
+    def _format_search_result(index: int, memory: Dict[str, Any], content: str) -> str:
+        """Format one cross_session_search result block."""
+        session_id = memory.get('metadata', {}).get('session_id', 'unknown')[:8]
+        relevance = memory.get('relevance', 0.0) * 100
+        return (
+            f"\n## Result {index} (Relevance: {relevance:.0f}%)"
+            f"\nSession: {session_id}"
+            f"\n{content}\n"
+        )
 
     def _format_as_markdown(self, data: Dict[str, Any]) -> str:
         """Format export data as markdown."""
@@ -691,9 +981,18 @@ Found {len(memories)} relevant memories:
         """Run the MCP server."""
         logger.info("mcp_server_starting")
 
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        options = self.server.create_initialization_options()
+        # The SDK does not derive this from the registered subscribe handler
+        options.capabilities.resources.subscribe = True
+
+        watcher = asyncio.create_task(self._watch_resources())
+        if self.compact_every and self.memory_manager.is_available():
+            self.compactor.start_background(interval_seconds=self.compact_every * 60)
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, options)
+        finally:
+            watcher.cancel()
+            self.compactor.stop_background()
+            self.runner.shutdown()
+            self.memory_manager.close()
@@ -4,9 +4,8 @@ These servers provide deeper integration with specific AI tools by monitoring
 their file systems, git repositories, and process metrics in real-time.
 """
 
-import os
+import asyncio
 import json
-import subprocess
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import structlog
@@ -15,17 +14,30 @@ from datetime import datetime
 try:
     from mcp.server import Server
     from mcp.server.stdio import stdio_server
-    from mcp.types import Resource, Tool, TextContent, Prompt, PromptMessage, PromptArgument
+    from mcp.types import Resource, Tool, TextContent, Prompt, PromptMessage, PromptArgument, GetPromptResult
     MCP_AVAILABLE = True
 except ImportError:
     MCP_AVAILABLE = False
     Server = None
 
+from ..core.health_monitor import HealthMonitor
 from ..models.session import Session, SessionType
+from .metrics_sampler import MetricsSampler
+from ..utils.file_index import FileIndex
+from ..utils.git_status import GitStatusProvider
 from ..utils.token_estimator import TokenEstimator
 
 logger = structlog.get_logger()
 
+# (name, title, description) of the resources each session exposes
+SESSION_RESOURCES = [
+    ("realtime_metrics", "Real-time Metrics", "Current token usage, file count, activity"),
+    ("git_status", "Git Status", "Current git repository status"),
+    ("recent_changes", "Recent Changes", "Recent file modifications"),
+    ("file_tree", "File Tree", "Current project file structure"),
+    ("context_estimate", "Context Estimate", "Estimated context window usage"),
+]
+
 
 class SessionMCPServer:
     """Enhanced MCP server for a specific AI coding session.
@@ -38,11 +50,30 @@ class SessionMCPServer:
     - Session activity detection
     """
 
-    def __init__(self, session: Session):
+    TREE_MAX_DEPTH = 4
+    TREE_MAX_ENTRIES = 500
+    INDEX_POLL_INTERVAL = 30.0
+    METRICS_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        session: Session,
+        git: Optional[GitStatusProvider] = None,
+        token_estimator: Optional[TokenEstimator] = None,
+        files: Optional[FileIndex] = None,
+        health_monitor: Optional[HealthMonitor] = None
+    ):
         """Initialize session MCP server.
 
+        The optional components can be shared between servers (see
+        ``SessionGateway``); everything else is per session.
+
         Args:
             session: The session to monitor and expose.
+            git: Git status provider (optional).
+            token_estimator: Token estimator (optional).
+            files: File index of the session's working directory (optional).
+            health_monitor: Health scorer (optional).
         """
         if not MCP_AVAILABLE:
             raise RuntimeError(
@@ -50,8 +81,13 @@ class SessionMCPServer:
             )
 
         self.session = session
-        self.token_estimator = TokenEstimator()
+        self.token_estimator = token_estimator or TokenEstimator()
         self.working_dir = Path(session.working_directory)
+        self.git = git or GitStatusProvider()
+        self.files = files if files is not None else FileIndex(self.working_dir)
+        self.metrics = MetricsSampler(session, self.token_estimator, health_monitor,
+                                      interval=self.METRICS_INTERVAL)
+        self.files.add_listener(self.metrics.trigger)
 
         # Initialize server
         server_name = f"llm-session-{session.id[:8]}"
@@ -70,116 +106,20 @@ class SessionMCPServer:
         @self.server.list_resources()
         async def list_resources() -> List[Resource]:
             """List resources for this session."""
-            return [
-                Resource(
-                    uri=f"session://{self.session.id}/realtime_metrics",
-                    name="Real-time Metrics",
-                    description="Current token usage, file count, activity",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri=f"session://{self.session.id}/git_status",
-                    name="Git Status",
-                    description="Current git repository status",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri=f"session://{self.session.id}/recent_changes",
-                    name="Recent Changes",
-                    description="Recent file modifications",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri=f"session://{self.session.id}/file_tree",
-                    name="File Tree",
-                    description="Current project file structure",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri=f"session://{self.session.id}/context_estimate",
-                    name="Context Estimate",
-                    description="Estimated context window usage",
-                    mimeType="application/json"
-                ),
-            ]
+            return self.resources()
 
         @self.server.read_resource()
         async def read_resource(uri: str) -> str:
             """Read session-specific resource."""
             logger.info("session_mcp_resource_read", uri=uri, session=self.session.id)
-
-            if uri.endswith("/realtime_metrics"):
-                metrics = await self._get_realtime_metrics()
-                return json.dumps(metrics, indent=2)
-
-            elif uri.endswith("/git_status"):
-                git_status = await self._get_git_status()
-                return json.dumps(git_status, indent=2)
-
-            elif uri.endswith("/recent_changes"):
-                changes = await self._get_recent_changes()
-                return json.dumps(changes, indent=2)
-
-            elif uri.endswith("/file_tree"):
-                tree = await self._get_file_tree()
-                return json.dumps(tree, indent=2)
-
-            elif uri.endswith("/context_estimate"):
-                estimate = await self._estimate_context()
-                return json.dumps(estimate, indent=2)
-
-            return json.dumps({"error": f"Unknown resource: {uri}"})
+            return json.dumps(await self.read(str(uri).rsplit("/", 1)[-1]), indent=2)
 
         # ==================== TOOLS ====================
 
         @self.server.list_tools()
         async def list_tools() -> List[Tool]:
             """List tools available for this session."""
-            return [
-                Tool(
-                    name="analyze_session_health",
-                    description="Deep analysis of session health metrics",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                ),
-                Tool(
-                    name="get_file_content",
-                    description="Read content of a file in the session",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "Relative path to file"
-                            }
-                        },
-                        "required": ["file_path"]
-                    }
-                ),
-                Tool(
-                    name="analyze_git_commits",
-                    description="Analyze recent git commits in this session",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "number",
-                                "description": "Number of commits to analyze (default: 10)"
-                            }
-                        }
-                    }
-                ),
-                Tool(
-                    name="suggest_context_cleanup",
-                    description="Suggest files/context that could be removed",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                ),
-            ]
+            return self.tools()
 
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
@@ -190,82 +130,152 @@ class SessionMCPServer:
                        session=self.session.id)
 
             try:
-                if name == "analyze_session_health":
-                    analysis = await self._analyze_health()
-                    return [TextContent(
-                        type="text",
-                        text=json.dumps(analysis, indent=2)
-                    )]
-
-                elif name == "get_file_content":
-                    file_path = arguments.get("file_path")
-                    content = await self._read_file(file_path)
-                    return [TextContent(
-                        type="text",
-                        text=json.dumps({
-                            "file_path": file_path,
-                            "content": content,
-                            "size": len(content) if content else 0
-                        }, indent=2)
-                    )]
-
-                elif name == "analyze_git_commits":
-                    limit = arguments.get("limit", 10)
-                    commits = await self._analyze_commits(limit)
-                    return [TextContent(
-                        type="text",
-                        text=json.dumps(commits, indent=2)
-                    )]
-
-                elif name == "suggest_context_cleanup":
-                    suggestions = await self._suggest_cleanup()
-                    return [TextContent(
-                        type="text",
-                        text=json.dumps(suggestions, indent=2)
-                    )]
-
-                else:
-                    return [TextContent(
-                        type="text",
-                        text=json.dumps({"error": f"Unknown tool: {name}"})
-                    )]
-
+                result = await self.call(name, arguments)
             except Exception as e:
                 logger.error("session_mcp_tool_error",
                            tool=name,
                            error=str(e),
                            session=self.session.id)
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({"error": str(e)})
-                )]
+                result = {"error": str(e)}
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
         # ==================== PROMPTS ====================
 
         @self.server.list_prompts()
         async def list_prompts() -> List[Prompt]:
             """List prompts for this session."""
-            return [
-                Prompt(
-                    name="session_status_report",
-                    description="Comprehensive status report for this session",
-                    arguments=[]
-                ),
-                Prompt(
-                    name="what_am_i_working_on",
-                    description="Infer what task this session is focused on",
-                    arguments=[]
-                ),
-            ]
+            return self.prompts()
 
         @self.server.get_prompt()
-        async def get_prompt(name: str, arguments: Dict[str, str]) -> PromptMessage:
+        async def get_prompt(name: str, arguments: Dict[str, str]) -> GetPromptResult:
             """Get session-specific prompt."""
-            if name == "session_status_report":
-                metrics = await self._get_realtime_metrics()
-                git_status = await self._get_git_status()
+            return GetPromptResult(messages=[PromptMessage(
+                role="user",
+                content=TextContent(type="text", text=await self.prompt(name))
+            )])
+
+    # ==================== DISPATCH ====================
+
+    def resources(self) -> List[Resource]:
+        """Resources of this session (``session://{id}/{name}``)."""
+        return [
+            Resource(
+                uri=f"session://{self.session.id}/{name}",
+                name=title,
+                description=description,
+                mimeType="application/json"
+            )
+            for name, title, description in SESSION_RESOURCES
+        ]
 
-                content = f"""# Session Status Report
+    async def read(self, name: str) -> Dict[str, Any]:
+        """Read a resource of this session by name (e.g. "git_status")."""
+        if name == "realtime_metrics":
+            return await self._get_realtime_metrics()
+        elif name == "git_status":
+            return await self._get_git_status()
+        elif name == "recent_changes":
+            return await self._get_recent_changes()
+        elif name == "file_tree":
+            return await self._get_file_tree()
+        elif name == "context_estimate":
+            return await self._estimate_context()
+        return {"error": f"Unknown resource: session://{self.session.id}/{name}"}
+
+    @staticmethod
+    def tools() -> List[Tool]:
+        """Tools available for a session."""
+        return [
+            Tool(
+                name="analyze_session_health",
+                description="Deep analysis of session health metrics",
+                inputSchema={
+                    "type": "object",
+                    "properties": {}
+                }
+            ),
+            Tool(
+                name="get_file_content",
+                description="Read content of a file in the session",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "file_path": {
+                            "type": "string",
+                            "description": "Relative path to file"
+                        }
+                    },
+                    "required": ["file_path"]
+                }
+            ),
+            Tool(
+                name="analyze_git_commits",
+                description="Analyze recent git commits in this session",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "limit": {
+                            "type": "number",
+                            "description": "Number of commits to analyze (default: 10)"
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="suggest_context_cleanup",
+                description="Suggest files/context that could be removed",
+                inputSchema={
+                    "type": "object",
+                    "properties": {}
+                }
+            ),
+        ]
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a tool of this session and return its result."""
+        if name == "analyze_session_health":
+            return await self._analyze_health()
+
+        elif name == "get_file_content":
+            file_path = arguments.get("file_path")
+            content = await self._read_file(file_path)
+            return {
+                "file_path": file_path,
+                "content": content,
+                "size": len(content) if content else 0
+            }
+
+        elif name == "analyze_git_commits":
+            return await self._analyze_commits(arguments.get("limit", 10))
+
+        elif name == "suggest_context_cleanup":
+            return await self._suggest_cleanup()
+
+        return {"error": f"Unknown tool: {name}"}
+
+    @staticmethod
+    def prompts() -> List[Prompt]:
+        """Prompts for a session."""
+        return [
+            Prompt(
+                name="session_status_report",
+                description="Comprehensive status report for this session",
+                arguments=[]
+            ),
+            Prompt(
+                name="what_am_i_working_on",
+                description="Infer what task this session is focused on",
+                arguments=[]
+            ),
+        ]
+
+    async def prompt(self, name: str) -> str:
+        """Render a prompt of this session."""
+        if name == "session_status_report":
+            metrics = await self._get_realtime_metrics()
+            git_status = await self._get_git_status()
+
+            content = f"""# Session Status Report
 
 **Session ID**: {self.session.id}
 **Type**: {self.session.type.value}
@@ -293,169 +303,78 @@ class SessionMCPServer:
 - **Last Activity**: {self.session.last_activity.isoformat()}
 - **Duration**: {metrics.get('duration_hours', 0):.1f} hours
 """
-                return PromptMessage(
-                    role="user",
-                    content=TextContent(type="text", text=content)
-                )
+            return content
 
-            elif name == "what_am_i_working_on":
-                # Infer from git commits, file names, etc.
-                commits = await self._analyze_commits(5)
-                changes = await self._get_recent_changes()
+        elif name == "what_am_i_working_on":
+            # Infer from git commits, file names, etc.
+            commits = await self._analyze_commits(5)
+            changes = await self._get_recent_changes()
 
-                content = f"""# Session Focus Analysis
+            content = f"""# Session Focus Analysis
 
 Based on recent activity in this session:
 
 ## Recent Commits
 """
-                for commit in commits.get('commits', [])[:3]:
-                    content += f"\n- {commit.get('message', 'N/A')}"
-
-                content += "\n\n## Recently Modified Files\n"
-                for file in changes.get('recent_files', [])[:5]:
-                    content += f"\n- {file['path']}"
-
-                content += "\n\n## Project Tags\n"
-                if self.session.tags:
-                    for tag in self.session.tags:
-                        content += f"\n- {tag}"
-                else:
-                    content += "\nNo tags set."
-
-                if self.session.description:
-                    content += f"\n\n## Session Description\n\n{self.session.description}"
-
-                return PromptMessage(
-                    role="user",
-                    content=TextContent(type="text", text=content)
-                )
+            for commit in commits.get('commits', [])[:3]:
+                content += f"\n- {commit.get('message', 'N/A')}"
 
-            return PromptMessage(
-                role="user",
-                content=TextContent(type="text", text=f"Unknown prompt: {name}")
-            )
+            content += "\n\n## Recently Modified Files\n"
+            for file in changes.get('recent_files', [])[:5]:
+                content += f"\n- {file['path']}"
+
+            content += "\n\n## Project Tags\n"
+            if self.session.tags:
+                for tag in self.session.tags:
+                    content += f"\n- {tag}"
+            else:
+                content += "\nNo tags set."
+
+            if self.session.description:
+                content += f"\n\n## Session Description\n\n{self.session.description}"
+
+            return content
+
+        return f"Unknown prompt: {name}"
 
     # ==================== HELPER METHODS ====================
 
     async def _get_realtime_metrics(self) -> Dict[str, Any]:
-        """Get real-time session metrics."""
-        # Update token count
-        token_count = self.token_estimator.estimate_session_tokens(self.session)
-        self.session.token_count = token_count
+        """Get real-time session metrics (from the latest background sample)."""
+        sample = await self.metrics.latest()
 
         # Calculate duration
         duration = (datetime.now() - self.session.start_time).total_seconds() / 3600
 
         return {
             "session_id": self.session.id,
-            "token_count": token_count,
+            "token_count": sample.token_count,
             "token_limit": self.session.token_limit,
-            "token_usage_percent": self.session.calculate_token_usage_percent(),
+            "token_usage_percent": sample.token_usage_percent,
             "file_count": self.session.file_count,
-            "health_score": self.session.health_score,
+            "health_score": sample.health_score,
             "duration_hours": duration,
             "last_activity": self.session.last_activity.isoformat(),
+            "sampled_at": sample.sampled_at.isoformat(),
+            "sample_age_seconds": round(sample.age(), 1),
             "timestamp": datetime.now().isoformat()
         }
 
     async def _get_git_status(self) -> Dict[str, Any]:
-        """Get git repository status."""
-        if not self.working_dir.exists():
-            return {"error": "Working directory not found"}
-
-        try:
-            # Check if git repo
-            result = subprocess.run(
-                ["git", "rev-parse", "--git-dir"],
-                cwd=str(self.working_dir),
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode != 0:
-                return {"error": "Not a git repository"}
-
-            # Get branch
-            branch = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=str(self.working_dir),
-                capture_output=True,
-                text=True,
-                timeout=5
-            ).stdout.strip()
-
-            # Get status
-            status = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=str(self.working_dir),
-                capture_output=True,
-                text=True,
-                timeout=5
-            ).stdout
-
-            # Parse status
-            modified = []
-            untracked = []
-            staged = []
-
-            for line in status.split('\n'):
-                if not line:
-                    continue
-                status_code = line[:2]
-                file_path = line[3:]
-
-                if status_code[0] in ['M', 'A', 'D', 'R']:
-                    staged.append(file_path)
-                if status_code[1] == 'M':
-                    modified.append(file_path)
-                if status_code == '??':
-                    untracked.append(file_path)
-
-            return {
-                "branch": branch,
-                "modified": modified,
-                "untracked": untracked,
-                "staged": staged,
-                "is_clean": len(modified) == 0 and len(untracked) == 0 and len(staged) == 0
-            }
-
-        except Exception as e:
-            logger.error("git_status_error", error=str(e))
-            return {"error": str(e)}
+        """Get git repository status (cached until the index or HEAD changes)."""
+        return await self.git.status(self.working_dir)
 
     async def _get_recent_changes(self) -> Dict[str, Any]:
-        """Get recently modified files."""
+        """Get recently modified files (from the file index)."""
         if not self.working_dir.exists():
             return {"error": "Working directory not found"}
 
         try:
-            recent_files = []
-
-            # Walk directory and find recently modified files
-            for root, dirs, files in os.walk(self.working_dir):
-                # Skip common ignore patterns
-                dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', '.venv', '__pycache__', '.pytest_cache']]
-
-                for file in files:
-                    file_path = Path(root) / file
-                    try:
-                        stat = file_path.stat()
-                        recent_files.append({
-                            "path": str(file_path.relative_to(self.working_dir)),
-                            "modified_time": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                            "size": stat.st_size
-                        })
-                    except:
-                        continue
-
-            # Sort by modification time
-            recent_files.sort(key=lambda x: x['modified_time'], reverse=True)
-
+            await asyncio.to_thread(self.files.ensure_built)
             return {
-                "recent_files": recent_files[:20],  # Top 20 most recent
-                "total_files": len(recent_files)
+                "recent_files": self.files.recent(20),  # Top 20 most recent
+                "total_files": len(self.files),
+                "indexed_at": datetime.fromtimestamp(self.files.scanned_at).isoformat()
             }
 
         except Exception as e:
@@ -463,27 +382,17 @@ Based on recent activity in this session:
             return {"error": str(e)}
 
     async def _get_file_tree(self) -> Dict[str, Any]:
-        """Get project file structure."""
+        """Get project file structure (from the file index, depth and size limited)."""
         if not self.working_dir.exists():
             return {"error": "Working directory not found"}
 
         try:
-            tree = []
-
-            for root, dirs, files in os.walk(self.working_dir):
-                # Skip common ignore patterns
-                dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', '.venv', '__pycache__', '.pytest_cache']]
-
-                level = str(root).replace(str(self.working_dir), '').count(os.sep)
-                indent = ' ' * 2 * level
-                tree.append(f"{indent}{os.path.basename(root)}/")
-
-                subindent = ' ' * 2 * (level + 1)
-                for file in files:
-                    tree.append(f"{subindent}{file}")
-
+            await asyncio.to_thread(self.files.ensure_built)
+            tree, truncated = self.files.tree(self.TREE_MAX_DEPTH, self.TREE_MAX_ENTRIES)
             return {
-                "tree": tree[:500],  # Limit to first 500 lines
+                "tree": tree,
+                "truncated": truncated,
+                "max_depth": self.TREE_MAX_DEPTH,
                 "working_directory": str(self.working_dir)
             }
 
@@ -492,8 +401,9 @@ Based on recent activity in this session:
             return {"error": str(e)}
 
     async def _estimate_context(self) -> Dict[str, Any]:
-        """Estimate context window usage."""
-        token_count = self.token_estimator.estimate_session_tokens(self.session)
+        """Estimate context window usage (from the latest background sample)."""
+        sample = await self.metrics.latest()
+        token_count = sample.token_count
 
         return {
             "session_id": self.session.id,
@@ -502,6 +412,8 @@ Based on recent activity in this session:
             "usage_percent": (token_count / self.session.token_limit * 100) if self.session.token_limit > 0 else 0,
             "tokens_remaining": max(0, self.session.token_limit - token_count),
             "estimation_method": "file_based",
+            "sampled_at": sample.sampled_at.isoformat(),
+            "sample_age_seconds": round(sample.age(), 1),
             "note": "This is an estimate based on file sizes. Actual token usage may vary."
         }
 
@@ -524,7 +436,8 @@ Based on recent activity in this session:
 
         return {
             "session_id": self.session.id,
-            "overall_health": self.session.health_score,
+            "overall_health": metrics.get('health_score', self.session.health_score),
+            "sample_age_seconds": metrics.get('sample_age_seconds'),
             "factors": {
                 "token_health": token_health,
                 "activity_health": activity_health,
@@ -547,41 +460,8 @@ Based on recent activity in this session:
             return None
 
     async def _analyze_commits(self, limit: int = 10) -> Dict[str, Any]:
-        """Analyze recent git commits."""
-        try:
-            result = subprocess.run(
-                ["git", "log", f"-{limit}", "--pretty=format:%H|%an|%ae|%ad|%s"],
-                cwd=str(self.working_dir),
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode != 0:
-                return {"error": "Failed to get git log"}
-
-            commits = []
-            for line in result.stdout.split('\n'):
-                if not line:
-                    continue
-                parts = line.split('|')
-                if len(parts) >= 5:
-                    commits.append({
-                        "hash": parts[0],
-                        "author": parts[1],
-                        "email": parts[2],
-                        "date": parts[3],
-                        "message": parts[4]
-                    })
-
-            return {
-                "commits": commits,
-                "count": len(commits)
-            }
-
-        except Exception as e:
-            logger.error("analyze_commits_error", error=str(e))
-            return {"error": str(e)}
+        """Analyze recent git commits (cached until HEAD moves)."""
+        return await self.git.log(self.working_dir, limit)
 
     async def _suggest_cleanup(self) -> Dict[str, Any]:
         """Suggest context cleanup."""
@@ -633,9 +513,17 @@ Based on recent activity in this session:
         """Run the session MCP server."""
         logger.info("session_mcp_server_starting", session_id=self.session.id)
 
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        if self.working_dir.exists():
+            await asyncio.to_thread(self.files.start_watching, self.INDEX_POLL_INTERVAL)
+        sampler = asyncio.create_task(self.metrics.run())
+
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options()
+                )
+        finally:
+            sampler.cancel()
+            self.files.stop_watching()
@@ -1,5 +1,6 @@
 """Storage and database management."""
 
 from .database import Database
+from .async_database import AsyncDatabase
 
-__all__ = ["Database"]
+__all__ = ["Database", "AsyncDatabase"]
@@ -0,0 +1,64 @@
+"""Async facade over Database.
+
+SQLite queries run on a BlockingCallRunner instead of the event loop, and
+concurrent identical reads share one query.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .database import Database
+from ..models import Session
+from ..utils.async_runner import BlockingCallRunner
+
+
+class AsyncDatabase:
+    """Awaitable wrapper around a Database.
+
+    Example:
+        db = AsyncDatabase(Database("data/sessions.db"))
+        sessions = await db.get_all_sessions()
+    """
+
+    def __init__(self, db: Database, runner: Optional[BlockingCallRunner] = None):
+        """Initialize facade.
+
+        Args:
+            db: Wrapped synchronous database.
+            runner: Executor to run queries on (a private 4-thread one if None).
+        """
+        self.db = db
+        self.runner = runner or BlockingCallRunner(max_workers=4, name="database")
+
+    async def get_all_sessions(self) -> List[Session]:
+        """Get all sessions."""
+        return await self.runner.run(self.db.get_all_sessions, key=("get_all_sessions",))
+
+    async def get_active_sessions(self) -> List[Session]:
+        """Get active sessions."""
+        return await self.runner.run(self.db.get_active_sessions, key=("get_active_sessions",))
+
+    async def get_session(self, session_id: str) -> Optional[Session]:
+        """Get a session by ID."""
+        return await self.runner.run(self.db.get_session, session_id, key=("get_session", session_id))
+
+    async def get_session_history(self, session_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get history entries of a session."""
+        return await self.runner.run(
+            self.db.get_session_history, session_id, limit,
+            key=("get_session_history", session_id, limit)
+        )
+
+    async def get_change_counter(self, name: str = "sessions") -> int:
+        """Get the change counter of a table."""
+        return await self.runner.run(self.db.get_change_counter, name, key=("get_change_counter", name))
+
+    async def get_session_page(self, after_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get a page of session IDs and types in ID order."""
+        return await self.runner.run(
+            self.db.get_session_page, after_id, limit,
+            key=("get_session_page", after_id, limit)
+        )
+
+    async def update_session(self, session: Session) -> None:
+        """Update a session (never coalesced)."""
+        await self.runner.run(self.db.update_session, session)
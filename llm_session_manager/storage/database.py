@@ -128,6 +128,26 @@ class Database:
                 )
             """)
 
+            # Change counters, bumped by triggers so readers in any process
+            # can cheaply tell whether cached listings are still valid
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS change_counters (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO change_counters (name, version) VALUES ('sessions', 0)
+            """)
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS sessions_changed_{event.lower()}
+                    AFTER {event} ON sessions
+                    BEGIN
+                        UPDATE change_counters SET version = version + 1 WHERE name = 'sessions';
+                    END
+                """)
+
             # Create indexes for common queries
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_sessions_status
@@ -271,6 +291,47 @@ class Database:
             rows = cursor.fetchall()
             return [self._row_to_session(row) for row in rows]
 
+    def get_change_counter(self, name: str = "sessions") -> int:
+        """Get the change counter of a table.
+
+        The counter increases with every insert, update or delete, from any
+        process, so it can key caches derived from the table.
+
+        Args:
+            name: Counter name (table).
+
+        Returns:
+            Current counter value (0 if unknown).
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM change_counters WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return row["version"] if row else 0
+
+    def get_session_page(self, after_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get a page of session IDs and types in ID order.
+
+        Keyset pagination on the primary key: each page is one index range
+        scan, however many sessions exist.
+
+        Args:
+            after_id: Last ID of the previous page (None for the first page).
+            limit: Maximum rows to return.
+
+        Returns:
+            List of {id, type} dicts.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, type FROM sessions
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (after_id or "", limit))
+            return [dict(row) for row in cursor.fetchall()]
+
     def get_active_sessions(self) -> List[Session]:
         """Retrieve only active sessions.
 
@@ -356,6 +417,90 @@ class Database:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    def add_history_entries(self, entries: List[tuple]) -> None:
+        """Add history snapshots for many sessions in one transaction.
+
+        Args:
+            entries: (session_id, token_count, health_score, status, timestamp)
+                tuples, timestamps in ISO format.
+        """
+        if not entries:
+            return
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO session_history (
+                    session_id, token_count, health_score, status, timestamp
+                ) VALUES (?, ?, ?, ?, ?)
+            """, entries)
+            logger.debug("history_entries_added", count=len(entries))
+
+    def prune_history(self, session_ids: List[str], keep: int) -> int:
+        """Delete all but the latest history entries of each session.
+
+        Args:
+            session_ids: Sessions to prune.
+            keep: Entries kept per session.
+
+        Returns:
+            Number of entries deleted.
+        """
+        if not session_ids:
+            return 0
+        with self.get_connection() as conn:
+            cursor = conn.executemany("""
+                DELETE FROM session_history
+                WHERE session_id = ? AND timestamp < (
+                    SELECT timestamp FROM session_history
+                    WHERE session_id = ?
+                    ORDER BY timestamp DESC
+                    LIMIT 1 OFFSET ?
+                )
+            """, [(sid, sid, keep - 1) for sid in dict.fromkeys(session_ids)])
+            deleted = cursor.rowcount
+        if deleted:
+            logger.debug("history_pruned", sessions=len(session_ids), deleted=deleted)
+        return deleted
+
+    def get_recent_history(
+        self,
+        session_ids: List[str],
+        per_session: int = 30
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Retrieve the latest history entries of many sessions at once.
+
+        One windowed query per batch of IDs instead of one query per session.
+
+        Args:
+            session_ids: Sessions to query.
+            per_session: Maximum entries per session.
+
+        Returns:
+            Dict of session ID to history entries, ordered oldest first.
+        """
+        history: Dict[str, List[Dict[str, Any]]] = {}
+        session_ids = list(dict.fromkeys(session_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(session_ids), 500):
+                batch = session_ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(f"""
+                    SELECT session_id, token_count, health_score, status, timestamp
+                    FROM (
+                        SELECT *, ROW_NUMBER() OVER (
+                            PARTITION BY session_id ORDER BY timestamp DESC
+                        ) AS position
+                        FROM session_history
+                        WHERE session_id IN ({placeholders})
+                    )
+                    WHERE position <= ?
+                    ORDER BY session_id, timestamp
+                """, (*batch, per_session))
+                for row in cursor.fetchall():
+                    history.setdefault(row["session_id"], []).append(dict(row))
+        return history
+
     def add_memory(self, memory: Memory) -> None:
         """Store a memory for cross-session sharing.
 
@@ -478,7 +623,7 @@ class Database:
         source: str = "heuristic",
         context_tags: Optional[List[str]] = None,
         file_extensions: Optional[List[str]] = None
-    ) -> None:
+    ) -> int:
         """Record user feedback on tag suggestions for learning.
 
         Args:
@@ -488,6 +633,9 @@ class Database:
             source: Source of suggestion (heuristic, ai, hybrid).
             context_tags: Other tags present at time of suggestion.
             file_extensions: File extensions found in session.
+
+        Returns:
+            Row ID of the feedback record.
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -506,6 +654,27 @@ class Database:
             logger.debug("tag_feedback_recorded",
                         tag=suggested_tag,
                         accepted=accepted)
+            return cursor.lastrowid
+
+    def get_tag_feedback_since(self, last_id: int = 0) -> List[Dict[str, Any]]:
+        """Get tag feedback rows recorded after a given row ID.
+
+        Args:
+            last_id: Last row ID already seen (0 for all rows).
+
+        Returns:
+            List of feedback dicts in ID order.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, suggested_tag, accepted, source, file_extensions
+                FROM tag_feedback
+                WHERE id > ?
+                ORDER BY id
+            """, (last_id,))
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
 
     def get_tag_acceptance_rate(self, tag: str) -> float:
         """Get historical acceptance rate for a tag.
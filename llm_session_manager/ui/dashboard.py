@@ -1,10 +1,13 @@
 """Rich TUI dashboard for LLM session monitoring."""
 
 import sys
+import copy
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Optional, Callable
+from typing import Any, Dict, Iterable, List, Optional, Callable, Tuple
 import structlog
 
 from rich.console import Console
@@ -20,17 +23,61 @@ from ..models import Session
 from ..core.health_monitor import HealthMonitor
 from ..core.session_discovery import SessionDiscovery
 from ..utils.token_estimator import TokenEstimator
+from .session_trends import SessionTrend, SessionTrends
+from .session_view import SessionIndex, SessionView
 
 logger = structlog.get_logger()
 
+# Escape sequences of navigation keys (after the leading ESC)
+ESCAPE_KEYS = {
+    "[A": "up", "[B": "down", "[5~": "pageup", "[6~": "pagedown",
+    "[H": "home", "[F": "end", "[1~": "home", "[4~": "end",
+    "OA": "up", "OB": "down", "OH": "home", "OF": "end",
+}
+
+# Session table columns: (key, title, width, justify). One line per row.
+SESSION_COLUMNS = (
+    ("id", "ID", 20, "left"),
+    ("type", "Type", 11, "center"),
+    ("pid", "PID", 7, "right"),
+    ("status", "Status", 8, "center"),
+    ("duration", "Duration", 9, "right"),
+    ("tokens", "Tokens", 32, "right"),
+    ("velocity", "Velocity", 17, "right"),
+    ("eta", "Limit In", 8, "right"),
+    ("health", "Health", 18, "left"),
+)
+
+
+def reconcile_sessions(sessions: List[Session], previous: Iterable[Session]) -> None:
+    """Carry identity and last known values over from a previous discovery.
+
+    Discovery may report the same process under a new ID, so sessions are
+    matched by (pid, type): they keep the previous ID and, until
+    re-estimated, the previous token count and health score.
+
+    Args:
+        sessions: Freshly discovered sessions (updated in place).
+        previous: Sessions of the previous refresh.
+    """
+    known = {(s.pid, s.type): s for s in previous}
+    for session in sessions:
+        match = known.get((session.pid, session.type))
+        if match is not None:
+            session.id = match.id
+            session.token_count = match.token_count
+            session.health_score = match.health_score
+
 
 def get_key_non_blocking():
     """Get a single key press in a non-blocking way.
 
     Returns:
-        Key character or None if no key pressed.
+        Lowercase key character, a navigation key name ("up", "down",
+        "pageup", "pagedown", "home", "end") or None if no key pressed.
     """
     try:
+        import os
         import sys
         import select
         import tty
@@ -47,8 +94,11 @@ def get_key_non_blocking():
 
             # Check if data is available (non-blocking)
             if select.select([sys.stdin], [], [], 0)[0]:
-                key = sys.stdin.read(1)
-                return key.lower()
+                # Read the whole escape sequence of arrow/page keys at once
+                data = os.read(sys.stdin.fileno(), 8).decode("utf-8", errors="ignore")
+                if data.startswith("\x1b") and len(data) > 1:
+                    return ESCAPE_KEYS.get(data[1:])
+                return data[:1].lower() or None
             return None
         finally:
             # Restore terminal settings
@@ -58,19 +108,72 @@ def get_key_non_blocking():
         return None
 
 
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Immutable view of session data published by the refresh worker.
+
+    The sessions are copies owned by the snapshot; neither the worker nor
+    the UI mutates them after publication.
+
+    Attributes:
+        version: Increases with every publication.
+        sessions: Sessions as of this snapshot.
+        refreshed_at: When the refresh producing this snapshot started.
+        refreshing: Whether the refresh is still in progress.
+        pending: Sessions still waiting for token estimation.
+        timings: Seconds spent per stage (discovery, tokens, health, history).
+        error: Error message if the refresh failed.
+        trends: Sparklines and projections by session ID.
+    """
+
+    version: int
+    sessions: Tuple[Session, ...] = ()
+    refreshed_at: datetime = field(default_factory=datetime.now)
+    refreshing: bool = False
+    pending: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    trends: Dict[str, SessionTrend] = field(default_factory=dict)
+
+
 class Dashboard:
     """Rich TUI dashboard for monitoring LLM sessions.
 
     Provides a live-updating terminal interface showing session health,
     token usage, and activity metrics.
+
+    Data is refreshed by a background worker that publishes immutable
+    snapshots, so the UI loop never blocks on discovery or token
+    estimation. Token estimates are computed concurrently and published
+    progressively as they complete.
+
+    Rendering is cached: each published snapshot has a new version, the
+    header and the session index are rebuilt only when the version
+    changes, table cells are cached per session row, and the screen is
+    repainted only when the version, the view or a displayed duration
+    (one-second resolution) changes.
+
+    The session table is virtualized: sort orders and filter postings are
+    indexed once per snapshot, and only the rows that fit the terminal
+    are rendered. The window scrolls with the arrow and page keys.
+
+    Each row shows token-velocity and health sparklines and a projected
+    time to the token limit, computed from in-memory ring buffers that are
+    seeded from stored history once and appended on every refresh.
     """
 
+    # Minimum seconds between progressive snapshots during token estimation
+    PROGRESS_INTERVAL = 0.25
+
     def __init__(
         self,
         discovery: SessionDiscovery,
         health_monitor: HealthMonitor,
         token_estimator: TokenEstimator,
-        refresh_interval: int = 5
+        refresh_interval: int = 5,
+        token_workers: int = 8,
+        db: Optional[Any] = None,
+        history_size: int = 30
     ):
         """Initialize dashboard.
 
@@ -79,6 +182,9 @@ class Dashboard:
             health_monitor: HealthMonitor instance for health scoring.
             token_estimator: TokenEstimator instance for token counting.
             refresh_interval: Seconds between refreshes (default: 5).
+            token_workers: Sessions whose tokens are estimated concurrently.
+            db: Database to seed trends from and record history to (optional).
+            history_size: Samples kept per session for trends.
         """
         self.discovery = discovery
         self.health_monitor = health_monitor
@@ -87,15 +193,41 @@ class Dashboard:
         self.console = Console()
         self.sessions: List[Session] = []
         self.last_refresh: datetime = datetime.now()
+        self.token_workers = token_workers
+        self.db = db
+        self.trends = SessionTrends(capacity=history_size)
+        self._trends: Dict[str, SessionTrend] = {}
         self.running = False
         self._stop_event = threading.Event()
 
+        # Latest published snapshot (replaced atomically by the worker)
+        self.snapshot: Optional[DashboardSnapshot] = None
+        self._publish_lock = threading.Lock()
+        self._next_version = 0
+        self._refresh_requested = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        # Render caches, invalidated by the snapshot version
+        self._snapshot_version = 0
+        self._header_cache: Optional[Tuple[int, Panel]] = None
+        self._footer_cache: Optional[Tuple[Tuple[int, bool], Panel]] = None
+        self._index = SessionIndex(())
+        self.view = SessionView()
+        self._row_cache: Dict[str, Tuple[Tuple, Tuple[Any, ...]]] = {}
+        self._layout: Optional[Layout] = None
+        self._layout_key: Optional[Tuple] = None
+        self._painted: Optional[Layout] = None
+        self.render_stats = {"layouts": 0, "rows_built": 0, "rows_cached": 0, "repaints": 0}
+
     def create_header(self) -> Panel:
         """Create header panel with title and metadata.
 
         Returns:
             Rich Panel with header information.
         """
+        if self._header_cache and self._header_cache[0] == self._snapshot_version:
+            return self._header_cache[1]
+
         session_count = len(self.sessions)
         refresh_time = self.last_refresh.strftime("%Y-%m-%d %H:%M:%S")
 
@@ -111,83 +243,139 @@ class Dashboard:
         header_text.append(f"  •  Idle: {idle_count}", style="yellow")
         header_text.append(f"\nLast Refresh: {refresh_time}", style="dim white")
 
-        return Panel(
+        header = Panel(
             Align.center(header_text),
             border_style="cyan",
             padding=(1, 2)
         )
+        self._header_cache = (self._snapshot_version, header)
+        return header
+
+    def page_size(self) -> int:
+        """Number of table rows that fit below the header and above the footer."""
+        # Header 7 + footer 4 lines; table title, borders, header row and caption 6
+        return max(1, self.console.size.height - 7 - 4 - 6)
 
-    def create_session_table(self, sessions: List[Session]) -> Table:
-        """Create Rich table with session information.
+    def create_session_table(
+        self,
+        sessions: Optional[List[Session]] = None,
+        page_size: Optional[int] = None
+    ) -> Table:
+        """Create Rich table with the visible window of sessions.
 
         Args:
-            sessions: List of Session objects to display.
+            sessions: Sessions to display (default: the current snapshot,
+                whose index is reused).
+            page_size: Rows to render (default: what fits the terminal).
 
         Returns:
             Rich Table with formatted session data.
         """
+        if sessions is None or sessions is self.sessions:
+            index = self._index
+        else:
+            index = SessionIndex(sessions)
+        visible, first, total = self.view.window(index, page_size or self.page_size())
+
+        caption = f"Rows {first + 1 if total else 0}-{first + len(visible)} of {total}"
+        if total != len(index.sessions):
+            caption += f" (filtered from {len(index.sessions)})"
+        caption += f"  •  {self.view.describe()}"
+
         table = Table(
             title="Active Sessions",
             title_style="bold magenta",
+            caption=caption,
+            caption_style="dim white",
             show_header=True,
             header_style="bold cyan",
-            border_style="blue",
-            show_lines=True
+            border_style="blue"
         )
 
-        # Define columns
-        table.add_column("ID", style="dim", width=25)
-        table.add_column("Type", justify="center", width=12)
-        table.add_column("PID", justify="right", width=8)
-        table.add_column("Status", justify="center", width=10)
-        table.add_column("Duration", justify="right", width=12)
-        table.add_column("Tokens", justify="right", width=30)
-        table.add_column("Health", justify="center", width=20)
+        # Define columns (one line per row, so page_size() rows fit exactly)
+        for key, title, width, justify in SESSION_COLUMNS:
+            table.add_column(title, justify=justify, width=width, no_wrap=True,
+                             style="dim" if key == "id" else None)
 
-        # Sort sessions by health score (worst first)
-        sorted_sessions = sorted(sessions, key=lambda s: s.health_score)
+        now = datetime.now()
+        for session in visible:
+            table.add_row(*self.format_row(session, now))
 
-        for session in sorted_sessions:
-            # Format duration as HH:MM:SS
-            duration = datetime.now() - session.start_time
-            duration_str = self._format_duration(duration)
+        if not visible:
+            # Show empty state
+            message = "No sessions match the filter" if index.sessions else "No active sessions found"
+            table.add_row(
+                Text(message, style="dim italic"),
+                *[""] * (len(SESSION_COLUMNS) - 1)
+            )
 
-            # Format token usage with progress bar
-            token_percent = (session.token_count / session.token_limit * 100) if session.token_limit > 0 else 0
-            token_text = self._create_token_bar(session.token_count, session.token_limit, token_percent)
+        return table
 
-            # Format health with color and emoji
-            health_score = session.health_score / 100  # Convert back to 0-1 scale
-            health_text = self._create_health_text(health_score)
+    def view_sessions(self) -> List[Session]:
+        """All sessions of the current snapshot in view order (sorted and filtered)."""
+        return [self._index.sessions[i] for i in self.view.rows(self._index)]
 
-            # Format type
-            type_text = Text(session.type.value, style=self._get_type_style(session.type.value))
+    def format_row(self, session: Session, now: Optional[datetime] = None) -> Tuple[Any, ...]:
+        """All table cells of a session, in SESSION_COLUMNS order.
 
-            # Format status
-            status_text = Text(session.status.value, style=self._get_status_style(session.status.value))
+        Args:
+            session: Session to format.
+            now: Reference time for the duration (default: now).
 
-            # Format ID (truncate if too long)
-            session_id = session.id[:23] + ".." if len(session.id) > 25 else session.id
+        Returns:
+            Tuple of cells.
+        """
+        session_id, type_text, pid, status_text, token_text, velocity_text, eta_text, health_text = \
+            self._row_cells(session)
 
-            # Add row
-            table.add_row(
-                session_id,
-                type_text,
-                str(session.pid),
-                status_text,
-                duration_str,
-                token_text,
-                health_text
-            )
+        # Format duration as HH:MM:SS
+        duration_str = self._format_duration((now or datetime.now()) - session.start_time)
+        return (session_id, type_text, pid, status_text, duration_str,
+                token_text, velocity_text, eta_text, health_text)
 
-        if not sessions:
-            # Show empty state
-            table.add_row(
-                Text("No active sessions found", style="dim italic"),
-                "", "", "", "", "", ""
-            )
+    def _row_cells(self, session: Session) -> Tuple[Any, ...]:
+        """Table cells of a session except duration, cached while its values are unchanged.
 
-        return table
+        Args:
+            session: Session to format.
+
+        Returns:
+            Tuple of (id, type, pid, status, tokens, velocity, time to
+            limit, health) cells.
+        """
+        trend = self._trends.get(session.id, SessionTrend())
+        key = (
+            session.id, session.type, session.pid, session.status,
+            session.token_count, session.token_limit, session.health_score, trend,
+        )
+        cached = self._row_cache.get(session.id)
+        if cached and cached[0] == key:
+            self.render_stats["rows_cached"] += 1
+            return cached[1]
+
+        # Format token usage with progress bar
+        token_percent = (session.token_count / session.token_limit * 100) if session.token_limit > 0 else 0
+        token_text = self._create_token_bar(session.token_count, session.token_limit, token_percent)
+
+        # Format health with color and emoji
+        health_score = session.health_score / 100  # Convert back to 0-1 scale
+        health_text = self._create_health_text(health_score, trend.health_sparkline)
+        velocity_text, eta_text = self._create_trend_texts(trend)
+
+        # Format type
+        type_text = Text(session.type.value, style=self._get_type_style(session.type.value))
+
+        # Format status
+        status_text = Text(session.status.value, style=self._get_status_style(session.status.value))
+
+        # Format ID (truncate if too long)
+        session_id = session.id[:18] + ".." if len(session.id) > 20 else session.id
+
+        cells = (session_id, type_text, str(session.pid), status_text, token_text,
+                 velocity_text, eta_text, health_text)
+        self._row_cache[session.id] = (key, cells)
+        self.render_stats["rows_built"] += 1
+        return cells
 
     def create_footer(self) -> Panel:
         """Create footer panel with keyboard shortcuts.
@@ -195,6 +383,10 @@ class Dashboard:
         Returns:
             Rich Panel with footer information.
         """
+        stale = self._is_stale()
+        if self._footer_cache and self._footer_cache[0] == (self._snapshot_version, stale):
+            return self._footer_cache[1]
+
         footer_text = Text()
         footer_text.append("Keyboard Shortcuts: ", style="bold white")
         footer_text.append("[Q]", style="bold red")
@@ -204,13 +396,65 @@ class Dashboard:
         footer_text.append("[D]", style="bold blue")
         footer_text.append("etails  ", style="white")
         footer_text.append("[H]", style="bold yellow")
-        footer_text.append("elp", style="white")
-
-        return Panel(
+        footer_text.append("elp  ", style="white")
+        footer_text.append("↑↓ PgUp PgDn", style="bold cyan")
+        footer_text.append(" scroll  ", style="white")
+        footer_text.append("[S]", style="bold cyan")
+        footer_text.append("ort  ", style="white")
+        footer_text.append("[T/V/X/P]", style="bold cyan")
+        footer_text.append(" filter", style="white")
+        footer_text.append("\n")
+        footer_text.append_text(self.create_refresh_status(stale))
+
+        footer = Panel(
             Align.center(footer_text),
             border_style="dim white",
             padding=(0, 2)
         )
+        self._footer_cache = ((self._snapshot_version, stale), footer)
+        return footer
+
+    def create_refresh_status(self, stale: Optional[bool] = None) -> Text:
+        """Create the refresh indicator and per-stage timings line.
+
+        Args:
+            stale: Whether the data is older than two refresh intervals
+                (computed if None).
+
+        Returns:
+            Rich Text for the footer.
+        """
+        if stale is None:
+            stale = self._is_stale()
+        text = Text()
+        snapshot = self.snapshot
+        if snapshot is None:
+            text.append("⟳ Loading sessions...", style="bold yellow")
+            return text
+
+        if snapshot.refreshing:
+            done = len(snapshot.sessions) - snapshot.pending
+            text.append(f"⟳ Refreshing (tokens {done}/{len(snapshot.sessions)})", style="bold yellow")
+        elif snapshot.error:
+            text.append(f"✗ Refresh failed: {snapshot.error}", style="bold red")
+        elif stale:
+            text.append("● Stale", style="bold red")
+        else:
+            text.append("● Up to date", style="green")
+
+        timings = "  ".join(
+            f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in snapshot.timings.items()
+        )
+        if timings:
+            text.append(f"   {timings}", style="dim white")
+        return text
+
+    def _is_stale(self) -> bool:
+        """Whether the shown data is older than two refresh intervals."""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.refreshing:
+            return False
+        return datetime.now() - snapshot.refreshed_at > timedelta(seconds=2 * self.refresh_interval)
 
     def _format_duration(self, duration: timedelta) -> str:
         """Format timedelta as HH:MM:SS.
@@ -246,7 +490,7 @@ class Dashboard:
             color = "red"
 
         # Create visual bar
-        bar_length = 15
+        bar_length = 10
         filled = int((percent / 100) * bar_length)
         bar = "█" * filled + "░" * (bar_length - filled)
 
@@ -258,11 +502,12 @@ class Dashboard:
 
         return text
 
-    def _create_health_text(self, health_score: float) -> Text:
+    def _create_health_text(self, health_score: float, spark: str = "") -> Text:
         """Create health display with emoji and color.
 
         Args:
             health_score: Score between 0.0 and 1.0.
+            spark: Health sparkline; replaces the status word when present.
 
         Returns:
             Rich Text with health indicator.
@@ -274,10 +519,49 @@ class Dashboard:
         text = Text()
         text.append(f"{emoji} ", style=color)
         text.append(f"{health_score * 100:.0f}% ", style=f"bold {color}")
-        text.append(f"({status})", style=color)
+        if spark:
+            text.append(spark, style=color)
+        else:
+            text.append(f"({status})", style=color)
 
         return text
 
+    def _create_trend_texts(self, trend: SessionTrend) -> Tuple[Text, Text]:
+        """Create the token velocity and time-to-limit cells.
+
+        Args:
+            trend: Trend summary of the session.
+
+        Returns:
+            Tuple of (velocity, time to limit) Rich Texts.
+        """
+        velocity = Text()
+        if trend.token_sparkline:
+            velocity.append(trend.token_sparkline + " ", style="cyan")
+        if trend.tokens_per_minute is None:
+            velocity.append("-", style="dim white")
+        elif trend.tokens_per_minute >= 1_000_000:
+            velocity.append(f"{trend.tokens_per_minute / 1_000_000:.1f}M/m", style="white")
+        elif trend.tokens_per_minute >= 10_000:
+            velocity.append(f"{trend.tokens_per_minute / 1000:.0f}k/m", style="white")
+        elif trend.tokens_per_minute >= 1000:
+            velocity.append(f"{trend.tokens_per_minute / 1000:.1f}k/m", style="white")
+        else:
+            velocity.append(f"{trend.tokens_per_minute:.0f}/m", style="white")
+
+        eta = trend.time_to_limit
+        if eta is None:
+            return velocity, Text("-", style="dim white")
+
+        minutes = int(eta.total_seconds() // 60)
+        if minutes >= 24 * 60:
+            label, color = f"{minutes // (24 * 60)}d", "green"
+        elif minutes >= 60:
+            label, color = f"{minutes // 60}h{minutes % 60:02d}m", "green" if minutes >= 120 else "yellow"
+        else:
+            label, color = f"{minutes}m" if minutes else "<1m", "red"
+        return velocity, Text(label, style=color)
+
     def _get_type_style(self, session_type: str) -> str:
         """Get color style for session type.
 
@@ -312,39 +596,214 @@ class Dashboard:
         return styles.get(status, "white")
 
     def refresh_data(self) -> None:
-        """Refresh session data from discovery and update metrics."""
-        logger.debug("refreshing_dashboard_data")
+        """Refresh session data from discovery and update metrics.
 
-        # Discover active sessions
-        self.sessions = self.discovery.discover_sessions()
+        Runs synchronously in the calling thread; the live dashboard uses
+        the background worker instead.
+        """
+        self._collect_snapshot()
+        self.apply_snapshot()
+
+    def _publish(self, sessions: List[Session], started: datetime, **kwargs) -> DashboardSnapshot:
+        """Publish copies of the working sessions as a new snapshot."""
+        with self._publish_lock:
+            self._next_version += 1
+            snapshot = DashboardSnapshot(
+                version=self._next_version,
+                sessions=tuple(copy.copy(s) for s in sessions),
+                refreshed_at=started,
+                **kwargs
+            )
+            self.snapshot = snapshot
+        return snapshot
 
-        # Update token counts
-        self.token_estimator.update_token_counts(self.sessions)
+    def _collect_snapshot(self) -> DashboardSnapshot:
+        """Run discovery, token estimation and health scoring, publishing progress.
 
-        # Update health scores
-        self.health_monitor.update_health_scores(self.sessions)
+        Discovery IDs embed the discovery time, so sessions are matched to
+        the previous snapshot by (pid, type): they keep their first ID and,
+        until re-estimated, their previous token count and health score.
 
-        # Update refresh timestamp
-        self.last_refresh = datetime.now()
+        Returns:
+            Final snapshot of this refresh.
+        """
+        logger.debug("refreshing_dashboard_data")
+        started = datetime.now()
+        timings: Dict[str, float] = {}
+
+        stage_start = time.perf_counter()
+        sessions = self.discovery.discover_sessions()
+        timings["discovery"] = time.perf_counter() - stage_start
+
+        reconcile_sessions(sessions, self.snapshot.sessions if self.snapshot else ())
+
+        # Progressive snapshots keep the previous trends until this refresh records its samples
+        trends = self.snapshot.trends if self.snapshot else {}
+        self._publish(sessions, started, refreshing=True, pending=len(sessions),
+                      timings=dict(timings), trends=trends)
+
+        # Estimate tokens concurrently; score health as each estimate lands
+        stage_start = time.perf_counter()
+        health_seconds = 0.0
+        pending = len(sessions)
+        last_publish = time.monotonic()
+        if sessions:
+            with ThreadPoolExecutor(max_workers=min(self.token_workers, len(sessions)),
+                                    thread_name_prefix="dashboard-tokens") as pool:
+                futures = {pool.submit(self.token_estimator.estimate_session_tokens, s): s for s in sessions}
+                for future in as_completed(futures):
+                    session = futures[future]
+                    try:
+                        session.token_count = future.result()
+                    except Exception as e:
+                        logger.debug("token_estimation_failed", session_id=session.id, error=str(e))
+
+                    health_start = time.perf_counter()
+                    session.health_score = self.health_monitor.calculate_health(session) * 100
+                    health_seconds += time.perf_counter() - health_start
+                    pending -= 1
+
+                    if pending and time.monotonic() - last_publish >= self.PROGRESS_INTERVAL:
+                        self._publish(sessions, started, refreshing=True, pending=pending,
+                                      timings=dict(timings, tokens=time.perf_counter() - stage_start),
+                                      trends=trends)
+                        last_publish = time.monotonic()
+
+        timings["tokens"] = time.perf_counter() - stage_start - health_seconds
+        timings["health"] = health_seconds
+
+        stage_start = time.perf_counter()
+        trends = self.trends.update(sessions, self.db)
+        timings["history"] = time.perf_counter() - stage_start
+        snapshot = self._publish(sessions, started, timings=timings, trends=trends)
 
         logger.info(
             "dashboard_data_refreshed",
-            session_count=len(self.sessions)
+            session_count=len(sessions),
+            **{f"{stage}_ms": round(seconds * 1000, 1) for stage, seconds in timings.items()}
         )
+        return snapshot
+
+    def apply_snapshot(self) -> bool:
+        """Adopt the latest published snapshot in the UI thread.
+
+        Returns:
+            True if a newer snapshot was adopted.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version == self._snapshot_version:
+            return False
+
+        self.sessions = list(snapshot.sessions)
+        self.last_refresh = snapshot.refreshed_at
+        self._snapshot_version = snapshot.version
+        self._trends = snapshot.trends
+
+        # Index sort orders and filters once for this snapshot
+        self._index = SessionIndex(self.sessions)
+
+        # Drop cached rows of sessions that are gone
+        current_ids = {s.id for s in self.sessions}
+        for session_id in [sid for sid in self._row_cache if sid not in current_ids]:
+            del self._row_cache[session_id]
+        return True
+
+    def start_refresh_worker(self) -> None:
+        """Start the background thread that refreshes data every interval."""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._refresh_loop, name="dashboard-refresh", daemon=True)
+        self._worker.start()
+
+    def stop_refresh_worker(self, timeout: float = 5.0) -> None:
+        """Stop the background refresh thread."""
+        self._stop_event.set()
+        self._refresh_requested.set()
+        if self._worker:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+
+    def request_refresh(self) -> None:
+        """Ask the worker to refresh now instead of at the next interval."""
+        self._refresh_requested.set()
+
+    def _refresh_loop(self) -> None:
+        """Worker: refresh, then wait for the interval or a refresh request."""
+        while not self._stop_event.is_set():
+            started = datetime.now()
+            try:
+                self._collect_snapshot()
+            except Exception as e:
+                logger.error("dashboard_refresh_failed", error=str(e))
+                previous = self.snapshot or DashboardSnapshot(version=0)
+                self._publish(list(previous.sessions), started, error=str(e), trends=previous.trends)
+
+            self._refresh_requested.wait(self.refresh_interval)
+            self._refresh_requested.clear()
+
+    def _render_key(self) -> Tuple[int, int, bool, int, int]:
+        """What the rendered layout depends on: snapshot version, staleness,
+        view state, terminal height and, while durations are shown, the
+        current second."""
+        return (self._snapshot_version, int(time.time()) if self.sessions else 0, self._is_stale(),
+                self.view.revision, self.console.size.height)
+
+    def handle_view_key(self, key: str) -> bool:
+        """Apply a scrolling, sorting or filtering key to the session table.
+
+        Args:
+            key: Key returned by get_key_non_blocking().
+
+        Returns:
+            True if the key was a view key.
+        """
+        page = self.page_size()
+        filter_keys = {"t": "type", "v": "status", "x": "health", "p": "project"}
+
+        if key in ("down", "j"):
+            self.view.scroll(1)
+        elif key in ("up", "k"):
+            self.view.scroll(-1)
+        elif key in ("pagedown", " "):
+            self.view.scroll(page)
+        elif key in ("pageup", "b"):
+            self.view.scroll(-page)
+        elif key in ("home", "g"):
+            self.view.scroll_to(0)
+        elif key == "end":
+            self.view.scroll_to(len(self._index.sessions))
+        elif key == "s":
+            self.view.cycle_sort()
+        elif key == "o":
+            self.view.toggle_order()
+        elif key in filter_keys:
+            self.view.cycle_filter(filter_keys[key], self._index)
+        elif key == "c":
+            self.view.clear_filters()
+        else:
+            return False
+        return True
 
     def create_layout(self) -> Layout:
         """Create dashboard layout with header, table, and footer.
 
+        The previous layout is returned while its render key is unchanged.
+
         Returns:
             Rich Layout with all components.
         """
+        key = self._render_key()
+        if self._layout is not None and key == self._layout_key:
+            return self._layout
+
         layout = Layout()
 
         # Split into header, body, footer
         layout.split_column(
             Layout(name="header", size=7),
             Layout(name="body"),
-            Layout(name="footer", size=3)
+            Layout(name="footer", size=4)
         )
 
         # Populate sections
@@ -352,8 +811,27 @@ class Dashboard:
         layout["body"].update(self.create_session_table(self.sessions))
         layout["footer"].update(self.create_footer())
 
+        self._layout, self._layout_key = layout, key
+        self.render_stats["layouts"] += 1
         return layout
 
+    def repaint(self, live: Live) -> bool:
+        """Repaint the live display if the layout changed.
+
+        Args:
+            live: Live display (created with auto_refresh=False).
+
+        Returns:
+            True if the screen was repainted.
+        """
+        layout = self.create_layout()
+        if layout is self._painted:
+            return False
+        live.update(layout, refresh=True)
+        self._painted = layout
+        self.render_stats["repaints"] += 1
+        return True
+
     def run_dashboard(self, callback: Optional[Callable] = None) -> None:
         """Run the dashboard with live updates and keyboard input.
 
@@ -361,6 +839,9 @@ class Dashboard:
         - 'q' or Ctrl+C: Quit dashboard
         - 'r': Force refresh
         - 'h': Show help
+        - Arrows/j/k, PgUp/PgDn, Home/End: Scroll the session table
+        - 's' / 'o': Cycle sort key / reverse order
+        - 't', 'v', 'x', 'p' / 'c': Filter by type, status, health, project / clear
 
         Args:
             callback: Optional callback function for handling user input.
@@ -373,19 +854,20 @@ class Dashboard:
         # Show initial message
         self.console.print("\n[cyan]Starting LLM Session Manager Dashboard...[/cyan]")
         self.console.print("[dim]Press 'q' to quit, 'r' to refresh, 'h' for help[/dim]\n")
-        time.sleep(1)
 
         try:
-            # Initial data refresh
-            self.refresh_data()
+            # Data arrives from the worker; the UI starts immediately
+            self.start_refresh_worker()
 
+            # Repaints are driven by repaint(), only when something changed
+            layout = self.create_layout()
             with Live(
-                self.create_layout(),
+                layout,
                 console=self.console,
-                refresh_per_second=2,
+                auto_refresh=False,
                 screen=False
             ) as live:
-                next_refresh = time.time() + self.refresh_interval
+                self._painted = layout
 
                 while self.running and not self._stop_event.is_set():
                     # Check for keyboard input (non-blocking)
@@ -399,12 +881,9 @@ class Dashboard:
                             self.console.print("\n[yellow]Exiting dashboard...[/yellow]\n")
                             break
                         elif key == 'r':
-                            # Force refresh
+                            # Force refresh (the footer shows progress)
                             logger.info("manual_refresh_requested")
-                            self.console.print("\n[green]Refreshing data...[/green]")
-                            self.refresh_data()
-                            next_refresh = time.time() + self.refresh_interval
-                            time.sleep(0.5)  # Brief pause to show message
+                            self.request_refresh()
                         elif key == 'h':
                             # Show help
                             logger.info("help_requested")
@@ -413,16 +892,13 @@ class Dashboard:
                             self.console.print("\n[dim]Press Enter to continue...[/dim]")
                             input()
                             live.start()
-                            live.update(self.create_layout())
-
-                    # Update display
-                    live.update(self.create_layout())
+                            self._painted = None
+                        elif self.handle_view_key(key):
+                            logger.debug("view_changed", view=self.view.describe())
 
-                    # Check if it's time for automatic refresh
-                    current_time = time.time()
-                    if current_time >= next_refresh:
-                        self.refresh_data()
-                        next_refresh = current_time + self.refresh_interval
+                    # Adopt the latest snapshot and update display
+                    self.apply_snapshot()
+                    self.repaint(live)
 
                     # Small sleep to prevent CPU spinning
                     time.sleep(0.1)
@@ -435,6 +911,7 @@ class Dashboard:
             self.console.print(f"\n[red]Error: {e}[/red]\n")
         finally:
             self.running = False
+            self.stop_refresh_worker()
             logger.info("dashboard_stopped")
             self.console.print("[green]Dashboard stopped successfully[/green]\n")
 
@@ -484,6 +961,19 @@ class Dashboard:
         help_text.append("Show session details\n", style="dim white")
         help_text.append("  H           - ", style="white")
         help_text.append("Show this help\n\n", style="dim white")
+        help_text.append("Session Table:\n", style="bold white")
+        help_text.append("  ↑ ↓ / J K   - ", style="white")
+        help_text.append("Scroll one row\n", style="dim white")
+        help_text.append("  PgUp PgDn   - ", style="white")
+        help_text.append("Scroll one page (also B / Space)\n", style="dim white")
+        help_text.append("  Home End    - ", style="white")
+        help_text.append("Jump to first / last row (also G)\n", style="dim white")
+        help_text.append("  S / O       - ", style="white")
+        help_text.append("Cycle sort key / reverse order\n", style="dim white")
+        help_text.append("  T V X P     - ", style="white")
+        help_text.append("Cycle filter by type, status, health, project\n", style="dim white")
+        help_text.append("  C           - ", style="white")
+        help_text.append("Clear filters\n\n", style="dim white")
         help_text.append("Health Indicators:\n", style="bold white")
         help_text.append("  ✅ Green   - ", style="green")
         help_text.append("Healthy (>= 70%)\n", style="dim white")
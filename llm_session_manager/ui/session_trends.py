@@ -0,0 +1,266 @@
+"""Per-session token and health trends for the dashboard.
+
+Each session keeps a fixed-size ring buffer of (time, tokens, health)
+samples. Buffers are seeded from stored history with one batched query
+and appended on every refresh, so rendering sparklines and projections
+never touches the database. Stored history is coarser: a session gets a
+new row only when its values changed, at most once per persist interval,
+and only its latest rows are kept.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+
+from ..models import Session
+
+logger = structlog.get_logger()
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values: Sequence[float], minimum: Optional[float] = None, maximum: Optional[float] = None) -> str:
+    """Render values as a string of block characters.
+
+    Args:
+        values: Values, oldest first.
+        minimum: Value of the lowest block (default: min of values).
+        maximum: Value of the highest block (default: max of values).
+
+    Returns:
+        One character per value.
+    """
+    if not values:
+        return ""
+    low = min(values) if minimum is None else minimum
+    high = max(values) if maximum is None else maximum
+    if high <= low:
+        return SPARK_CHARS[0] * len(values)
+    top = len(SPARK_CHARS) - 1
+    return "".join(
+        SPARK_CHARS[max(0, min(top, int((v - low) / (high - low) * top + 0.5)))]
+        for v in values
+    )
+
+
+@dataclass(frozen=True)
+class SessionTrend:
+    """Trend summary of one session, computed when a refresh completes.
+
+    Attributes:
+        token_sparkline: Token velocity per refresh interval.
+        health_sparkline: Health score (0-100 scale) per sample.
+        tokens_per_minute: Recent token velocity, None without enough samples.
+        time_to_limit: Projected time until the token limit, None if not growing.
+    """
+
+    token_sparkline: str = ""
+    health_sparkline: str = ""
+    tokens_per_minute: Optional[float] = None
+    time_to_limit: Optional[timedelta] = None
+
+
+class SessionTrends:
+    """Ring buffers of recent samples, keyed by session ID.
+
+    Example:
+        trends = SessionTrends(capacity=30)
+        trends.seed(db.get_recent_history(ids, per_session=30))
+        entries = trends.record(sessions)
+        trend = trends.summary(session)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 30,
+        velocity_window: int = 6,
+        spark_width: int = 8,
+        persist_interval: float = 30,
+        history_limit: int = 500,
+    ):
+        """Initialize empty buffers.
+
+        Args:
+            capacity: Samples kept per session.
+            velocity_window: Most recent samples used for the velocity estimate.
+            spark_width: Characters per sparkline.
+            persist_interval: Minimum seconds between stored history rows of a session.
+            history_limit: Stored history rows kept per session.
+        """
+        self.capacity = capacity
+        self.velocity_window = velocity_window
+        self.spark_width = spark_width
+        self.persist_interval = persist_interval
+        self.history_limit = history_limit
+        self._buffers: Dict[str, Deque[Tuple[float, int, float]]] = {}
+        # Last stored history row per session: (epoch seconds, tokens, health, status)
+        self._persisted: Dict[str, Tuple[float, int, float, str]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._buffers
+
+    def seed(self, history: Dict[str, List[Dict]]) -> int:
+        """Fill buffers from stored history rows (oldest first per session).
+
+        Args:
+            history: Session ID -> rows with token_count, health_score, timestamp.
+
+        Returns:
+            Number of samples loaded.
+        """
+        loaded = 0
+        with self._lock:
+            for session_id, rows in history.items():
+                buffer = self._buffers.setdefault(session_id, deque(maxlen=self.capacity))
+                for row in rows:
+                    timestamp = datetime.fromisoformat(row["timestamp"]).timestamp()
+                    buffer.append((timestamp, row["token_count"], row["health_score"]))
+                    loaded += 1
+                if rows:
+                    last = rows[-1]
+                    self._persisted[session_id] = (
+                        datetime.fromisoformat(last["timestamp"]).timestamp(),
+                        last["token_count"], last["health_score"], last["status"],
+                    )
+        return loaded
+
+    def record(self, sessions: Iterable[Session], now: Optional[datetime] = None) -> List[Tuple]:
+        """Append the current values of each session.
+
+        Args:
+            sessions: Sessions after a refresh.
+            now: Sample time (default: now).
+
+        Returns:
+            (session_id, token_count, health_score, status, timestamp) rows
+            for persisting as history.
+        """
+        now = now or datetime.now()
+        timestamp = now.timestamp()
+        entries = []
+        with self._lock:
+            for session in sessions:
+                buffer = self._buffers.setdefault(session.id, deque(maxlen=self.capacity))
+                buffer.append((timestamp, session.token_count, session.health_score))
+                entries.append((session.id, session.token_count, session.health_score,
+                                session.status.value, now.isoformat()))
+        return entries
+
+    def prune(self, session_ids: Iterable[str]) -> None:
+        """Drop buffers of sessions not in ``session_ids``."""
+        keep = set(session_ids)
+        with self._lock:
+            for session_id in [sid for sid in self._buffers if sid not in keep]:
+                del self._buffers[session_id]
+                self._persisted.pop(session_id, None)
+
+    def due_for_history(self, entries: List[Tuple]) -> List[Tuple]:
+        """Keep the entries worth storing and mark them as stored.
+
+        An entry is stored if its values differ from the session's last
+        stored row and at least ``persist_interval`` seconds have passed.
+
+        Args:
+            entries: Rows returned by record().
+
+        Returns:
+            The subset of ``entries`` to persist.
+        """
+        due = []
+        with self._lock:
+            for entry in entries:
+                session_id, tokens, health, status, timestamp = entry
+                at = datetime.fromisoformat(timestamp).timestamp()
+                last = self._persisted.get(session_id)
+                if last and (last[1:] == (tokens, health, status) or at - last[0] < self.persist_interval):
+                    continue
+                self._persisted[session_id] = (at, tokens, health, status)
+                due.append(entry)
+        return due
+
+    def samples(self, session_id: str) -> List[Tuple[float, int, float]]:
+        """(epoch seconds, tokens, health) samples of a session, oldest first."""
+        with self._lock:
+            return list(self._buffers.get(session_id, ()))
+
+    def update(self, sessions: List[Session], db: Optional[Any] = None) -> Dict[str, SessionTrend]:
+        """Record a sample per session and summarize each session's trend.
+
+        Buffers of sessions seen for the first time are seeded from stored
+        history with one batched query; samples due for history are written
+        back in one transaction and older rows of those sessions beyond
+        ``history_limit`` are deleted. Database errors are logged, not raised.
+
+        Args:
+            sessions: Sessions with final token counts and health scores.
+            db: Database with session_history (optional).
+
+        Returns:
+            Dict of session ID to SessionTrend.
+        """
+        unseen = [s.id for s in sessions if s.id not in self]
+        if db is not None and unseen:
+            try:
+                loaded = self.seed(db.get_recent_history(unseen, self.capacity))
+                logger.debug("trends_seeded", sessions=len(unseen), samples=loaded)
+            except Exception as e:
+                logger.warning("trends_seed_failed", error=str(e))
+
+        entries = self.record(sessions)
+        self.prune(s.id for s in sessions)
+
+        due = self.due_for_history(entries)
+        if db is not None and due:
+            try:
+                db.add_history_entries(due)
+                db.prune_history([entry[0] for entry in due], self.history_limit)
+            except Exception as e:
+                logger.warning("history_save_failed", error=str(e))
+
+        return {s.id: self.summary(s) for s in sessions}
+
+    def summary(self, session: Session) -> SessionTrend:
+        """Sparklines, velocity and time-to-limit projection of a session.
+
+        Args:
+            session: Session (its token limit bounds the projection).
+
+        Returns:
+            SessionTrend (empty without samples).
+        """
+        samples = self.samples(session.id)
+        if not samples:
+            return SessionTrend()
+
+        # Tokens per minute over each interval; a drop (new conversation) counts as 0
+        rates = []
+        for (t0, tokens0, _), (t1, tokens1, _) in zip(samples, samples[1:]):
+            minutes = (t1 - t0) / 60
+            rates.append(max(0.0, (tokens1 - tokens0) / minutes) if minutes > 0 else 0.0)
+
+        # Velocity over the recent window, since the last token drop
+        recent = samples[-self.velocity_window:]
+        for i in range(len(recent) - 1, 0, -1):
+            if recent[i][1] < recent[i - 1][1]:
+                recent = recent[i:]
+                break
+        velocity = None
+        if len(recent) >= 2 and recent[-1][0] > recent[0][0]:
+            velocity = (recent[-1][1] - recent[0][1]) / ((recent[-1][0] - recent[0][0]) / 60)
+
+        time_to_limit = None
+        if velocity and velocity > 0 and session.token_limit > 0:
+            remaining = max(0, session.token_limit - samples[-1][1])
+            time_to_limit = timedelta(minutes=remaining / velocity)
+
+        return SessionTrend(
+            token_sparkline=sparkline(rates[-self.spark_width:], minimum=0),
+            health_sparkline=sparkline([h for _, _, h in samples[-self.spark_width:]], 0, 100),
+            tokens_per_minute=velocity,
+            time_to_limit=time_to_limit,
+        )
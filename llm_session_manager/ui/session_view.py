@@ -0,0 +1,205 @@
+"""Indexed, virtualized view over a dashboard snapshot.
+
+A ``SessionIndex`` is built once per published snapshot: per-dimension
+postings (type, status, health band, project) for filtering and lazily
+computed sort orders. A ``SessionView`` holds the user's sort, filters and
+scroll position and asks the index for the visible window only, so a
+frame never sorts or scans the full session list.
+"""
+
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from ..models import Session
+
+# Health bands, matching the dashboard help (>= 70 healthy, 40-70 warning)
+HEALTH_BANDS = ("critical", "warning", "healthy")
+
+
+def health_band(session: Session) -> str:
+    """Health band of a session's 0-100 health score."""
+    if session.health_score >= 70:
+        return "healthy"
+    if session.health_score >= 40:
+        return "warning"
+    return "critical"
+
+
+FILTER_DIMENSIONS: Dict[str, Callable[[Session], str]] = {
+    "type": lambda s: s.type.value,
+    "status": lambda s: s.status.value,
+    "health": health_band,
+    "project": lambda s: s.project_name or "-",
+}
+
+SORT_KEYS: Dict[str, Callable[[Session], object]] = {
+    "health": lambda s: s.health_score,
+    "tokens": lambda s: s.token_count,
+    "duration": lambda s: -s.start_time.timestamp(),
+    "type": lambda s: s.type.value,
+    "status": lambda s: s.status.value,
+    "project": lambda s: s.project_name or "",
+}
+
+
+class SessionIndex:
+    """Filter postings and sort orders for one immutable snapshot.
+
+    Example:
+        index = SessionIndex(snapshot.sessions)
+        rows = index.query("tokens", descending=True, filters={"status": "active"})
+        visible = [index.sessions[i] for i in rows[0:20]]
+    """
+
+    def __init__(self, sessions: Sequence[Session]):
+        """Build postings for every filter dimension.
+
+        Args:
+            sessions: Sessions of the snapshot (not modified).
+        """
+        self.sessions: Tuple[Session, ...] = tuple(sessions)
+        self.postings: Dict[str, Dict[str, FrozenSet[int]]] = {}
+        for dimension, value_of in FILTER_DIMENSIONS.items():
+            groups: Dict[str, set] = {}
+            for position, session in enumerate(self.sessions):
+                groups.setdefault(value_of(session), set()).add(position)
+            self.postings[dimension] = {value: frozenset(p) for value, p in groups.items()}
+
+        self._orders: Dict[str, List[int]] = {}
+        self._queries: Dict[Tuple, List[int]] = {}
+
+    def values(self, dimension: str) -> List[str]:
+        """Filter values present for a dimension, sorted."""
+        values = list(self.postings[dimension])
+        if dimension == "health":
+            return [band for band in HEALTH_BANDS if band in self.postings[dimension]]
+        return sorted(values)
+
+    def order(self, sort_key: str) -> List[int]:
+        """Positions sorted ascending by a key (computed once per index)."""
+        if sort_key not in self._orders:
+            key = SORT_KEYS[sort_key]
+            self._orders[sort_key] = sorted(range(len(self.sessions)), key=lambda i: key(self.sessions[i]))
+        return self._orders[sort_key]
+
+    def query(
+        self,
+        sort_key: str = "health",
+        descending: bool = False,
+        filters: Optional[Dict[str, str]] = None
+    ) -> List[int]:
+        """Positions matching all filters, in sort order (cached per query).
+
+        Args:
+            sort_key: One of SORT_KEYS.
+            descending: Reverse the sort order.
+            filters: Dimension -> required value.
+
+        Returns:
+            List of positions into ``sessions``.
+        """
+        filters = {d: v for d, v in (filters or {}).items() if v is not None}
+        cache_key = (sort_key, descending, tuple(sorted(filters.items())))
+        if cache_key in self._queries:
+            return self._queries[cache_key]
+
+        order = self.order(sort_key)
+        if descending:
+            order = order[::-1]
+
+        if filters:
+            allowed = None
+            for dimension, value in filters.items():
+                matches = self.postings[dimension].get(value, frozenset())
+                allowed = matches if allowed is None else allowed & matches
+            # Walk the smaller side: the matches when few, the order when many
+            if len(allowed) * 4 < len(order):
+                rank = {position: r for r, position in enumerate(order)} if len(allowed) else {}
+                result = sorted(allowed, key=rank.__getitem__)
+            else:
+                result = [i for i in order if i in allowed]
+        else:
+            result = order
+
+        self._queries[cache_key] = result
+        return result
+
+
+class SessionView:
+    """Sort, filter and scroll state of the session table.
+
+    ``revision`` changes whenever the visible result may change, so
+    renderers can cache on it.
+    """
+
+    def __init__(self):
+        """Initialize with the default view: all sessions, worst health first."""
+        self.sort_key = "health"
+        self.descending = False
+        self.filters: Dict[str, Optional[str]] = {d: None for d in FILTER_DIMENSIONS}
+        self.offset = 0
+        self.revision = 0
+
+    def rows(self, index: SessionIndex) -> List[int]:
+        """Positions of the sessions in view, in display order."""
+        return index.query(self.sort_key, self.descending, self.filters)
+
+    def window(self, index: SessionIndex, page_size: int) -> Tuple[List[Session], int, int]:
+        """Sessions visible in a page of the table.
+
+        Args:
+            index: Index of the current snapshot.
+            page_size: Rows that fit on screen.
+
+        Returns:
+            Tuple of (visible sessions, first row number, total rows in view).
+        """
+        rows = self.rows(index)
+        self.offset = max(0, min(self.offset, len(rows) - page_size))
+        visible = [index.sessions[i] for i in rows[self.offset:self.offset + page_size]]
+        return visible, self.offset, len(rows)
+
+    def scroll(self, delta: int) -> None:
+        """Move the window by ``delta`` rows (clamped when rendered)."""
+        self.offset = max(0, self.offset + delta)
+        self.revision += 1
+
+    def scroll_to(self, offset: int) -> None:
+        """Jump to a row (a large number jumps to the end)."""
+        self.offset = max(0, offset)
+        self.revision += 1
+
+    def cycle_sort(self) -> None:
+        """Switch to the next sort key."""
+        keys = list(SORT_KEYS)
+        self.sort_key = keys[(keys.index(self.sort_key) + 1) % len(keys)]
+        self.offset = 0
+        self.revision += 1
+
+    def toggle_order(self) -> None:
+        """Reverse the sort order."""
+        self.descending = not self.descending
+        self.offset = 0
+        self.revision += 1
+
+    def cycle_filter(self, dimension: str, index: SessionIndex) -> None:
+        """Cycle a filter through 'all' and the values present in the snapshot."""
+        choices: List[Optional[str]] = [None] + index.values(dimension)
+        current = self.filters[dimension]
+        position = choices.index(current) if current in choices else 0
+        self.filters[dimension] = choices[(position + 1) % len(choices)]
+        self.offset = 0
+        self.revision += 1
+
+    def clear_filters(self) -> None:
+        """Show all sessions."""
+        self.filters = {d: None for d in FILTER_DIMENSIONS}
+        self.offset = 0
+        self.revision += 1
+
+    def describe(self) -> str:
+        """Short description of sort and active filters."""
+        arrow = "↓" if self.descending else "↑"
+        parts = [f"sort: {self.sort_key} {arrow}"]
+        active = [f"{d}={v}" for d, v in self.filters.items() if v is not None]
+        parts.append("filter: " + (", ".join(active) if active else "none"))
+        return "  •  ".join(parts)
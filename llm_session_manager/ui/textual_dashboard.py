@@ -0,0 +1,258 @@
+"""Textual dashboard for LLM session monitoring.
+
+An asyncio alternative to the Rich ``Live`` loop of ``Dashboard``: the
+refresh runs as an async worker (discovery and token estimation in
+threads, estimates in parallel), and each published snapshot arrives as a
+``SessionsChanged`` message naming the sessions that changed, so only
+their table cells are redrawn. Between refreshes the app sleeps on the
+event loop instead of polling the keyboard; durations advance with each
+refresh rather than on a per-second repaint of the table.
+
+Data handling and formatting are shared with ``Dashboard``: snapshots,
+session identity, trends, the view (sort and filters) and cell rendering.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import structlog
+from textual import work
+from textual.app import App, ComposeResult
+from textual.message import Message
+from textual.widgets import DataTable, Footer, Static
+
+from ..models import Session
+from ..core.health_monitor import HealthMonitor
+from ..core.session_discovery import SessionDiscovery
+from ..utils.token_estimator import TokenEstimator
+from .dashboard import SESSION_COLUMNS, Dashboard, reconcile_sessions
+
+logger = structlog.get_logger()
+
+
+class SessionsChanged(Message):
+    """A snapshot was published.
+
+    Attributes:
+        changed: IDs of sessions whose values changed, or None if all may have.
+    """
+
+    def __init__(self, changed: Optional[FrozenSet[str]] = None) -> None:
+        super().__init__()
+        self.changed = changed
+
+
+class DashboardApp(App):
+    """Textual app showing the session table, refresh status and key bindings.
+
+    Example:
+        app = DashboardApp(discovery, health_monitor, token_estimator, db=db)
+        app.run()
+    """
+
+    TITLE = "LLM Session Manager"
+
+    CSS = """
+    #summary {
+        height: 7;
+    }
+    #sessions {
+        height: 1fr;
+    }
+    #status {
+        height: 1;
+        padding: 0 2;
+    }
+    """
+
+    BINDINGS = [
+        ("q", "quit", "Quit"),
+        ("r", "refresh", "Refresh"),
+        ("s", "view('s')", "Sort"),
+        ("o", "view('o')", "Order"),
+        ("t", "view('t')", "Type"),
+        ("v", "view('v')", "Status"),
+        ("x", "view('x')", "Health"),
+        ("p", "view('p')", "Project"),
+        ("c", "view('c')", "Clear"),
+    ]
+
+    def __init__(
+        self,
+        discovery: SessionDiscovery,
+        health_monitor: HealthMonitor,
+        token_estimator: TokenEstimator,
+        refresh_interval: int = 5,
+        token_workers: int = 8,
+        db=None
+    ):
+        """Initialize app.
+
+        Args:
+            discovery: SessionDiscovery instance for finding sessions.
+            health_monitor: HealthMonitor instance for health scoring.
+            token_estimator: TokenEstimator instance for token counting.
+            refresh_interval: Seconds between refreshes (default: 5).
+            token_workers: Sessions whose tokens are estimated concurrently.
+            db: Database to seed trends from and record history to (optional).
+        """
+        super().__init__()
+        self.dashboard = Dashboard(
+            discovery, health_monitor, token_estimator,
+            refresh_interval=refresh_interval, token_workers=token_workers, db=db
+        )
+        self.refreshing = False
+        self._shown: Dict[str, Tuple] = {}
+        self.stats = {"refreshes": 0, "rows_rebuilt": 0, "cells_updated": 0}
+
+    def compose(self) -> ComposeResult:
+        """Summary panel, session table, refresh status and key bindings."""
+        yield Static(id="summary")
+        yield DataTable(id="sessions", cursor_type="row", zebra_stripes=True)
+        yield Static(id="status")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        """Create the columns and schedule refreshes."""
+        self.table = self.query_one("#sessions", DataTable)
+        self.summary = self.query_one("#summary", Static)
+        self.status = self.query_one("#status", Static)
+        for key, title, width, _ in SESSION_COLUMNS:
+            self.table.add_column(title, width=width, key=key)
+
+        self.status.update(self.dashboard.create_refresh_status())
+        self.set_interval(self.dashboard.refresh_interval, self.action_refresh)
+        self.action_refresh()
+
+    def action_refresh(self) -> None:
+        """Start a refresh unless one is running."""
+        if not self.refreshing:
+            self.refreshing = True
+            self.refresh_sessions()
+
+    @work(group="refresh")
+    async def refresh_sessions(self) -> None:
+        """Worker: discover sessions, estimate tokens in parallel, record trends.
+
+        Progress is published as snapshots (at most every
+        ``Dashboard.PROGRESS_INTERVAL`` seconds during estimation).
+        """
+        dashboard = self.dashboard
+        started = datetime.now()
+        timings: Dict[str, float] = {}
+        previous = dashboard.snapshot
+        trends = previous.trends if previous else {}
+
+        try:
+            stage_start = time.perf_counter()
+            sessions: List[Session] = await asyncio.to_thread(dashboard.discovery.discover_sessions)
+            timings["discovery"] = time.perf_counter() - stage_start
+            reconcile_sessions(sessions, previous.sessions if previous else ())
+
+            dashboard._publish(sessions, started, refreshing=True, pending=len(sessions),
+                               timings=dict(timings), trends=trends)
+            self.post_message(SessionsChanged())
+
+            # Estimate tokens concurrently; score health as each estimate lands
+            stage_start = time.perf_counter()
+            semaphore = asyncio.Semaphore(dashboard.token_workers)
+            changed: set = set()
+            pending = len(sessions)
+            last_publish = time.monotonic()
+
+            async def estimate(session: Session) -> None:
+                nonlocal pending, last_publish
+                async with semaphore:
+                    try:
+                        session.token_count = await asyncio.to_thread(
+                            dashboard.token_estimator.estimate_session_tokens, session
+                        )
+                    except Exception as e:
+                        logger.debug("token_estimation_failed", session_id=session.id, error=str(e))
+                session.health_score = dashboard.health_monitor.calculate_health(session) * 100
+                changed.add(session.id)
+                pending -= 1
+
+                if pending and time.monotonic() - last_publish >= dashboard.PROGRESS_INTERVAL:
+                    dashboard._publish(sessions, started, refreshing=True, pending=pending,
+                                       timings=dict(timings, tokens=time.perf_counter() - stage_start),
+                                       trends=trends)
+                    self.post_message(SessionsChanged(frozenset(changed)))
+                    changed.clear()
+                    last_publish = time.monotonic()
+
+            await asyncio.gather(*(estimate(s) for s in sessions))
+            timings["tokens"] = time.perf_counter() - stage_start
+
+            stage_start = time.perf_counter()
+            trends = await asyncio.to_thread(dashboard.trends.update, sessions, dashboard.db)
+            timings["history"] = time.perf_counter() - stage_start
+
+            # Every row's trend moved on, so all rows may change
+            dashboard._publish(sessions, started, timings=timings, trends=trends)
+            self.post_message(SessionsChanged())
+            logger.info(
+                "dashboard_data_refreshed",
+                session_count=len(sessions),
+                **{f"{stage}_ms": round(seconds * 1000, 1) for stage, seconds in timings.items()}
+            )
+        except Exception as e:
+            logger.error("dashboard_refresh_failed", error=str(e))
+            dashboard._publish(list(previous.sessions) if previous else [], started,
+                               error=str(e), trends=trends)
+            self.post_message(SessionsChanged())
+        finally:
+            self.refreshing = False
+            self.stats["refreshes"] += 1
+
+    def on_sessions_changed(self, message: SessionsChanged) -> None:
+        """Adopt the latest snapshot and redraw what it changed."""
+        dashboard = self.dashboard
+        if dashboard.apply_snapshot():
+            sessions = dashboard.view_sessions()
+            # Membership or order changed (new values of the sort key move rows)
+            if [s.id for s in sessions] != list(self._shown):
+                self._rebuild_rows(sessions)
+            else:
+                by_id = {s.id: s for s in sessions}
+                ids = by_id if message.changed is None else message.changed
+                for session_id in ids:
+                    if session_id in by_id:
+                        self._update_row(by_id[session_id])
+            self.summary.update(dashboard.create_header())
+
+        self.status.update(dashboard.create_refresh_status())
+
+    def _rebuild_rows(self, sessions: Optional[List[Session]] = None) -> None:
+        """Re-add all rows in view order (after membership or view changes)."""
+        sessions = self.dashboard.view_sessions() if sessions is None else sessions
+        table = self.table
+        table.clear()
+        self._shown.clear()
+        now = datetime.now()
+        for session in sessions:
+            cells = self.dashboard.format_row(session, now)
+            table.add_row(*cells, key=session.id)
+            self._shown[session.id] = cells
+        self.stats["rows_rebuilt"] += 1
+
+    def _update_row(self, session: Session, now: Optional[datetime] = None) -> None:
+        """Update the cells of one row that differ from what is shown."""
+        shown = self._shown.get(session.id)
+        if shown is None:
+            return
+        cells = self.dashboard.format_row(session, now)
+        table = self.table
+        for (key, *_), old, new in zip(SESSION_COLUMNS, shown, cells):
+            if old != new:
+                table.update_cell(session.id, key, new)
+                self.stats["cells_updated"] += 1
+        self._shown[session.id] = cells
+
+    def action_view(self, key: str) -> None:
+        """Change sort or filters (same keys as the Rich dashboard) and re-order rows."""
+        if self.dashboard.handle_view_key(key):
+            self._rebuild_rows()
+            self.notify(self.dashboard.view.describe(), timeout=2)
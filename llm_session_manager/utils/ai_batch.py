@@ -0,0 +1,320 @@
+"""Concurrent AI tagging and description generation for many sessions.
+
+Context for all sessions is gathered in parallel on a thread pool, and the
+resulting prompts are sent through an async Anthropic client with a
+bounded number of requests in flight. Rate limits (429), overload (529)
+and transient errors are retried with exponential backoff; a server
+``retry-after`` pauses every worker, not just the one that was throttled.
+Results are yielded as each session completes. Sessions whose context is
+unchanged since a previous run are answered from the response cache
+without taking a request slot.
+"""
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional
+
+import structlog
+
+from .ai_tagger import AITagger
+from .async_runner import BlockingCallRunner
+from .description_generator import DescriptionGenerator
+from .response_cache import ResponseCache
+from ..models import Session
+
+try:
+    from anthropic import AsyncAnthropic, APIConnectionError, APIStatusError
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# HTTP statuses worth retrying: rate limited, server errors, overloaded
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one session in a batch.
+
+    Attributes:
+        session: Session that was processed.
+        kind: "tags" or "description".
+        tags: Suggested tags (kind "tags").
+        extensions: File extensions of the sampled context (kind "tags").
+        description: Generated description (kind "description").
+        error: Error message if the session failed or was skipped.
+        attempts: API calls made (0 if skipped or cached).
+        duration: Seconds from start of the batch to completion.
+        cached: Whether the result came from the response cache.
+    """
+
+    session: Session
+    kind: str
+    tags: Optional[List[str]] = None
+    extensions: List[str] = field(default_factory=list)
+    description: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    duration: float = 0.0
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether a result was produced."""
+        return self.error is None
+
+
+class AIBatchProcessor:
+    """Runs AI tagging or description generation over many sessions.
+
+    Example:
+        processor = AIBatchProcessor(max_concurrency=4)
+        async for result in processor.suggest_tags(sessions):
+            print(result.session.id, result.tags)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        context_workers: int = 8,
+        tagger: Optional[AITagger] = None,
+        generator: Optional[DescriptionGenerator] = None,
+        cache: Optional[ResponseCache] = None,
+        refresh: bool = False
+    ):
+        """Initialize batch processor.
+
+        Args:
+            api_key: Anthropic API key. If None, will try ANTHROPIC_API_KEY env var.
+            base_url: API base URL (default: the SDK's, or ANTHROPIC_BASE_URL).
+            max_concurrency: Maximum API requests in flight.
+            max_retries: Retries per session after the first attempt.
+            backoff_base: First backoff delay in seconds (doubles per retry).
+            backoff_max: Upper bound for a single backoff delay.
+            context_workers: Threads gathering session context.
+            tagger: Prompt builder/parser for tags.
+            generator: Prompt builder/parser for descriptions.
+            cache: Response cache for default tagger/generator
+                (data/ai_cache if None).
+            refresh: Ignore cached responses and call the API for every session.
+        """
+        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.context_workers = context_workers
+        self.refresh = refresh
+        cache = cache or ResponseCache()
+        self.tagger = tagger or AITagger(api_key="", cache=cache)
+        self.generator = generator or DescriptionGenerator(api_key="", cache=cache)
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0}
+
+        # Monotonic time before which no worker may send a request
+        self._paused_until = 0.0
+
+    def is_available(self) -> bool:
+        """Check if batch AI calls can be made.
+
+        Returns:
+            True if the anthropic SDK is installed and an API key is set.
+        """
+        return ANTHROPIC_AVAILABLE and bool(self.api_key)
+
+    def suggest_tags(
+        self,
+        sessions: List[Session],
+        max_tags: int = 10,
+        context_files: int = 10
+    ) -> AsyncIterator[BatchResult]:
+        """Suggest tags for many sessions, yielding results as they complete.
+
+        Args:
+            sessions: Sessions to analyze.
+            max_tags: Maximum tags per session.
+            context_files: Number of files to sample per session.
+
+        Returns:
+            Async iterator of BatchResult in completion order.
+        """
+        return self._run(
+            sessions,
+            kind="tags",
+            build=lambda s: self.tagger.prepare_request(s, context_files=context_files),
+            parse=self.tagger.parse_tags,
+            limit=lambda tags, result: self.tagger.rank_tags(tags, result.extensions, max_tags),
+            cache=self.tagger.cache,
+            model=self.tagger.MODEL,
+            max_tokens=self.tagger.MAX_TOKENS
+        )
+
+    def generate_descriptions(
+        self,
+        sessions: List[Session],
+        max_length: int = 200,
+        context_files: int = 8
+    ) -> AsyncIterator[BatchResult]:
+        """Generate descriptions for many sessions, yielding results as they complete.
+
+        Args:
+            sessions: Sessions to describe.
+            max_length: Maximum description length in characters.
+            context_files: Number of files to sample per session.
+
+        Returns:
+            Async iterator of BatchResult in completion order.
+        """
+        return self._run(
+            sessions,
+            kind="description",
+            build=lambda s: self.generator.prepare_request(s, max_length=max_length, context_files=context_files),
+            parse=lambda text: self.generator.parse_description(text, max_length),
+            limit=lambda description, result: description,
+            cache=self.generator.cache,
+            model=self.generator.MODEL,
+            max_tokens=self.generator.MAX_TOKENS
+        )
+
+    async def _run(self, sessions, kind, build, parse, limit, cache, model, max_tokens) -> AsyncIterator[BatchResult]:
+        """Process sessions concurrently and yield results in completion order."""
+        if not self.is_available():
+            raise RuntimeError("AI batch processing not available. Set ANTHROPIC_API_KEY environment variable.")
+
+        started = time.monotonic()
+        runner = BlockingCallRunner(max_workers=self.context_workers, name="ai-context")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        client = AsyncAnthropic(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+
+        async def process(session: Session) -> BatchResult:
+            result = BatchResult(session=session, kind=kind)
+            try:
+                request = await runner.run(build, session)
+                if request is None:
+                    result.error = "no analyzable content"
+                    return result
+                result.extensions = request.extensions or []
+
+                parsed = None if self.refresh else cache.get(request.fingerprint)
+                if parsed is not None:
+                    result.cached = True
+                else:
+                    async with semaphore:
+                        text, result.attempts = await self._create_with_retry(client, model, max_tokens, request.prompt)
+                    parsed = parse(text)
+                    cache.set(request.fingerprint, parsed)
+
+                parsed = limit(parsed, result)
+                if kind == "tags":
+                    result.tags = parsed
+                else:
+                    result.description = parsed
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result.error = str(e)
+                logger.warning("ai_batch_item_failed", session_id=session.id, kind=kind, error=str(e))
+            finally:
+                result.duration = time.monotonic() - started
+            return result
+
+        tasks = [asyncio.ensure_future(process(session)) for session in sessions]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await client.close()
+            runner.shutdown()
+
+            logger.info("ai_batch_completed",
+                       kind=kind,
+                       sessions=len(sessions),
+                       duration=round(time.monotonic() - started, 2),
+                       cache_hits=cache.stats["hits"],
+                       cache_misses=cache.stats["misses"],
+                       **self.stats)
+
+    async def _create_with_retry(self, client: Any, model: str, max_tokens: int, prompt: str):
+        """Send one message request, retrying throttled or transient failures.
+
+        Args:
+            client: AsyncAnthropic client.
+            model: Model name.
+            max_tokens: Response token limit.
+            prompt: User prompt.
+
+        Returns:
+            Tuple of (response text, attempts made).
+
+        Raises:
+            APIStatusError: For non-retryable statuses or when retries run out.
+            APIConnectionError: When retries run out on connection errors.
+        """
+        attempt = 0
+        while True:
+            await self._wait_for_pause()
+            attempt += 1
+            self.stats["requests"] += 1
+            try:
+                response = await client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+                return response.content[0].text, attempt
+
+            except APIStatusError as e:
+                if e.status_code not in RETRYABLE_STATUS or attempt > self.max_retries:
+                    raise
+                delay = self._backoff(attempt, self._retry_after(e.response))
+                if e.status_code in (429, 529):
+                    # Throttling applies to the whole account: pause everyone
+                    self.stats["rate_limited"] += 1
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+            except APIConnectionError:
+                if attempt > self.max_retries:
+                    raise
+                delay = self._backoff(attempt, None)
+
+            self.stats["retries"] += 1
+            logger.debug("ai_request_retry", attempt=attempt, delay=round(delay, 2))
+            await asyncio.sleep(delay)
+
+    async def _wait_for_pause(self) -> None:
+        """Sleep while a shared rate-limit pause is in effect."""
+        while True:
+            remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Delay before retry ``attempt``: server hint, else jittered exponential."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = self.backoff_base * (2 ** (attempt - 1))
+        return min(delay, self.backoff_max) * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _retry_after(response: Any) -> Optional[float]:
+        """Seconds to wait from a ``retry-after`` header, if present."""
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("retry-after")
+        try:
+            return max(0.0, float(value)) if value is not None else None
+        except (TypeError, ValueError):
+            return None
@@ -1,12 +1,15 @@
 """AI-powered tag suggestion using LLM analysis."""
 
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import structlog
 from anthropic import Anthropic
 
 from ..models import Session
+from .file_sampler import FileSampler
+from .response_cache import PreparedRequest, ResponseCache, context_fingerprint
+from .tag_ranker import TagRanker
 
 logger = structlog.get_logger()
 
@@ -23,16 +26,42 @@ class AITagger:
     Falls back to heuristic analysis if LLM is unavailable.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    MODEL = "claude-3-5-sonnet-20241022"
+    MAX_TOKENS = 500
+
+    # Files eligible for context sampling and the content budget for a prompt
+    CONTEXT_EXTENSIONS = {
+        '.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs', '.java', '.rb', '.php',
+        '.md', '.json', '.yaml', '.yml', '.toml', '.sql', '.html', '.css', '.scss', '.vue'
+    }
+    CONTEXT_BYTES = 6000
+    CONTEXT_TOKENS = 1200
+    CONTEXT_FILE_BYTES = 1200
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        ranker: Optional[TagRanker] = None
+    ):
         """Initialize AI tagger.
 
         Args:
             api_key: Anthropic API key. If None, will try ANTHROPIC_API_KEY env var.
+            cache: Cache of parsed responses by context fingerprint
+                (data/ai_cache if None).
+            ranker: Optional learned ranker re-ranking and pruning suggestions
+                from past accept/reject feedback.
         """
         self.logger = structlog.get_logger()
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.cache = cache or ResponseCache()
+        self.ranker = ranker
         self.client = None
 
+        # File extensions of the last sampled context
+        self.last_extensions: List[str] = []
+
         if self.api_key:
             try:
                 self.client = Anthropic(api_key=self.api_key)
@@ -52,14 +81,19 @@ class AITagger:
         self,
         session: Session,
         max_tags: int = 10,
-        context_files: int = 10
+        context_files: int = 10,
+        refresh: bool = False
     ) -> List[str]:
         """Use AI to suggest tags based on deep content analysis.
 
+        Tags for unchanged context (same sampled files, contents and
+        existing tags) are served from the response cache.
+
         Args:
             session: Session to analyze.
             max_tags: Maximum number of tags to return.
             context_files: Number of files to sample for context.
+            refresh: Ignore cached tags and call the LLM again.
 
         Returns:
             List of suggested tags ordered by relevance.
@@ -68,45 +102,101 @@ class AITagger:
             logger.warning("ai_tagger_not_available")
             return []
 
-        if not session.working_directory or not os.path.isdir(session.working_directory):
-            logger.debug("no_working_directory", session_id=session.id)
-            return []
-
         try:
-            # Gather context about the session
-            context = self._gather_context(session, max_files=context_files)
-
-            if not context["files"]:
-                logger.debug("no_analyzable_files", session_id=session.id)
+            request = self._prepare(session, context_files)
+            if request is None:
                 return []
+            prompt, fingerprint, context = request
+            self.last_extensions = self.context_extensions(context)
 
-            # Build prompt for LLM
-            prompt = self._build_tag_prompt(session, context)
+            if not refresh:
+                cached = self.cache.get(fingerprint)
+                if cached is not None:
+                    logger.info("ai_tags_cached", session_id=session.id)
+                    return self.rank_tags(cached, self.last_extensions, max_tags)
 
             # Call LLM
             response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=500,
+                model=self.MODEL,
+                max_tokens=self.MAX_TOKENS,
                 messages=[{
                     "role": "user",
                     "content": prompt
                 }]
             )
 
-            # Parse tags from response
-            tags = self._parse_tag_response(response.content[0].text)
+            tags = self.parse_tags(response.content[0].text)
+            self.cache.set(fingerprint, tags)
+
+            tags = self.rank_tags(tags, self.last_extensions, max_tags)
 
             logger.info("ai_tags_suggested",
                        session_id=session.id,
                        count=len(tags),
-                       tags=tags[:max_tags])
+                       tags=tags)
 
-            return tags[:max_tags]
+            return tags
 
         except Exception as e:
             logger.error("ai_tagging_failed", error=str(e))
             return []
 
+    def prepare_request(self, session: Session, context_files: int = 10) -> Optional[PreparedRequest]:
+        """Gather session context and build the tagging prompt.
+
+        Args:
+            session: Session to analyze.
+            context_files: Number of files to sample for context.
+
+        Returns:
+            PreparedRequest with the context extensions, or None if the
+            session has nothing to analyze.
+        """
+        request = self._prepare(session, context_files)
+        if request is None:
+            return None
+        prompt, fingerprint, context = request
+        return PreparedRequest(prompt, fingerprint, self.context_extensions(context))
+
+    def rank_tags(self, tags: List[str], extensions: List[str], max_tags: Optional[int] = None) -> List[str]:
+        """Re-rank parsed tags with the learned ranker, if any.
+
+        Args:
+            tags: Tags in LLM relevance order.
+            extensions: File extensions of the session context.
+            max_tags: Maximum tags to return.
+
+        Returns:
+            Ranked (and pruned) tags.
+        """
+        if self.ranker:
+            return self.ranker.rank(tags, source="ai", extensions=extensions, max_tags=max_tags)
+        return tags[:max_tags]
+
+    @staticmethod
+    def context_extensions(context: Dict) -> List[str]:
+        """Extensions of the files sampled into a context."""
+        return sorted({Path(f["path"]).suffix.lower() for f in context["files"]} - {""})
+
+    def _prepare(self, session: Session, context_files: int) -> Optional[Tuple[str, str, Dict]]:
+        """Build (prompt, fingerprint, context) for a session, or None."""
+        if not session.working_directory or not os.path.isdir(session.working_directory):
+            logger.debug("no_working_directory", session_id=session.id)
+            return None
+
+        context = self._gather_context(session, max_files=context_files)
+
+        if not context["files"]:
+            logger.debug("no_analyzable_files", session_id=session.id)
+            return None
+
+        fingerprint = context_fingerprint("tags", context, model=self.MODEL)
+        return self._build_tag_prompt(session, context), fingerprint, context
+
+    def parse_tags(self, response_text: str, max_tags: Optional[int] = None) -> List[str]:
+        """Parse tags (at most ``max_tags`` if given) from an LLM response."""
+        return self._parse_tag_response(response_text)[:max_tags]
+
     def _gather_context(self, session: Session, max_files: int = 10) -> Dict:
         """Gather context about the session for analysis.
 
@@ -127,46 +217,16 @@ class AITagger:
         }
 
         try:
-            files_collected = 0
-
-            for root, dirs, files in os.walk(session.working_directory):
-                # Skip common directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '__pycache__', 'node_modules', '.git', 'venv', 'env',
-                    'build', 'dist', '.next', 'target', 'out'
-                }]
-
-                # Collect directory names
-                for d in dirs:
-                    context["directories"].add(d.lower())
-
-                # Sample interesting files
-                for filename in files:
-                    if files_collected >= max_files:
-                        break
-
-                    file_path = os.path.join(root, filename)
-                    ext = Path(filename).suffix.lower()
-
-                    # Track extensions
-                    if ext:
-                        context["file_extensions"].add(ext)
-
-                    # Only analyze certain file types
-                    if ext in {'.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs',
-                               '.java', '.rb', '.php', '.md', '.json', '.yaml', '.yml',
-                               '.toml', '.sql', '.html', '.css', '.scss', '.vue'}:
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read(5000)  # First 5KB
-                                relative_path = os.path.relpath(file_path, session.working_directory)
-                                context["files"].append({
-                                    "path": relative_path,
-                                    "content": content
-                                })
-                                files_collected += 1
-                        except (UnicodeDecodeError, IOError):
-                            continue
+            sample = FileSampler(
+                self.CONTEXT_EXTENSIONS,
+                max_files=max_files,
+                max_bytes=self.CONTEXT_BYTES,
+                max_tokens=self.CONTEXT_TOKENS,
+                file_bytes=self.CONTEXT_FILE_BYTES
+            ).sample(session.working_directory)
+            context["files"] = sample.files
+            context["directories"] = sample.directories
+            context["file_extensions"] = sample.extensions
 
         except Exception as e:
             logger.debug("context_gathering_error", error=str(e))
@@ -184,8 +244,8 @@ class AITagger:
             Formatted prompt string.
         """
         files_summary = "\n\n".join([
-            f"File: {f['path']}\n```\n{f['content'][:1000]}...\n```"
-            for f in context["files"][:5]
+            f"File: {f['path']}\n```\n{f['content']}...\n```"
+            for f in context["files"]
         ])
 
         prompt = f"""Analyze this software development session and suggest relevant tags.
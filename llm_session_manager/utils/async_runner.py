@@ -0,0 +1,168 @@
+"""Run blocking calls from async code without stalling the event loop.
+
+BlockingCallRunner executes synchronous work (embedding searches, SQLite
+queries) on a bounded thread pool. Concurrent calls with the same key share
+one in-flight execution, and work whose callers have all gone away is
+cancelled: queued calls never start, and running calls stop at their next
+``check_cancelled()`` checkpoint.
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class OperationCancelled(Exception):
+    """Raised inside blocking work whose caller has been cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe flag shared between an async caller and its worker thread."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+
+_current_token: contextvars.ContextVar[Optional[CancellationToken]] = contextvars.ContextVar(
+    "cancellation_token", default=None
+)
+
+
+def check_cancelled() -> None:
+    """Cancellation checkpoint for blocking code.
+
+    A no-op unless the code runs under BlockingCallRunner and its caller
+    was cancelled, in which case OperationCancelled is raised.
+    """
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+@dataclass
+class _InFlight:
+    """A running call and the number of callers waiting for it."""
+
+    task: "asyncio.Task"
+    token: CancellationToken
+    waiters: int = 0
+
+
+class BlockingCallRunner:
+    """Bounded executor with request coalescing and cancellation.
+
+    Example:
+        runner = BlockingCallRunner(max_workers=4)
+        results = await runner.run(
+            memory_mgr.search_memories, "auth", limit=5,
+            key=("search", "auth", 5)
+        )
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "blocking"):
+        """Initialize runner.
+
+        Args:
+            max_workers: Maximum threads running blocking work at once.
+            name: Thread name prefix.
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self.stats = {"calls": 0, "coalesced": 0, "cancelled": 0}
+
+    async def run(self, func: Callable[..., Any], *args, key: Optional[Hashable] = None, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` on the pool and await its result.
+
+        Args:
+            func: Blocking callable.
+            *args: Positional arguments for ``func``.
+            key: Coalescing key. Calls with an equal key made while one is
+                in flight share its result; None disables coalescing.
+            **kwargs: Keyword arguments for ``func``.
+
+        Returns:
+            The return value of ``func``.
+
+        Raises:
+            asyncio.CancelledError: If this caller is cancelled. The shared
+                work is cancelled once no caller is waiting for it.
+        """
+        loop = asyncio.get_running_loop()
+        if key is None:
+            key = object()
+
+        entry = self._inflight.get(key)
+        if entry is None:
+            token = CancellationToken()
+            task = loop.create_task(self._execute(token, func, args, kwargs))
+            entry = _InFlight(task=task, token=token)
+            self._inflight[key] = entry
+            task.add_done_callback(lambda _, key=key, entry=entry: self._release(key, entry))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            if not entry.task.done() and entry.waiters == 1:
+                entry.token.cancel()
+                entry.task.cancel()
+                self.stats["cancelled"] += 1
+                logger.debug("blocking_call_cancelled", func=getattr(func, "__name__", str(func)))
+            raise
+        finally:
+            entry.waiters -= 1
+
+    async def _execute(self, token: CancellationToken, func: Callable[..., Any], args, kwargs) -> Any:
+        """Submit one call to the pool with its cancellation token installed."""
+        context = contextvars.copy_context()
+        context.run(_current_token.set, token)
+        future = self._executor.submit(context.run, func, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Drops the call if it is still queued; a running call stops at
+            # its next check_cancelled()
+            future.cancel()
+            token.cancel()
+            raise
+
+    def _release(self, key: Hashable, entry: _InFlight) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+        # Retrieve the exception so a call nobody awaited does not warn
+        if not entry.task.cancelled():
+            entry.task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently queued or running."""
+        return len(self._inflight)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool, cancelling queued calls."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,13 +1,16 @@
 """Automatic tag suggestion based on session content analysis."""
 
+import hashlib
+import json
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import Any, List, Dict, Optional, Set, Tuple
 from collections import Counter
 import structlog
 
 from ..models import Session
+from .tag_ranker import TagRanker
 
 logger = structlog.get_logger()
 
@@ -146,162 +149,320 @@ class AutoTagger:
         'feature': 'feature',
     }
 
-    def __init__(self):
-        """Initialize auto-tagger."""
-        self.logger = structlog.get_logger()
+    # Directories never walked
+    SKIP_DIRS = {'__pycache__', 'node_modules', '.git', 'venv', 'env', 'build', 'dist'}
 
-    def suggest_tags(self, session: Session, max_tags: int = 10) -> List[str]:
-        """Suggest tags for a session based on content analysis.
+    # Files whose content is scanned for imports and keywords
+    CONTENT_EXTENSIONS = {'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', '.rb', '.php'}
 
-        Args:
-            session: Session to analyze.
-            max_tags: Maximum number of tags to return.
+    # Bytes read per file and files scanned per session
+    CONTENT_READ_SIZE = 50000
+    SAMPLE_FILES = 50
 
-        Returns:
-            List of suggested tags, ordered by relevance.
-        """
-        if not session.working_directory or not os.path.isdir(session.working_directory):
-            logger.debug("no_working_directory", session_id=session.id)
-            return []
+    # Per-file cache entries kept on disk
+    MAX_CACHE_ENTRIES = 20000
 
-        tag_counter = Counter()
+    # Most common extensions used as the feedback context of a session
+    CONTEXT_EXTENSIONS = 3
 
-        # Analyze file extensions
-        extension_tags = self._analyze_extensions(session.working_directory)
-        tag_counter.update(extension_tags)
+    def __init__(self, cache_path: Optional[str] = None, ranker: Optional[TagRanker] = None):
+        """Initialize auto-tagger.
 
-        # Analyze directory structure
-        directory_tags = self._analyze_directories(session.working_directory)
-        tag_counter.update(directory_tags)
+        Args:
+            cache_path: Optional JSON file persisting per-file content tags
+                between runs (in-memory only if None).
+            ranker: Optional learned ranker re-ranking and pruning suggestions
+                from past accept/reject feedback.
+        """
+        self.logger = structlog.get_logger()
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.ranker = ranker
 
-        # Analyze file content (imports, keywords)
-        content_tags = self._analyze_content(session.working_directory)
-        tag_counter.update(content_tags)
+        # Dominant file extensions of the last analyzed directory
+        self.last_extensions: List[str] = []
 
-        # Use description if available
-        if session.description:
-            desc_tags = self._analyze_text(session.description)
-            tag_counter.update(desc_tags)
+        # path -> (mtime_ns, size, tag counts) of the content scan
+        self._file_cache: Dict[str, Tuple[int, int, Dict[str, int]]] = {}
+        self._cache_dirty = False
+        if self.cache_path:
+            self._load_cache()
 
-        # Get most common tags
-        suggested_tags = [tag for tag, count in tag_counter.most_common(max_tags)]
+    # ==================== RULES ====================
 
-        logger.info("tags_suggested",
-                   session_id=session.id,
-                   count=len(suggested_tags),
-                   tags=suggested_tags)
+    @classmethod
+    def _rules(cls) -> Dict[str, Any]:
+        """Compile import and keyword rules into one scanner (once per class).
 
-        return suggested_tags
+        Every keyword and the literal prefix of every import pattern
+        ("from", "import") become one named group of a prefix-trie regex.
+        A single pass over the lowercased content finds all of them,
+        overlapping matches included; import patterns are then only tried
+        at the positions where their prefix occurs.
 
-    def _analyze_extensions(self, directory: str) -> Counter:
-        """Analyze file extensions in directory.
+        Returns:
+            Dictionary with the compiled ``scanner``, ``groups`` (group name
+            -> literals it implies), ``anchored`` (literal -> [(index,
+            compiled pattern, tag)]), ``unanchored`` patterns and ``version``.
+        """
+        if '_compiled_rules' in cls.__dict__:
+            return cls._compiled_rules
+
+        anchored: Dict[str, List[Tuple[int, re.Pattern, str]]] = {}
+        unanchored: List[Tuple[int, re.Pattern, str]] = []
+        for index, (pattern, tag) in enumerate(cls.IMPORT_PATTERNS.items()):
+            compiled = re.compile(pattern, re.IGNORECASE)
+            literal = re.match(r'[A-Za-z]+', pattern)
+            prefix = literal.group().lower() if literal else ""
+            # A quantifier after the literal makes its last letter optional
+            if prefix and pattern[len(prefix):len(prefix) + 1] in ('?', '*', '{'):
+                prefix = prefix[:-1]
+            if prefix:
+                anchored.setdefault(prefix, []).append((index, compiled, tag))
+            else:
+                unanchored.append((index, compiled, tag))
+
+        literals = sorted(set(anchored) | {k.lower() for k in cls.KEYWORD_TAGS})
+        names = {literal: f"r{i}" for i, literal in enumerate(literals)}
+
+        trie: Dict[str, Any] = {}
+        for literal in literals:
+            node = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[''] = literal
+
+        def build(node: Dict[str, Any]) -> str:
+            # Longer continuations come before the end marker, so the
+            # longest literal at a position wins
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if '' in node:
+                branches.append(f"(?P<{names[node['']]}>)")
+            return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+        # Zero-width lookahead so overlapping literals are all found; a match
+        # of a literal also counts as a match of any literal that prefixes it
+        scanner = re.compile(f"(?={build(trie)})") if literals else None
+        groups = {
+            names[literal]: [other for other in literals if literal.startswith(other)]
+            for literal in literals
+        }
+
+        version = hashlib.sha1(
+            json.dumps([cls.IMPORT_PATTERNS, cls.KEYWORD_TAGS], sort_keys=True).encode()
+        ).hexdigest()[:12]
+
+        cls._compiled_rules = {
+            "scanner": scanner,
+            "groups": groups,
+            "anchored": anchored,
+            "unanchored": unanchored,
+            "version": version,
+        }
+        return cls._compiled_rules
+
+    def _scan_text(self, text: str) -> Tuple[Set[str], List[str]]:
+        """Find keywords and import patterns in text with one scanner pass.
 
         Args:
-            directory: Directory to analyze.
+            text: Text to scan.
 
         Returns:
-            Counter of tags found.
+            Tuple of (keywords found, tags of matching import patterns
+            with one entry per matching pattern).
         """
-        tags = Counter()
+        rules = self._rules()
+        lowered = text.lower()
+        literals: Set[str] = set()
+        matched: Dict[int, str] = {}
+
+        if rules["scanner"] is not None:
+            for match in rules["scanner"].finditer(lowered):
+                for literal in rules["groups"][match.lastgroup]:
+                    literals.add(literal)
+                    for index, pattern, tag in rules["anchored"].get(literal, ()):
+                        if index not in matched and pattern.match(lowered, match.start()):
+                            matched[index] = tag
+
+        for index, pattern, tag in rules["unanchored"]:
+            if pattern.search(lowered):
+                matched[index] = tag
+
+        keywords = {k for k in self.KEYWORD_TAGS if k.lower() in literals}
+        return keywords, list(matched.values())
+
+    # ==================== CACHE ====================
+
+    def _load_cache(self) -> None:
+        """Load the per-file cache, discarding it if the rules changed."""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self._rules()["version"]:
+                logger.debug("tag_cache_outdated", path=str(self.cache_path))
+                return
+            self._file_cache = {
+                path: (entry[0], entry[1], entry[2]) for path, entry in data.get("files", {}).items()
+            }
+        except (OSError, ValueError, IndexError, TypeError) as e:
+            logger.warning("tag_cache_load_failed", error=str(e))
+
+    def save_cache(self) -> None:
+        """Persist the per-file cache if it changed (no-op without cache_path)."""
+        if not self.cache_path or not self._cache_dirty:
+            return
+
+        # Oldest entries first; keep the most recently used ones
+        entries = list(self._file_cache.items())[-self.MAX_CACHE_ENTRIES:]
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": self._rules()["version"],
+                    "files": {path: list(entry) for path, entry in entries},
+                }, f)
+            self._cache_dirty = False
+        except OSError as e:
+            logger.warning("tag_cache_save_failed", error=str(e))
+
+    def _file_content_tags(self, file_path: str) -> Optional[Dict[str, int]]:
+        """Tag counts contributed by one file's content, cached by (path, mtime).
 
+        Args:
+            file_path: File to scan.
+
+        Returns:
+            Tag counts (imports weigh 3, keywords 1), or None if the file
+            could not be read as text.
+        """
         try:
-            for root, dirs, files in os.walk(directory):
-                # Skip common directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '__pycache__', 'node_modules', '.git', 'venv', 'env', 'build', 'dist'
-                }]
+            stat = os.stat(file_path)
+        except OSError:
+            return None
 
-                for filename in files:
-                    ext = Path(filename).suffix.lower()
-                    if ext in self.EXTENSION_TAGS:
-                        for tag in self.EXTENSION_TAGS[ext]:
-                            tags[tag] += 1
+        cached = self._file_cache.pop(file_path, None)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            self._file_cache[file_path] = cached
+            self.cache_stats["hits"] += 1
+            return cached[2]
 
-        except Exception as e:
-            logger.debug("extension_analysis_error", error=str(e))
+        self.cache_stats["misses"] += 1
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read(self.CONTENT_READ_SIZE)
+        except (UnicodeDecodeError, IOError):
+            return None
 
-        return tags
+        keywords, import_tags = self._scan_text(content)
+        tags = Counter()
+        for tag in import_tags:
+            tags[tag] += 3  # Weight imports highly
+        for keyword in keywords:
+            tags[self.KEYWORD_TAGS[keyword]] += 1
+
+        counts = dict(tags)
+        self._file_cache[file_path] = (stat.st_mtime_ns, stat.st_size, counts)
+        self._cache_dirty = True
+        return counts
+
+    # ==================== ANALYSIS ====================
 
-    def _analyze_directories(self, directory: str) -> Counter:
-        """Analyze directory names for patterns.
+    def suggest_tags(self, session: Session, max_tags: int = 10) -> List[str]:
+        """Suggest tags for a session based on content analysis.
 
         Args:
-            directory: Directory to analyze.
+            session: Session to analyze.
+            max_tags: Maximum number of tags to return.
 
         Returns:
-            Counter of tags found.
+            List of suggested tags, ordered by relevance.
         """
-        tags = Counter()
+        if not session.working_directory or not os.path.isdir(session.working_directory):
+            logger.debug("no_working_directory", session_id=session.id)
+            return []
 
-        try:
-            for root, dirs, files in os.walk(directory):
-                for dir_name in dirs:
-                    dir_lower = dir_name.lower()
-                    if dir_lower in self.DIRECTORY_TAGS:
-                        tags[self.DIRECTORY_TAGS[dir_lower]] += 2  # Weight directory names higher
+        tag_counter = self._collect_tags(session)
+
+        if self.ranker:
+            # Re-rank every candidate by count times learned acceptance
+            suggested_tags = self.ranker.rank(
+                [tag for tag, count in tag_counter.most_common()],
+                source="heuristic",
+                extensions=self.last_extensions,
+                scores=tag_counter,
+                max_tags=max_tags
+            )
+        else:
+            # Get most common tags
+            suggested_tags = [tag for tag, count in tag_counter.most_common(max_tags)]
 
-        except Exception as e:
-            logger.debug("directory_analysis_error", error=str(e))
+        logger.info("tags_suggested",
+                   session_id=session.id,
+                   count=len(suggested_tags),
+                   tags=suggested_tags,
+                   cache_hits=self.cache_stats["hits"],
+                   cache_misses=self.cache_stats["misses"])
 
-        return tags
+        return suggested_tags
 
-    def _analyze_content(self, directory: str, sample_files: int = 50) -> Counter:
-        """Analyze file content for imports and keywords.
+    def _collect_tags(self, session: Session) -> Counter:
+        """Merge directory, per-file and description tag counters of a session."""
+        tag_counter = self._analyze_directory(session.working_directory)
+
+        # Use description if available
+        if session.description:
+            tag_counter.update(self._analyze_text(session.description))
+
+        self.save_cache()
+        return tag_counter
+
+    def _analyze_directory(self, directory: str) -> Counter:
+        """Walk a directory once and merge per-file tag counters.
+
+        Counts extension tags for every file, directory-name tags, and the
+        (cached) content tags of up to SAMPLE_FILES source files.
 
         Args:
             directory: Directory to analyze.
-            sample_files: Maximum number of files to sample.
 
         Returns:
             Counter of tags found.
         """
         tags = Counter()
+        extensions = Counter()
         files_analyzed = 0
 
         try:
             for root, dirs, files in os.walk(directory):
-                if files_analyzed >= sample_files:
-                    break
-
                 # Skip common directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '__pycache__', 'node_modules', '.git', 'venv', 'env', 'build', 'dist'
-                }]
+                dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
 
-                for filename in files:
-                    if files_analyzed >= sample_files:
-                        break
+                for dir_name in dirs:
+                    dir_tag = self.DIRECTORY_TAGS.get(dir_name.lower())
+                    if dir_tag:
+                        tags[dir_tag] += 2  # Weight directory names higher
 
-                    file_path = os.path.join(root, filename)
+                for filename in files:
                     ext = Path(filename).suffix.lower()
+                    if ext in self.EXTENSION_TAGS:
+                        extensions[ext] += 1
+                    for tag in self.EXTENSION_TAGS.get(ext, ()):
+                        tags[tag] += 1
 
-                    # Only analyze text files
-                    if ext not in {'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', '.rb', '.php'}:
+                    if files_analyzed >= self.SAMPLE_FILES or ext not in self.CONTENT_EXTENSIONS:
                         continue
 
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read(50000)  # Read first 50KB
-
-                            # Check for import patterns
-                            for pattern, tag in self.IMPORT_PATTERNS.items():
-                                if re.search(pattern, content, re.IGNORECASE):
-                                    tags[tag] += 3  # Weight imports highly
-
-                            # Check for keywords
-                            content_lower = content.lower()
-                            for keyword, tag in self.KEYWORD_TAGS.items():
-                                if keyword in content_lower:
-                                    tags[tag] += 1
-
-                            files_analyzed += 1
-
-                    except (UnicodeDecodeError, IOError):
-                        continue
+                    content_tags = self._file_content_tags(os.path.join(root, filename))
+                    if content_tags is not None:
+                        tags.update(content_tags)
+                        files_analyzed += 1
 
         except Exception as e:
-            logger.debug("content_analysis_error", error=str(e))
+            logger.debug("directory_analysis_error", error=str(e))
 
+        self.last_extensions = [ext for ext, _ in extensions.most_common(self.CONTEXT_EXTENSIONS)]
         return tags
 
     def _analyze_text(self, text: str) -> Counter:
@@ -314,11 +475,10 @@ class AutoTagger:
             Counter of tags found.
         """
         tags = Counter()
-        text_lower = text.lower()
+        keywords, _ = self._scan_text(text)
 
-        for keyword, tag in self.KEYWORD_TAGS.items():
-            if keyword in text_lower:
-                tags[tag] += 2  # Weight description matches
+        for keyword in keywords:
+            tags[self.KEYWORD_TAGS[keyword]] += 2  # Weight description matches
 
         return tags
 
@@ -335,15 +495,7 @@ class AutoTagger:
         if not session.working_directory or not os.path.isdir(session.working_directory):
             return []
 
-        tag_counter = Counter()
-
-        # Analyze everything
-        tag_counter.update(self._analyze_extensions(session.working_directory))
-        tag_counter.update(self._analyze_directories(session.working_directory))
-        tag_counter.update(self._analyze_content(session.working_directory))
-
-        if session.description:
-            tag_counter.update(self._analyze_text(session.description))
+        tag_counter = self._collect_tags(session)
 
         # Only return tags with high confidence
         confident_tags = [tag for tag, count in tag_counter.items() if count >= min_confidence]
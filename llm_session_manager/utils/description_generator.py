@@ -7,6 +7,8 @@ import structlog
 from anthropic import Anthropic
 
 from ..models import Session
+from .file_sampler import FileSampler
+from .response_cache import PreparedRequest, ResponseCache, context_fingerprint
 
 logger = structlog.get_logger()
 
@@ -23,14 +25,26 @@ class DescriptionGenerator:
     Creates concise, informative summaries.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    MODEL = "claude-3-5-sonnet-20241022"
+    MAX_TOKENS = 300
+
+    # Code files eligible for context sampling and the content budget for a prompt
+    CONTEXT_EXTENSIONS = {'.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs', '.java'}
+    CONTEXT_BYTES = 2400
+    CONTEXT_TOKENS = 500
+    CONTEXT_FILE_BYTES = 600
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
         """Initialize description generator.
 
         Args:
             api_key: Anthropic API key. If None, will try ANTHROPIC_API_KEY env var.
+            cache: Cache of parsed responses by context fingerprint
+                (data/ai_cache if None).
         """
         self.logger = structlog.get_logger()
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.cache = cache or ResponseCache()
         self.client = None
 
         if self.api_key:
@@ -52,14 +66,18 @@ class DescriptionGenerator:
         self,
         session: Session,
         max_length: int = 200,
-        context_files: int = 8
+        context_files: int = 8,
+        refresh: bool = False
     ) -> Optional[str]:
         """Generate a description for a session using AI.
 
+        Descriptions for unchanged context are served from the response cache.
+
         Args:
             session: Session to describe.
             max_length: Maximum description length in characters.
             context_files: Number of files to sample for context.
+            refresh: Ignore a cached description and call the LLM again.
 
         Returns:
             Generated description or None if generation fails.
@@ -68,36 +86,30 @@ class DescriptionGenerator:
             logger.warning("description_generator_not_available")
             return None
 
-        if not session.working_directory or not os.path.isdir(session.working_directory):
-            logger.debug("no_working_directory", session_id=session.id)
-            return None
-
         try:
-            # Gather context
-            context = self._gather_context(session, max_files=context_files)
-
-            if not context["files"] and not context["readme_content"]:
-                logger.debug("insufficient_context", session_id=session.id)
+            request = self.prepare_request(session, max_length=max_length, context_files=context_files)
+            if request is None:
                 return None
+            prompt, fingerprint = request.prompt, request.fingerprint
 
-            # Build prompt
-            prompt = self._build_description_prompt(session, context, max_length)
+            if not refresh:
+                cached = self.cache.get(fingerprint)
+                if cached is not None:
+                    logger.info("description_cached", session_id=session.id)
+                    return cached
 
             # Call LLM
             response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=300,
+                model=self.MODEL,
+                max_tokens=self.MAX_TOKENS,
                 messages=[{
                     "role": "user",
                     "content": prompt
                 }]
             )
 
-            description = response.content[0].text.strip()
-
-            # Ensure it's not too long
-            if len(description) > max_length:
-                description = description[:max_length-3] + "..."
+            description = self.parse_description(response.content[0].text, max_length)
+            self.cache.set(fingerprint, description)
 
             logger.info("description_generated",
                        session_id=session.id,
@@ -109,6 +121,46 @@ class DescriptionGenerator:
             logger.error("description_generation_failed", error=str(e))
             return None
 
+    def prepare_request(
+        self,
+        session: Session,
+        max_length: int = 200,
+        context_files: int = 8
+    ) -> Optional[PreparedRequest]:
+        """Gather session context and build the description prompt.
+
+        Args:
+            session: Session to describe.
+            max_length: Maximum description length in characters.
+            context_files: Number of files to sample for context.
+
+        Returns:
+            PreparedRequest, or None if there is too little context.
+        """
+        if not session.working_directory or not os.path.isdir(session.working_directory):
+            logger.debug("no_working_directory", session_id=session.id)
+            return None
+
+        context = self._gather_context(session, max_files=context_files)
+
+        if not context["files"] and not context["readme_content"]:
+            logger.debug("insufficient_context", session_id=session.id)
+            return None
+
+        fingerprint = context_fingerprint("description", context, model=self.MODEL, max_length=max_length)
+        return PreparedRequest(self._build_description_prompt(session, context, max_length), fingerprint)
+
+    @staticmethod
+    def parse_description(response_text: str, max_length: int = 200) -> str:
+        """Clean an LLM response into a description of at most ``max_length`` chars."""
+        description = response_text.strip()
+
+        # Ensure it's not too long
+        if len(description) > max_length:
+            description = description[:max_length-3] + "..."
+
+        return description
+
     def _gather_context(self, session: Session, max_files: int = 8) -> Dict:
         """Gather context for description generation.
 
@@ -169,45 +221,18 @@ class DescriptionGenerator:
                 except Exception:
                     pass
 
-            # Sample code files
-            files_collected = 0
-            for root, dirs, files in os.walk(session.working_directory):
-                if files_collected >= max_files:
-                    break
-
-                # Skip common directories
-                dirs[:] = [d for d in dirs if d not in {
-                    '__pycache__', 'node_modules', '.git', 'venv', 'env',
-                    'build', 'dist', '.next', 'target'
-                }]
-
-                # Track key directories
-                for d in dirs[:5]:
-                    context["key_directories"].add(d.lower())
-
-                for filename in files:
-                    if files_collected >= max_files:
-                        break
-
-                    file_path = os.path.join(root, filename)
-                    ext = Path(filename).suffix.lower()
-
-                    if ext:
-                        context["file_types"].add(ext)
-
-                    # Sample interesting files
-                    if ext in {'.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs', '.java'}:
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read(2000)
-                                relative_path = os.path.relpath(file_path, session.working_directory)
-                                context["files"].append({
-                                    "path": relative_path,
-                                    "content": content
-                                })
-                                files_collected += 1
-                        except (UnicodeDecodeError, IOError):
-                            continue
+            # Sample the most informative code files (manifests are read above)
+            sample = FileSampler(
+                self.CONTEXT_EXTENSIONS,
+                max_files=max_files,
+                max_bytes=self.CONTEXT_BYTES,
+                max_tokens=self.CONTEXT_TOKENS,
+                file_bytes=self.CONTEXT_FILE_BYTES,
+                include_manifests=False
+            ).sample(session.working_directory)
+            context["files"] = sample.files
+            context["file_types"] = sample.extensions
+            context["key_directories"] = sample.top_directories
 
         except Exception as e:
             logger.debug("context_gathering_error", error=str(e))
@@ -255,9 +280,9 @@ class DescriptionGenerator:
                 "",
                 "Sample files:"
             ])
-            for f in context['files'][:3]:
+            for f in context['files']:
                 prompt_parts.append(f"\n{f['path']}:")
-                prompt_parts.append(f["content"][:300])
+                prompt_parts.append(f["content"])
 
         if context['file_types']:
             prompt_parts.append(f"\nFile types: {', '.join(sorted(context['file_types']))}")
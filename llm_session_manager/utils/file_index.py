@@ -0,0 +1,394 @@
+"""In-memory index of a working tree for recent-file and file-tree queries.
+
+The index is built with one ``os.scandir`` pass and then kept current by
+filesystem events (with the optional ``watchdog`` package) or by periodic
+rescans in a background thread. Queries never touch the disk:
+
+- ``recent(n)`` reads a bounded min-heap of the most recently modified
+  files. Entries superseded by later changes are skipped when read; the
+  heap is rebuilt only if too few valid entries remain.
+- ``tree(max_depth, max_entries)`` walks the in-memory directory map and
+  stops at the depth and size limits, so its cost does not grow with the
+  size of the repository.
+"""
+
+import heapq
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import structlog
+
+from .file_sampler import SKIP_DIRS
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    FileSystemEventHandler = object
+
+logger = structlog.get_logger()
+
+IGNORE_DIRS = SKIP_DIRS | {'.pytest_cache', '.ruff_cache', '.svn', '.hg'}
+
+# Watchdog events that can change the index (not opened/closed/closed_no_write)
+INDEX_EVENT_TYPES = {'created', 'modified', 'deleted', 'moved'}
+
+
+class FileIndex:
+    """Files of a directory tree with their mtimes and sizes.
+
+    Example:
+        index = FileIndex("/path/to/project")
+        index.scan()
+        index.start_watching()
+        index.recent(20)
+        index.tree(max_depth=3, max_entries=500)
+    """
+
+    def __init__(self, root: Union[str, Path], recent_capacity: int = 256, ignore_dirs: Set[str] = IGNORE_DIRS):
+        """Initialize an empty (unbuilt) index.
+
+        Args:
+            root: Directory to index.
+            recent_capacity: Files kept in the most-recent heap.
+            ignore_dirs: Directory names that are not indexed.
+        """
+        self.root = Path(root)
+        self.recent_capacity = recent_capacity
+        self.ignore_dirs = set(ignore_dirs)
+        self.built = False
+        self.scanned_at: Optional[float] = None
+        self.stats = {"scans": 0, "updates": 0, "heap_rebuilds": 0}
+
+        self._files: Dict[str, Tuple[float, int]] = {}
+        self._subdirs: Dict[str, Set[str]] = {}
+        self._dir_files: Dict[str, Set[str]] = {}
+        self._recent: List[Tuple[float, str]] = []
+        self._lock = threading.RLock()
+        self._scan_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+        self._observer = None
+        self._listeners: List[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    # ==================== BUILDING ====================
+
+    def scan(self) -> int:
+        """(Re)build the index from disk.
+
+        Returns:
+            Number of files indexed.
+        """
+        started = time.perf_counter()
+        files: Dict[str, Tuple[float, int]] = {}
+        subdirs: Dict[str, Set[str]] = {}
+        dir_files: Dict[str, Set[str]] = {}
+        self._scan_into("", files, subdirs, dir_files)
+
+        recent = heapq.nlargest(self.recent_capacity, ((m, p) for p, (m, _) in files.items()))
+        heapq.heapify(recent)
+        with self._lock:
+            changed = self.built and files != self._files
+            self._files, self._subdirs, self._dir_files, self._recent = files, subdirs, dir_files, recent
+            self.built = True
+            self.scanned_at = time.time()
+            self.stats["scans"] += 1
+
+        logger.debug("file_index_scanned", root=str(self.root), files=len(files),
+                     ms=round((time.perf_counter() - started) * 1000, 1))
+        if changed:
+            self._notify()
+        return len(files)
+
+    def ensure_built(self) -> None:
+        """Scan once if the index has not been built (safe to call from several threads)."""
+        if self.built:
+            return
+        with self._scan_lock:
+            if not self.built:
+                self.scan()
+
+    def update(self, path: Union[str, Path]) -> None:
+        """Re-stat one path after a filesystem event.
+
+        Files are added, updated or removed; a created directory is scanned
+        and a removed one is dropped with everything below it.
+
+        Args:
+            path: Absolute path, or path relative to the root.
+        """
+        rel = self._relative(path)
+        if rel is None or not self.built:
+            return
+
+        full = self.root / rel
+        try:
+            is_dir = full.is_dir()
+            stat = None if is_dir else full.stat()
+        except OSError:
+            is_dir, stat = False, None
+
+        with self._lock:
+            self.stats["updates"] += 1
+            parent, name = os.path.split(rel)
+            changed = False
+            if is_dir:
+                # Known directories change whenever a child does; the child has its own event
+                if rel not in self._subdirs:
+                    changed = True
+                    files: Dict[str, Tuple[float, int]] = {}
+                    self._scan_into(rel, files, self._subdirs, self._dir_files)
+                    self._files.update(files)
+                    self._subdirs.setdefault(parent, set()).add(name)
+                    for file_rel, (mtime, _) in files.items():
+                        self._push_recent(mtime, file_rel)
+            elif stat is not None:
+                entry = (stat.st_mtime, stat.st_size)
+                if self._files.get(rel) != entry:
+                    changed = True
+                    self._files[rel] = entry
+                    self._dir_files.setdefault(parent, set()).add(name)
+                    self._push_recent(stat.st_mtime, rel)
+            else:
+                changed = self._remove(rel)
+        if changed:
+            self._notify()
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` (from the watching thread) whenever files change."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]) -> None:
+        """Stop calling ``callback``."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("file_index_listener_failed", error=str(e))
+
+    def _scan_into(self, start: str, files, subdirs, dir_files) -> None:
+        stack = [start]
+        while stack:
+            rel_dir = stack.pop()
+            names: Set[str] = set()
+            children: Set[str] = set()
+            try:
+                with os.scandir(self.root / rel_dir) as entries:
+                    for entry in entries:
+                        rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in self.ignore_dirs:
+                                    children.add(entry.name)
+                                    stack.append(rel)
+                                continue
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        files[rel] = (stat.st_mtime, stat.st_size)
+                        names.add(entry.name)
+            except OSError:
+                continue
+            subdirs[rel_dir] = children
+            dir_files[rel_dir] = names
+
+    def _remove(self, rel: str) -> bool:
+        """Drop a file or directory; returns whether it was indexed."""
+        parent, name = os.path.split(rel)
+        if self._files.pop(rel, None) is not None:
+            self._dir_files.get(parent, set()).discard(name)
+        elif rel in self._subdirs:
+            self._subdirs.get(parent, set()).discard(name)
+            prefix = rel + os.sep
+            for key in [k for k in self._files if k.startswith(prefix)]:
+                del self._files[key]
+            for mapping in (self._subdirs, self._dir_files):
+                for key in [k for k in mapping if k == rel or k.startswith(prefix)]:
+                    del mapping[key]
+        else:
+            return False
+        return True
+
+    def _relative(self, path: Union[str, Path]) -> Optional[str]:
+        """Path relative to the root, or None if outside it or ignored."""
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.root)
+            except ValueError:
+                return None
+        rel = str(path)
+        if rel in ("", ".") or any(part in self.ignore_dirs for part in path.parts):
+            return None
+        return rel
+
+    # ==================== QUERIES ====================
+
+    def _push_recent(self, mtime: float, rel: str) -> None:
+        if len(self._recent) < self.recent_capacity:
+            heapq.heappush(self._recent, (mtime, rel))
+        elif mtime > self._recent[0][0]:
+            heapq.heapreplace(self._recent, (mtime, rel))
+
+    def recent(self, n: int = 20) -> List[Dict[str, Any]]:
+        """The ``n`` most recently modified files, newest first.
+
+        Args:
+            n: Number of files (at most ``recent_capacity``).
+
+        Returns:
+            List of {path, modified_time, size}.
+        """
+        n = min(n, self.recent_capacity)
+        with self._lock:
+            valid = self._valid_recent()
+            if len(valid) < min(n, len(self._files)):
+                # Too many entries were superseded or deleted; rebuild from the index
+                self._recent = heapq.nlargest(
+                    self.recent_capacity, ((m, p) for p, (m, _) in self._files.items())
+                )
+                heapq.heapify(self._recent)
+                self.stats["heap_rebuilds"] += 1
+                valid = self._valid_recent()
+            top = heapq.nlargest(n, valid)
+            return [
+                {
+                    "path": rel,
+                    "modified_time": datetime.fromtimestamp(mtime).isoformat(),
+                    "size": self._files[rel][1],
+                }
+                for mtime, rel in top
+            ]
+
+    def _valid_recent(self) -> List[Tuple[float, str]]:
+        """Heap entries still matching the index (one per file)."""
+        seen = set()
+        valid = []
+        for mtime, rel in self._recent:
+            current = self._files.get(rel)
+            if current is not None and current[0] == mtime and rel not in seen:
+                seen.add(rel)
+                valid.append((mtime, rel))
+        return valid
+
+    def tree(self, max_depth: int = 3, max_entries: int = 500) -> Tuple[List[str], bool]:
+        """Indented listing of the tree, directories before their contents.
+
+        Directories below ``max_depth`` are shown collapsed (``name/ ...``).
+
+        Args:
+            max_depth: Directory levels expanded below the root.
+            max_entries: Maximum lines returned.
+
+        Returns:
+            (lines, truncated) where truncated is True if a limit was hit.
+        """
+        lines: List[str] = []
+        truncated = False
+        with self._lock:
+            stack: List[Tuple[str, int, bool]] = [("", 0, True)]
+            while stack:
+                rel_dir, level, expand = stack.pop()
+                if len(lines) >= max_entries:
+                    truncated = True
+                    break
+                name = os.path.basename(rel_dir) if rel_dir else self.root.name
+                if not expand:
+                    lines.append(f"{'  ' * level}{name}/ ...")
+                    truncated = True
+                    continue
+                lines.append(f"{'  ' * level}{name}/")
+
+                indent = '  ' * (level + 1)
+                for file_name in sorted(self._dir_files.get(rel_dir, ())):
+                    if len(lines) >= max_entries:
+                        truncated = True
+                        break
+                    lines.append(f"{indent}{file_name}")
+
+                children = sorted(self._subdirs.get(rel_dir, ()), reverse=True)
+                for child in children:
+                    child_rel = os.path.join(rel_dir, child) if rel_dir else child
+                    stack.append((child_rel, level + 1, level + 1 <= max_depth))
+        return lines, truncated
+
+    # ==================== WATCHING ====================
+
+    def start_watching(self, poll_interval: float = 30.0) -> str:
+        """Keep the index current in the background.
+
+        Uses filesystem events if ``watchdog`` is installed, otherwise
+        rescans every ``poll_interval`` seconds in a daemon thread.
+
+        Args:
+            poll_interval: Seconds between rescans when polling.
+
+        Returns:
+            "events" or "polling".
+        """
+        self.ensure_built()
+        if WATCHDOG_AVAILABLE:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_IndexEventHandler(self), str(self.root), recursive=True)
+                self._observer.daemon = True
+                self._observer.start()
+                logger.info("file_index_watching", root=str(self.root), mode="events")
+                return "events"
+            except Exception as e:
+                logger.warning("file_index_watch_failed", error=str(e))
+                self._observer = None
+
+        self._stop_event.clear()
+        self._poller = threading.Thread(
+            target=self._poll_loop, args=(poll_interval,), name="file-index-poll", daemon=True
+        )
+        self._poller.start()
+        logger.info("file_index_watching", root=str(self.root), mode="polling", interval=poll_interval)
+        return "polling"
+
+    def stop_watching(self) -> None:
+        """Stop event handling or polling."""
+        self._stop_event.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        if self._poller is not None:
+            self._poller.join(timeout=1)
+            self._poller = None
+
+    def _poll_loop(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.scan()
+            except Exception as e:
+                logger.warning("file_index_scan_failed", root=str(self.root), error=str(e))
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events that can change the index to ``FileIndex.update``."""
+
+    def __init__(self, index: FileIndex):
+        super().__init__()
+        self.index = index
+
+    def on_any_event(self, event) -> None:
+        if event.event_type not in INDEX_EVENT_TYPES:
+            return
+        self.index.update(event.src_path)
+        dest = getattr(event, "dest_path", None)
+        if dest:
+            self.index.update(dest)
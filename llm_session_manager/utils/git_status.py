@@ -0,0 +1,312 @@
+"""Cached, asynchronous git status and log for session working directories.
+
+``git status --porcelain=v2 --branch`` reports the branch, upstream,
+ahead/behind counts and every changed path in one process, so a status
+needs a single ``git`` invocation instead of three. Results are cached per
+repository, keyed on the mtimes of the files git rewrites when the status
+can change (``.git/index``, ``HEAD`` and the checked-out branch ref), and
+reused for up to ``ttl`` seconds while that key is unchanged. The TTL
+bounds staleness from unstaged edits, which do not touch the index.
+
+Subprocesses run with ``asyncio.create_subprocess_exec`` and
+``--no-optional-locks``, so polling neither blocks the event loop nor
+rewrites the index (which would change the cache key). Concurrent callers
+for the same repository share one in-flight ``git`` process.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+PathLike = Union[str, Path]
+FIELD_SEP = "\x1f"
+
+
+def find_git_dir(path: PathLike) -> Optional[Path]:
+    """Locate the git directory of the repository containing ``path``.
+
+    Handles ``.git`` files (worktrees and submodules) that point elsewhere.
+
+    Args:
+        path: A directory inside a working tree.
+
+    Returns:
+        The git directory, or None if ``path`` is not inside a repository.
+    """
+    current = Path(path).resolve()
+    for directory in (current, *current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                return (directory / content[len("gitdir:"):].strip()).resolve()
+            return None
+    return None
+
+
+def parse_porcelain_v2(output: str) -> Dict[str, Any]:
+    """Parse ``git status --porcelain=v2 --branch -z`` output.
+
+    Args:
+        output: NUL-separated status records.
+
+    Returns:
+        Dict with branch, commit, upstream, ahead, behind, staged, modified,
+        untracked, conflicted and is_clean.
+    """
+    status: Dict[str, Any] = {
+        "branch": None,
+        "commit": None,
+        "upstream": None,
+        "ahead": 0,
+        "behind": 0,
+        "staged": [],
+        "modified": [],
+        "untracked": [],
+        "conflicted": [],
+    }
+
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+
+        if kind == "#":
+            _, key, *values = record.split(" ")
+            if key == "branch.head":
+                status["branch"] = "HEAD" if values[0] == "(detached)" else values[0]
+            elif key == "branch.oid":
+                status["commit"] = None if values[0] == "(initial)" else values[0]
+            elif key == "branch.upstream":
+                status["upstream"] = values[0]
+            elif key == "branch.ab":
+                status["ahead"] = int(values[0])
+                status["behind"] = -int(values[1])
+        elif kind == "1":
+            fields = record.split(" ", 8)
+            _add_change(status, fields[1], fields[8])
+        elif kind == "2":
+            # Rename/copy: the original path follows as its own record
+            fields = record.split(" ", 9)
+            _add_change(status, fields[1], fields[9])
+            i += 1
+        elif kind == "u":
+            status["conflicted"].append(record.split(" ", 10)[10])
+        elif kind == "?":
+            status["untracked"].append(record[2:])
+
+    status["is_clean"] = not (status["staged"] or status["modified"]
+                              or status["untracked"] or status["conflicted"])
+    return status
+
+
+def _add_change(status: Dict[str, Any], xy: str, path: str) -> None:
+    if xy[0] != ".":
+        status["staged"].append(path)
+    if xy[1] != ".":
+        status["modified"].append(path)
+
+
+class GitStatusProvider:
+    """Asynchronous ``git status``/``git log`` with a per-repository cache.
+
+    One provider can be shared by any number of sessions; entries are keyed
+    by working directory. Returned dicts are shared with the cache and must
+    be treated as read-only.
+
+    Example:
+        git = GitStatusProvider(ttl=5.0)
+        status = await git.status("/path/to/repo")
+        commits = await git.log("/path/to/repo", limit=10)
+    """
+
+    def __init__(self, ttl: float = 5.0, timeout: float = 5.0):
+        """Initialize an empty cache.
+
+        Args:
+            ttl: Seconds a result is reused while its repository key is unchanged.
+            timeout: Seconds before a ``git`` process is killed.
+        """
+        self.ttl = ttl
+        self.timeout = timeout
+        self.stats = {"hits": 0, "misses": 0}
+        self._git_dirs: Dict[str, Optional[Path]] = {}
+        self._cache: Dict[Tuple, Tuple[Tuple, float, Dict[str, Any]]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+    async def status(self, path: PathLike) -> Dict[str, Any]:
+        """Status of the repository containing ``path``.
+
+        Args:
+            path: Working directory.
+
+        Returns:
+            ``parse_porcelain_v2`` fields, or {"error": ...}.
+        """
+        return await self._cached(
+            ("status", str(path)), path,
+            ["status", "--porcelain=v2", "--branch", "-z"],
+            parse_porcelain_v2,
+        )
+
+    async def log(self, path: PathLike, limit: int = 10) -> Dict[str, Any]:
+        """Most recent commits of the repository containing ``path``.
+
+        Args:
+            path: Working directory.
+            limit: Number of commits.
+
+        Returns:
+            Dict with commits (hash, author, email, date, message) and count,
+            or {"error": ...}.
+        """
+        fmt = FIELD_SEP.join(["%H", "%an", "%ae", "%ad", "%s"])
+        return await self._cached(
+            ("log", str(path), int(limit)), path,
+            ["log", f"-{int(limit)}", f"--pretty=format:{fmt}"],
+            _parse_log,
+        )
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Drop cached results for ``path`` (default: all repositories)."""
+        if path is None:
+            self._cache.clear()
+            return
+        for key in [k for k in self._cache if k[1] == str(path)]:
+            del self._cache[key]
+
+    def _repo_key(self, path: PathLike) -> Optional[Tuple]:
+        """Mtimes of the index, HEAD and the checked-out ref (None outside a repo)."""
+        path = str(path)
+        if path not in self._git_dirs:
+            self._git_dirs[path] = find_git_dir(path)
+        git_dir = self._git_dirs[path]
+        if git_dir is None:
+            return None
+
+        key = [_mtime(git_dir / "index"), _mtime(git_dir / "HEAD")]
+        try:
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            head = ""
+        if head.startswith("ref:"):
+            ref = head[4:].strip()
+            key += [ref, _mtime(git_dir / ref), _mtime(git_dir / "packed-refs")]
+            common = _common_dir(git_dir)
+            if common != git_dir:
+                key += [_mtime(common / ref), _mtime(common / "packed-refs")]
+        else:
+            key.append(head)
+        return tuple(key)
+
+    async def _cached(self, cache_key: Tuple, path: PathLike, args: List[str], parse) -> Dict[str, Any]:
+        if not Path(path).exists():
+            return {"error": "Working directory not found"}
+        repo_key = self._repo_key(path)
+        if repo_key is None:
+            return {"error": "Not a git repository"}
+
+        entry = self._cache.get(cache_key)
+        if entry and entry[0] == repo_key and time.monotonic() - entry[1] < self.ttl:
+            self.stats["hits"] += 1
+            return entry[2]
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            self.stats["hits"] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await self._run(path, args, parse)
+            if "error" not in result:
+                self._cache[cache_key] = (repo_key, time.monotonic(), result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[cache_key]
+
+    async def _run(self, path: PathLike, args: List[str], parse) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git", "--no-optional-locks", *args,
+                cwd=str(path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            logger.error("git_spawn_failed", error=str(e))
+            return {"error": str(e)}
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.warning("git_timeout", command=args[0], path=str(path))
+            return {"error": f"git {args[0]} timed out"}
+
+        if process.returncode != 0:
+            message = stderr.decode("utf-8", "replace").strip()
+            logger.debug("git_failed", command=args[0], path=str(path), error=message)
+            return {"error": message or f"git {args[0]} failed"}
+
+        logger.debug("git_completed", command=args[0], path=str(path),
+                     ms=round((time.perf_counter() - started) * 1000, 1))
+        return parse(stdout.decode("utf-8", "replace"))
+
+
+def _parse_log(output: str) -> Dict[str, Any]:
+    commits = []
+    for line in output.split("\n"):
+        parts = line.split(FIELD_SEP)
+        if len(parts) == 5:
+            commits.append({
+                "hash": parts[0],
+                "author": parts[1],
+                "email": parts[2],
+                "date": parts[3],
+                "message": parts[4],
+            })
+    return {"commits": commits, "count": len(commits)}
+
+
+def _mtime(path: Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """Shared git directory of a linked worktree (the git dir itself otherwise)."""
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    return (git_dir / common).resolve()
@@ -1,7 +1,8 @@
 """Smart recommendations engine for session management."""
 
+import bisect
 from datetime import datetime, timedelta
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable, Optional, Set
 import structlog
 
 from ..models import Session, SessionStatus
@@ -26,10 +27,168 @@ class RecommendationEngine:
     CRITICAL_HEALTH = 0.30  # 30% health score
     IDLE_THRESHOLD_MINUTES = 30  # Consider idle after 30 minutes
 
+    # Session fields that recommendations depend on (besides idle time)
+    _SIGNATURE_FIELDS = (
+        "status", "health_score", "token_count", "token_limit",
+        "error_count", "project_name", "last_activity",
+    )
+
     def __init__(self):
-        """Initialize recommendation engine."""
+        """Initialize recommendation engine.
+
+        The engine keeps inverted indexes (project -> sessions, tag ->
+        sessions) and per-session recommendations that are updated as
+        sessions change, so repeated analysis of a mostly unchanged session
+        list only recomputes what changed.
+        """
         self.logger = structlog.get_logger()
 
+        self._sessions: Dict[str, Session] = {}
+        self._signatures: Dict[str, Tuple] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+        # Inverted indexes
+        self._by_project: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._active: Set[str] = set()
+
+        # Cached recommendations: per session, per project, per tag
+        self._session_recs: Dict[str, List[Dict[str, Any]]] = {}
+        self._project_recs: Dict[str, Dict[str, Any]] = {}
+        self._tag_recs: Dict[str, Dict[str, Any]] = {}
+        self._dirty_projects: Set[str] = set()
+        self._dirty_tags: Set[str] = set()
+
+        # Sorted (last_activity, id) for idle detection and
+        # (-base score, first seen, id) for ranking
+        self._by_activity: List[Tuple[datetime, str]] = []
+        self._by_base_score: List[Tuple[float, int, str]] = []
+        self._base_scores: Dict[str, float] = {}
+
+        # Last emitted recommendations for diffs
+        self.version = 0
+        self._emitted: Dict[str, Dict[str, Any]] = {}
+        self._previous: Dict[str, Dict[str, Any]] = {}
+
+    # ==================== INDEX MAINTENANCE ====================
+
+    def _signature(self, session: Session) -> Tuple:
+        """Values of a session that recommendations depend on."""
+        return tuple(getattr(session, name) for name in self._SIGNATURE_FIELDS) + (tuple(session.tags),)
+
+    @staticmethod
+    def _base_score(session: Session) -> float:
+        """Task-independent part of the best-session score (health and tokens)."""
+        token_available = 1 - (session.calculate_token_usage_percent() / 100)
+        return (session.health_score / 100) * 0.4 + token_available * 0.3
+
+    def upsert_session(self, session: Session) -> bool:
+        """Add or update a session in the indexes.
+
+        Args:
+            session: Session to index.
+
+        Returns:
+            True if the session was new or changed.
+        """
+        signature = self._signature(session)
+        old = self._sessions.get(session.id)
+        if old is not None and self._signatures[session.id] == signature:
+            self._sessions[session.id] = session
+            return False
+
+        if old is not None:
+            self._unindex(session.id)
+        else:
+            self._order[session.id] = self._next_order
+            self._next_order += 1
+
+        self._sessions[session.id] = session
+        self._signatures[session.id] = signature
+
+        if session.project_name:
+            self._by_project.setdefault(session.project_name, set()).add(session.id)
+            self._dirty_projects.add(session.project_name)
+        for tag in set(session.tags):
+            self._by_tag.setdefault(tag, set()).add(session.id)
+            self._dirty_tags.add(tag)
+        if session.status == SessionStatus.ACTIVE:
+            self._active.add(session.id)
+
+        self._session_recs[session.id] = self._static_recommendations(session)
+        bisect.insort(self._by_activity, (session.last_activity, session.id))
+        self._base_scores[session.id] = self._base_score(session)
+        bisect.insort(self._by_base_score, (-self._base_scores[session.id], self._order[session.id], session.id))
+        return True
+
+    def remove_session(self, session_id: str) -> bool:
+        """Remove a session from the indexes.
+
+        Args:
+            session_id: ID of the session to remove.
+
+        Returns:
+            True if the session was indexed.
+        """
+        if session_id not in self._sessions:
+            return False
+        self._unindex(session_id)
+        del self._sessions[session_id]
+        del self._signatures[session_id]
+        del self._order[session_id]
+        return True
+
+    def _unindex(self, session_id: str) -> None:
+        """Remove a session's entries from every index (not from _sessions)."""
+        signature = self._signatures[session_id]
+        last_activity = signature[self._SIGNATURE_FIELDS.index("last_activity")]
+        project = signature[self._SIGNATURE_FIELDS.index("project_name")]
+
+        if project:
+            members = self._by_project.get(project, set())
+            members.discard(session_id)
+            if not members:
+                self._by_project.pop(project, None)
+            self._dirty_projects.add(project)
+        for tag in set(signature[-1]):
+            members = self._by_tag.get(tag, set())
+            members.discard(session_id)
+            if not members:
+                self._by_tag.pop(tag, None)
+            self._dirty_tags.add(tag)
+        self._active.discard(session_id)
+        self._session_recs.pop(session_id, None)
+
+        self._remove_sorted(self._by_activity, (last_activity, session_id))
+        base_score = self._base_scores.pop(session_id)
+        self._remove_sorted(self._by_base_score, (-base_score, self._order[session_id], session_id))
+
+    @staticmethod
+    def _remove_sorted(items: List[Tuple], item: Tuple) -> None:
+        """Remove an item from a sorted list by bisection."""
+        index = bisect.bisect_left(items, item)
+        if index < len(items) and items[index] == item:
+            del items[index]
+
+    def sync(self, sessions: List[Session]) -> Set[str]:
+        """Bring the indexes in line with a full session list.
+
+        Args:
+            sessions: Current sessions; indexed sessions not in the list are removed.
+
+        Returns:
+            IDs of sessions that were added, changed or removed.
+        """
+        changed = {s.id for s in sessions if self.upsert_session(s)}
+        current = {s.id for s in sessions}
+        for session_id in [sid for sid in self._sessions if sid not in current]:
+            self.remove_session(session_id)
+            changed.add(session_id)
+        return changed
+
+    # ==================== RECOMMENDATIONS ====================
+
     def analyze_sessions(self, sessions: List[Session]) -> List[Dict[str, Any]]:
         """Analyze all sessions and generate recommendations.
 
@@ -38,20 +197,50 @@ class RecommendationEngine:
 
         Returns:
             List of recommendation dictionaries with:
+                - id: str (stable key, e.g. "restart_tokens:<session id>")
                 - type: str (restart, close, merge, switch, warning)
                 - priority: str (high, medium, low)
                 - session_ids: List[str]
                 - message: str
                 - reason: str
         """
+        self.sync(sessions)
+        return self.current_recommendations()
+
+    def current_recommendations(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Recommendations for the indexed sessions.
+
+        Only projects and tags whose membership changed since the last call
+        are re-evaluated.
+
+        Args:
+            now: Reference time for idle detection (default: now).
+
+        Returns:
+            Recommendations sorted by priority.
+        """
+        now = now or datetime.now()
+        self._refresh_relationships()
+
         recommendations = []
+        for session_id in sorted(self._session_recs, key=self._order.__getitem__):
+            recommendations.extend(self._session_recs[session_id])
+        recommendations.extend(self._idle_recommendations(now))
+        recommendations.extend(self._project_recs[p] for p in self._sorted_groups(self._project_recs, self._by_project))
 
-        # Analyze each session individually
-        for session in sessions:
-            recommendations.extend(self._analyze_single_session(session))
+        if len(self._active) >= 5:
+            active_ids = self._ordered(self._active)
+            recommendations.append({
+                "id": "too_many_active",
+                "type": "warning",
+                "priority": "medium",
+                "session_ids": active_ids,
+                "message": f"{len(active_ids)} concurrent active sessions",
+                "reason": "Managing many sessions can be overwhelming",
+                "action": "Consider closing or consolidating some sessions"
+            })
 
-        # Analyze relationships between sessions
-        recommendations.extend(self._analyze_session_relationships(sessions))
+        recommendations.extend(self._tag_recs[t] for t in self._sorted_groups(self._tag_recs, self._by_tag))
 
         # Sort by priority
         priority_order = {"high": 0, "medium": 1, "low": 2}
@@ -59,9 +248,130 @@ class RecommendationEngine:
 
         return recommendations
 
+    def diff(self, since_version: Optional[int] = None, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Changes in recommendations since a version seen by the caller.
+
+        The engine remembers the current and the previous emitted version,
+        so a consumer polling regularly receives only what changed.
+        Recommendations are matched by their ``id``.
+
+        Args:
+            since_version: Version the caller last saw (None for a full list).
+            now: Reference time for idle detection.
+
+        Returns:
+            Dict with version, reset (True when the full list is sent as
+            ``added``), added, changed and removed (recommendation IDs).
+        """
+        current = {rec["id"]: rec for rec in self.current_recommendations(now)}
+        if current != self._emitted:
+            self._previous = self._emitted
+            self._emitted = current
+            self.version += 1
+
+        if since_version == self.version:
+            base = current
+        elif since_version is not None and since_version == self.version - 1:
+            base = self._previous
+        else:
+            return {
+                "version": self.version,
+                "reset": True,
+                "added": list(current.values()),
+                "changed": [],
+                "removed": [],
+            }
+
+        return {
+            "version": self.version,
+            "reset": False,
+            "added": [rec for key, rec in current.items() if key not in base],
+            "changed": [rec for key, rec in current.items() if key in base and base[key] != rec],
+            "removed": [key for key in base if key not in current],
+        }
+
+    def _ordered(self, session_ids: Iterable[str]) -> List[str]:
+        """Session IDs in first-seen order."""
+        return sorted(session_ids, key=self._order.__getitem__)
+
+    def _sorted_groups(self, recs: Dict[str, Dict[str, Any]], index: Dict[str, Set[str]]) -> List[str]:
+        """Group keys with a recommendation, ordered by their first-seen member."""
+        return sorted(recs, key=lambda key: min(self._order[sid] for sid in index[key]))
+
+    def _refresh_relationships(self) -> None:
+        """Recompute merge recommendations for projects and tags that changed."""
+        for project in self._dirty_projects:
+            members = self._by_project.get(project, set())
+            if len(members) >= 2:
+                self._project_recs[project] = self._project_recommendation(project, self._ordered(members))
+            else:
+                self._project_recs.pop(project, None)
+        self._dirty_projects.clear()
+
+        for tag in self._dirty_tags:
+            members = self._by_tag.get(tag, set())
+            if len(members) >= 3:
+                self._tag_recs[tag] = self._tag_recommendation(tag, self._ordered(members))
+            else:
+                self._tag_recs.pop(tag, None)
+        self._dirty_tags.clear()
+
+    def _project_recommendation(self, project: str, session_ids: List[str]) -> Dict[str, Any]:
+        """Merge recommendation for sessions sharing a project."""
+        project_sessions = [self._sessions[sid] for sid in session_ids]
+        # Find the healthiest session
+        best_session = max(project_sessions, key=lambda s: s.health_score)
+        return {
+            "id": f"merge_project:{project}",
+            "type": "merge",
+            "priority": "medium",
+            "session_ids": session_ids,
+            "message": f"Multiple sessions for project '{project}'",
+            "reason": f"Found {len(project_sessions)} sessions working on same project",
+            "action": f"Consider consolidating into session {best_session.id[:20]} (healthiest)"
+        }
+
+    @staticmethod
+    def _tag_recommendation(tag: str, session_ids: List[str]) -> Dict[str, Any]:
+        """Merge recommendation for sessions sharing a tag."""
+        return {
+            "id": f"merge_tag:{tag}",
+            "type": "merge",
+            "priority": "low",
+            "session_ids": session_ids,
+            "message": f"Multiple sessions with tag '#{tag}'",
+            "reason": f"Found {len(session_ids)} sessions with similar context",
+            "action": "Consider merging if working on related tasks"
+        }
+
+    def _idle_recommendations(self, now: datetime) -> List[Dict[str, Any]]:
+        """Close recommendations for sessions idle 2+ hours (a prefix of the activity index)."""
+        cutoff = bisect.bisect_right(self._by_activity, (now - timedelta(hours=2), "\uffff"))
+        recommendations = []
+        for _, session_id in self._by_activity[:cutoff]:
+            rec = self._idle_recommendation(self._sessions[session_id], now)
+            if rec:
+                recommendations.append(rec)
+        return recommendations
+
     def _analyze_single_session(self, session: Session) -> List[Dict[str, Any]]:
         """Analyze a single session for issues.
 
+        Args:
+            session: Session to analyze.
+
+        Returns:
+            List of recommendations for this session.
+        """
+        recommendations = self._static_recommendations(session)
+        idle = self._idle_recommendation(session, datetime.now())
+        if idle:
+            recommendations.append(idle)
+        return recommendations
+
+    def _static_recommendations(self, session: Session) -> List[Dict[str, Any]]:
+        """Token, health and error recommendations (independent of the clock).
+
         Args:
             session: Session to analyze.
 
@@ -74,6 +384,7 @@ class RecommendationEngine:
         token_pct = session.calculate_token_usage_percent() / 100
         if token_pct >= self.CRITICAL_TOKEN_USAGE:
             recommendations.append({
+                "id": f"restart_tokens:{session.id}",
                 "type": "restart",
                 "priority": "high",
                 "session_ids": [session.id],
@@ -83,6 +394,7 @@ class RecommendationEngine:
             })
         elif token_pct >= self.HIGH_TOKEN_USAGE:
             recommendations.append({
+                "id": f"warn_tokens:{session.id}",
                 "type": "warning",
                 "priority": "medium",
                 "session_ids": [session.id],
@@ -95,6 +407,7 @@ class RecommendationEngine:
         health_score = session.health_score / 100
         if health_score <= self.CRITICAL_HEALTH:
             recommendations.append({
+                "id": f"restart_health:{session.id}",
                 "type": "restart",
                 "priority": "high",
                 "session_ids": [session.id],
@@ -104,6 +417,7 @@ class RecommendationEngine:
             })
         elif health_score <= self.LOW_HEALTH:
             recommendations.append({
+                "id": f"warn_health:{session.id}",
                 "type": "warning",
                 "priority": "medium",
                 "session_ids": [session.id],
@@ -112,23 +426,10 @@ class RecommendationEngine:
                 "action": "Monitor closely or consider restarting"
             })
 
-        # Idle session detection
-        idle_time = datetime.now() - session.last_activity
-        if idle_time > timedelta(minutes=self.IDLE_THRESHOLD_MINUTES):
-            idle_hours = idle_time.total_seconds() / 3600
-            if idle_hours >= 2:
-                recommendations.append({
-                    "type": "close",
-                    "priority": "low",
-                    "session_ids": [session.id],
-                    "message": f"Session idle for {idle_hours:.1f} hours",
-                    "reason": "Long idle time - consider closing to free resources",
-                    "action": "Export context and close session if no longer needed"
-                })
-
         # Error accumulation
         if session.error_count >= 10:
             recommendations.append({
+                "id": f"restart_errors:{session.id}",
                 "type": "restart",
                 "priority": "medium",
                 "session_ids": [session.id],
@@ -139,131 +440,48 @@ class RecommendationEngine:
 
         return recommendations
 
-    def _analyze_session_relationships(self, sessions: List[Session]) -> List[Dict[str, Any]]:
-        """Analyze relationships between sessions.
-
-        Args:
-            sessions: List of all sessions.
-
-        Returns:
-            List of recommendations for session relationships.
-        """
-        recommendations = []
-
-        if len(sessions) <= 1:
-            return recommendations
-
-        # Check for sessions in same project
-        project_groups: Dict[str, List[Session]] = {}
-        for session in sessions:
-            if session.project_name:
-                if session.project_name not in project_groups:
-                    project_groups[session.project_name] = []
-                project_groups[session.project_name].append(session)
-
-        # Recommend merging sessions in same project
-        for project, project_sessions in project_groups.items():
-            if len(project_sessions) >= 2:
-                # Find the healthiest session
-                best_session = max(project_sessions, key=lambda s: s.health_score)
-                other_sessions = [s for s in project_sessions if s.id != best_session.id]
-
-                recommendations.append({
-                    "type": "merge",
-                    "priority": "medium",
-                    "session_ids": [s.id for s in project_sessions],
-                    "message": f"Multiple sessions for project '{project}'",
-                    "reason": f"Found {len(project_sessions)} sessions working on same project",
-                    "action": f"Consider consolidating into session {best_session.id[:20]} (healthiest)"
-                })
-
-        # Check for too many concurrent sessions
-        active_sessions = [s for s in sessions if s.status == SessionStatus.ACTIVE]
-        if len(active_sessions) >= 5:
-            recommendations.append({
-                "type": "warning",
-                "priority": "medium",
-                "session_ids": [s.id for s in active_sessions],
-                "message": f"{len(active_sessions)} concurrent active sessions",
-                "reason": "Managing many sessions can be overwhelming",
-                "action": "Consider closing or consolidating some sessions"
-            })
-
-        # Check for sessions with similar tags
-        tag_groups: Dict[str, List[Session]] = {}
-        for session in sessions:
-            for tag in session.tags:
-                if tag not in tag_groups:
-                    tag_groups[tag] = []
-                tag_groups[tag].append(session)
-
-        for tag, tag_sessions in tag_groups.items():
-            if len(tag_sessions) >= 3:
-                recommendations.append({
-                    "type": "merge",
+    def _idle_recommendation(self, session: Session, now: datetime) -> Optional[Dict[str, Any]]:
+        """Close recommendation if the session has been idle for 2+ hours."""
+        # Idle session detection
+        idle_time = now - session.last_activity
+        if idle_time > timedelta(minutes=self.IDLE_THRESHOLD_MINUTES):
+            idle_hours = idle_time.total_seconds() / 3600
+            if idle_hours >= 2:
+                return {
+                    "id": f"close_idle:{session.id}",
+                    "type": "close",
                     "priority": "low",
-                    "session_ids": [s.id for s in tag_sessions],
-                    "message": f"Multiple sessions with tag '#{tag}'",
-                    "reason": f"Found {len(tag_sessions)} sessions with similar context",
-                    "action": "Consider merging if working on related tasks"
-                })
+                    "session_ids": [session.id],
+                    "message": f"Session idle for {idle_hours:.1f} hours",
+                    "reason": "Long idle time - consider closing to free resources",
+                    "action": "Export context and close session if no longer needed"
+                }
+        return None
 
-        return recommendations
+    # ==================== BEST SESSION ====================
 
     def get_best_session_for_task(
         self,
-        sessions: List[Session],
+        sessions: Optional[List[Session]] = None,
         task_tags: List[str] = None,
         project_name: str = None
     ) -> Tuple[Session, str]:
         """Recommend the best session for a new task.
 
         Args:
-            sessions: Available sessions.
+            sessions: Available sessions (None to use the indexed sessions).
             task_tags: Tags related to the task.
             project_name: Project name for the task.
 
         Returns:
             Tuple of (best_session, reason) or (None, reason) if should start new.
         """
-        if not sessions:
+        if sessions is not None:
+            self.sync(sessions)
+        if not self._sessions:
             return None, "No active sessions - start a new one"
 
-        candidates = []
-
-        for session in sessions:
-            score = 0.0
-            reasons = []
-
-            # Health score contributes 40%
-            health_factor = session.health_score / 100
-            score += health_factor * 0.4
-            if health_factor > 0.7:
-                reasons.append("healthy")
-
-            # Token availability contributes 30%
-            token_available = 1 - (session.calculate_token_usage_percent() / 100)
-            score += token_available * 0.3
-            if token_available > 0.5:
-                reasons.append("low token usage")
-
-            # Project match contributes 20%
-            if project_name and session.project_name == project_name:
-                score += 0.2
-                reasons.append("same project")
-
-            # Tag overlap contributes 10%
-            if task_tags and session.tags:
-                tag_overlap = len(set(task_tags) & set(session.tags)) / len(task_tags)
-                score += tag_overlap * 0.1
-                if tag_overlap > 0:
-                    reasons.append("matching tags")
-
-            candidates.append((session, score, reasons))
-
-        # Sort by score
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        best_session, best_score, reasons = candidates[0]
+        best_session, best_score, reasons = self.top_sessions_for_task(task_tags, project_name, k=1)[0]
 
         # Only recommend if score is decent
         if best_score >= 0.5:
@@ -272,6 +490,78 @@ class RecommendationEngine:
         else:
             return None, f"Best session score too low ({best_score:.1%}) - start a new session"
 
+    def top_sessions_for_task(
+        self,
+        task_tags: Optional[List[str]] = None,
+        project_name: Optional[str] = None,
+        k: int = 3
+    ) -> List[Tuple[Session, float, List[str]]]:
+        """Top-k indexed sessions for a task.
+
+        Score: health 40%, token availability 30%, project match 20%, tag
+        overlap 10%. Only sessions found through the project and tag indexes
+        can earn the task bonus; the rest are ranked by their precomputed
+        health/token score, so only the first k of those are looked at.
+
+        Args:
+            task_tags: Tags related to the task.
+            project_name: Project name for the task.
+            k: Number of sessions to return.
+
+        Returns:
+            List of (session, score, reasons), best first.
+        """
+        task_tags = list(dict.fromkeys(task_tags or []))
+        candidate_ids = set(self._by_project.get(project_name, ())) if project_name else set()
+        for tag in task_tags:
+            candidate_ids.update(self._by_tag.get(tag, ()))
+
+        scored = [self._score(self._sessions[sid], task_tags, project_name) for sid in candidate_ids]
+
+        # Best sessions without task bonus, from the base-score index
+        taken = 0
+        for _, _, session_id in self._by_base_score:
+            if taken >= k:
+                break
+            if session_id not in candidate_ids:
+                scored.append(self._score(self._sessions[session_id], task_tags, project_name))
+                taken += 1
+
+        scored.sort(key=lambda item: (-item[1], self._order[item[0].id]))
+        return scored[:k]
+
+    @staticmethod
+    def _score(session: Session, task_tags: List[str], project_name: Optional[str]) -> Tuple[Session, float, List[str]]:
+        """Score one session for a task."""
+        score = 0.0
+        reasons = []
+
+        # Health score contributes 40%
+        health_factor = session.health_score / 100
+        score += health_factor * 0.4
+        if health_factor > 0.7:
+            reasons.append("healthy")
+
+        # Token availability contributes 30%
+        token_available = 1 - (session.calculate_token_usage_percent() / 100)
+        score += token_available * 0.3
+        if token_available > 0.5:
+            reasons.append("low token usage")
+
+        # Project match contributes 20%
+        if project_name and session.project_name == project_name:
+            score += 0.2
+            reasons.append("same project")
+
+        # Tag overlap contributes 10%
+        if task_tags and session.tags:
+            tag_overlap = len(set(task_tags) & set(session.tags)) / len(task_tags)
+            score += tag_overlap * 0.1
+            if tag_overlap > 0:
+                reasons.append("matching tags")
+
+        return session, score, reasons
+
     def format_recommendations(self, recommendations: List[Dict[str, Any]]) -> str:
         """Format recommendations as a readable string.
 
@@ -0,0 +1,153 @@
+"""On-disk TTL cache for parsed LLM responses.
+
+AI tagging and description generation are deterministic enough that an
+unchanged project should not pay for the same call twice. Responses are
+keyed by a fingerprint of the gathered context (sampled file paths and
+content hashes, existing tags, other prompt inputs) and expire after a TTL.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+class PreparedRequest(NamedTuple):
+    """A prompt ready to send, with the fingerprint its response is cached under.
+
+    Attributes:
+        prompt: User prompt.
+        fingerprint: Context fingerprint (see context_fingerprint).
+        extensions: File extensions of the sampled context, if relevant.
+    """
+
+    prompt: str
+    fingerprint: str
+    extensions: Optional[List[str]] = None
+
+
+def context_fingerprint(kind: str, context: Dict[str, Any], **params: Any) -> str:
+    """Fingerprint gathered context for cache lookups.
+
+    File contents are reduced to SHA-256 hashes; sets are sorted so the
+    fingerprint does not depend on walk order.
+
+    Args:
+        kind: Namespace such as "tags" or "description".
+        context: Context dict; ``files`` is a list of {path, content}.
+        **params: Other inputs that change the response (model, limits).
+
+    Returns:
+        Hex fingerprint.
+    """
+    def normalize(value: Any) -> Any:
+        if isinstance(value, (set, frozenset)):
+            return sorted(normalize(v) for v in value)
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+
+    normalized = {k: normalize(v) for k, v in context.items() if k != "files"}
+    normalized["files"] = sorted(
+        (f["path"], hashlib.sha256(f["content"].encode("utf-8", "replace")).hexdigest())
+        for f in context.get("files", [])
+    )
+
+    payload = json.dumps(
+        {"kind": kind, "params": normalize(params), "context": normalized},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """File-per-entry JSON cache with a time-to-live.
+
+    Example:
+        cache = ResponseCache("data/ai_cache")
+        tags = cache.get(fingerprint)
+        if tags is None:
+            tags = call_llm()
+            cache.set(fingerprint, tags)
+    """
+
+    def __init__(self, cache_dir: str = "data/ai_cache", ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """Initialize cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per entry (created on
+                first write).
+            ttl_seconds: Age after which entries are ignored and removed.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on miss or expiry."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug("response_cache_unreadable", key=key, error=str(e))
+            self.stats["misses"] += 1
+            return None
+
+        if time.time() - entry.get("created", 0) > self.ttl_seconds:
+            self.stats["misses"] += 1
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+        self.stats["hits"] += 1
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under a key."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._entry_path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"created": time.time(), "value": value}, f)
+            # Atomic so concurrent readers never see a partial entry
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("response_cache_write_failed", key=key, error=str(e))
+
+    def clear(self) -> int:
+        """Delete all entries.
+
+        Returns:
+            Number of entries deleted.
+        """
+        removed = 0
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
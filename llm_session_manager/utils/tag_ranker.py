@@ -0,0 +1,294 @@
+"""Learned re-ranking of tag suggestions from accept/reject feedback.
+
+Every accepted or rejected suggestion is recorded in the ``tag_feedback``
+table. Instead of aggregating that table per tag at suggestion time, the
+ranker keeps acceptance counts in memory, keyed by tag, by (tag, source)
+and by (tag, source, file extension), so ranking a list of candidates is
+pure dictionary lookups. Counts are loaded once (a JSON snapshot plus any
+feedback rows newer than it), updated as feedback is recorded, and written
+back periodically.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+STATE_VERSION = 1
+
+# Counts key: (tag, source or None, extension or None) -> [accepted, total]
+_Key = Tuple[str, Optional[str], Optional[str]]
+
+
+class TagRanker:
+    """In-memory acceptance model used to re-rank and prune suggestions.
+
+    Acceptance rates are smoothed hierarchically: the global tag rate is
+    pulled towards a neutral prior, the per-source rate towards the tag
+    rate, and the per-extension rate towards the per-source rate, so sparse
+    contexts fall back to broader evidence.
+
+    Example:
+        ranker = TagRanker.load(db, "data/tag_ranker.json")
+        tags = ranker.rank(["python", "api"], source="ai", extensions=[".py"])
+        ranker.record(session.id, "python", True, source="ai", extensions=[".py"])
+        ranker.save()
+    """
+
+    def __init__(
+        self,
+        db=None,
+        state_path: Optional[str] = None,
+        prior: float = 0.5,
+        smoothing: float = 2.0,
+        prune_below: float = 0.2,
+        min_evidence: int = 3,
+        save_every: int = 20,
+        save_interval: float = 60.0
+    ):
+        """Initialize an empty ranker.
+
+        Args:
+            db: Database used to record feedback and catch up on new rows.
+            state_path: JSON snapshot path (no persistence if None).
+            prior: Acceptance rate assumed for tags without feedback.
+            smoothing: Pseudo-count pulling each level towards its parent.
+            prune_below: Drop tags whose rate falls below this...
+            min_evidence: ...once they have at least this much (tag, source) feedback.
+            save_every: Persist after this many unsaved updates.
+            save_interval: Or when unsaved updates are older than this (seconds).
+        """
+        self.db = db
+        self.state_path = Path(state_path) if state_path else None
+        self.prior = prior
+        self.smoothing = smoothing
+        self.prune_below = prune_below
+        self.min_evidence = min_evidence
+        self.save_every = save_every
+        self.save_interval = save_interval
+
+        self._counts: Dict[_Key, List[int]] = {}
+        self._last_feedback_id = 0
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db=None, state_path: Optional[str] = None, **kwargs) -> "TagRanker":
+        """Create a ranker from its snapshot plus feedback recorded since.
+
+        Args:
+            db: Database with the tag_feedback table.
+            state_path: JSON snapshot path.
+            **kwargs: Other TagRanker options.
+
+        Returns:
+            Loaded TagRanker.
+        """
+        ranker = cls(db=db, state_path=state_path, **kwargs)
+        ranker._load_state()
+        if ranker._catch_up():
+            ranker.save()
+        return ranker
+
+    def _catch_up(self) -> int:
+        """Apply feedback rows newer than the last one absorbed.
+
+        Returns:
+            Number of rows applied.
+        """
+        if self.db is None:
+            return 0
+        rows = self.db.get_tag_feedback_since(self._last_feedback_id)
+        for row in rows:
+            extensions = json.loads(row["file_extensions"]) if row["file_extensions"] else []
+            self._apply(row["suggested_tag"], bool(row["accepted"]), row["source"], extensions)
+            with self._lock:
+                self._last_feedback_id = max(self._last_feedback_id, row["id"])
+                self._unsaved += 1
+        return len(rows)
+
+    def _load_state(self) -> None:
+        """Read the JSON snapshot, ignoring a missing or incompatible file."""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get("version") != STATE_VERSION:
+                return
+            self._counts = {
+                (tag, source, ext): [accepted, total]
+                for tag, source, ext, accepted, total in state["counts"]
+            }
+            self._last_feedback_id = state["last_feedback_id"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("tag_ranker_state_unreadable", error=str(e))
+            self._counts = {}
+            self._last_feedback_id = 0
+
+    def save(self) -> None:
+        """Write the counts snapshot if there are unsaved updates."""
+        if not self.state_path:
+            return
+        with self._lock:
+            if not self._unsaved:
+                return
+            state = {
+                "version": STATE_VERSION,
+                "last_feedback_id": self._last_feedback_id,
+                "counts": [[tag, source, ext, c[0], c[1]] for (tag, source, ext), c in self._counts.items()],
+            }
+            self._unsaved = 0
+            self._last_save = time.monotonic()
+
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning("tag_ranker_save_failed", error=str(e))
+
+    def _apply(self, tag: str, accepted: bool, source: Optional[str], extensions: Iterable[str]) -> None:
+        """Add one feedback event to every key it contributes to."""
+        keys = [(tag, None, None), (tag, source, None)]
+        keys.extend((tag, source, ext) for ext in set(extensions))
+        with self._lock:
+            for key in keys:
+                counts = self._counts.setdefault(key, [0, 0])
+                counts[0] += int(accepted)
+                counts[1] += 1
+
+    def record(
+        self,
+        session_id: str,
+        tag: str,
+        accepted: bool,
+        source: str = "heuristic",
+        context_tags: Optional[List[str]] = None,
+        extensions: Optional[Iterable[str]] = None
+    ) -> None:
+        """Record feedback in the database and update the model incrementally.
+
+        Args:
+            session_id: Session the tag was suggested for.
+            tag: Suggested tag.
+            accepted: Whether the user accepted it.
+            source: Suggestion source (heuristic, ai, hybrid).
+            context_tags: Other tags present at the time.
+            extensions: Dominant file extensions of the session.
+        """
+        extensions = sorted(set(extensions or []))
+        caught_up = False
+        if self.db is not None:
+            row_id = self.db.add_tag_feedback(
+                session_id, tag, accepted, source,
+                context_tags=context_tags,
+                file_extensions=extensions or None
+            )
+            if row_id == self._last_feedback_id + 1:
+                self._last_feedback_id = row_id
+            else:
+                # Another process wrote feedback meanwhile: absorb its rows
+                # (and ours) so the snapshot's last id stays exact
+                caught_up = self._catch_up() > 0
+
+        if not caught_up:
+            self._apply(tag, accepted, source, extensions)
+            with self._lock:
+                self._unsaved += 1
+
+        with self._lock:
+            due = (self._unsaved >= self.save_every or
+                   time.monotonic() - self._last_save >= self.save_interval)
+        if due:
+            self.save()
+
+    def acceptance_rate(self, tag: str, source: Optional[str] = None, extensions: Iterable[str] = ()) -> float:
+        """Smoothed acceptance rate of a tag in a context.
+
+        Args:
+            tag: Tag to score.
+            source: Suggestion source, or None for all sources.
+            extensions: File extensions of the session.
+
+        Returns:
+            Rate between 0.0 and 1.0 (the prior without feedback).
+        """
+        def smoothed(key: _Key, parent: float) -> float:
+            accepted, total = self._counts.get(key, (0, 0))
+            return (accepted + parent * self.smoothing) / (total + self.smoothing)
+
+        rate = smoothed((tag, None, None), self.prior)
+        if source is None:
+            return rate
+        rate = smoothed((tag, source, None), rate)
+
+        accepted = total = 0
+        for ext in set(extensions):
+            counts = self._counts.get((tag, source, ext))
+            if counts:
+                accepted += counts[0]
+                total += counts[1]
+        if total:
+            rate = (accepted + rate * self.smoothing) / (total + self.smoothing)
+        return rate
+
+    def rank(
+        self,
+        candidates: Iterable[str],
+        source: str = "heuristic",
+        extensions: Iterable[str] = (),
+        scores: Optional[Dict[str, float]] = None,
+        max_tags: Optional[int] = None
+    ) -> List[str]:
+        """Re-rank candidate tags by relevance times learned acceptance.
+
+        Consistently rejected tags (rate below ``prune_below`` with at least
+        ``min_evidence`` feedback for this source) are dropped. Uses no I/O.
+
+        Args:
+            candidates: Tags in their original relevance order.
+            source: Suggestion source (heuristic, ai).
+            extensions: File extensions of the session.
+            scores: Relevance score per tag (default: decreasing with position).
+            max_tags: Maximum tags to return.
+
+        Returns:
+            Re-ranked tags.
+        """
+        candidates = list(dict.fromkeys(candidates))
+        extensions = set(extensions)
+        count = len(candidates)
+
+        ranked = []
+        for position, tag in enumerate(candidates):
+            rate = self.acceptance_rate(tag, source, extensions)
+            evidence = self._counts.get((tag, source, None), (0, 0))[1]
+            if evidence >= self.min_evidence and rate < self.prune_below:
+                continue
+
+            relevance = scores[tag] if scores and tag in scores else 1.0 - position / (2 * count)
+            # A neutral rate (the prior) leaves relevance unchanged
+            ranked.append((relevance * rate / self.prior, -position, tag))
+
+        ranked.sort(reverse=True)
+        return [tag for _, _, tag in ranked[:max_tags]]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Model size and persistence state."""
+        return {
+            "keys": len(self._counts),
+            "tags": sum(1 for _, source, _ in self._counts if source is None),
+            "unsaved": self._unsaved,
+            "last_feedback_id": self._last_feedback_id,
+        }
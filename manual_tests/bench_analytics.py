@@ -0,0 +1,215 @@
+"""Benchmark: team analytics endpoints on a large sessions table.
+
+Seeds a SQLite database (1M sessions across 10 teams by default) and times
+each analytics endpoint three ways:
+
+- previous: load every matching session through the ORM and aggregate in
+  Python (the endpoints before they moved to SQL)
+- GROUP BY: SQL aggregates over ``sessions`` (used when rollups are absent)
+- rollups: the trigger-maintained rollup tables
+
+Usage:
+    python manual_tests/bench_analytics.py [sessions] [db_path]
+
+Pass ``db_path`` to keep the seeded database for later runs.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path (settings must not point at the real database)
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import structlog
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import SessionModel, Team
+from app.rollups import TRIGGER_NAMES, install_rollups
+from app.routers import analytics
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+TEAMS = 10
+TYPES = ["claude_code", "cursor_cli", "copilot"]
+STATUSES = ["active", "completed", "completed", "completed", "failed", "idle"]
+
+
+def seed(db_path: Path, count: int) -> None:
+    """Create the schema and bulk-insert ``count`` sessions, then build rollups."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for name in TRIGGER_NAMES:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO teams (id, name) VALUES (?, ?)",
+        [(f"t{i}", f"Team {i}") for i in range(TEAMS)],
+    )
+
+    def rows(start, stop):
+        for i in range(start, stop):
+            started = now - timedelta(minutes=rng.randrange(90 * 24 * 60))
+            ended = started + timedelta(minutes=rng.randrange(1, 600))
+            yield (
+                f"s{i}", 1000 + i % 50000, rng.choice(TYPES), rng.choice(STATUSES),
+                started.isoformat(" "), ended.isoformat(" "), "/tmp",
+                rng.randrange(250_000), 200_000, round(rng.uniform(0, 100), 1),
+                f"project-{rng.randrange(40)}", f"t{i % TEAMS}",
+            )
+
+    for start in range(0, count, 100_000):
+        conn.executemany(
+            "INSERT INTO sessions (id, pid, type, status, start_time, last_activity, "
+            "working_directory, token_count, token_limit, health_score, project_name, team_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows(start, min(start + 100_000, count)),
+        )
+    conn.commit()
+    conn.close()
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        install_rollups(Base.metadata, conn)
+    print(f"  rollup backfill: {time.perf_counter() - started:.1f} s")
+    engine.dispose()
+
+
+def previous_team(db, team_id):
+    """Previous /team: every session loaded, counted in Python."""
+    sessions = db.query(SessionModel).filter(SessionModel.team_id == team_id).all()
+    projects = {}
+    for s in sessions:
+        project = projects.setdefault(s.project_name, [0, 0, 0.0])
+        project[0] += 1
+        project[1] += s.token_count
+        project[2] += s.health_score
+    return {
+        "total": len(sessions),
+        "active": sum(1 for s in sessions if s.status == "active"),
+        "tokens": sum(s.token_count for s in sessions),
+        "healthy": sum(1 for s in sessions if s.health_score >= 80),
+        "types": {t: sum(1 for s in sessions if s.type == t) for t in TYPES},
+        "projects": projects,
+    }
+
+
+def previous_trends(db, team_id, days=30):
+    """Previous /trends: sessions in the window loaded, grouped by day in Python."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    daily = {}
+    for s in db.query(SessionModel).filter(
+        SessionModel.team_id == team_id, SessionModel.start_time >= cutoff
+    ).all():
+        day = daily.setdefault(s.start_time.date().isoformat(), [0, 0, 0.0])
+        day[0] += 1
+        day[1] += s.token_count
+        day[2] += s.health_score
+    return sorted(daily.items())
+
+
+def previous_health(db, team_id):
+    """Previous /health-distribution: bucket every loaded session."""
+    buckets = [0] * 10
+    for s in db.query(SessionModel).filter(SessionModel.team_id == team_id).all():
+        buckets[min(9, max(0, int(s.health_score) // 10))] += 1
+    return buckets
+
+
+def previous_tokens(db, team_id):
+    """Previous /token-usage: bucket and filter every loaded session."""
+    sessions = db.query(SessionModel).filter(SessionModel.team_id == team_id).all()
+    buckets = [0] * 6
+    for s in sessions:
+        buckets[min(5, sum(1 for bound in (10_000, 50_000, 100_000, 150_000, 200_000)
+                           if s.token_count >= bound))] += 1
+    approaching = sorted(
+        (s for s in sessions if s.token_count / s.token_limit > 0.8),
+        key=lambda s: s.token_count / s.token_limit, reverse=True,
+    )[:10]
+    return buckets, max(s.token_count for s in sessions), approaching
+
+
+def previous_duration(db, team_id):
+    """Previous /session-duration: durations of every loaded session, sorted."""
+    durations = sorted(
+        (s.last_activity - s.start_time).total_seconds() / 60
+        for s in db.query(SessionModel).filter(SessionModel.team_id == team_id).all()
+    )
+    return sum(durations) / len(durations), durations[len(durations) // 2], durations[-10:]
+
+
+def timed(fn, repeats: int) -> float:
+    """Median milliseconds of ``repeats`` calls."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tmp = None
+    if len(sys.argv) > 2:
+        db_path = Path(sys.argv[2])
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        db_path = Path(tmp.name) / "sessions.db"
+
+    if not db_path.exists():
+        print(f"Seeding {count:,} sessions into {db_path}...")
+        seed(db_path, count)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    db = sessionmaker(bind=engine)()
+
+    endpoints = [
+        ("team", previous_team, lambda team_id: analytics.team_analytics(team_id=team_id, db=db)),
+        ("trends (30d)", previous_trends,
+         lambda team_id: analytics.analytics_trends(team_id=team_id, days=30, db=db)),
+        ("health-distribution", previous_health,
+         lambda team_id: analytics.health_distribution(team_id=team_id, db=db)),
+        ("token-usage", previous_tokens,
+         lambda team_id: analytics.token_usage_analytics(team_id=team_id, db=db)),
+        ("session-duration", previous_duration,
+         lambda team_id: analytics.session_duration_analytics(team_id=team_id, db=db)),
+    ]
+    rollups_available = analytics.rollups_available
+
+    print(f"\nOne team ({count // TEAMS:,} of {count:,} sessions), median ms:")
+    print(f"  {'endpoint':<22}{'previous':>12}{'GROUP BY':>12}{'rollups':>12}")
+    for name, previous, endpoint in endpoints:
+        old = timed(lambda: previous(db, "t0"), 1)
+        analytics.rollups_available = lambda _db: False
+        grouped = timed(lambda: asyncio.run(endpoint("t0")), 3)
+        analytics.rollups_available = rollups_available
+        rolled = timed(lambda: asyncio.run(endpoint("t0")), 5)
+        print(f"  {name:<22}{old:>12.1f}{grouped:>12.1f}{rolled:>12.1f}")
+
+    db.close()
+    engine.dispose()
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
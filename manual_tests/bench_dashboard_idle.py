@@ -0,0 +1,127 @@
+"""Benchmark: CPU used by an idle dashboard with many sessions.
+
+Drives the dashboard's display loop (100ms ticks) for a fixed time with
+200 synthetic sessions and no data changes, rendering to an in-memory
+terminal. Compares the previous behaviour (rebuild the layout every tick,
+auto-refresh twice per second) with the cached renderer (rebuild and
+repaint only when the snapshot version or a displayed duration changes).
+
+Usage:
+    python manual_tests/bench_dashboard_idle.py [sessions] [seconds]
+"""
+
+import io
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import structlog
+import logging
+from rich.console import Console
+from rich.live import Live
+
+from llm_session_manager.core.health_monitor import HealthMonitor
+from llm_session_manager.models import Session, SessionStatus, SessionType
+from llm_session_manager.ui.dashboard import Dashboard
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+TICK = 0.1
+
+
+class StaticDiscovery:
+    """Returns the same synthetic sessions on every discovery."""
+
+    def __init__(self, count: int):
+        now = datetime.now()
+        types = [SessionType.CLAUDE_CODE, SessionType.CURSOR_CLI]
+        statuses = [SessionStatus.ACTIVE, SessionStatus.IDLE]
+        self.sessions = [
+            Session(
+                id=f"session_{i:04d}_{int(now.timestamp())}",
+                pid=10000 + i,
+                type=types[i % 2],
+                status=statuses[i % 2],
+                start_time=now - timedelta(minutes=i),
+                token_count=(i * 997) % 200000,
+                health_score=float(30 + (i * 7) % 70),
+            )
+            for i in range(count)
+        ]
+
+    def discover_sessions(self):
+        return list(self.sessions)
+
+
+class NoopEstimator:
+    """Token counts are already set on the synthetic sessions."""
+
+    def estimate_session_tokens(self, session):
+        return session.token_count
+
+
+class NoopHealthMonitor(HealthMonitor):
+    """Keeps the synthetic health scores."""
+
+    def calculate_health(self, session):
+        return session.health_score / 100
+
+
+def make_dashboard(count: int) -> Dashboard:
+    dashboard = Dashboard(StaticDiscovery(count), NoopHealthMonitor(), NoopEstimator())
+    dashboard.console = Console(file=io.StringIO(), force_terminal=True, width=160, height=60)
+    dashboard.refresh_data()
+    return dashboard
+
+
+def run_rebuild_every_tick(dashboard: Dashboard, seconds: float) -> None:
+    """Previous loop: new layout every tick, Live auto-refreshing twice a second."""
+    with Live(dashboard.create_layout(), console=dashboard.console,
+              refresh_per_second=2, screen=False) as live:
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            dashboard._layout = None  # Defeat the layout cache
+            dashboard._header_cache = None
+            dashboard._sorted_cache = None
+            dashboard._row_cache.clear()
+            live.update(dashboard.create_layout())
+            time.sleep(TICK)
+
+
+def run_cached(dashboard: Dashboard, seconds: float) -> None:
+    """Current loop: repaint only when the render key changes."""
+    with Live(dashboard.create_layout(), console=dashboard.console,
+              auto_refresh=False, screen=False) as live:
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            dashboard.repaint(live)
+            time.sleep(TICK)
+
+
+def measure(name: str, loop, count: int, seconds: float) -> float:
+    dashboard = make_dashboard(count)
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    loop(dashboard, seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    print(f"{name:<22} CPU {cpu:6.2f}s over {wall:5.1f}s wall  ({cpu / wall:6.1%} of a core)  "
+          f"layouts={dashboard.render_stats['layouts']} repaints={dashboard.render_stats['repaints']}")
+    return cpu
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    print(f"Idle dashboard with {count} sessions, {seconds:.0f}s per run\n")
+    before = measure("rebuild every tick", run_rebuild_every_tick, count, seconds)
+    after = measure("cached rendering", run_cached, count, seconds)
+    print(f"\nCPU reduction: {1 - after / before:.0%}")
+
+
+if __name__ == "__main__":
+    main()
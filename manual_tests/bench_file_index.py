@@ -0,0 +1,103 @@
+"""Benchmark: recent-changes and file-tree queries on a large working tree.
+
+Creates a synthetic tree (100k files by default) and compares the previous
+per-request walk of SessionMCPServer (stat every file, sort, truncate)
+with the file index: one initial scan, then in-memory queries after a
+batch of edits applied as filesystem events.
+
+Usage:
+    python manual_tests/bench_file_index.py [files]
+"""
+
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import structlog
+
+from llm_session_manager.utils.file_index import FileIndex
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+SKIP = ['.git', 'node_modules', '.venv', '__pycache__', '.pytest_cache']
+
+
+def build_tree(root: Path, files: int) -> None:
+    """Spread ``files`` files over packages/<a>/<b>/ directories, 100 per leaf."""
+    for i in range(files):
+        leaf = root / "packages" / f"pkg_{i // 10000:02d}" / f"mod_{(i // 100) % 100:02d}"
+        if i % 100 == 0:
+            leaf.mkdir(parents=True, exist_ok=True)
+        (leaf / f"file_{i % 100:02d}.py").write_bytes(b"x = 1\n")
+
+
+def walk_recent(root: Path) -> list:
+    """Previous behaviour: stat every file, sort all, keep 20."""
+    recent = []
+    for current, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP]
+        for name in names:
+            stat = (Path(current) / name).stat()
+            recent.append((stat.st_mtime, name))
+    recent.sort(reverse=True)
+    return recent[:20]
+
+
+def walk_tree(root: Path) -> list:
+    """Previous behaviour: list everything, keep 500 lines."""
+    tree = []
+    for current, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP]
+        level = str(current).replace(str(root), '').count(os.sep)
+        tree.append(f"{' ' * 2 * level}{os.path.basename(current)}/")
+        tree.extend(f"{' ' * 2 * (level + 1)}{name}" for name in names)
+    return tree[:500]
+
+
+def timed(fn, repeats: int) -> float:
+    """Median milliseconds of ``repeats`` calls."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        print(f"Creating {files:,} files...")
+        build_tree(root, files)
+
+        print("\nPer-request walk (previous):")
+        print(f"  recent changes: {timed(lambda: walk_recent(root), 3):9.1f} ms")
+        print(f"  file tree:      {timed(lambda: walk_tree(root), 3):9.1f} ms")
+
+        index = FileIndex(root)
+        started = time.perf_counter()
+        index.scan()
+        print(f"\nFile index (initial scan {((time.perf_counter() - started) * 1000):.0f} ms):")
+
+        # Edit 50 files and deliver their events, as the watcher would
+        for i in range(0, files, max(1, files // 50)):
+            path = root / "packages" / f"pkg_{i // 10000:02d}" / f"mod_{(i // 100) % 100:02d}" / f"file_{i % 100:02d}.py"
+            path.write_bytes(b"x = 2\n")
+            index.update(path)
+
+        print(f"  recent changes: {timed(lambda: index.recent(20), 50):9.3f} ms")
+        print(f"  file tree:      {timed(lambda: index.tree(4, 500), 50):9.3f} ms")
+        print(f"  stats: {index.stats}")
+
+
+if __name__ == "__main__":
+    main()
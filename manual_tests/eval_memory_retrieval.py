@@ -0,0 +1,89 @@
+"""Offline evaluation of memory retrieval (dense vs lexical vs hybrid).
+
+Seeds a throwaway MemoryManager with the labeled corpus and reports
+recall@k, MRR and latency for each search mode. Without ChromaDB only the
+lexical (BM25) mode can run.
+
+Usage:
+    python manual_tests/eval_memory_retrieval.py [eval_set.json]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm_session_manager.context.hybrid_retriever import BM25Index, HybridRetriever
+from llm_session_manager.context.retrieval_eval import evaluate_retrieval, load_eval_set
+from llm_session_manager.core.memory_manager import MemoryManager
+
+DEFAULT_EVAL_SET = Path(__file__).parent / "data" / "memory_eval.json"
+K_VALUES = (1, 3, 5, 10)
+
+
+def print_report(mode: str, report: dict) -> None:
+    """Print one evaluation report row."""
+    recall = "  ".join(f"R@{k}={report['recall'][k]:.2f}" for k in K_VALUES)
+    latency = report["latency_ms"]
+    print(f"{mode:<8} {recall}  MRR={report['mrr']:.2f}  "
+          f"latency mean={latency['mean']:.1f}ms p95={latency['p95']:.1f}ms")
+
+
+def evaluate_lexical_only(memories, queries) -> dict:
+    """Evaluate BM25 alone, without ChromaDB."""
+    index = BM25Index()
+    for memory in memories:
+        index.add(memory["id"], memory["content"])
+
+    def search(query, limit):
+        return [doc_id for doc_id, _ in index.search(query, limit)]
+
+    return evaluate_retrieval(search, queries, K_VALUES)
+
+
+def main():
+    """Run the evaluation."""
+    eval_path = sys.argv[1] if len(sys.argv) > 1 else str(DEFAULT_EVAL_SET)
+    memories, queries = load_eval_set(eval_path)
+
+    print("=" * 70)
+    print("Memory Retrieval Evaluation")
+    print("=" * 70)
+    print(f"Eval set: {eval_path}")
+    print(f"Memories: {len(memories)}  Queries: {len(queries)}")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = MemoryManager(storage_path=tmp, retriever=HybridRetriever())
+
+        if not manager.is_available():
+            print("ChromaDB not available - evaluating lexical retrieval only\n")
+            print_report("lexical", evaluate_lexical_only(memories, queries))
+            return
+
+        # Map generated memory IDs back to the labeled IDs
+        id_map = {}
+        for memory in memories:
+            metadata = {"eval_id": memory["id"]}
+            if memory.get("timestamp"):
+                metadata["timestamp"] = memory["timestamp"]
+            memory_id = manager.add_memory(
+                session_id=memory.get("session_id", "eval"),
+                content=memory["content"],
+                tags=memory.get("tags", []),
+                metadata=metadata
+            )
+            id_map[memory_id] = memory["id"]
+
+        for mode in ("dense", "lexical", "hybrid"):
+            def search(query, limit, mode=mode):
+                results = manager.search_memories(query, limit=limit, mode=mode)
+                return [id_map.get(r["id"], r["id"]) for r in results]
+
+            print_report(mode, evaluate_retrieval(search, queries, K_VALUES))
+
+
+if __name__ == "__main__":
+    main()
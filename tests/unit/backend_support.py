@@ -0,0 +1,78 @@
+"""Shared setup for unit tests of the team dashboard backend (``backend/app``).
+
+Importing this module puts the backend on ``sys.path`` with settings that do
+not touch the real database, and skips the importing test module when the
+backend requirements are not installed.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+
+os.environ.setdefault("JWT_SECRET_KEY", "unit-test-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+try:
+    import fastapi  # noqa: F401
+    import pydantic_settings  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("backend requirements not installed")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import SessionModel, Team  # noqa: E402
+
+
+def make_session(db_path):
+    """Create the backend schema in a SQLite file and return an ORM session."""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def make_session_row(session_id, start=None, minutes=60, **fields):
+    """Build a SessionModel row lasting ``minutes`` from ``start``."""
+    start = start or datetime.utcnow() - timedelta(hours=2)
+    values = dict(
+        id=session_id,
+        pid=1,
+        type="claude_code",
+        status="active",
+        start_time=start,
+        last_activity=start + timedelta(minutes=minutes),
+        working_directory="/tmp",
+        token_count=1000,
+        health_score=90.0,
+    )
+    values.update(fields)
+    return SessionModel(**values)
+
+
+def add_sample_sessions(db):
+    """Add team "t1" with three sessions and one team-less session.
+
+    Returns:
+        Noon today (UTC), the start time of the two newest team sessions
+    """
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    db.add(Team(id="t1", name="Core"))
+    db.add_all([
+        make_session_row("s1", team_id="t1", project_name="api", token_count=5_000,
+                         health_score=95.0, start=today, minutes=30),
+        make_session_row("s2", team_id="t1", project_name="api", token_count=75_000,
+                         health_score=65.0, status="completed", start=today, minutes=90),
+        make_session_row("s3", team_id="t1", token_count=190_000, token_limit=200_000,
+                         health_score=40.0, status="failed",
+                         start=today - timedelta(days=1), minutes=10),
+        make_session_row("s4", token_count=250_000, health_score=100.0, type="cursor_cli"),
+    ])
+    db.commit()
+    return today
@@ -0,0 +1,189 @@
+"""Unit tests for concurrent AI batch processing against a fake Anthropic API."""
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from llm_session_manager.models import Session
+from llm_session_manager.utils.ai_batch import AIBatchProcessor
+from llm_session_manager.utils.ai_tagger import AITagger
+from llm_session_manager.utils.response_cache import ResponseCache
+
+
+class FakeAnthropicHandler(BaseHTTPRequestHandler):
+    """Serves POST /v1/messages with scripted statuses."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+            status = server.statuses.pop(0) if server.statuses else 200
+
+        time.sleep(server.latency)
+        with server.lock:
+            server.in_flight -= 1
+
+        if status == 200:
+            payload = {
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "text", "text": server.reply}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 10, "output_tokens": 5},
+            }
+        else:
+            payload = {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}}
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("retry-after", "0.1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeRanker:
+    """Records the context each ranking was asked for."""
+
+    def __init__(self):
+        self.extensions = []
+
+    def rank(self, tags, source, extensions, max_tags=None):
+        self.extensions.append(extensions)
+        return tags[:max_tags]
+
+
+class TestAIBatchProcessor(unittest.TestCase):
+    """Test bounded concurrency, retries and streaming."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAnthropicHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.in_flight = 0
+        self.server.peak = 0
+        self.server.statuses = []
+        self.server.latency = 0.05
+        self.server.reply = "python, fastapi, rest-api"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.tmp = tempfile.TemporaryDirectory()
+        project = Path(self.tmp.name) / "project"
+        project.mkdir()
+        (project / "main.py").write_text("from fastapi import FastAPI\napp = FastAPI()\n")
+        self.project = str(project)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def make_processor(self, **kwargs):
+        return AIBatchProcessor(
+            api_key="test-key",
+            base_url=f"http://127.0.0.1:{self.server.server_port}",
+            backoff_base=0.01,
+            cache=ResponseCache(f"{self.tmp.name}/ai_cache"),
+            **kwargs
+        )
+
+    def collect(self, iterator):
+        async def consume():
+            return [result async for result in iterator]
+        return asyncio.run(consume())
+
+    def test_concurrency_is_bounded_and_results_stream(self):
+        """At most max_concurrency requests are in flight; every session completes."""
+        sessions = [Session(id=f"s{i}", working_directory=self.project) for i in range(6)]
+        processor = self.make_processor(max_concurrency=2)
+
+        results = self.collect(processor.suggest_tags(sessions, max_tags=2))
+
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(results[0].tags, ["python", "fastapi"])
+        self.assertLessEqual(self.server.peak, 2)
+        self.assertEqual(self.server.requests, 6)
+
+    def test_tags_are_ranked_with_context_extensions(self):
+        """The ranker sees the extensions sampled for each session."""
+        ranker = FakeRanker()
+        tagger = AITagger(api_key="", ranker=ranker, cache=ResponseCache(f"{self.tmp.name}/ai_cache"))
+        processor = self.make_processor(tagger=tagger)
+
+        results = self.collect(processor.suggest_tags([Session(id="s1", working_directory=self.project)]))
+
+        self.assertEqual(results[0].extensions, [".py"])
+        self.assertEqual(ranker.extensions, [[".py"]])
+
+    def test_rate_limit_is_retried_after_delay(self):
+        """A 429 is retried after the server's retry-after delay."""
+        self.server.statuses = [429]
+        self.server.reply = "  A FastAPI service.  "
+        processor = self.make_processor(max_concurrency=1)
+
+        results = self.collect(processor.generate_descriptions(
+            [Session(id="s1", working_directory=self.project)]
+        ))
+
+        self.assertEqual(results[0].description, "A FastAPI service.")
+        self.assertEqual(results[0].attempts, 2)
+        self.assertGreaterEqual(results[0].duration, 0.1)
+        self.assertEqual(processor.stats["rate_limited"], 1)
+
+    def test_non_retryable_error_is_reported(self):
+        """A client error fails the session without retrying."""
+        self.server.statuses = [400]
+        processor = self.make_processor()
+
+        results = self.collect(processor.suggest_tags(
+            [Session(id="s1", working_directory=self.project)]
+        ))
+
+        self.assertFalse(results[0].ok)
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(processor.stats["retries"], 0)
+
+    def test_unchanged_context_is_served_from_cache(self):
+        """A second batch over unchanged projects makes no requests unless refreshed."""
+        sessions = [Session(id="s1", working_directory=self.project)]
+        self.collect(self.make_processor().suggest_tags(sessions))
+
+        results = self.collect(self.make_processor().suggest_tags(sessions, max_tags=1))
+        self.assertTrue(results[0].cached)
+        self.assertEqual(results[0].tags, ["python"])
+        self.assertEqual(self.server.requests, 1)
+
+        results = self.collect(self.make_processor(refresh=True).suggest_tags(sessions))
+        self.assertFalse(results[0].cached)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_sessions_without_content_are_skipped(self):
+        """Sessions without a working directory never reach the API."""
+        processor = self.make_processor()
+
+        results = self.collect(processor.suggest_tags([Session(id="s1")]))
+
+        self.assertEqual(results[0].error, "no analyzable content")
+        self.assertEqual(self.server.requests, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
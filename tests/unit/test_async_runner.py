@@ -0,0 +1,145 @@
+"""Unit tests for the blocking-call runner and async facades."""
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+
+from llm_session_manager.core.async_memory_manager import AsyncMemoryManager
+from llm_session_manager.models import Session, SessionType
+from llm_session_manager.storage import AsyncDatabase, Database
+from llm_session_manager.utils.async_runner import (
+    BlockingCallRunner,
+    OperationCancelled,
+    check_cancelled,
+)
+
+
+class TestBlockingCallRunner(unittest.IsolatedAsyncioTestCase):
+    """Test coalescing, bounding and cancellation."""
+
+    async def asyncSetUp(self):
+        self.runner = BlockingCallRunner(max_workers=2)
+
+    async def asyncTearDown(self):
+        self.runner.shutdown(wait=True)
+
+    async def test_runs_off_event_loop(self):
+        """Blocking work runs on a worker thread."""
+        thread_name = await self.runner.run(lambda: threading.current_thread().name)
+        self.assertNotEqual(thread_name, threading.current_thread().name)
+
+    async def test_identical_calls_are_coalesced(self):
+        """Concurrent calls with the same key execute once."""
+        calls = []
+
+        def search(query):
+            calls.append(query)
+            time.sleep(0.05)
+            return [query]
+
+        results = await asyncio.gather(*[
+            self.runner.run(search, "auth", key=("search", "auth")) for _ in range(5)
+        ])
+
+        self.assertEqual(calls, ["auth"])
+        self.assertEqual(results, [["auth"]] * 5)
+        self.assertEqual(self.runner.stats["coalesced"], 4)
+        self.assertEqual(self.runner.in_flight, 0)
+
+    async def test_concurrency_is_bounded(self):
+        """No more than max_workers calls run at the same time."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        await asyncio.gather(*[self.runner.run(work) for _ in range(6)])
+        self.assertLessEqual(peak, 2)
+
+    async def test_cancelled_running_call_stops_at_checkpoint(self):
+        """Cancelling the caller makes running work raise at check_cancelled."""
+        started = threading.Event()
+        outcome = []
+
+        def long_search():
+            started.set()
+            try:
+                for _ in range(200):
+                    time.sleep(0.005)
+                    check_cancelled()
+                outcome.append("finished")
+            except OperationCancelled:
+                outcome.append("cancelled")
+                raise
+
+        task = asyncio.ensure_future(self.runner.run(long_search))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.runner.shutdown(wait=True)
+        self.assertEqual(outcome, ["cancelled"])
+
+    async def test_shared_call_survives_one_cancelled_waiter(self):
+        """Coalesced work keeps running while another caller still waits."""
+        def slow():
+            time.sleep(0.05)
+            check_cancelled()
+            return "done"
+
+        first = asyncio.ensure_future(self.runner.run(slow, key="k"))
+        second = asyncio.ensure_future(self.runner.run(slow, key="k"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        self.assertEqual(await second, "done")
+        self.assertEqual(self.runner.stats["cancelled"], 0)
+
+
+class TestAsyncFacades(unittest.IsolatedAsyncioTestCase):
+    """Test the async Database and MemoryManager wrappers."""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.runner = BlockingCallRunner(max_workers=2)
+        db = Database(f"{self.tmp.name}/sessions.db")
+        db.init_db()
+        db.add_session(Session(id="s1", pid=1, type=SessionType.CLAUDE_CODE))
+        self.db = AsyncDatabase(db, self.runner)
+
+    async def asyncTearDown(self):
+        self.runner.shutdown(wait=True)
+        self.tmp.cleanup()
+
+    async def test_database_reads(self):
+        """Reads return the same data as the synchronous Database."""
+        sessions = await self.db.get_all_sessions()
+        self.assertEqual([s.id for s in sessions], ["s1"])
+        self.assertEqual((await self.db.get_session("s1")).pid, 1)
+        self.assertIsNone(await self.db.get_session("missing"))
+
+    async def test_memory_search_without_chromadb(self):
+        """The memory facade mirrors MemoryManager when ChromaDB is unavailable."""
+        from llm_session_manager.core.memory_manager import MemoryManager
+
+        manager = MemoryManager(storage_path=f"{self.tmp.name}/memories")
+        manager.collection = None
+        memories = AsyncMemoryManager(manager, self.runner)
+
+        self.assertEqual(await memories.search_memories("auth"), [])
+        self.assertFalse((await memories.get_stats())["available"])
+
+
+if __name__ == "__main__":
+    unittest.main()
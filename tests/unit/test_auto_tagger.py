@@ -0,0 +1,81 @@
+"""Unit tests for the auto-tagger scanner and per-file cache."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from llm_session_manager.models import Session
+from llm_session_manager.utils.auto_tagger import AutoTagger
+
+
+class TestAutoTaggerScanner(unittest.TestCase):
+    """Test the combined import/keyword scanner."""
+
+    def setUp(self):
+        self.tagger = AutoTagger()
+
+    def test_scan_matches_individual_rules(self):
+        """One scanner pass finds what the individual rules would find."""
+        text = (
+            "from fastapi import FastAPI\n"
+            "import axios from 'axios'; // graphql later\n"
+            "ElasticSearch for search, JWT authentication\n"
+        )
+        keywords, import_tags = self.tagger._scan_text(text)
+
+        expected_keywords = {k for k in AutoTagger.KEYWORD_TAGS if k in text.lower()}
+        self.assertEqual(keywords, expected_keywords)
+        self.assertIn("search", keywords)  # Overlaps "elasticsearch"
+        self.assertEqual(sorted(import_tags), ["api", "fastapi", "graphql"])
+
+    def test_import_pattern_needs_its_suffix(self):
+        """An import prefix alone does not trigger an import rule."""
+        _, import_tags = self.tagger._scan_text("import os\nfrom pathlib import Path\n")
+        self.assertEqual(import_tags, [])
+
+
+class TestAutoTaggerCache(unittest.TestCase):
+    """Test per-file caching by (path, mtime)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.project = Path(self.tmp.name) / "project"
+        (self.project / "api").mkdir(parents=True)
+        self.module = self.project / "api" / "app.py"
+        self.module.write_text("from fastapi import FastAPI\n# JWT authentication\n")
+        (self.project / "README.md").write_text("docs")
+        self.cache_path = Path(self.tmp.name) / "tag_cache.json"
+        self.session = Session(id="s1", working_directory=str(self.project))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unchanged_files_come_from_cache(self):
+        """A second run, even in a new tagger, rescans nothing."""
+        first = AutoTagger(cache_path=str(self.cache_path))
+        tags = first.suggest_tags(self.session)
+        self.assertIn("fastapi", tags)
+        self.assertEqual(first.cache_stats["misses"], 1)
+
+        second = AutoTagger(cache_path=str(self.cache_path))
+        self.assertEqual(second.suggest_tags(self.session), tags)
+        self.assertEqual(second.cache_stats, {"hits": 1, "misses": 0})
+
+    def test_modified_file_is_rescanned(self):
+        """Changing a file's mtime invalidates its cached tags."""
+        tagger = AutoTagger(cache_path=str(self.cache_path))
+        tagger.suggest_tags(self.session)
+
+        self.module.write_text("from flask import Flask\n")
+        stat = self.module.stat()
+        os.utime(self.module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        tags = tagger.suggest_tags(self.session)
+
+        self.assertIn("flask", tags)
+        self.assertNotIn("fastapi", tags)
+        self.assertEqual(tagger.cache_stats["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
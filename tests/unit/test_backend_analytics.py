@@ -0,0 +1,102 @@
+"""Unit tests for the backend analytics endpoints."""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.unit.backend_support import add_sample_sessions, make_session
+
+from sqlalchemy import text
+
+from app.rollups import TRIGGER_NAMES, rollups_available
+from app.routers import analytics
+
+
+class AnalyticsEndpointTests:
+    """Endpoint assertions shared by the rollup and GROUP BY code paths."""
+
+    ROLLUPS = True
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = make_session(Path(self.tmp.name) / "sessions.db")
+        if not self.ROLLUPS:
+            for name in TRIGGER_NAMES:
+                self.db.execute(text(f"DROP TRIGGER {name}"))
+            self.db.commit()
+        self.assertEqual(rollups_available(self.db), self.ROLLUPS)
+        add_sample_sessions(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        self.db.get_bind().dispose()
+        self.tmp.cleanup()
+
+    def call(self, endpoint, **kwargs):
+        return asyncio.run(endpoint(db=self.db, **kwargs))
+
+    def test_team_analytics(self):
+        """Team summaries, health bands and projects."""
+        result = self.call(analytics.team_analytics, team_id="t1")
+        self.assertEqual(result["team_name"], "Core")
+        self.assertEqual(result["summary"]["total_sessions"], 3)
+        self.assertEqual(result["summary"]["failed_sessions"], 1)
+        self.assertEqual(result["summary"]["total_tokens"], 270_000)
+        self.assertEqual(result["summary"]["average_health_score"], 66.67)
+        self.assertEqual(
+            {k: result["health_distribution"][k] for k in ("healthy", "warning", "critical")},
+            {"healthy": 1, "warning": 1, "critical": 1},
+        )
+        self.assertEqual(result["top_projects"], [
+            {"name": "api", "session_count": 2, "total_tokens": 80_000, "avg_health": 80.0}
+        ])
+
+        everyone = self.call(analytics.team_analytics, team_id=None)
+        self.assertEqual(everyone["session_types"], {"claude_code": 3, "cursor_cli": 1})
+
+    def test_trends_and_distributions(self):
+        """Daily trends, health and token buckets, and duration stats."""
+        trends = self.call(analytics.analytics_trends, team_id="t1", days=7)
+        self.assertEqual(trends["total_sessions"], 3)
+        self.assertEqual([d["session_count"] for d in trends["daily_breakdown"]], [1, 2])
+        self.assertEqual(trends["daily_breakdown"][1]["completed_count"], 1)
+        self.assertEqual(trends["trend"], "increasing")
+
+        health = self.call(analytics.health_distribution, team_id=None)
+        self.assertEqual(health["distribution"]["90-100"]["count"], 2)
+        self.assertEqual(health["distribution"]["40-49"]["percentage"], 25.0)
+
+        tokens = self.call(analytics.token_usage_analytics, team_id=None)
+        self.assertEqual(tokens["distribution"], {
+            "0-10k": 1, "10k-50k": 0, "50k-100k": 1,
+            "100k-150k": 0, "150k-200k": 1, "200k+": 1,
+        })
+        self.assertEqual(tokens["token_stats"]["max_tokens"], 250_000)
+        self.assertEqual([s["id"] for s in tokens["sessions_approaching_limit"]], ["s4", "s3"])
+
+        durations = self.call(analytics.session_duration_analytics, team_id="t1")
+        self.assertEqual(durations["duration_stats"], {
+            "average_minutes": 43.3, "max_minutes": 90.0,
+            "min_minutes": 10.0, "median_minutes": 30.0,
+        })
+        self.assertEqual(durations["longest_sessions"][0]["session_id"], "s2")
+
+    def test_empty_team(self):
+        """A team without sessions gets the empty responses."""
+        self.assertEqual(self.call(analytics.token_usage_analytics, team_id="none")["total_sessions"], 0)
+        self.assertEqual(self.call(analytics.analytics_trends, team_id="none", days=7)["daily_breakdown"], [])
+
+
+class TestAnalyticsFromRollups(AnalyticsEndpointTests, unittest.TestCase):
+    """Endpoints reading the trigger-maintained rollup tables."""
+
+
+class TestAnalyticsFromGroupBy(AnalyticsEndpointTests, unittest.TestCase):
+    """Endpoints aggregating the sessions table directly."""
+
+    ROLLUPS = False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Unit tests that backend queries are served by indexes.
+
+Each test runs real endpoint code against SQLite, captures the SELECTs it
+issues and checks ``EXPLAIN QUERY PLAN`` for full scans of the indexed
+tables. Unfiltered aggregates (``/api/sessions/stats``, ``/api/projects``,
+all-teams analytics) have to read every row and are not covered.
+"""
+
+import asyncio
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from tests.unit.backend_support import add_sample_sessions, make_session
+
+from sqlalchemy import event, inspect, text
+
+from app.collaboration.chat import ChatManager
+from app.database import Base
+from app.models import SessionEvent, SessionModel, SessionParticipant, User
+from app.routers import analytics, sessions, teams
+
+INDEXED_TABLES = ("sessions", "session_messages", "session_participants", "session_events")
+
+
+class FakeRequest:
+    """Just enough of a Starlette request for conditional responses."""
+
+    headers = {}
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Test EXPLAIN QUERY PLAN output for router and collaboration queries."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = make_session(Path(self.tmp.name) / "sessions.db")
+        add_sample_sessions(self.db)
+        self.db.add(User(id="u1", email="u1@example.com", username="u1", password_hash="x"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.db.get_bind().dispose()
+        self.tmp.cleanup()
+
+    def plans(self, fn):
+        """Run ``fn`` and return (statement, plan details) for each SELECT it issued."""
+        engine = self.db.get_bind()
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            fn()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        self.assertTrue(statements)
+        conn = self.db.connection()
+        return [
+            (statement, [row[-1] for row in conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )])
+            for statement, parameters in statements
+        ]
+
+    def assertIndexed(self, fn):
+        for statement, details in self.plans(fn):
+            for detail in details:
+                words = detail.split()
+                if words[:1] == ["SCAN"] and words[1] in INDEXED_TABLES and "USING" not in words:
+                    self.fail(f"{detail} in:\n{statement}")
+
+    def call(self, endpoint, **kwargs):
+        return lambda: asyncio.run(endpoint(db=self.db, **kwargs))
+
+    def list_sessions(self, **filters):
+        params = dict(
+            request=FakeRequest(), status=None, type=None, team_id=None, project=None,
+            tag=None, since=None, until=None, fields=None, cursor=None, limit=2,
+        )
+        params.update(filters)
+        return self.call(sessions.list_sessions, **params)
+
+    def test_session_list_queries(self):
+        """Session lists page through an index for each filter."""
+        first_page = self.list_sessions()()
+        cursor = json.loads(first_page.body)["next_cursor"]
+
+        self.assertIndexed(self.list_sessions())
+        for filters in ({"team_id": "t1"}, {"status": "active"}, {"project": "api"}):
+            self.assertIndexed(self.list_sessions(
+                since=datetime(2020, 1, 1), fields="id", cursor=cursor, **filters
+            ))
+
+        self.assertIndexed(self.call(sessions.get_session, session_id="s1"))
+        self.assertIndexed(self.call(
+            teams.list_team_sessions, team_id="t1", request=FakeRequest(),
+            status="active", fields=None, cursor=None, limit=50,
+        ))
+        self.assertIndexed(self.call(teams.get_team, team_id="t1"))
+        self.assertIndexed(self.call(teams.list_teams))
+
+    def test_team_analytics_queries(self):
+        """Team-scoped analytics, with and without rollups, search by team."""
+        endpoints = [
+            (analytics.team_analytics, {}),
+            (analytics.analytics_trends, {"days": 7}),
+            (analytics.health_distribution, {}),
+            (analytics.token_usage_analytics, {}),
+            (analytics.session_duration_analytics, {}),
+            (analytics.top_sessions, {"metric": "token_count", "limit": 5}),
+        ]
+        for endpoint, kwargs in endpoints:
+            self.assertIndexed(self.call(endpoint, team_id="t1", **kwargs))
+
+        rollups_available = analytics.rollups_available
+        analytics.rollups_available = lambda db: False
+        try:
+            for endpoint, kwargs in endpoints:
+                self.assertIndexed(self.call(endpoint, team_id="t1", **kwargs))
+        finally:
+            analytics.rollups_available = rollups_available
+
+    def test_collaboration_queries(self):
+        """Chat history, participant lookups and event history search by session."""
+        chat = ChatManager(self.db)
+        chat.send_message(session_id="s1", user_id="u1", username="u1", content="hi")
+        self.assertIndexed(lambda: chat.get_messages("s1", before=datetime.utcnow()))
+        self.assertIndexed(lambda: chat.get_stats("s1"))
+        self.assertIndexed(lambda: self.db.query(SessionParticipant).filter(
+            SessionParticipant.session_id == "s1", SessionParticipant.user_id == "u1"
+        ).first())
+        self.assertIndexed(lambda: self.db.query(SessionEvent).filter(
+            SessionEvent.session_id == "s1"
+        ).order_by(SessionEvent.timestamp.desc()).limit(50).all())
+
+    def test_existing_databases_gain_indexes(self):
+        """Creating the schema over tables without the indexes adds them."""
+        for index in SessionModel.__table__.indexes:
+            self.db.execute(text(f"DROP INDEX {index.name}"))
+        self.db.commit()
+
+        Base.metadata.create_all(bind=self.db.get_bind())
+        names = {i["name"] for i in inspect(self.db.get_bind()).get_indexes("sessions")}
+        self.assertTrue({index.name for index in SessionModel.__table__.indexes} <= names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Unit tests for the backend's incrementally maintained analytics rollups."""
+
+import sqlite3
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+
+from tests.unit.backend_support import add_sample_sessions, make_session
+
+from sqlalchemy import text
+
+from app.database import Base
+from app.models import SessionBucketRollup, SessionModel, SessionRollup
+from app.rollups import rebuild_rollups, rollups_available
+
+
+class TestSessionRollups(unittest.TestCase):
+    """Test that triggers keep the rollup tables equal to a full rebuild."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "sessions.db"
+        self.db = make_session(self.db_path)
+        self.today = add_sample_sessions(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        self.db.get_bind().dispose()
+        self.tmp.cleanup()
+
+    def snapshot(self):
+        return (
+            sorted(
+                (r.team_key, r.day, r.type, r.status, r.project_name, r.session_count,
+                 r.token_total, round(r.health_total, 6), round(r.duration_total, 3))
+                for r in self.db.query(SessionRollup)
+            ),
+            sorted(
+                (r.team_key, r.metric, r.bucket, r.session_count)
+                for r in self.db.query(SessionBucketRollup)
+            ),
+        )
+
+    def test_triggers_match_a_full_rebuild(self):
+        """Inserts, updates, deletes and raw CLI writes keep rollups equal to a rebuild."""
+        self.assertTrue(rollups_available(self.db))
+
+        s2 = self.db.get(SessionModel, "s2")
+        s2.team_id = None
+        s2.health_score = 12.0
+        s2.last_activity = s2.last_activity + timedelta(hours=1)
+        self.db.delete(self.db.get(SessionModel, "s1"))
+        self.db.commit()
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "INSERT INTO sessions (id, pid, type, status, start_time, last_activity, "
+            "working_directory, token_count, health_score, team_id) "
+            "VALUES ('cli', 7, 'claude_code', 'active', ?, ?, '/tmp', 42000, 88.5, 't1')",
+            (self.today.isoformat(), (self.today + timedelta(minutes=5)).isoformat()),
+        )
+        conn.commit()
+        conn.close()
+
+        incremental = self.snapshot()
+        rebuild_rollups(self.db.connection())
+        self.assertEqual(incremental, self.snapshot())
+        self.assertNotIn(0, [row[-1] for row in incremental[1]])
+
+    def test_schema_creation_backfills_missing_rollups(self):
+        """Creating the schema over existing sessions installs triggers and backfills."""
+        expected = self.snapshot()
+        for name in ("sessions_rollup_insert", "sessions_rollup_update", "sessions_rollup_delete"):
+            self.db.execute(text(f"DROP TRIGGER {name}"))
+        self.db.execute(text("DELETE FROM session_rollups"))
+        self.db.commit()
+
+        Base.metadata.create_all(bind=self.db.get_bind())
+        self.assertEqual(self.snapshot(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
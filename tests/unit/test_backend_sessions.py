@@ -0,0 +1,110 @@
+"""Unit tests for paginated, filterable and cacheable session lists."""
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from tests.unit.backend_support import make_session, make_session_row
+
+try:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+except ImportError:  # TestClient needs httpx
+    raise unittest.SkipTest("httpx not installed")
+
+from app.database import get_db
+from app.models import SessionModel, Team
+from app.routers import sessions, teams
+
+
+class TestSessionLists(unittest.TestCase):
+    """Test keyset pages, filters, field projection and ETags."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = make_session(Path(self.tmp.name) / "sessions.db")
+        self.db.add(Team(id="t1", name="Core"))
+        base = datetime(2026, 1, 1, 12)
+        for i in range(25):
+            # Pairs of sessions share a last_activity, so the id breaks ties
+            self.db.add(make_session_row(
+                f"s{i:02d}", start=base, minutes=i // 2,
+                status="active" if i % 2 else "completed",
+                team_id="t1" if i < 10 else None,
+                tags=["bugfix"] if i % 5 == 0 else ["feature"],
+            ))
+        self.db.commit()
+
+        app = FastAPI()
+        app.include_router(sessions.router, prefix="/api/sessions")
+        app.include_router(teams.router, prefix="/api/teams")
+        app.dependency_overrides[get_db] = lambda: self.db
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.db.close()
+        self.db.get_bind().dispose()
+        self.tmp.cleanup()
+
+    def ids(self, response):
+        return [s["id"] for s in response.json()["sessions"]]
+
+    def test_pages_follow_cursor_without_gaps(self):
+        """Walking next_cursor visits every session once, newest activity first."""
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+            page = self.client.get("/api/sessions", params=params).json()
+            seen.extend(s["id"] for s in page["sessions"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        expected = [
+            s.id for s in self.db.query(SessionModel).order_by(
+                SessionModel.last_activity.desc(), SessionModel.id.desc()
+            )
+        ]
+        self.assertEqual(seen, expected)
+        self.assertEqual(seen[:2], ["s24", "s23"])
+        self.assertEqual(self.client.get("/api/sessions", params={"cursor": "bogus"}).status_code, 400)
+
+    def test_filters_and_projection(self):
+        """Filters combine; fields= limits the keys returned."""
+        response = self.client.get("/api/sessions", params={
+            "team_id": "t1", "status": "active", "tag": "bugfix",
+            "since": "2026-01-01T12:01:00", "fields": "id,tags",
+        })
+        self.assertEqual(response.json()["sessions"], [
+            {"id": "s05", "tags": ["bugfix"]},
+        ])
+
+        default = self.client.get("/api/sessions", params={"limit": 1}).json()["sessions"][0]
+        self.assertEqual(set(default), set(sessions.DEFAULT_LIST_FIELDS))
+        self.assertEqual(self.client.get("/api/sessions", params={"fields": "id,secret"}).status_code, 400)
+
+    def test_etag_returns_not_modified_until_data_changes(self):
+        """An unchanged page answers If-None-Match with 304; an update changes the ETag."""
+        first = self.client.get("/api/teams/t1/sessions", params={"limit": 3})
+        self.assertEqual(self.ids(first), ["s09", "s08", "s07"])
+        etag = first.headers["etag"]
+
+        again = self.client.get(
+            "/api/teams/t1/sessions", params={"limit": 3}, headers={"If-None-Match": etag}
+        )
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+
+        session = self.db.get(SessionModel, "s08")
+        session.health_score = 10.0
+        self.db.commit()
+        changed = self.client.get(
+            "/api/teams/t1/sessions", params={"limit": 3}, headers={"If-None-Match": etag}
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+
+if __name__ == "__main__":
+    unittest.main()
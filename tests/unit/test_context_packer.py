@@ -0,0 +1,98 @@
+"""Unit tests for token-budgeted context packing."""
+
+import unittest
+
+from llm_session_manager.context.context_packer import (
+    ContextPacker,
+    MinHasher,
+    TRIM_MARKER,
+)
+from llm_session_manager.utils.token_estimator import TokenEstimator
+
+
+def make_memory(memory_id, content, relevance=0.5, session_id="session_1"):
+    """Build a memory dict shaped like MemoryManager.search_memories results."""
+    return {
+        "id": memory_id,
+        "content": content,
+        "relevance": relevance,
+        "metadata": {"session_id": session_id, "timestamp": "2026-01-01T00:00:00"},
+    }
+
+
+class TestMinHasher(unittest.TestCase):
+    """Test MinHash similarity estimates."""
+
+    def test_identical_and_disjoint_texts(self):
+        """Identical texts match fully; unrelated texts barely match."""
+        hasher = MinHasher()
+        text = "use jwt tokens with a short expiry and refresh rotation"
+        self.assertEqual(hasher.similarity(hasher.signature(text), hasher.signature(text)), 1.0)
+
+        other = hasher.signature("sqlite database locked enable wal journal mode now")
+        self.assertLess(hasher.similarity(hasher.signature(text), other), 0.2)
+
+
+class TestContextPacker(unittest.TestCase):
+    """Test ContextPacker selection, trimming and dedupe."""
+
+    def setUp(self):
+        self.packer = ContextPacker(token_estimator=TokenEstimator(use_tiktoken=False))
+        self.memories = [
+            make_memory("auth", "JWT authentication uses python-jose with HS256 tokens. " * 5, 0.9),
+            make_memory("db", "SQLite database locked errors are fixed by enabling WAL mode. " * 5, 0.7),
+            make_memory("ui", "Memoize React components to avoid needless re-renders. " * 5, 0.4),
+        ]
+
+    def test_budget_never_exceeded(self):
+        """The packed text fits every budget, whatever the memories."""
+        for budget in (60, 120, 200, 400, 2000):
+            packed = self.packer.pack(self.memories, token_budget=budget)
+            self.assertLessEqual(packed.tokens_used, budget)
+            self.assertEqual(packed.tokens_used, self.packer.count_tokens(packed.text))
+
+    def test_large_budget_keeps_relevance_order(self):
+        """With room for everything, memories appear most relevant first."""
+        packed = self.packer.pack(self.memories, token_budget=5000)
+
+        self.assertEqual([entry["id"] for entry in packed.manifest], ["auth", "db", "ui"])
+        self.assertFalse(any(entry["trimmed"] for entry in packed.manifest))
+        self.assertEqual(packed.skipped, [])
+
+    def test_near_duplicates_are_skipped(self):
+        """A near-duplicate of a more relevant memory is not packed."""
+        duplicate = make_memory(
+            "auth_copy", "JWT authentication uses python-jose with HS256 tokens. " * 5 + "Also.", 0.8
+        )
+        packed = self.packer.pack(self.memories + [duplicate], token_budget=5000)
+
+        self.assertNotIn("auth_copy", [entry["id"] for entry in packed.manifest])
+        self.assertIn(
+            {"id": "auth_copy", "reason": "duplicate", "duplicate_of": "auth"},
+            packed.skipped,
+        )
+
+    def test_trimmed_memory_is_flagged(self):
+        """A memory cut to fit is marked as trimmed in the manifest."""
+        packer = ContextPacker(
+            token_estimator=TokenEstimator(use_tiktoken=False), min_snippet_tokens=5
+        )
+        long_memory = make_memory("long", "word " * 400, 0.9)
+        packed = packer.pack([long_memory], token_budget=150)
+
+        self.assertEqual(len(packed.manifest), 1)
+        self.assertTrue(packed.manifest[0]["trimmed"])
+        self.assertIn(TRIM_MARKER, packed.text)
+        self.assertLessEqual(packed.tokens_used, 150)
+
+    def test_budget_below_overhead_packs_nothing(self):
+        """A budget smaller than header and footer yields empty context."""
+        packed = self.packer.pack(self.memories, token_budget=5)
+
+        self.assertEqual(packed.text, "")
+        self.assertEqual(packed.manifest, [])
+        self.assertEqual(len(packed.skipped), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
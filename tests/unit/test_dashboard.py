@@ -0,0 +1,236 @@
+"""Unit tests for dashboard render caching, background refresh and the session table view."""
+
+import io
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from rich.console import Console
+
+from llm_session_manager.core.health_monitor import HealthMonitor
+from llm_session_manager.models import Session, SessionStatus, SessionType
+from llm_session_manager.ui.dashboard import Dashboard
+from llm_session_manager.ui.session_trends import SessionTrends
+from llm_session_manager.ui.session_view import SessionIndex
+
+
+class FakeDiscovery:
+    """Discovers fresh Session objects with time-stamped IDs, like the real one."""
+
+    def __init__(self, pids):
+        self.pids = pids
+        self.calls = 0
+
+    def discover_sessions(self):
+        self.calls += 1
+        return [
+            Session(id=f"claude_code_{pid}_{self.calls}", pid=pid, type=SessionType.CLAUDE_CODE)
+            for pid in self.pids
+        ]
+
+
+class FakeEstimator:
+    """Token counts by pid, optionally gated to observe concurrency."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.gate = None
+
+    def estimate_session_tokens(self, session):
+        if self.gate:
+            self.gate.wait(timeout=5)
+        return self.tokens[session.pid]
+
+
+class FakeHealthMonitor(HealthMonitor):
+    def calculate_health(self, session):
+        return 0.9
+
+
+def make_dashboard(pids=(1, 2, 3)):
+    estimator = FakeEstimator({pid: pid * 1000 for pid in pids})
+    dashboard = Dashboard(FakeDiscovery(list(pids)), FakeHealthMonitor(), estimator, refresh_interval=60)
+    dashboard.console = Console(file=io.StringIO(), width=120)
+    return dashboard, estimator
+
+
+class TestDashboardRenderCache(unittest.TestCase):
+    """Test snapshot-versioned layout and row caches."""
+
+    def setUp(self):
+        self.dashboard, self.estimator = make_dashboard()
+        # One-sample sparklines settle after two refreshes of steady values
+        self.dashboard.trends = SessionTrends(spark_width=1)
+        self.dashboard.refresh_data()
+        self.dashboard.refresh_data()
+
+    @mock.patch("llm_session_manager.ui.dashboard.time.time", return_value=1000.0)
+    def test_layout_reused_until_snapshot_changes(self, _):
+        """The same layout is returned while neither data nor the second changes."""
+        first = self.dashboard.create_layout()
+        self.assertIs(self.dashboard.create_layout(), first)
+
+        self.dashboard.refresh_data()
+        self.assertIsNot(self.dashboard.create_layout(), first)
+
+    def test_unchanged_rows_are_reused(self):
+        """A refresh rebuilds only the rows whose values changed."""
+        self.dashboard.create_layout()
+        self.assertEqual(self.dashboard.render_stats["rows_built"], 3)
+
+        self.estimator.tokens[2] += 1
+        self.dashboard.refresh_data()
+        self.dashboard.create_layout()
+
+        self.assertEqual(self.dashboard.render_stats["rows_built"], 4)
+        self.assertEqual(self.dashboard.render_stats["rows_cached"], 2)
+
+    @mock.patch("llm_session_manager.ui.dashboard.time.time", return_value=1000.0)
+    def test_repaint_only_on_change(self, _):
+        """repaint() updates the live display only for a new layout."""
+        live = mock.Mock()
+        self.assertTrue(self.dashboard.repaint(live))
+        self.assertFalse(self.dashboard.repaint(live))
+        self.assertEqual(live.update.call_count, 1)
+
+
+class TestDashboardRefresh(unittest.TestCase):
+    """Test snapshots, identity reconciliation and the background worker."""
+
+    def test_session_identity_is_stable_across_discoveries(self):
+        """Rediscovered processes keep their first ID."""
+        dashboard, _ = make_dashboard()
+        dashboard.refresh_data()
+        first_ids = [s.id for s in dashboard.sessions]
+        dashboard.refresh_data()
+
+        self.assertEqual([s.id for s in dashboard.sessions], first_ids)
+        self.assertEqual(dashboard.sessions[0].token_count, 1000)
+        self.assertEqual(dashboard.sessions[0].health_score, 90.0)
+
+    def test_tokens_estimated_concurrently_with_progressive_snapshots(self):
+        """Estimates run in parallel and each completion is published."""
+        dashboard, estimator = make_dashboard()
+        dashboard.PROGRESS_INTERVAL = 0
+        estimator.gate = threading.Barrier(3)  # Times out unless all three run at once
+
+        published = []
+        original = dashboard._publish
+
+        def record(*args, **kwargs):
+            snapshot = original(*args, **kwargs)
+            published.append((snapshot.refreshing, snapshot.pending))
+            return snapshot
+
+        dashboard._publish = record
+        dashboard.refresh_data()
+
+        self.assertEqual(published[0], (True, 3))
+        self.assertEqual(published[-1], (False, 0))
+        self.assertIn((True, 1), published)
+        self.assertEqual([s.token_count for s in dashboard.sessions], [1000, 2000, 3000])
+        self.assertEqual(set(dashboard.snapshot.timings), {"discovery", "tokens", "health", "history"})
+
+    def test_worker_keeps_ui_responsive(self):
+        """The UI renders a refreshing indicator while estimation is blocked."""
+        dashboard, estimator = make_dashboard()
+        release = threading.Event()
+        estimator.gate = release
+
+        dashboard.start_refresh_worker()
+        try:
+            deadline = time.monotonic() + 5
+            while dashboard.snapshot is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertTrue(dashboard.apply_snapshot())
+            self.assertTrue(dashboard.snapshot.refreshing)
+            footer = dashboard.create_footer().renderable.renderable
+            self.assertIn("Refreshing (tokens 0/3)", footer.plain)
+
+            release.set()
+            while dashboard.snapshot.refreshing and time.monotonic() < deadline:
+                time.sleep(0.01)
+            dashboard.apply_snapshot()
+            self.assertIn("Up to date", dashboard.create_footer().renderable.renderable.plain)
+        finally:
+            release.set()
+            dashboard.stop_refresh_worker()
+
+
+def make_sessions(count):
+    types = [SessionType.CLAUDE_CODE, SessionType.CURSOR_CLI]
+    statuses = [SessionStatus.ACTIVE, SessionStatus.IDLE, SessionStatus.ERROR]
+    return [
+        Session(
+            id=f"s{i:03d}", pid=i, type=types[i % 2], status=statuses[i % 3],
+            health_score=float((i * 37) % 100), token_count=i * 100,
+            project_name=f"proj{i % 4}"
+        )
+        for i in range(count)
+    ]
+
+
+class TestSessionTableView(unittest.TestCase):
+    """Test the indexed, virtualized session table."""
+
+    def setUp(self):
+        self.dashboard, _ = make_dashboard()
+        self.dashboard._publish(make_sessions(200), datetime.now())
+        self.dashboard.apply_snapshot()
+
+    def test_only_visible_window_is_rendered(self):
+        """A page of 10 rows formats 10 sessions, not the whole snapshot."""
+        table = self.dashboard.create_session_table(page_size=10)
+
+        self.assertEqual(table.row_count, 10)
+        self.assertEqual(self.dashboard.render_stats["rows_built"], 10)
+        self.assertIn("Rows 1-10 of 200", table.caption)
+
+    def test_scrolling_is_clamped_to_the_last_page(self):
+        """Keys move the window, which never runs past the end."""
+        self.dashboard.handle_view_key("pagedown")
+        self.dashboard.handle_view_key("down")
+        page = self.dashboard.page_size()
+        visible, first, _ = self.dashboard.view.window(self.dashboard._index, page)
+        self.assertEqual(first, page + 1)
+
+        self.dashboard.handle_view_key("end")
+        visible, first, total = self.dashboard.view.window(self.dashboard._index, page)
+        self.assertEqual(first + len(visible), total)
+        self.assertFalse(self.dashboard.handle_view_key("z"))
+
+    def test_sort_and_filter_match_full_scan(self):
+        """Indexed queries return what sorting and filtering the full list would."""
+        sessions = make_sessions(200)
+        index = SessionIndex(sessions)
+
+        rows = index.query("tokens", descending=True, filters={"status": "idle", "project": "proj1"})
+        expected = sorted(
+            (s for s in sessions if s.status.value == "idle" and s.project_name == "proj1"),
+            key=lambda s: s.token_count, reverse=True
+        )
+        self.assertEqual([sessions[i].id for i in rows], [s.id for s in expected])
+
+        rows = index.query("health", filters={"health": "critical"})
+        self.assertTrue(all(sessions[i].health_score < 40 for i in rows))
+        self.assertEqual([sessions[i].health_score for i in rows],
+                         sorted(sessions[i].health_score for i in rows))
+
+    def test_view_changes_are_cached_per_snapshot(self):
+        """Filters cycle through snapshot values and repeated queries reuse results."""
+        self.dashboard.handle_view_key("v")
+        self.assertEqual(self.dashboard.view.filters["status"], "active")
+
+        first = self.dashboard.view.rows(self.dashboard._index)
+        self.assertIs(self.dashboard.view.rows(self.dashboard._index), first)
+
+        layout = self.dashboard.create_layout()
+        self.dashboard.handle_view_key("c")
+        self.assertIsNot(self.dashboard.create_layout(), layout)
+
+
+if __name__ == "__main__":
+    unittest.main()
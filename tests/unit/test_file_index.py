@@ -0,0 +1,103 @@
+"""Unit tests for the working-tree file index."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from llm_session_manager.utils.file_index import FileIndex, _IndexEventHandler
+
+
+class TestFileIndex(unittest.TestCase):
+    """Test the most-recent heap, tree limits and event updates."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for i in range(10):
+            self.write(f"pkg/mod_{i}.py", mtime=1_000_000 + i)
+        self.write("pkg/deep/er/still/file.py", mtime=1_000_000)
+        self.write("node_modules/dep/index.js", mtime=2_000_000)
+        self.index = FileIndex(self.root, recent_capacity=4)
+        self.index.scan()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel, mtime):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def recent_paths(self, n=3):
+        return [f["path"] for f in self.index.recent(n)]
+
+    def test_recent_files_follow_updates_and_deletes(self):
+        """Ignored dirs are skipped; edits move files up and deletions drop them."""
+        self.assertEqual(len(self.index), 11)
+        self.assertEqual(self.recent_paths(), ["pkg/mod_9.py", "pkg/mod_8.py", "pkg/mod_7.py"])
+
+        self.index.update(self.write("pkg/mod_0.py", mtime=1_500_000))
+        (self.root / "pkg/mod_9.py").unlink()
+        self.index.update(self.root / "pkg/mod_9.py")
+        self.assertEqual(self.recent_paths(), ["pkg/mod_0.py", "pkg/mod_8.py", "pkg/mod_7.py"])
+        self.assertEqual(self.index.stats["heap_rebuilds"], 0)
+
+        # Deleting more heap entries than remain valid falls back to a rebuild
+        for name in ("mod_0", "mod_8", "mod_7"):
+            (self.root / f"pkg/{name}.py").unlink()
+            self.index.update(self.root / f"pkg/{name}.py")
+        self.assertEqual(self.recent_paths(), ["pkg/mod_6.py", "pkg/mod_5.py", "pkg/mod_4.py"])
+        self.assertEqual(self.index.stats["heap_rebuilds"], 1)
+
+    def test_tree_is_depth_and_size_limited(self):
+        """Directories past max_depth are collapsed and output stops at max_entries."""
+        lines, truncated = self.index.tree(max_depth=2, max_entries=100)
+        self.assertEqual(lines[0], f"{self.root.name}/")
+        self.assertIn("  pkg/", lines)
+        self.assertIn("    deep/", lines)
+        self.assertIn("      er/ ...", lines)
+        self.assertTrue(truncated)
+
+        lines, truncated = self.index.tree(max_depth=10, max_entries=5)
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(truncated)
+
+    def test_directory_events(self):
+        """A created directory is scanned; a removed one is dropped with its files."""
+        changes = []
+        self.index.add_listener(lambda: changes.append(1))
+        self.write("new/a.py", mtime=3_000_000)
+        self.index.update(self.root / "new")
+        self.assertEqual(self.recent_paths(1), ["new/a.py"])
+
+        shutil.rmtree(self.root / "pkg")
+        self.index.update(self.root / "pkg")
+        self.assertEqual(len(self.index), 1)
+        self.assertNotIn("  pkg/", self.index.tree()[0])
+        self.assertEqual(len(changes), 2)
+
+
+    def test_unchanged_files_do_not_notify(self):
+        """Re-stating an unchanged file or reading it does not call listeners."""
+        changes = []
+        self.index.add_listener(lambda: changes.append(1))
+        path = self.root / "pkg" / "mod_1.py"
+        self.index.update(path)
+        self.index.update(self.root / "pkg" / "missing.py")
+
+        handler = _IndexEventHandler(self.index)
+        for event_type in ("opened", "closed", "closed_no_write"):
+            handler.on_any_event(SimpleNamespace(event_type=event_type, src_path=str(path)))
+        self.assertEqual(changes, [])
+
+        os.utime(path, (3_000_000, 3_000_000))
+        handler.on_any_event(SimpleNamespace(event_type="modified", src_path=str(path)))
+        self.assertEqual(changes, [1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Unit tests for ranked, budgeted file sampling."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from llm_session_manager.utils.file_sampler import FileSampler
+
+
+class TestFileSampler(unittest.TestCase):
+    """Test ranking, budgets and directory overview."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        files = {
+            "a_helpers/util_0.py": "x = 0\n",
+            "a_helpers/util_1.py": "x = 1\n",
+            "a_helpers/util_2.py": "x = 2\n",
+            "src/pkg/big.py": "# big\n" * 500,
+            "src/pkg/main.py": "def main(): pass\n",
+            "pyproject.toml": "[project]\nname = 'demo'\n",
+            "web/style.css": "body {}\n",
+            "node_modules/lib/index.js": "ignored\n",
+            "logo.png": "\0binary",
+        }
+        for index, (rel_path, content) in enumerate(files.items()):
+            path = self.root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+            os.utime(path, (1_000_000 + index, 1_000_000 + index))
+        self.recent = self.root / "a_helpers" / "util_1.py"
+        os.utime(self.recent, (2_000_000, 2_000_000))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def paths(self, sample):
+        return [f["path"] for f in sample.files]
+
+    def test_ranks_manifests_entry_points_recent_and_largest(self):
+        """Signal files come first, not whatever the walk yields first."""
+        sample = FileSampler({".py", ".css"}, max_files=5).sample(str(self.root))
+
+        self.assertEqual(self.paths(sample), [
+            "pyproject.toml",
+            os.path.join("src", "pkg", "main.py"),
+            os.path.join("a_helpers", "util_1.py"),        # Most recent
+            os.path.join("src", "pkg", "big.py"),          # Largest .py
+            os.path.join("web", "style.css"),
+        ])
+
+    def test_byte_and_token_budgets(self):
+        """Content is truncated so the sample fits the tightest budget."""
+        sample = FileSampler({".py"}, max_bytes=10_000, max_tokens=100, file_bytes=300).sample(str(self.root))
+
+        self.assertLessEqual(sample.bytes_read, 400)
+        self.assertTrue(all(len(f["content"]) <= 300 for f in sample.files))
+
+    def test_binary_files_hand_back_their_allowance(self):
+        """A binary file's slot and bytes go to the next ranked file."""
+        # logo.png is the most recent candidate but cannot be decoded
+        sample = FileSampler({".png", ".css"}, max_files=1, max_bytes=8,
+                             include_manifests=False).sample(str(self.root))
+
+        self.assertEqual(sample.files, [{"path": os.path.join("web", "style.css"), "content": "body {}\n"}])
+
+    def test_skips_excluded_dirs_and_collects_overview(self):
+        """Skipped directories are not scanned; extensions and dirs are reported."""
+        sample = FileSampler({".js", ".py", ".png"}, max_files=20).sample(str(self.root))
+
+        self.assertNotIn("node_modules", sample.directories)
+        self.assertFalse(any("node_modules" in p for p in self.paths(sample)))
+        self.assertNotIn("logo.png", self.paths(sample))  # Binary
+        self.assertEqual(sample.top_directories, {"a_helpers", "src", "web"})
+        self.assertIn("pkg", sample.directories)
+        self.assertTrue({".py", ".css", ".toml", ".png"} <= sample.extensions)
+
+
+if __name__ == "__main__":
+    unittest.main()
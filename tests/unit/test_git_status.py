@@ -0,0 +1,94 @@
+"""Unit tests for the cached async git status provider."""
+
+import os
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from llm_session_manager.utils.git_status import GitStatusProvider, find_git_dir, parse_porcelain_v2
+
+
+def git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+class TestParsePorcelainV2(unittest.TestCase):
+    """Test parsing of porcelain v2 records."""
+
+    def test_branch_headers_and_entries(self):
+        """Headers, ordinary, renamed, unmerged and untracked records are classified."""
+        output = "\0".join([
+            "# branch.oid 1234abcd",
+            "# branch.head main",
+            "# branch.upstream origin/main",
+            "# branch.ab +2 -1",
+            "1 M. N... 100644 100644 100644 aaa bbb staged.py",
+            "1 .M N... 100644 100644 100644 aaa aaa edited file.py",
+            "2 R. N... 100644 100644 100644 aaa aaa R100 new.py",
+            "old.py",
+            "u UU N... 100644 100644 100644 100644 a b c conflict.py",
+            "? notes.txt",
+            "",
+        ])
+        status = parse_porcelain_v2(output)
+
+        self.assertEqual(status["branch"], "main")
+        self.assertEqual((status["upstream"], status["ahead"], status["behind"]), ("origin/main", 2, 1))
+        self.assertEqual(status["staged"], ["staged.py", "new.py"])
+        self.assertEqual(status["modified"], ["edited file.py"])
+        self.assertEqual(status["conflicted"], ["conflict.py"])
+        self.assertEqual(status["untracked"], ["notes.txt"])
+        self.assertFalse(status["is_clean"])
+
+
+class TestGitStatusProvider(unittest.IsolatedAsyncioTestCase):
+    """Test status, log and cache invalidation against a real repository."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.tmp.name)
+        git(self.repo, "init", "-q", "-b", "main")
+        (self.repo / "a.py").write_text("a = 1\n")
+        git(self.repo, "add", "a.py")
+        git(self.repo, "commit", "-q", "-m", "Add a | with pipe")
+        self.git = GitStatusProvider(ttl=60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_status_is_cached_until_index_changes(self):
+        """Repeated calls are served from memory; staging a file invalidates them."""
+        status = await self.git.status(self.repo)
+        self.assertEqual(status["branch"], "main")
+        self.assertTrue(status["is_clean"])
+        self.assertIs(await self.git.status(self.repo), status)
+        self.assertEqual(self.git.stats, {"hits": 1, "misses": 1})
+
+        (self.repo / "b.py").write_text("b = 2\n")
+        git(self.repo, "add", "b.py")
+        index = self.repo / ".git" / "index"
+        os.utime(index, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+        status = await self.git.status(self.repo)
+        self.assertEqual(status["staged"], ["b.py"])
+        self.assertEqual(self.git.stats["misses"], 2)
+
+    async def test_log_and_errors(self):
+        """Commit messages survive '|'; non-repositories report an error."""
+        log = await self.git.log(self.repo, 5)
+        self.assertEqual(log["count"], 1)
+        self.assertEqual(log["commits"][0]["message"], "Add a | with pipe")
+
+        with tempfile.TemporaryDirectory() as plain:
+            if find_git_dir(plain) is None:
+                self.assertEqual(await self.git.status(plain), {"error": "Not a git repository"})
+        self.assertEqual(await self.git.status(self.repo / "missing"), {"error": "Working directory not found"})
+
+
+if __name__ == "__main__":
+    unittest.main()
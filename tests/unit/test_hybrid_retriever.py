@@ -0,0 +1,182 @@
+"""Unit tests for hybrid memory retrieval."""
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from llm_session_manager.context.hybrid_retriever import (
+    BM25Index,
+    HybridRetriever,
+    reciprocal_rank_fusion,
+    recency_decay,
+)
+from llm_session_manager.context.retrieval_eval import LabeledQuery, evaluate_retrieval
+from llm_session_manager.core.memory_manager import MemoryManager
+
+
+class FakeCollection:
+    """Minimal stand-in for a ChromaDB collection.
+
+    ``query`` ranks documents by the distances given at construction time.
+    """
+
+    def __init__(self, distances):
+        self.docs = {}
+        self.distances = distances
+
+    def count(self):
+        return len(self.docs)
+
+    def add(self, ids, documents, metadatas):
+        for memory_id, doc, meta in zip(ids, documents, metadatas):
+            self.docs[memory_id] = (doc, meta)
+
+    def get(self, where=None, include=None, ids=None):
+        items = [
+            (i, d, m) for i, (d, m) in self.docs.items()
+            if not where or all(m.get(k) == v for k, v in where.items())
+        ]
+        return {
+            "ids": [i for i, _, _ in items],
+            "documents": [d for _, d, _ in items],
+            "metadatas": [m for _, _, m in items],
+        }
+
+    def query(self, query_texts, n_results, where=None):
+        ranked = sorted(self.docs, key=lambda i: self.distances.get(self.docs[i][0], 2.0))[:n_results]
+        return {
+            "ids": [ranked],
+            "documents": [[self.docs[i][0] for i in ranked]],
+            "metadatas": [[self.docs[i][1] for i in ranked]],
+            "distances": [[self.distances.get(self.docs[i][0], 2.0) for i in ranked]],
+        }
+
+    def delete(self, ids):
+        for memory_id in ids:
+            self.docs.pop(memory_id, None)
+
+
+class TestBM25Index(unittest.TestCase):
+    """Test the incremental BM25 index."""
+
+    def setUp(self):
+        self.index = BM25Index()
+        self.index.add("jwt", "JWT authentication with python-jose tokens")
+        self.index.add("sqlite", "SQLite database is locked; enable WAL mode")
+        self.index.add("react", "Memoize React components to avoid re-renders")
+
+    def test_exact_term_ranks_first(self):
+        """A document containing the query identifier ranks first."""
+        results = self.index.search("database locked", limit=3)
+        self.assertEqual(results[0][0], "sqlite")
+
+    def test_no_overlap_returns_nothing(self):
+        """Documents without query terms are not returned."""
+        self.assertEqual(self.index.search("kubernetes"), [])
+
+    def test_remove_document(self):
+        """Removed documents disappear from results."""
+        self.index.remove("jwt")
+        self.assertNotIn("jwt", self.index)
+        self.assertEqual(self.index.search("jwt tokens"), [])
+
+    def test_allowed_ids_filter(self):
+        """Results can be restricted to a set of IDs."""
+        results = self.index.search("database react", allowed_ids={"react"})
+        self.assertEqual([doc_id for doc_id, _ in results], ["react"])
+
+
+class TestFusion(unittest.TestCase):
+    """Test rank fusion, recency and calibration."""
+
+    def test_rrf_rewards_agreement(self):
+        """A document ranked by both lists beats one ranked by a single list."""
+        fused = reciprocal_rank_fusion([["a", "b"], ["b", "c"]])
+        self.assertGreater(fused["b"], fused["a"])
+        self.assertGreater(fused["a"], fused["c"])
+
+    def test_recency_decay_half_life(self):
+        """Decay reaches one half after one half-life."""
+        now = datetime(2026, 1, 31)
+        timestamp = (now - timedelta(days=30)).isoformat()
+        self.assertAlmostEqual(recency_decay(timestamp, now, half_life_days=30), 0.5)
+        self.assertEqual(recency_decay(None, now), 1.0)
+
+    def test_fuse_relevance_is_calibrated(self):
+        """Relevance stays within 0-1 and follows the raw signals."""
+        retriever = HybridRetriever(recency_weight=0.0)
+        documents = {
+            "a": ("alpha", {"timestamp": datetime.now().isoformat()}),
+            "b": ("beta", {}),
+        }
+        results = retriever.fuse([("a", 0.2), ("b", 1.6)], [("a", 8.0)], documents, limit=5)
+
+        self.assertEqual([r["id"] for r in results], ["a", "b"])
+        for result in results:
+            self.assertGreaterEqual(result["relevance"], 0.0)
+            self.assertLessEqual(result["relevance"], 1.0)
+        self.assertGreater(results[0]["relevance"], results[1]["relevance"])
+        # Hits without a known document are dropped
+        self.assertEqual(retriever.fuse([], [("x", 1.0)], {}, limit=5), [])
+
+
+class TestMemoryManagerHybridSearch(unittest.TestCase):
+    """Test MemoryManager.search_memories against a fake collection."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = MemoryManager(storage_path=self.tmp.name)
+        # Dense retrieval thinks the React note is closest to everything
+        self.manager.collection = FakeCollection({
+            "Memoize React components": 0.3,
+            "ECONNRESET is retried with backoff": 1.4,
+        })
+        self.react_id = self.manager.add_memory("s1", "Memoize React components")
+        self.retry_id = self.manager.add_memory("s2", "ECONNRESET is retried with backoff")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lexical_signal_rescues_exact_identifier(self):
+        """Hybrid search surfaces the exact-match memory dense search ranks low."""
+        dense = self.manager.search_memories("ECONNRESET", limit=1, mode="dense")
+        hybrid = self.manager.search_memories("ECONNRESET", limit=1, mode="hybrid")
+
+        self.assertEqual(dense[0]["id"], self.react_id)
+        self.assertEqual(hybrid[0]["id"], self.retry_id)
+
+    def test_deleted_memory_leaves_lexical_index(self):
+        """Deleting a memory also removes it from lexical search."""
+        self.manager.search_memories("ECONNRESET", mode="lexical")
+        self.manager.delete_memory(self.retry_id)
+        self.assertEqual(self.manager.search_memories("ECONNRESET", mode="lexical"), [])
+
+
+    def test_writes_from_other_processes_are_indexed(self):
+        """Memories added to the collection behind the manager's back become searchable."""
+        self.manager.search_memories("ECONNRESET", mode="lexical")
+        self.manager.collection.add(["m3"], ["WAL checkpoint starvation"], [{"session_id": "s3"}])
+
+        results = self.manager.search_memories("checkpoint", mode="lexical")
+        self.assertEqual([m["id"] for m in results], ["m3"])
+
+class TestRetrievalEval(unittest.TestCase):
+    """Test the offline evaluation harness."""
+
+    def test_recall_and_mrr(self):
+        """Recall@k and MRR are computed from ranked IDs."""
+        queries = [
+            LabeledQuery("q1", ["a"]),
+            LabeledQuery("q2", ["x", "y"]),
+        ]
+        rankings = {"q1": ["b", "a"], "q2": ["x", "c", "y"]}
+        report = evaluate_retrieval(lambda q, k: rankings[q][:k], queries, k_values=(1, 3))
+
+        self.assertEqual(report["queries"], 2)
+        self.assertAlmostEqual(report["recall"][1], 0.25)
+        self.assertAlmostEqual(report["recall"][3], 1.0)
+        self.assertAlmostEqual(report["mrr"], 0.75)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Unit tests for the multi-session MCP gateway."""
+
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import anyio
+from mcp.types import (
+    CallToolRequest,
+    CallToolRequestParams,
+    GetPromptRequest,
+    GetPromptRequestParams,
+    ListResourcesRequest,
+    ReadResourceRequest,
+    ReadResourceRequestParams,
+)
+
+from llm_session_manager.mcp.gateway import SessionGateway
+from llm_session_manager.models import Session
+from llm_session_manager.storage.database import Database
+
+
+class FakeEstimator:
+    """Token count derived from the session's PID."""
+
+    def estimate_session_tokens(self, session):
+        return session.pid * 1000
+
+
+class TestSessionGateway(unittest.IsolatedAsyncioTestCase):
+    """Test namespacing, shared components and session sync."""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / "repo_a").mkdir()
+        (root / "repo_b").mkdir()
+        self.db = Database(str(root / "sessions.db"))
+        self.db.init_db()
+        for sid, pid, repo in (("a1", 1, "repo_a"), ("a2", 2, "repo_a"), ("b1", 3, "repo_b")):
+            self.db.add_session(Session(id=sid, pid=pid, working_directory=str(root / repo)))
+
+        self.gateway = SessionGateway(db=self.db)
+        self.gateway.token_estimator = FakeEstimator()
+        await self.gateway.sync_sessions(force=True)
+
+    async def asyncTearDown(self):
+        await self.gateway.stop()
+        self.tmp.cleanup()
+
+    async def request(self, request_type, request):
+        return (await self.gateway.server.request_handlers[request_type](request)).root
+
+    async def read(self, uri):
+        result = await self.request(ReadResourceRequest, ReadResourceRequest(
+            method="resources/read", params=ReadResourceRequestParams(uri=uri)))
+        return json.loads(result.contents[0].text)
+
+    async def call(self, name, arguments):
+        result = await self.request(CallToolRequest, CallToolRequest(
+            method="tools/call", params=CallToolRequestParams(name=name, arguments=arguments)))
+        return json.loads(result.content[0].text)
+
+    async def test_sessions_share_components_but_not_state(self):
+        """Sessions in one directory share its index; each keeps its own sampler."""
+        a1, a2, b1 = (self.gateway.sessions[sid] for sid in ("a1", "a2", "b1"))
+        self.assertIs(a1.files, a2.files)
+        self.assertIsNot(a1.files, b1.files)
+        self.assertIs(a1.git, b1.git)
+        self.assertIsNot(a1.metrics, a2.metrics)
+
+        self.assertEqual((await self.read("session://a1/context_estimate"))["estimated_tokens"], 1000)
+        self.assertEqual((await self.read("session://a2/context_estimate"))["estimated_tokens"], 2000)
+
+    async def test_resources_and_tools_are_namespaced(self):
+        """Each session's resources are listed; tools route by session_id."""
+        listing = await self.request(ListResourcesRequest, ListResourcesRequest(method="resources/list"))
+        uris = [str(r.uri) for r in listing.resources]
+        self.assertEqual(len(uris), 1 + 3 * 5)
+        self.assertIn("session://b1/git_status", uris)
+
+        health = await self.call("analyze_session_health", {"session_id": "b1"})
+        self.assertEqual(health["session_id"], "b1")
+        self.assertIn("Unknown session", (await self.call("analyze_session_health", {"session_id": "zz"}))["error"])
+        self.assertEqual((await self.call("list_sessions", {}))["count"], 3)
+
+    async def test_prompts_render_for_a_session(self):
+        """prompts/get returns a GetPromptResult for the requested session."""
+        result = await self.request(GetPromptRequest, GetPromptRequest(
+            method="prompts/get",
+            params=GetPromptRequestParams(name="session_status_report", arguments={"session_id": "a2"}),
+        ))
+        self.assertEqual(len(result.messages), 1)
+        self.assertIn("**Session ID**: a2", result.messages[0].content.text)
+
+    async def test_sync_follows_database(self):
+        """Deleted sessions are dropped with their last index user; unchanged DBs are not re-read."""
+        self.assertFalse(await self.gateway.sync_sessions())
+
+        self.db.delete_session("b1")
+        self.assertTrue(await self.gateway.sync_sessions())
+        self.assertEqual(sorted(self.gateway.sessions), ["a1", "a2"])
+        self.assertEqual(len(self.gateway._indexes), 1)
+        self.assertIn("Unknown resource", (await self.read("session://b1/git_status"))["error"])
+
+
+class TestSocketTransport(unittest.IsolatedAsyncioTestCase):
+    """Test serving clients over a Unix domain socket."""
+
+    async def test_initialize_over_socket(self):
+        """A client connecting to the socket completes the MCP handshake."""
+        with tempfile.TemporaryDirectory() as tmp:
+            gateway = SessionGateway(db=Database(f"{tmp}/sessions.db"))
+            path = f"{tmp}/gateway.sock"
+            server = asyncio.create_task(gateway.run_socket(path))
+            try:
+                for _ in range(100):
+                    if Path(path).exists():
+                        break
+                    await asyncio.sleep(0.01)
+
+                request = {
+                    "jsonrpc": "2.0", "id": 1, "method": "initialize",
+                    "params": {"protocolVersion": "2024-11-05", "capabilities": {},
+                               "clientInfo": {"name": "test", "version": "1"}},
+                }
+                async with await anyio.connect_unix(path) as stream:
+                    await stream.send(json.dumps(request).encode() + b"\n")
+                    response = b""
+                    while not response.endswith(b"\n"):
+                        response += await stream.receive()
+
+                self.assertEqual(json.loads(response)["result"]["serverInfo"]["name"], "llm-session-gateway")
+            finally:
+                server.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await server
+            self.assertFalse(Path(path).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
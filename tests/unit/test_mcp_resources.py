@@ -0,0 +1,181 @@
+"""Unit tests for paginated, cached MCP resource listing, reads, notifications and prompts."""
+
+import json
+import tempfile
+import unittest
+
+from mcp.types import (
+    GetPromptRequest,
+    GetPromptRequestParams,
+    ListResourcesRequest,
+    ListResourceTemplatesRequest,
+    PaginatedRequestParams,
+    ReadResourceRequest,
+    ReadResourceRequestParams,
+)
+
+from llm_session_manager.mcp.server import MCPServer
+from llm_session_manager.models import Session
+from tests.unit.test_hybrid_retriever import FakeCollection
+
+
+class TestResourceListing(unittest.IsolatedAsyncioTestCase):
+    """Test cursor pagination, templates and change-counter invalidation."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MCPServer(db_path=f"{self.tmp.name}/sessions.db", memory_path=f"{self.tmp.name}/memories")
+        self.server.RESOURCE_PAGE_SIZE = 10
+        for i in range(25):
+            self.server.db.add_session(Session(id=f"session-{i:03d}", pid=i))
+
+    def tearDown(self):
+        self.server.runner.shutdown()
+        self.tmp.cleanup()
+
+    async def list_page(self, cursor=None):
+        handler = self.server.server.request_handlers[ListResourcesRequest]
+        params = PaginatedRequestParams(cursor=cursor) if cursor else None
+        result = await handler(ListResourcesRequest(method="resources/list", params=params))
+        return result.root
+
+    async def test_pages_cover_every_session_once(self):
+        """Following nextCursor yields each session's info resource exactly once."""
+        uris, cursor, pages = [], None, 0
+        while True:
+            page = await self.list_page(cursor)
+            uris.extend(str(r.uri) for r in page.resources)
+            pages += 1
+            cursor = page.nextCursor
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, 3)
+        session_uris = [u for u in uris if u.endswith("/info")]
+        self.assertEqual(session_uris, [f"session://session-{i:03d}/info" for i in range(25)])
+        self.assertIn("session://list", uris)
+
+    async def test_listing_is_cached_until_sessions_change(self):
+        """Repeated listings are cache hits; a write invalidates them."""
+        first = await self.list_page()
+        self.assertIs(await self.list_page(), first)
+        self.assertEqual(self.server.listing_stats, {"hits": 1, "misses": 1})
+
+        self.server.db.delete_session("session-000")
+        page = await self.list_page()
+        self.assertNotIn("session://session-000/info", [str(r.uri) for r in page.resources])
+
+    async def test_templates_and_bad_cursor(self):
+        """Per-session resources are advertised as templates; junk cursors are rejected."""
+        handler = self.server.server.request_handlers[ListResourceTemplatesRequest]
+        result = await handler(ListResourceTemplatesRequest(method="resources/templates/list"))
+        self.assertEqual(
+            [t.uriTemplate for t in result.root.resourceTemplates],
+            ["session://{session_id}/info", "session://{session_id}/health", "session://{session_id}/memories"]
+        )
+
+        with self.assertRaises(ValueError):
+            await self.list_page("not-a-cursor")
+
+
+class FakeClient:
+    """Records resources/updated notifications."""
+
+    def __init__(self):
+        self.updated = []
+
+    async def send_resource_updated(self, uri):
+        self.updated.append(str(uri))
+
+
+class TestResourceReads(unittest.IsolatedAsyncioTestCase):
+    """Test the response cache and change notifications."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MCPServer(db_path=f"{self.tmp.name}/sessions.db", memory_path=f"{self.tmp.name}/memories")
+        self.session = Session(id="s1", pid=1, token_count=100)
+        self.server.db.add_session(self.session)
+
+    def tearDown(self):
+        self.server.runner.shutdown()
+        self.tmp.cleanup()
+
+    async def read(self, uri):
+        handler = self.server.server.request_handlers[ReadResourceRequest]
+        result = await handler(ReadResourceRequest(method="resources/read", params=ReadResourceRequestParams(uri=uri)))
+        return result.root.contents[0].text
+
+    async def test_reads_are_compact_and_cached_per_version(self):
+        """Bodies are compact JSON, reused until the sessions change."""
+        body = await self.read("session://s1/health")
+        self.assertNotIn("\n", body)
+        self.assertIn("component_scores", json.loads(body)["breakdown"])
+
+        self.assertEqual(await self.read("session://s1/health"), body)
+        self.assertEqual(self.server.resource_cache_stats, {"hits": 1, "misses": 1})
+
+        self.session.token_count = 5000
+        self.server.db.update_session(self.session)
+        self.assertEqual(json.loads(await self.read("session://s1/info"))["token_count"], 5000)
+
+    async def test_cache_is_bounded_and_drops_old_versions(self):
+        """The cache keeps RESOURCE_CACHE_SIZE entries of the current version."""
+        self.server.RESOURCE_CACHE_SIZE = 2
+        for uri in ("session://s1/info", "session://s1/health", "session://s1/memories"):
+            await self.read(uri)
+        self.assertEqual(list(self.server._resource_cache), ["session://s1/health", "session://s1/memories"])
+
+        self.server.db.update_session(self.session)
+        await self.read("session://s1/info")
+        self.assertEqual(list(self.server._resource_cache), ["session://s1/info"])
+
+    async def test_subscribers_are_notified_once_per_change(self):
+        """A changed snapshot sends one resources/updated per subscribed client."""
+        client = FakeClient()
+        self.server._subscriptions["session://s1/info"] = {client}
+        self.assertEqual(await self.server.notify_resource_changes(), 0)
+        self.assertEqual(await self.server.notify_resource_changes(), 0)
+
+        self.session.token_count = 5000
+        self.server.db.update_session(self.session)
+        self.assertEqual(await self.server.notify_resource_changes(), 1)
+        self.assertEqual(await self.server.notify_resource_changes(), 0)
+        self.assertEqual(client.updated, ["session://s1/info"])
+
+
+
+class TestPrompts(unittest.IsolatedAsyncioTestCase):
+    """Test prompts/get through the registered handler."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MCPServer(db_path=f"{self.tmp.name}/sessions.db", memory_path=f"{self.tmp.name}/memories")
+        self.server.db.add_session(Session(id="s1", pid=1, token_count=100))
+        self.server.memory_manager.collection = FakeCollection({})
+        self.server.memory_manager.add_memory("s1", "Retry ECONNRESET with backoff")
+
+    def tearDown(self):
+        self.server.runner.shutdown()
+        self.tmp.cleanup()
+
+    async def prompt(self, name, arguments):
+        handler = self.server.server.request_handlers[GetPromptRequest]
+        result = await handler(GetPromptRequest(
+            method="prompts/get", params=GetPromptRequestParams(name=name, arguments=arguments)
+        ))
+        self.assertEqual(len(result.root.messages), 1)
+        return result.root.messages[0].content.text
+
+    async def test_prompts_pack_memories(self):
+        """Each prompt returns a GetPromptResult; memory prompts include packed memories."""
+        self.assertIn("**ID**: s1", await self.prompt("session_summary", {"session_id": "s1"}))
+        for name, arguments in [
+            ("find_relevant_session", {"task": "ECONNRESET"}),
+            ("cross_session_search", {"query": "ECONNRESET", "token_budget": "200"}),
+        ]:
+            self.assertIn("Retry ECONNRESET with backoff", await self.prompt(name, arguments))
+        self.assertIn("Total Sessions: 1", await self.prompt("session_health_check", {}))
+
+if __name__ == "__main__":
+    unittest.main()
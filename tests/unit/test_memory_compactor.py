@@ -0,0 +1,195 @@
+"""Unit tests for memory compaction."""
+
+import json
+import math
+import tempfile
+import time
+import unittest
+
+from llm_session_manager.context.memory_compactor import MemoryCompactor
+from llm_session_manager.core.memory_manager import MemoryManager
+
+DAY = 86400
+
+
+class FakeEmbeddingCollection:
+    """Stand-in for a ChromaDB collection with fixed embeddings.
+
+    Embeddings are looked up by document text and normalized, and ``query``
+    returns squared L2 distances like Chroma's default space.
+    """
+
+    metadata = {"description": "test"}
+
+    def __init__(self, embeddings):
+        self.embeddings = {
+            text: [x / math.sqrt(sum(v * v for v in vector)) for x in vector]
+            for text, vector in embeddings.items()
+        }
+        self.docs = {}
+
+    def count(self):
+        return len(self.docs)
+
+    def add(self, ids, documents, metadatas):
+        for memory_id, doc, meta in zip(ids, documents, metadatas):
+            self.docs[memory_id] = (doc, dict(meta))
+
+    def _matches(self, meta, where):
+        for key, condition in (where or {}).items():
+            value = meta.get(key)
+            if isinstance(condition, dict):
+                if value is None or not value > condition["$gt"]:
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    def get(self, ids=None, where=None, include=None):
+        items = [
+            (i, d, m) for i, (d, m) in self.docs.items()
+            if (ids is None or i in ids) and self._matches(m, where)
+        ]
+        return {
+            "ids": [i for i, _, _ in items],
+            "documents": [d for _, d, _ in items],
+            "metadatas": [m for _, _, m in items],
+            "embeddings": [self.embeddings[d] for _, d, _ in items],
+        }
+
+    def query(self, query_embeddings, n_results, include=None, where=None, query_texts=None):
+        target = query_embeddings[0]
+        distances = {
+            memory_id: sum((a - b) ** 2 for a, b in zip(target, self.embeddings[doc]))
+            for memory_id, (doc, _) in self.docs.items()
+        }
+        ranked = sorted(distances, key=distances.get)[:n_results]
+        return {
+            "ids": [ranked],
+            "documents": [[self.docs[i][0] for i in ranked]],
+            "metadatas": [[self.docs[i][1] for i in ranked]],
+            "distances": [[distances[i] for i in ranked]],
+        }
+
+    def update(self, ids, metadatas):
+        for memory_id, meta in zip(ids, metadatas):
+            self.docs[memory_id] = (self.docs[memory_id][0], dict(meta))
+
+    def delete(self, ids):
+        for memory_id in ids:
+            self.docs.pop(memory_id, None)
+
+
+class TestMemoryCompactor(unittest.TestCase):
+    """Test merging, provenance, expiry and incremental runs."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = MemoryManager(storage_path=self.tmp.name)
+        self.manager.collection = FakeEmbeddingCollection({
+            "Use WAL mode for SQLite": [1.0, 0.0, 0.0],
+            "Enable SQLite WAL mode": [0.99, 0.05, 0.0],
+            "Memoize React components": [0.0, 1.0, 0.0],
+            "JWT auth with python-jose": [0.0, 0.0, 1.0],
+            "Use python-jose for JWT auth": [0.02, 0.0, 0.99],
+        })
+        self.compactor = MemoryCompactor(self.manager, expire_after_days=None)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_merges_duplicates_keeping_provenance(self):
+        """Near-duplicates collapse into one memory listing every source session."""
+        first = self.manager.add_memory("s1", "Use WAL mode for SQLite", tags=["db"])
+        second = self.manager.add_memory("s2", "Enable SQLite WAL mode", tags=["sqlite"])
+        self.manager.add_memory("s3", "Memoize React components")
+
+        report = self.compactor.run()
+
+        self.assertEqual(report.clusters, 1)
+        self.assertEqual(report.merged, 1)
+        self.assertGreater(report.bytes_reclaimed, 0)
+        self.assertEqual(self.manager.collection.count(), 2)
+
+        keeper = first if first in self.manager.collection.docs else second
+        meta = self.manager.collection.docs[keeper][1]
+        self.assertEqual(sorted(json.loads(meta["source_sessions"])), ["s1", "s2"])
+        self.assertEqual(sorted(json.loads(meta["tags"])), ["db", "sqlite"])
+        self.assertEqual(json.loads(meta["merged_ids"]), [second if keeper == first else first])
+
+    def test_dry_run_changes_nothing(self):
+        """A dry run reports merges but leaves the store and state untouched."""
+        self.manager.add_memory("s1", "Use WAL mode for SQLite")
+        self.manager.add_memory("s2", "Enable SQLite WAL mode")
+
+        report = self.compactor.run(dry_run=True)
+
+        self.assertEqual(report.merged, 1)
+        self.assertEqual(self.manager.collection.count(), 2)
+        self.assertEqual(self.compactor.load_state(), {})
+
+    def test_incremental_run_only_scans_new_memories(self):
+        """After a run, only memories added later are clustered, against the whole store."""
+        self.manager.add_memory("s1", "Use WAL mode for SQLite")
+        self.manager.add_memory("s2", "JWT auth with python-jose")
+        first = self.compactor.run(now=time.time())
+        self.assertFalse(first.incremental)
+        self.assertEqual(first.scanned, 2)
+
+        time.sleep(0.01)
+        self.manager.add_memory("s3", "Use python-jose for JWT auth")
+        second = self.compactor.run()
+
+        self.assertTrue(second.incremental)
+        self.assertEqual(second.scanned, 1)
+        self.assertEqual(second.merged, 1)
+
+    def test_expires_old_unused_memories(self):
+        """Memories idle past the window expire unless they are used often."""
+        compactor = MemoryCompactor(self.manager, expire_after_days=30, keep_access_count=2)
+        stale = self.manager.add_memory("s1", "Memoize React components")
+        used = self.manager.add_memory("s2", "JWT auth with python-jose")
+
+        # Retrieve the second memory twice; usage is flushed by the run
+        self.manager._record_usage([used, used])
+        report = compactor.run(now=time.time() + 60 * DAY)
+
+        self.assertEqual(report.expired, 1)
+        self.assertNotIn(stale, self.manager.collection.docs)
+        self.assertEqual(self.manager.collection.docs[used][1]["access_count"], 2)
+
+
+    def test_background_runs_compact_incrementally(self):
+        """Scheduled runs merge new duplicates without a caller and stop on request."""
+        self.manager.add_memory("s1", "Use WAL mode for SQLite")
+        self.manager.add_memory("s2", "Enable SQLite WAL mode")
+
+        self.compactor.start_background(interval_seconds=0.01)
+        try:
+            for _ in range(200):
+                if self.compactor.load_state():
+                    break
+                time.sleep(0.01)
+        finally:
+            self.compactor.stop_background()
+
+        self.assertEqual(self.manager.collection.count(), 1)
+        self.assertIsNone(self.compactor._thread)
+
+    def test_usage_is_flushed_without_a_compaction_run(self):
+        """Retrieval counts reach metadata once enough are pending, and on close."""
+        memory_id = self.manager.add_memory("s1", "Use WAL mode for SQLite")
+        self.manager.USAGE_FLUSH_THRESHOLD = 3
+
+        self.manager._record_usage([memory_id, memory_id])
+        self.assertNotIn("access_count", self.manager.collection.docs[memory_id][1])
+        self.manager._record_usage([memory_id])
+        self.assertEqual(self.manager.collection.docs[memory_id][1]["access_count"], 3)
+
+        self.manager._record_usage([memory_id])
+        self.manager.close()
+        self.assertEqual(self.manager.collection.docs[memory_id][1]["access_count"], 4)
+        self.assertEqual(self.manager._pending_usage, {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Unit tests for background session metrics sampling."""
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+
+from llm_session_manager.mcp.metrics_sampler import MetricsSampler
+from llm_session_manager.mcp.session_server import SessionMCPServer
+from llm_session_manager.models import Session
+
+
+class SlowEstimator:
+    """Counts estimates and records the thread they ran on."""
+
+    def __init__(self, tokens=50_000, delay=0.05):
+        self.tokens = tokens
+        self.delay = delay
+        self.calls = 0
+        self.threads = set()
+
+    def estimate_session_tokens(self, session):
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return self.tokens
+
+
+class TestMetricsSampler(unittest.IsolatedAsyncioTestCase):
+    """Test shared measurements, triggers and handler integration."""
+
+    def setUp(self):
+        self.session = Session(id="s1", pid=1, token_limit=100_000)
+        self.estimator = SlowEstimator()
+
+    async def test_concurrent_reads_share_one_measurement_off_the_loop(self):
+        """The first reads wait for one threaded measurement; later reads are instant."""
+        sampler = MetricsSampler(self.session, self.estimator)
+        samples = await asyncio.gather(*(sampler.latest() for _ in range(5)))
+
+        self.assertEqual(self.estimator.calls, 1)
+        self.assertNotIn(threading.get_ident(), self.estimator.threads)
+        self.assertTrue(all(s is samples[0] for s in samples))
+        self.assertEqual(samples[0].token_usage_percent, 50.0)
+        self.assertEqual(self.session.token_count, 50_000)
+
+        self.assertIs(await sampler.latest(), samples[0])
+        self.assertEqual(self.estimator.calls, 1)
+
+    async def test_trigger_samples_early(self):
+        """A file-change trigger (from another thread) refreshes before the interval."""
+        sampler = MetricsSampler(self.session, self.estimator, interval=3600, min_interval=0)
+        task = asyncio.create_task(sampler.run())
+        try:
+            while sampler.stats["samples"] < 1:
+                await asyncio.sleep(0.01)
+            self.estimator.tokens = 80_000
+            threading.Thread(target=sampler.trigger).start()
+            for _ in range(200):
+                if sampler.stats["samples"] >= 2:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual((await sampler.latest()).token_count, 80_000)
+        finally:
+            task.cancel()
+
+    async def test_handlers_report_sample_age(self):
+        """Metrics, context and health responses come from the sample and report its age."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.session.working_directory = tmp
+            server = SessionMCPServer(self.session)
+            server.metrics.token_estimator = self.estimator
+
+            metrics = await server._get_realtime_metrics()
+            context = await server._estimate_context()
+            health = await server._analyze_health()
+
+        self.assertEqual(self.estimator.calls, 1)
+        self.assertEqual(metrics["token_count"], 50_000)
+        self.assertEqual(context["estimated_tokens"], 50_000)
+        for response in (metrics, context, health):
+            self.assertGreaterEqual(response["sample_age_seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Unit tests for the indexed recommendation engine."""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from llm_session_manager.models import Session, SessionStatus
+from llm_session_manager.utils.recommendations import RecommendationEngine
+
+
+def make_session(session_id, **kwargs):
+    kwargs.setdefault("last_activity", datetime.now())
+    return Session(id=session_id, **kwargs)
+
+
+class TestRecommendationIndexes(unittest.TestCase):
+    """Test recommendations maintained from inverted indexes."""
+
+    def setUp(self):
+        self.engine = RecommendationEngine()
+        self.sessions = [
+            make_session("a", project_name="web", tags=["api"]),
+            make_session("b", project_name="web", tags=["api"], health_score=20.0),
+            make_session("c", tags=["api"], token_count=196000),
+            make_session("d", last_activity=datetime.now() - timedelta(hours=3)),
+        ]
+
+    def ids(self, recommendations):
+        return {rec["id"] for rec in recommendations}
+
+    def test_analyze_sessions(self):
+        """Per-session and relationship recommendations are produced."""
+        recommendations = self.engine.analyze_sessions(self.sessions)
+
+        self.assertEqual(self.ids(recommendations), {
+            "restart_health:b", "restart_tokens:c", "close_idle:d",
+            "merge_project:web", "merge_tag:api",
+        })
+        self.assertEqual(recommendations[0]["priority"], "high")
+        merge = next(r for r in recommendations if r["id"] == "merge_project:web")
+        self.assertEqual(merge["session_ids"], ["a", "b"])
+
+    def test_indexes_follow_session_changes(self):
+        """Changed and removed sessions update only the affected groups."""
+        self.engine.analyze_sessions(self.sessions)
+
+        self.sessions[0].tags = ["docs"]  # Mutated in place
+        recommendations = self.engine.analyze_sessions(self.sessions)
+        self.assertNotIn("merge_tag:api", self.ids(recommendations))
+
+        self.engine.remove_session("b")
+        recommendations = self.engine.current_recommendations()
+        self.assertNotIn("merge_project:web", self.ids(recommendations))
+        self.assertNotIn("restart_health:b", self.ids(recommendations))
+
+    def test_diff_since_version(self):
+        """Callers that pass their version receive only the changes."""
+        self.engine.sync(self.sessions)
+        first = self.engine.diff()
+        self.assertTrue(first["reset"])
+
+        unchanged = self.engine.diff(first["version"])
+        self.assertEqual((unchanged["added"], unchanged["changed"], unchanged["removed"]), ([], [], []))
+
+        self.sessions[2].token_count = 0
+        self.engine.upsert_session(self.sessions[2])
+        update = self.engine.diff(first["version"])
+        self.assertFalse(update["reset"])
+        self.assertEqual(update["removed"], ["restart_tokens:c"])
+        self.assertEqual(update["version"], first["version"] + 1)
+
+        stale = self.engine.diff(first["version"] - 1)
+        self.assertTrue(stale["reset"])
+
+
+class TestBestSession(unittest.TestCase):
+    """Test top-k best-session queries."""
+
+    def brute_force(self, sessions, tags, project):
+        scored = [RecommendationEngine._score(s, tags, project) for s in sessions]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored
+
+    def test_top_k_matches_linear_scoring(self):
+        """Indexed top-k returns the same ranking as scoring every session."""
+        rng = random.Random(7)
+        sessions = [
+            make_session(
+                f"s{i}",
+                project_name=rng.choice(["web", "cli", None]),
+                tags=rng.sample(["api", "ui", "db", "auth"], rng.randint(0, 2)),
+                health_score=rng.choice([100.0, 80.0, 40.0]),
+                token_count=rng.randint(0, 200000),
+            )
+            for i in range(300)
+        ]
+        engine = RecommendationEngine()
+        engine.sync(sessions)
+
+        for tags, project in [(["api"], "web"), (["db", "auth"], None), ([], "cli"), ([], None)]:
+            expected = self.brute_force(sessions, tags, project)[:5]
+            actual = engine.top_sessions_for_task(tags, project, k=5)
+            self.assertEqual([s.id for s, _, _ in actual], [s.id for s, _, _ in expected])
+
+    def test_best_session_ties_prefer_first_seen(self):
+        """Equal scores resolve to the earliest session, as before."""
+        engine = RecommendationEngine()
+        sessions = [make_session(f"s{i}", status=SessionStatus.IDLE) for i in range(5)]
+
+        best, reason = engine.get_best_session_for_task(sessions)
+        self.assertEqual(best.id, "s0")
+        self.assertIn("healthy", reason)
+        self.assertEqual(engine.get_best_session_for_task([])[0], None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Unit tests for the AI response cache and context fingerprints."""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from llm_session_manager.models import Session
+from llm_session_manager.utils.ai_tagger import AITagger
+from llm_session_manager.utils.response_cache import ResponseCache, context_fingerprint
+
+
+class TestContextFingerprint(unittest.TestCase):
+    """Test what does and does not change a fingerprint."""
+
+    def setUp(self):
+        self.context = {
+            "files": [
+                {"path": "a.py", "content": "import os"},
+                {"path": "b.py", "content": "print(1)"},
+            ],
+            "existing_tags": ["python"],
+            "extensions": {".py"},
+        }
+
+    def test_stable_under_file_order(self):
+        """Sampling the same files in another order gives the same key."""
+        reordered = dict(self.context, files=list(reversed(self.context["files"])))
+        self.assertEqual(
+            context_fingerprint("tags", self.context),
+            context_fingerprint("tags", reordered)
+        )
+
+    def test_changes_with_content_tags_and_params(self):
+        """File content, existing tags and prompt parameters change the key."""
+        base = context_fingerprint("tags", self.context, model="m")
+        edited = dict(self.context, files=[{"path": "a.py", "content": "import sys"}, self.context["files"][1]])
+        retagged = dict(self.context, existing_tags=["python", "cli"])
+
+        self.assertNotEqual(base, context_fingerprint("tags", edited, model="m"))
+        self.assertNotEqual(base, context_fingerprint("tags", retagged, model="m"))
+        self.assertNotEqual(base, context_fingerprint("tags", self.context, model="other"))
+        self.assertNotEqual(base, context_fingerprint("description", self.context, model="m"))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test hits, misses and expiry."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_and_miss_counters(self):
+        """Stored values are returned and counted as hits."""
+        cache = ResponseCache(self.tmp.name)
+        self.assertIsNone(cache.get("k"))
+        cache.set("k", ["python", "cli"])
+
+        self.assertEqual(ResponseCache(self.tmp.name).get("k"), ["python", "cli"])
+        self.assertEqual(cache.get("k"), ["python", "cli"])
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1})
+
+    def test_expired_entries_are_removed(self):
+        """Entries older than the TTL miss and are deleted."""
+        cache = ResponseCache(self.tmp.name, ttl_seconds=0.05)
+        cache.set("k", "value")
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(list(Path(self.tmp.name).glob("*.json")), [])
+
+    def test_tagger_serves_unchanged_context_from_cache(self):
+        """AITagger answers from the cache without calling the API."""
+        project = Path(self.tmp.name) / "project"
+        project.mkdir()
+        (project / "main.py").write_text("import typer\n")
+        session = Session(id="s1", working_directory=str(project))
+
+        tagger = AITagger(api_key="", cache=ResponseCache(f"{self.tmp.name}/cache"))
+        tagger.client = object()  # Any API call would fail
+        fingerprint = tagger.prepare_request(session).fingerprint
+        tagger.cache.set(fingerprint, ["cli", "python", "typer"])
+
+        self.assertEqual(tagger.suggest_tags_ai(session, max_tags=2), ["cli", "python"])
+
+        (project / "main.py").write_text("import click\n")
+        self.assertEqual(tagger.suggest_tags_ai(session), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Unit tests for dashboard session trends and batched history seeding."""
+
+import io
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from rich.console import Console
+
+from llm_session_manager.core.health_monitor import HealthMonitor
+from llm_session_manager.models import Session, SessionType
+from llm_session_manager.storage import Database
+from llm_session_manager.ui.dashboard import Dashboard
+from llm_session_manager.ui.session_trends import SessionTrends, sparkline
+
+
+class FakeDiscovery:
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    def discover_sessions(self):
+        return [Session(id=s.id, pid=s.pid, type=s.type) for s in self.sessions]
+
+
+class FakeEstimator:
+    def __init__(self):
+        self.tokens = {}
+
+    def estimate_session_tokens(self, session):
+        return self.tokens.get(session.id, 0)
+
+
+class FakeHealthMonitor(HealthMonitor):
+    def calculate_health(self, session):
+        return 0.8
+
+
+class TestSessionTrends(unittest.TestCase):
+    """Test ring buffers, sparklines and projections."""
+
+    def test_sparkline_scales_values(self):
+        """Values map onto the eight block characters."""
+        self.assertEqual(sparkline([0, 50, 100], 0, 100), "▁▅█")
+        self.assertEqual(sparkline([3, 3]), "▁▁")
+        self.assertEqual(sparkline([]), "")
+
+    def test_velocity_and_time_to_limit(self):
+        """Steady growth projects the remaining budget at the recent rate."""
+        trends = SessionTrends(capacity=5)
+        session = Session(id="s1", token_limit=10000)
+        start = datetime(2026, 1, 1, 12, 0)
+        for minute in range(8):
+            session.token_count = 1000 + minute * 500
+            trends.record([session], now=start + timedelta(minutes=minute))
+
+        trend = trends.summary(session)
+        self.assertEqual(len(trends.samples("s1")), 5)
+        self.assertAlmostEqual(trend.tokens_per_minute, 500)
+        self.assertEqual(trend.time_to_limit, timedelta(minutes=(10000 - 4500) / 500))
+        self.assertEqual(len(trend.token_sparkline), 4)
+
+    def test_token_drop_resets_velocity(self):
+        """A new conversation (fewer tokens) does not yield a negative projection."""
+        trends = SessionTrends()
+        session = Session(id="s1")
+        start = datetime(2026, 1, 1, 12, 0)
+        for minute, tokens in enumerate([5000, 9000, 100]):
+            session.token_count = tokens
+            trends.record([session], now=start + timedelta(minutes=minute))
+
+        trend = trends.summary(session)
+        self.assertIsNone(trend.tokens_per_minute)
+        self.assertIsNone(trend.time_to_limit)
+
+
+class TestHistorySeeding(unittest.TestCase):
+    """Test batched history reads and dashboard integration."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(f"{self.tmp.name}/sessions.db")
+        self.db.init_db()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_recent_history_is_limited_per_session(self):
+        """One query returns each session's latest entries, oldest first."""
+        start = datetime(2026, 1, 1, 12, 0)
+        self.db.add_history_entries([
+            (sid, i * 10, 90.0, "active", (start + timedelta(minutes=i)).isoformat())
+            for sid in ("a", "b", "c") for i in range(5)
+        ])
+
+        history = self.db.get_recent_history(["a", "b", "missing"], per_session=3)
+
+        self.assertEqual(set(history), {"a", "b"})
+        self.assertEqual([row["token_count"] for row in history["a"]], [20, 30, 40])
+
+    def test_history_is_stored_on_change_and_pruned(self):
+        """Unchanged or too-frequent samples are not stored; old rows are deleted."""
+        trends = SessionTrends(persist_interval=60, history_limit=3)
+        session = Session(id="a", pid=1, token_count=100)
+        start = datetime(2026, 1, 1, 12, 0)
+
+        for minutes, tokens in [(0, 100), (0.5, 200), (1, 100), (2, 300), (3, 400), (4, 500)]:
+            session.token_count = tokens
+            due = trends.due_for_history(trends.record([session], now=start + timedelta(minutes=minutes)))
+            self.db.add_history_entries(due)
+            self.db.prune_history([e[0] for e in due], trends.history_limit)
+
+        # 0.5 is too soon and 1 repeats the stored value
+        self.assertEqual([row["token_count"] for row in self.db.get_session_history("a")], [500, 400, 300])
+
+    def test_dashboard_seeds_once_and_records_history(self):
+        """Trends resume from stored history and rows render without SQL."""
+        session = Session(id="claude_code_1_100", pid=1, type=SessionType.CLAUDE_CODE)
+        start = datetime.now() - timedelta(minutes=3)
+        self.db.add_history_entries([
+            (session.id, 1000 * i, 80.0, "active", (start + timedelta(minutes=i)).isoformat())
+            for i in range(3)
+        ])
+
+        estimator = FakeEstimator()
+        estimator.tokens[session.id] = 3000
+        dashboard = Dashboard(FakeDiscovery([session]), FakeHealthMonitor(), estimator, db=self.db)
+        dashboard.console = Console(file=io.StringIO(), width=200)
+
+        with mock.patch.object(self.db, "get_recent_history", wraps=self.db.get_recent_history) as seed:
+            dashboard.refresh_data()
+            dashboard.refresh_data()
+        self.assertEqual(seed.call_count, 1)
+
+        # The second refresh changed nothing, so only the first was stored
+        self.assertEqual(len(dashboard.trends.samples(session.id)), 5)
+        self.assertEqual(len(self.db.get_session_history(session.id)), 4)
+
+        trend = dashboard.snapshot.trends[session.id]
+        self.assertGreater(trend.tokens_per_minute, 0)
+        self.assertIsNotNone(trend.time_to_limit)
+
+        with mock.patch.object(self.db, "get_connection", side_effect=AssertionError("SQL in render")):
+            table = dashboard.create_session_table(page_size=5)
+        self.assertEqual(table.row_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Unit tests for the learned tag ranker."""
+
+import tempfile
+import unittest
+
+from llm_session_manager.models import Session, SessionType
+from llm_session_manager.storage import Database
+from llm_session_manager.utils.tag_ranker import TagRanker
+
+
+class TestTagRanker(unittest.TestCase):
+    """Test ranking, incremental updates and persistence."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(f"{self.tmp.name}/sessions.db")
+        self.db.init_db()
+        self.db.add_session(Session(id="s1", pid=1, type=SessionType.CLAUDE_CODE))
+        self.state_path = f"{self.tmp.name}/tag_ranker.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def count_queries(self):
+        """Count connections opened on the database from now on."""
+        calls = []
+        original = self.db.get_connection
+
+        def counting():
+            calls.append(1)
+            return original()
+
+        self.db.get_connection = counting
+        return calls
+
+    def test_feedback_reranks_and_prunes_without_sql(self):
+        """Accepted tags move up, rejected ones are pruned; ranking issues no queries."""
+        ranker = TagRanker.load(self.db, self.state_path)
+        for _ in range(3):
+            ranker.record("s1", "docker", True, "heuristic", extensions=[".py"])
+            ranker.record("s1", "frontend", False, "heuristic", extensions=[".py"])
+
+        candidates = ["frontend", "python", "backend", "docker"] + [f"tag{i}" for i in range(96)]
+        queries = self.count_queries()
+        ranked = ranker.rank(candidates, source="heuristic", extensions=[".py"])
+
+        self.assertEqual(queries, [])
+        self.assertEqual(ranked[0], "docker")
+        self.assertNotIn("frontend", ranked)
+        self.assertEqual(ranked[1:3], ["python", "backend"])
+
+    def test_extension_context_refines_source_rate(self):
+        """Feedback in one file-type context weighs most in that context."""
+        ranker = TagRanker(self.db)
+        for _ in range(4):
+            ranker.record("s1", "react", True, "ai", extensions=[".tsx"])
+            ranker.record("s1", "react", False, "ai", extensions=[".py"])
+
+        self.assertGreater(ranker.acceptance_rate("react", "ai", [".tsx"]), 0.7)
+        self.assertLess(ranker.acceptance_rate("react", "ai", [".py"]), 0.3)
+        self.assertAlmostEqual(ranker.acceptance_rate("unknown", "ai"), 0.5)
+
+    def test_snapshot_and_catch_up_do_not_double_count(self):
+        """A reload uses the snapshot plus only rows written after it."""
+        ranker = TagRanker.load(self.db, self.state_path)
+        ranker.record("s1", "api", True, "heuristic")
+        ranker.save()
+
+        # Written by another process after the snapshot
+        self.db.add_tag_feedback("s1", "api", False, "heuristic")
+
+        reloaded = TagRanker.load(self.db, self.state_path)
+        self.assertEqual(reloaded._counts[("api", None, None)], [1, 2])
+        self.assertEqual(reloaded.stats["last_feedback_id"], 2)
+
+        reloaded.record("s1", "api", True, "heuristic")
+        self.assertEqual(reloaded._counts[("api", None, None)], [2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Unit tests for the Textual dashboard app."""
+
+import asyncio
+import unittest
+
+from textual.widgets import DataTable
+
+from llm_session_manager.core.health_monitor import HealthMonitor
+from llm_session_manager.models import Session, SessionType
+from llm_session_manager.ui.textual_dashboard import DashboardApp
+
+
+class FakeDiscovery:
+    def __init__(self, pids):
+        self.pids = pids
+
+    def discover_sessions(self):
+        return [Session(id=f"claude_code_{pid}", pid=pid, type=SessionType.CLAUDE_CODE) for pid in self.pids]
+
+
+class FakeEstimator:
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def estimate_session_tokens(self, session):
+        return self.tokens[session.pid]
+
+
+class FakeHealthMonitor(HealthMonitor):
+    def calculate_health(self, session):
+        return 0.9
+
+
+class TestDashboardApp(unittest.IsolatedAsyncioTestCase):
+    """Test async refresh and targeted row updates."""
+
+    def make_app(self, pids=(1, 2, 3)):
+        self.discovery = FakeDiscovery(list(pids))
+        self.estimator = FakeEstimator({pid: pid * 1000 for pid in pids})
+        return DashboardApp(self.discovery, FakeHealthMonitor(), self.estimator, refresh_interval=3600)
+
+    async def wait_refreshed(self, app, pilot, refreshes):
+        for _ in range(200):
+            if app.stats["refreshes"] >= refreshes and not app.refreshing:
+                break
+            await asyncio.sleep(0.01)
+        await pilot.pause()
+
+    async def test_rows_follow_refreshes(self):
+        """Rows are added on the first refresh and only changed cells update later."""
+        app = self.make_app()
+        async with app.run_test() as pilot:
+            await self.wait_refreshed(app, pilot, 1)
+            table = app.query_one("#sessions", DataTable)
+            self.assertEqual(table.row_count, 3)
+            self.assertIn("2,000", table.get_cell("claude_code_2", "tokens").plain)
+            rebuilt = app.stats["rows_rebuilt"]
+
+            self.estimator.tokens[2] = 5000
+            await pilot.press("r")
+            await self.wait_refreshed(app, pilot, 2)
+
+            self.assertIn("5,000", table.get_cell("claude_code_2", "tokens").plain)
+            self.assertEqual(app.stats["rows_rebuilt"], rebuilt)
+
+    async def test_membership_and_view_changes_rebuild_rows(self):
+        """A vanished session's row is removed; sort keys re-order the table."""
+        app = self.make_app()
+        async with app.run_test() as pilot:
+            await self.wait_refreshed(app, pilot, 1)
+            table = app.query_one("#sessions", DataTable)
+
+            self.discovery.pids.remove(1)
+            await pilot.press("r")
+            await self.wait_refreshed(app, pilot, 2)
+            self.assertEqual(table.row_count, 2)
+
+            await pilot.press("s", "o")  # Tokens, descending
+            self.assertEqual([row.key.value for row in table.ordered_rows],
+                             ["claude_code_3", "claude_code_2"])
+
+    async def test_sort_key_changes_reorder_rows(self):
+        """A refresh that changes sort key values re-orders the rows."""
+        app = self.make_app()
+        async with app.run_test() as pilot:
+            await self.wait_refreshed(app, pilot, 1)
+            table = app.query_one("#sessions", DataTable)
+            await pilot.press("s", "o")  # Tokens, descending
+
+            self.estimator.tokens[1] = 9000
+            await pilot.press("r")
+            await self.wait_refreshed(app, pilot, 2)
+
+            expected = [s.id for s in app.dashboard.view_sessions()]
+            self.assertEqual(expected, ["claude_code_1", "claude_code_3", "claude_code_2"])
+            self.assertEqual([row.key.value for row in table.ordered_rows], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()